@@ -66,7 +66,6 @@ except Exception as e:
 # --- Now safe to import audio-related libraries ---
 import pygame
 import pyaudio
-import speech_recognition
 
 # Restore stderr after audio imports
 sys.stderr = sys.__stderr__
@@ -75,27 +74,15 @@ warnings.filterwarnings("ignore", category=RuntimeWarning)
 
 # --- Project imports ---
 from config import CONFIG
-from calendar_module import CalendarModule
-from weather_module import WeatherModule
-from fitbit_module import FitbitModule
-from smarthome_module import SmartHomeModule
-from stocks_module import StocksModule
-from clock_module import ClockModule
-from retrocharacters_module import RetroCharactersModule
-from module_manager import ModuleManager
+from module_manager import ModuleManager, ModuleRegistry
 from layout_manager import LayoutManager
-from AI_Module import AIInteractionModule
-from ai_voice_module import AIVoiceModule
-from countdown_module import CountdownModule
-from quote_module import QuoteModule
-from news_module import NewsModule
-from openclaw_module import OpenClawModule
-from sysinfo_module import SysInfoModule
-from greeting_module import GreetingModule
-from octopus_energy_module import OctopusEnergyModule
-from avatar_module import AvatarModule
-from phone_module import PhoneModule
 from api_tracker import api_tracker
+from background_fetcher import fetch_scheduler
+from ha_state import shutdown_ha_stores
+from compositor import FrameCompositor, position_rect
+from frame_scheduler import FrameScheduler
+from module_profiler import ModuleProfiler
+from module_base import LayerCache
 
 
 def ensure_valid_color(color):
@@ -164,20 +151,23 @@ class MagicMirror:
         self.initialize_screen()
         self.clock = pygame.time.Clock()
 
-        # Initialize modules first
-        self.modules = self.initialize_modules()
+        # Register modules; they are imported and constructed on demand
+        # (first visible, or needed by a command) - see ModuleRegistry
+        self.loading_config = CONFIG.get('module_loading', {})
+        self.registry = ModuleRegistry(
+            frame_budget_ms=self.loading_config.get('frame_budget_ms', 40),
+        )
+        self.registry.register_from_config(skip=self.loading_config.get('skip', ['eleven_voice']))
+        self.modules = self.registry.modules
 
         self.frame_rate = CONFIG.get('frame_rate', 30)
         self.running = True
         self.state = "active"
         self.font = pygame.font.Font(None, 48)
 
-        # Create module manager with pre-initialized modules
-        self.module_manager = ModuleManager(initialized_modules=self.modules)
-
-        # Prevent module_manager from re-initializing
-        self.module_manager.initialize_modules = lambda: None
-        self.module_manager.initialize_module = lambda x: None
+        # Module manager owns visibility; initialize_module() loads
+        # through the registry
+        self.module_manager = ModuleManager(registry=self.registry)
 
         self._positions_initialized = False
 
@@ -189,44 +179,61 @@ class MagicMirror:
         self.module_positions = {}
         self.setup_module_positions()
 
+        # Dirty-rect compositor: only changed regions are repainted/pushed
+        comp_cfg = CONFIG.get('compositor', {})
+        self.compositor = FrameCompositor(
+            self.screen,
+            full_update_ratio=comp_cfg.get('full_update_ratio', 0.6),
+            enabled=comp_cfg.get('enabled', True),
+        )
+        # Pre-rendered surfaces for RetainedLayer modules (static content)
+        self.layer_cache = LayerCache()
+
+        # Adaptive tick rate: full only while something animates
+        fs_cfg = CONFIG.get('frame_scheduler', {})
+        self.frame_scheduler = FrameScheduler(
+            frame_rate=self.frame_rate,
+            max_fps=fs_cfg.get('max_fps'),
+            idle_fps=fs_cfg.get('idle_fps', 4),
+            wake_hold_ms=fs_cfg.get('wake_hold_ms', 1500),
+            input_poll_ms=fs_cfg.get('input_poll_ms', 50),
+            log_interval_s=fs_cfg.get('log_interval_s', 300),
+            enabled=fs_cfg.get('enabled', True),
+        )
+
         # Animation manager for fade transitions and center notifications
         from animation_manager import AnimationManager
         self.animation_manager = AnimationManager(
             self.screen.get_width(), self.screen.get_height()
         )
 
-        # Wire notification callbacks for modules that support them
-        for name, module in self.modules.items():
-            if hasattr(module, 'set_notification_callback'):
-                module.set_notification_callback(self.animation_manager.push_notification)
+        # Per-module update/draw timing (web panel /api/profile)
+        prof_cfg = CONFIG.get('profiler', {})
+        self.profiler = ModuleProfiler(
+            frame_rate=self.frame_rate,
+            module_budget_ms=prof_cfg.get('module_budget_ms', 5.0),
+            window_s=prof_cfg.get('window_s', 60),
+            log_interval_s=prof_cfg.get('log_interval_s', 300),
+            enabled=prof_cfg.get('enabled', True),
+        )
+        self.profiler.instrument(self.modules, self.animation_manager)
 
-        # Premium boot: modules fade in one after another (bars first,
-        # then columns top to bottom)
+        # Premium boot: modules load (and fade in) in this order - bars
+        # first, then columns top to bottom, then the rest
         layout_v2 = CONFIG.get('layout_v2', {})
         boot_order = ['clock', 'stocks']
-        boot_order += [n for n in layout_v2.get('left_modules', []) if n in self.modules]
-        boot_order += [n for n in layout_v2.get('right_modules', []) if n in self.modules]
-        self.animation_manager.stagger_in([n for n in boot_order if n in self.modules])
-
-        # Wire the avatar to the voice module: lipsync audio + state changes
-        if 'avatar' in self.modules and 'ai_voice' in self.modules:
-            voice = self.modules['ai_voice']
-            avatar = self.modules['avatar']
-            if hasattr(voice, 'set_audio_sink'):
-                voice.set_audio_sink(avatar.feed_audio)
-            if hasattr(voice, 'set_state_listener'):
-                voice.set_state_listener(avatar.set_voice_state)
-            logging.info("Avatar wired to AI voice module (lipsync + state)")
+        boot_order += layout_v2.get('left_modules', []) + layout_v2.get('right_modules', [])
+        names = self.registry.names()
+        self.load_order = [n for n in dict.fromkeys(boot_order) if n in names]
+        self.load_order += [n for n in names if n not in self.load_order]
 
         # Spoken commands: transcripts arrive on the WebSocket thread, so
         # they queue here and are parsed on the main loop
         from queue import Queue as _Queue
         self.voice_command_queue = _Queue()
+        self._voice_check_pending = False   # set by the voice thread, run in the main loop
         from voice_commands import ModuleCommand
         self.voice_command_parser = ModuleCommand()
-        if 'ai_voice' in self.modules and hasattr(self.modules['ai_voice'], 'set_command_listener'):
-            self.modules['ai_voice'].set_command_listener(self.voice_command_queue.put)
-            logging.info("Voice command listener wired to AI voice module")
 
         # Phone control panel (LAN only, no auth - see web_panel.py)
         self.web_panel = None
@@ -239,37 +246,10 @@ class MagicMirror:
             except Exception as e:
                 logging.error(f"Web panel failed to start: {e}")
 
-        # Ensure all modules have a visibility entry (don't override
-        # decisions already made by ModuleManager.verify_voice_module)
-        for module_name in self.modules.keys():
-            if module_name not in self.module_manager.module_visibility:
-                self.module_manager.module_visibility[module_name] = True
-
-        # Auto-hide openclaw if no gateway configured
-        if 'openclaw' in self.modules:
-            oc = self.modules['openclaw']
-            if not getattr(oc, 'gateway_url', ''):
-                self.module_manager.module_visibility['openclaw'] = False
-                logging.info("OpenClaw hidden: no gateway URL configured")
-
-        # Auto-hide smarthome if no HA URL configured
-        if 'smarthome' in self.modules:
-            sh = self.modules['smarthome']
-            if not getattr(sh, 'ha_url', ''):
-                self.module_manager.module_visibility['smarthome'] = False
-                logging.info("SmartHome hidden: no HA URL configured")
-
-        # Phone module: needs the calendar for the leave countdown; hide
-        # entirely when neither HA nor calendar can feed it
-        if 'phone' in self.modules:
-            phone = self.modules['phone']
-            if 'calendar' in self.modules:
-                phone.set_calendar_source(self.modules['calendar'])
-            if not getattr(phone, 'ha_url', '') and 'calendar' not in self.modules:
-                self.module_manager.module_visibility['phone'] = False
-                logging.info("Phone hidden: no HA URL and no calendar")
-
-        logging.info(f"Initialized modules: {list(self.modules.keys())}")
+        # Everything else is wired as each module loads
+        self.registry.add_listener(self._on_module_loaded)
+        self.initialize_modules()
+        logging.info(f"Registered modules: {names}; loaded at boot: {list(self.modules.keys())}")
 
     def setup_logging(self):
         """Set up logging configuration."""
@@ -303,75 +283,66 @@ class MagicMirror:
             logging.debug(message)
 
     def initialize_modules(self):
-        """Initialize modules, skipping any disabled in module_visibility.
+        """Construct the modules needed before the first frame.
 
-        Voice modules (ai_voice, ai_interaction, eleven_voice) open network
-        connections on init and cost API credits, so they are only created
-        when explicitly enabled in config.
+        With module_loading.lazy (the default) that is only the 'eager'
+        list (the clock); the rest load as they become visible once the
+        first frame is up. With lazy off, everything loads here, Fitbit
+        last (depends on network, can be slow).
         """
-        modules = {}
-        module_classes = {
-            'clock': ClockModule,
-            'weather': WeatherModule,
-            'stocks': StocksModule,
-            'calendar': CalendarModule,
-            'fitbit': FitbitModule,
-            'retro_characters': RetroCharactersModule,
-            'ai_voice': AIVoiceModule,
-            'ai_interaction': AIInteractionModule,
-            'countdown': CountdownModule,
-            'quote': QuoteModule,
-            'news': NewsModule,
-            'openclaw': OpenClawModule,
-            'smarthome': SmartHomeModule,
-            'sysinfo': SysInfoModule,
-            'greeting': GreetingModule,
-            'octopus_energy': OctopusEnergyModule,
-            'avatar': AvatarModule,
-            'phone': PhoneModule
-        }
-
-        config_copy = CONFIG.copy()
-        visibility = CONFIG.get('module_visibility', {})
-
-        for module_name, module_config in config_copy.items():
-            if not isinstance(module_config, dict) or 'class' not in module_config:
-                continue
+        if self.loading_config.get('lazy', True):
+            eager = self.loading_config.get('eager', ['clock'])
+        else:
+            eager = [n for n in self.load_order if n != 'fitbit'] + ['fitbit']
+        for name in eager:
+            if name in self.load_order:
+                self.registry.load(name, 'boot')
+
+    def _on_module_loaded(self, name, module):
+        """Wire a freshly constructed module into the mirror (main loop)."""
+        self.profiler.instrument_module(name, module)
+        if hasattr(module, 'set_notification_callback'):
+            module.set_notification_callback(self.animation_manager.push_notification)
+        self.animation_manager.stagger_in([name])
+        self.compositor.invalidate()
+
+        # Wire the avatar to the voice module: lipsync audio (state changes
+        # reach it through _on_voice_state)
+        if name in ('avatar', 'ai_voice') and 'avatar' in self.modules and 'ai_voice' in self.modules:
+            voice = self.modules['ai_voice']
+            avatar = self.modules['avatar']
+            if hasattr(voice, 'set_audio_sink'):
+                voice.set_audio_sink(avatar.feed_audio)
+            logging.info("Avatar wired to AI voice module (lipsync + state)")
 
-            # Skip modules explicitly disabled in config (prevents network
-            # connections like the OpenAI Realtime WebSocket from opening)
-            if not visibility.get(module_name, True):
-                logging.info(f"Skipping {module_name}: disabled in module_visibility")
-                continue
+        if name == 'ai_voice':
+            if hasattr(module, 'set_state_listener'):
+                module.set_state_listener(self._on_voice_state)
+            if hasattr(module, 'set_command_listener'):
+                module.set_command_listener(self._on_voice_transcript)
+                logging.info("Voice command listener wired to AI voice module")
+            self.module_manager.verify_voice_module()
 
-            try:
-                if module_name == 'ai_voice':
-                    logging.info(f"Attempting to initialize primary voice module: {module_name}")
-                    modules[module_name] = module_classes[module_name](module_config)
-                    logging.info(f"Successfully initialized {module_name}")
-                elif module_name == 'ai_interaction' and 'ai_voice' not in modules:
-                    logging.info("Falling back to AIInteractionModule")
-                    modules[module_name] = module_classes[module_name](module_config)
-                    logging.info(f"Initialized fallback module: {module_name}")
-                elif module_name in module_classes and module_name != 'fitbit':
-                    modules[module_name] = module_classes[module_name](**module_config.get('params', {}))
-                    logging.info(f"Initialized module: {module_name}")
-            except Exception as e:
-                logging.error(f"Error initializing {module_name}: {e}")
-                logging.error(traceback.format_exc())
-                if module_name == 'ai_voice':
-                    logging.warning("Primary voice module failed, attempting fallback")
+        # Auto-hide openclaw if no gateway configured
+        if name == 'openclaw' and not getattr(module, 'gateway_url', ''):
+            self.module_manager.module_visibility['openclaw'] = False
+            logging.info("OpenClaw hidden: no gateway URL configured")
 
-        # Initialize Fitbit last (depends on network, can be slow)
-        if 'fitbit' in config_copy and visibility.get('fitbit', True):
-            try:
-                logging.info("Initializing FitbitModule (delayed)")
-                modules['fitbit'] = module_classes['fitbit'](**config_copy['fitbit'].get('params', {}))
-                logging.info("Successfully initialized FitbitModule")
-            except Exception as e:
-                logging.error(f"Error initializing fitbit: {e}")
+        # Auto-hide smarthome if no HA URL configured
+        if name == 'smarthome' and not getattr(module, 'ha_url', ''):
+            self.module_manager.module_visibility['smarthome'] = False
+            logging.info("SmartHome hidden: no HA URL configured")
 
-        return modules
+        # Phone module: needs the calendar for the leave countdown; hide
+        # entirely when neither HA nor calendar can feed it
+        if name in ('phone', 'calendar') and 'phone' in self.modules:
+            phone = self.modules['phone']
+            if 'calendar' in self.modules:
+                phone.set_calendar_source(self.modules['calendar'])
+            if (name == 'phone' and not getattr(phone, 'ha_url', '')
+                    and 'calendar' not in self.registry.names()):
+                self.module_manager.module_visibility['phone'] = False
+                logging.info("Phone hidden: no HA URL and no calendar")
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -383,8 +354,9 @@ class MagicMirror:
                 elif event.key == pygame.K_d:
                     self.toggle_debug()
                 elif event.key == pygame.K_h:
-                    if 'smarthome' in self.modules:
-                        self.modules['smarthome'].toggle_dashboard()
+                    sh = self.registry.load('smarthome', 'command')
+                    if sh is not None:
+                        sh.toggle_dashboard()
                 elif event.key == pygame.K_s:
                     if self.state == "active":
                         self.change_state("screensaver")
@@ -400,7 +372,8 @@ class MagicMirror:
                 elif event.key == pygame.K_SPACE:
                     if self.state != "active":
                         self.change_state("active")
-                    elif 'ai_voice' in self.modules:
+                    elif (self.module_manager.voice_interface != 'ai_interaction'
+                          and self.registry.load('ai_voice', 'command') is not None):
                         try:
                             logging.info("Space bar pressed - triggering AIVoiceModule")
                             self.modules['ai_voice'].on_button_press()
@@ -409,7 +382,7 @@ class MagicMirror:
                             if 'ai_interaction' in self.modules:
                                 logging.info("Falling back to AIInteractionModule")
                                 self.modules['ai_interaction'].on_button_press()
-                    elif 'ai_interaction' in self.modules:
+                    elif self.registry.load('ai_interaction', 'command') is not None:
                         logging.info("Using AIInteractionModule (primary voice unavailable)")
                         self.modules['ai_interaction'].on_button_press()
 
@@ -417,14 +390,19 @@ class MagicMirror:
         """Draw all visible modules in z-order for mirror layout.
 
         State-aware: active draws info modules, screensaver draws retro chars,
-        sleep draws clock only.
+        sleep draws clock only. Layers are registered with the compositor,
+        which clears, repaints and pushes only the regions that changed.
         """
         try:
-            self.screen.fill((0, 0, 0))
-
             # Advance animation timers
             self.animation_manager.update()
 
+            comp = self.compositor
+            comp.begin_frame()
+            if self.debug_layout:
+                # Debug boxes and labels sit outside the module zones
+                comp.invalidate()
+
             layout_v2 = CONFIG.get('layout_v2', {})
             left_names = layout_v2.get('left_modules', [])
             right_names = layout_v2.get('right_modules', [])
@@ -436,71 +414,164 @@ class MagicMirror:
                 # Only draw screensaver overlays and clock
                 for name in fullscreen_names:
                     if name in screensaver_names:
-                        self._draw_module(name)
-                self._draw_module('clock')
+                        self._add_module_layer(name)
+                self._add_module_layer('clock')
 
             elif self.state == "sleep":
                 # Clock only
-                self._draw_module('clock')
+                self._add_module_layer('clock')
 
             else:
                 # Active state: draw everything except screensaver
                 # 1) Left and right column modules
                 for name in left_names + right_names:
-                    self._draw_module(name)
+                    self._add_module_layer(name)
 
-                # 2) Bottom bar: stock ticker
+                # 2) Bottom bar: stock ticker (scrolls, so always dirty)
                 if 'stocks' in self.modules and self.module_manager.is_module_visible('stocks'):
                     stocks = self.modules['stocks']
                     if hasattr(stocks, 'draw_scrolling_ticker'):
-                        stocks.draw_scrolling_ticker(self.screen)
-                        # Debug box for ticker (not drawn via _draw_module)
-                        if self.debug_layout:
-                            pos = self.module_positions.get('stocks', {})
-                            sw = self.screen.get_width()
-                            th = 40
-                            ty = self.screen.get_height() - th
-                            pygame.draw.rect(self.screen, (255, 0, 0),
-                                            (0, ty, sw, th), 1)
+                        comp.add_layer(
+                            'stocks', [self._module_rect('stocks')], True,
+                            self._draw_ticker,
+                        )
                     else:
-                        self._draw_module('stocks')
+                        self._add_module_layer('stocks')
 
                 # 3) Top bar: clock
-                self._draw_module('clock')
+                self._add_module_layer('clock')
 
                 # 4) Center overlays (AI/voice - only when active)
                 for name in center_names:
-                    self._draw_module(name)
+                    self._add_module_layer(name)
 
                 # 4b) Smart home dashboard overlay (voice/'h' key, on demand)
                 sh = self.modules.get('smarthome')
                 if sh is not None and hasattr(sh, 'draw_dashboard'):
-                    sh.draw_dashboard(self.screen)
+                    rect = (sh.get_dashboard_rect(self.screen)
+                            if hasattr(sh, 'get_dashboard_rect')
+                            else self.screen.get_rect())
+                    if rect is not None:
+                        comp.add_layer(
+                            'dashboard', [rect], True,
+                            lambda: sh.draw_dashboard(self.screen),
+                        )
 
                 # 5) Draw any remaining modules not in layout zones
                 drawn = set(['clock', 'stocks'] + left_names + right_names
                             + center_names + fullscreen_names)
                 for name in self.modules:
                     if name not in drawn:
-                        self._draw_module(name)
+                        self._add_module_layer(name)
 
             # Center notifications (on top of everything in all states)
-            self.animation_manager.draw_notifications(self.screen)
+            notif_rect = self.animation_manager.get_notification_rect()
+            if notif_rect is not None:
+                comp.add_layer(
+                    'notifications', [notif_rect], True,
+                    lambda: self.animation_manager.draw_notifications(self.screen),
+                )
 
             # Debug overlay
             if self.debug_layout:
-                self._draw_debug_overlay()
+                comp.add_layer(
+                    'debug', [self.screen.get_rect()], True,
+                    self._draw_debug_overlay,
+                )
 
-            pygame.display.flip()
+            comp.present()
         except Exception as e:
             logging.error(f"Error in draw_modules: {e}")
             logging.error(traceback.format_exc())
 
+    def _animation_demand(self):
+        """Names of what is animating this frame (drives the frame rate).
+
+        Asks the AnimationManager and every module drawn this frame that
+        has an is_animating() hook; modules without one count as static.
+        """
+        demand = []
+        if self.animation_manager.is_animating():
+            demand.append('animation')
+        if self.registry.has_pending():
+            demand.append('loading')
+        for name in self.compositor.get_layer_names():
+            module = self.modules.get('smarthome' if name == 'dashboard' else name)
+            if module is None or not hasattr(module, 'is_animating'):
+                continue
+            try:
+                if module.is_animating() and name not in demand:
+                    demand.append(name)
+            except Exception as e:
+                logging.debug(f"is_animating failed for {name}: {e}")
+        return demand
+
+    def _on_voice_state(self, status):
+        """Voice status changes (voice thread): drive the avatar, re-check
+        the voice interface on the main loop, wake the loop."""
+        if 'avatar' in self.modules:
+            self.modules['avatar'].set_voice_state(status)
+        self._voice_check_pending = True
+        self.frame_scheduler.wake('voice')
+
+    def _on_voice_transcript(self, text):
+        """Spoken command transcript (voice thread): queue it, wake the loop."""
+        self.voice_command_queue.put(text)
+        self.frame_scheduler.wake('voice')
+
+    def _module_rect(self, name):
+        """Screen rect of a module's layout zone (full screen if unknown)."""
+        position = self.module_positions.get(name, {})
+        if not position.get('width') or not position.get('height'):
+            return self.screen.get_rect()
+        return position_rect(position)
+
+    def _add_module_layer(self, name):
+        """Register a visible module with the compositor.
+
+        A module is repainted when it is fading, when its retained layer
+        is stale (content_version changed), or when its optional
+        needs_redraw() hook says so (modules with neither repaint every
+        frame). get_draw_rects() adds areas painted outside its zone.
+        """
+        if name not in self.modules:
+            return
+        if not self.module_manager.is_module_visible(name):
+            return
+        if self.animation_manager.get_module_alpha(name) <= 0:
+            return  # Fully faded out
+
+        module = self.modules[name]
+        rects = [self._module_rect(name)]
+        if hasattr(module, 'get_draw_rects'):
+            rects += module.get_draw_rects(self.module_positions.get(name, {}))
+        if self.animation_manager.is_module_fading(name):
+            dirty = True
+        elif hasattr(module, 'content_version'):
+            dirty = self.layer_cache.is_stale(
+                name, module, self.module_positions.get(name, {})
+            )
+        else:
+            dirty = not hasattr(module, 'needs_redraw') or module.needs_redraw()
+        self.compositor.add_layer(name, rects, dirty, lambda: self._draw_module(name))
+
+    def _draw_ticker(self):
+        """Draw the bottom-bar stock ticker (not drawn via _draw_module)."""
+        self.modules['stocks'].draw_scrolling_ticker(self.screen)
+        # Debug box for ticker
+        if self.debug_layout:
+            sw = self.screen.get_width()
+            th = 40
+            ty = self.screen.get_height() - th
+            pygame.draw.rect(self.screen, (255, 0, 0), (0, ty, sw, th), 1)
+
     def _draw_module(self, name):
         """Draw a single module if it exists and is visible.
 
         Applies per-module fade alpha from the animation manager.
-        When a module is mid-fade, it renders to a temp surface first.
+        RetainedLayer modules blit their cached surface (re-rendered only
+        when content_version changes). Other modules mid-fade render to a
+        temp surface first.
         """
         if name not in self.modules:
             return
@@ -514,7 +585,9 @@ class MagicMirror:
         if alpha <= 0:
             return  # Fully faded out
 
-        if self.animation_manager.is_module_fading(name):
+        if hasattr(module, 'content_version'):
+            self.layer_cache.blit(self.screen, name, module, position, alpha)
+        elif self.animation_manager.is_module_fading(name):
             # Render to temp surface and apply alpha
             w = position.get('width', 300)
             h = position.get('height', 300)
@@ -555,6 +628,7 @@ class MagicMirror:
         """Toggle debug mode on/off (includes visible layout grid)."""
         self.debug_mode = not self.debug_mode
         self.debug_layout = self.debug_mode
+        self.compositor.invalidate()
         logging.info(f"Debug mode {'enabled' if self.debug_mode else 'disabled'}")
 
     def _toggle_module_by_key(self, key):
@@ -573,7 +647,7 @@ class MagicMirror:
             return
 
         module_name = toggle_list[idx]
-        if module_name not in self.modules:
+        if module_name not in self.module_manager.module_visibility:
             return
 
         current = self.module_manager.is_module_visible(module_name)
@@ -604,7 +678,7 @@ class MagicMirror:
             return
 
         # Dashboard control ("show the dashboard", "close dashboard")
-        if 'dashboard' in lowered and 'smarthome' in self.modules:
+        if 'dashboard' in lowered and self.registry.load('smarthome', 'command') is not None:
             sh = self.modules['smarthome']
             if any(w in lowered for w in ('hide', 'close', 'dismiss')):
                 sh.hide_dashboard()
@@ -614,6 +688,12 @@ class MagicMirror:
                 sh.toggle_dashboard()
             return
 
+        # Data refresh ("refresh the news", "update stocks")
+        target = self.voice_command_parser.parse_refresh(text)
+        if target and self.refresh_module(target):
+            self.speech_logger.log_user_speech(text, was_command=True)
+            return
+
         # Module show/hide ("hide the news", "show weather")
         command = self.voice_command_parser.parse_command(text)
         if command:
@@ -625,11 +705,31 @@ class MagicMirror:
                     duration_ms=2000,
                 )
 
+    def refresh_module(self, name):
+        """Fetch a module's data now, ahead of background polling.
+
+        Used by the voice "refresh ..." command and the web panel. Returns
+        False if the module is not loaded or has no refresh() hook.
+        """
+        module = self.modules.get(name)
+        if module is None or not hasattr(module, 'refresh'):
+            return False
+        module.refresh()
+        logging.info(f"Refreshing {name}")
+        self.animation_manager.push_notification(f"{name}: refreshing", duration_ms=2000)
+        return True
+
     def update_modules(self):
         # Apply commands queued by the web control panel
         if self.web_panel:
             self.web_panel.process_commands()
 
+        # Fall back to (or back from) the text assistant as the realtime
+        # connection fails or recovers
+        if self._voice_check_pending:
+            self._voice_check_pending = False
+            self.module_manager.verify_voice_module()
+
         # Spoken commands from the realtime voice module
         while not self.voice_command_queue.empty():
             try:
@@ -653,7 +753,21 @@ class MagicMirror:
         # Update visible modules (state-aware)
         screensaver_names = CONFIG.get('screensaver_modules', ['retro_characters'])
         sleep_names = CONFIG.get('sleep_modules', ['clock'])
-        for module_name, module in self.modules.items():
+
+        # Queue modules that just became visible and build a few
+        for module_name in self.load_order:
+            if module_name in self.modules or not self.module_manager.is_module_visible(module_name):
+                continue
+            if self.state == "active" and module_name in screensaver_names:
+                continue
+            if self.state == "screensaver" and module_name not in screensaver_names and module_name != 'clock':
+                continue
+            if self.state == "sleep" and module_name not in sleep_names:
+                continue
+            self.registry.request(module_name)
+        self.registry.pump()
+
+        for module_name, module in list(self.modules.items()):
             if self.module_manager.is_module_visible(module_name):
                 try:
                     if self.state == "active" and module_name in screensaver_names:
@@ -688,10 +802,13 @@ class MagicMirror:
             logging.info("Starting Magic Mirror main loop")
             while self.running:
                 try:
+                    frame_start = time.perf_counter()
                     self.handle_events()
                     self.update_modules()
                     self.draw_modules()
-                    self.clock.tick(self.frame_rate)
+                    self.registry.first_frame(prewarm=self.loading_config.get('prewarm', True))
+                    self.profiler.end_frame(time.perf_counter() - frame_start)
+                    self.frame_scheduler.tick(self.state, self._animation_demand())
                 except KeyboardInterrupt:
                     logging.info("Ctrl+C received")
                     self.running = False
@@ -716,6 +833,8 @@ class MagicMirror:
         if self.web_panel:
             self.web_panel.stop()
         api_tracker.force_summary()
+        fetch_scheduler.shutdown(timeout=0.5)
+        shutdown_ha_stores(timeout=0.5)
 
         module_names = list(self.modules.keys())
         module_names.reverse()
@@ -798,6 +917,7 @@ class MagicMirror:
             return
         old_state = self.state
         self.state = new_state
+        self.compositor.invalidate()
         self.animation_manager.begin_state_transition(old_state, new_state)
         logging.info(f"Mirror state changed to: {new_state}")
 
@@ -808,7 +928,7 @@ class MagicMirror:
             return
 
         try:
-            for name in self.modules.keys():
+            for name in self.registry.names():
                 position = self.layout_manager.get_module_position(name)
                 if position:
                     self.module_positions[name] = position
@@ -816,7 +936,7 @@ class MagicMirror:
                 else:
                     logging.warning(f"No position defined for module: {name}")
 
-            missing_positions = [name for name in self.modules.keys() if name not in self.module_positions]
+            missing_positions = [name for name in self.registry.names() if name not in self.module_positions]
             if missing_positions:
                 logging.warning(f"Modules missing positions: {missing_positions}")
 
@@ -854,7 +974,7 @@ class MagicMirror:
 
         except Exception as e:
             logging.error(f"Error setting up module positions: {e}")
-            for i, name in enumerate(self.modules.keys()):
+            for i, name in enumerate(self.registry.names()):
                 self.module_positions[name] = {'x': 10, 'y': 10 + i * 100, 'width': 300, 'height': 90}
                 logging.warning(f"Using emergency fallback position for {name}")
 
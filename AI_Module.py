@@ -12,6 +12,8 @@ from queue import Queue
 import time
 import traceback
 from voice_commands import ModuleCommand
+from tts_cache import tts_cache
+from speech_pipeline import PygameSpeechPlayer, SpeechPipeline
 import json
 import pyaudio
 import math
@@ -20,6 +22,7 @@ DEFAULT_MODEL = "gpt-5.4-mini"
 DEFAULT_MAX_TOKENS = 250
 # Pinned snapshot: the unversioned gpt-4o-mini-tts alias shuts down 2026-07-23
 TTS_MODEL = "gpt-4o-mini-tts-2025-12-15"
+TTS_VOICE = "alloy"
 
 class AIInteractionModule:
     def __init__(self, config_path=None, **kwargs):
@@ -88,6 +91,26 @@ class AIInteractionModule:
         
         # Initialize voice command parser
         self.command_parser = ModuleCommand()
+
+        # Phrases synthesised into the TTS cache once idle (tts_cache.py)
+        cache_config = CONFIG.get('tts_cache', {})
+        self.prewarm_phrases = list(cache_config.get('prewarm_phrases', []))
+        self.prewarm_idle_s = cache_config.get('prewarm_idle_s', 20)
+        self._last_busy = time.time()
+        self._prewarm_thread = None
+        self._prewarmed_engine = None
+
+        # Replies are spoken sentence by sentence, synthesis overlapping
+        # playback (speech_pipeline.py)
+        speech_config = CONFIG.get('speech_pipeline', {})
+        self.speech = SpeechPipeline(
+            self.speech_file, PygameSpeechPlayer(self.tts_volume),
+            depth=speech_config.get('depth', 2),
+            min_chars=speech_config.get('min_chars', 12),
+            max_chars=speech_config.get('max_chars', 240),
+            on_discard=tts_cache.discard,
+            on_start=lambda: self.set_status("Speaking", "Speaking response..."),
+        )
         
         # At the end of initialization
         self._initialized = True
@@ -111,7 +134,83 @@ class AIInteractionModule:
         # This method is now primarily for hotword processing
         # Physical button is no longer used - interaction is through
         # keyboard space bar or hotword "Mirror"
-        pass
+        if self.recording or self.processing or self.speech.is_speaking():
+            self._last_busy = time.time()
+        elif time.time() - self._last_busy >= self.prewarm_idle_s:
+            self.prewarm_tts()
+
+    def prewarm_tts(self):
+        """Synthesise the configured phrases into the TTS cache in the background.
+
+        Runs once per engine (again if OpenAI access comes or goes). It
+        stops between phrases as soon as the user starts speaking and
+        picks up where it left off at the next idle spell.
+        """
+        if not self.prewarm_phrases or not tts_cache.enabled:
+            return
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return
+        engine, voice, synthesise = self._tts_engines()[0]
+        if engine == self._prewarmed_engine:
+            return
+
+        def busy():
+            return (self.recording or self.processing or not self.running
+                    or self.speech.is_speaking())
+
+        def run():
+            added = tts_cache.prewarm(engine, voice, self.prewarm_phrases, synthesise,
+                                      should_stop=busy)
+            if added:
+                self.logger.info(f"Prewarmed {added} TTS phrases ({engine})")
+            if not busy():
+                self._prewarmed_engine = engine
+
+        self._prewarm_thread = threading.Thread(target=run, name="tts-prewarm", daemon=True)
+        self._prewarm_thread.start()
+
+    def _tts_engines(self):
+        """[(engine, voice, synthesise(text, path))] in order of preference."""
+        engines = []
+        if self.client and self.has_openai_access:
+            def openai_tts(text, path):
+                response = self.client.audio.speech.create(
+                    model=TTS_MODEL,
+                    voice=TTS_VOICE,
+                    input=text,
+                )
+                response.stream_to_file(path)
+            engines.append((f"openai:{TTS_MODEL}", TTS_VOICE, openai_tts))
+
+        def google_tts(text, path):
+            gTTS(text=text, lang='en', slow=False).save(path)
+        engines.append(("gtts", "en", google_tts))
+        return engines
+
+    def speech_file(self, text):
+        """Audio file for text: from the TTS cache, else synthesised and cached.
+
+        OpenAI TTS is tried first, then gTTS. Offline, a sentence cached
+        earlier from OpenAI still plays in that voice. A hit returns
+        without touching the network. Pass the path to
+        tts_cache.discard() once played (it only removes uncached files).
+        """
+        engines = self._tts_engines()
+        openai_engine = f"openai:{TTS_MODEL}"
+        if engines[0][0] != openai_engine and tts_cache.contains(openai_engine, TTS_VOICE, text):
+            path = tts_cache.get(openai_engine, TTS_VOICE, text)
+            if path is not None:
+                return path
+        for i, (engine, voice, synthesise) in enumerate(engines):
+            try:
+                path, hit = tts_cache.fetch(engine, voice, text, lambda p: synthesise(text, p))
+            except Exception as e:
+                if i + 1 == len(engines):
+                    raise
+                self.logger.warning(f"{engine} TTS failed, falling back to gTTS: {e}")
+                continue
+            self.logger.debug(f"TTS {'cache hit' if hit else 'synthesised'} ({engine}): '{text[:40]}'")
+            return path
 
     def set_status(self, status, message=None):
         """Set status with logging"""
@@ -156,6 +255,12 @@ class AIInteractionModule:
         """Handle button press activation"""
         self.logger.info("Activation triggered via button/spacebar")
 
+        # Pressing again while a reply is being spoken cuts it short
+        if self.speech.is_speaking():
+            self.logger.info("Interrupting spoken reply")
+            self.speech.cancel()
+            return
+
         # Skip if we're already processing
         if self.recording or self.processing:
             self.logger.info("Already processing, ignoring activation")
@@ -307,42 +412,25 @@ class AIInteractionModule:
     def speak_chunk(self, text_chunk):
         """Real-time text-to-speech for response chunks.
 
-        Uses OpenAI TTS (gpt-4o-mini-tts) as primary, falls back to gTTS.
+        Queues the chunk on the speech pipeline and returns at once: it is
+        synthesised (OpenAI TTS, then gTTS, via the TTS cache) while
+        earlier chunks are still playing.
         """
         if not text_chunk.strip():
             return
+        self.speech.say(text_chunk)
 
-        temp_file = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "data", "temp_chunk.mp3"
-        )
-        os.makedirs(os.path.dirname(temp_file), exist_ok=True)
+    def get_tts_stats(self):
+        """TTS cache hit rate, synthesis time saved and size (web panel)."""
+        return tts_cache.get_stats()
 
-        try:
-            if self.client and self.has_openai_access:
-                try:
-                    response = self.client.audio.speech.create(
-                        model=TTS_MODEL,
-                        voice="alloy",
-                        input=text_chunk,
-                    )
-                    response.stream_to_file(temp_file)
-                except Exception as e:
-                    self.logger.warning(f"OpenAI TTS chunk failed, falling back to gTTS: {e}")
-                    tts = gTTS(text=text_chunk, lang='en', slow=False)
-                    tts.save(temp_file)
-            else:
-                tts = gTTS(text=text_chunk, lang='en', slow=False)
-                tts.save(temp_file)
+    def get_speech_stats(self):
+        """Time to first word and inter-sentence gaps of spoken replies (web panel)."""
+        return self.speech.stats()
 
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(10)
-        except Exception as e:
-            self.logger.error(f"Error in speak_chunk: {e}")
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+    def is_animating(self):
+        """Frame-scheduler hook: recording/processing indicators pulse."""
+        return bool(self.recording or self.processing)
 
     def draw(self, screen, position):
         """Draw AI status -- only visible when recording or processing.
@@ -411,6 +499,8 @@ class AIInteractionModule:
         """Safely clean up resources even when audio is disabled"""
         # Stop any running threads
         self.running = False
+        self.speech.stop()
+        tts_cache.flush()
         
         # Only try to join threads that exist
         if hasattr(self, 'processing_thread') and self.processing_thread and self.processing_thread.is_alive():
@@ -545,7 +635,7 @@ class AIInteractionModule:
                 if event.key == pygame.K_SPACE:
                     self.logger.info("SPACE key pressed - activating voice input")
 
-                    if not self.recording and not self.processing:
+                    if self.speech.is_speaking() or not (self.recording or self.processing):
                         self.on_button_press()
                     else:
                         self.logger.debug("Already recording or processing - ignoring space bar")
@@ -569,6 +659,9 @@ class AIInteractionModule:
                         self.logger.error(f"Could not enumerate audio devices: {e}")
                     
                 elif event.key == pygame.K_ESCAPE:
+                    if self.speech.is_speaking():
+                        self.logger.info("Spoken reply canceled by ESC key")
+                        self.speech.cancel()
                     if self.recording:
                         self.logger.info("Recording canceled by ESC key")
                         self.recording = False
@@ -690,16 +783,19 @@ class AIInteractionModule:
             # Log the final text we're sending to the API
             self.logger.info(f"Processing with AI: '{text}'")
             
-            # Stream the response from OpenAI
+            # Stream the response from OpenAI, speaking each sentence
+            # as soon as it is complete
             response_text = ""
+            self.speech.begin()
             for chunk in self.stream_response(text):
                 response_text += chunk
-                self.set_status("Responding", response_text[-40:])
-                
-            self.logger.info(f"AI Response: '{response_text}'")
+                self.speech.feed(chunk)
+                if self.status != "Speaking":
+                    self.set_status("Responding", response_text[-40:])
+            self.speech.end()
 
-            self.set_status("Speaking", "Speaking response...")
-            self.speak_text(response_text)
+            self.logger.info(f"AI Response: '{response_text}'")
+            self.speech.wait()
             
             # Add to response queue for main thread
             self.response_queue.put(('speech', {
@@ -713,6 +809,8 @@ class AIInteractionModule:
         except Exception as e:
             self.logger.error(f"Error in AI processing: {e}")
             self.set_status("Error", f"AI error: {str(e)[:30]}")
+            # An unfinished reply would leave is_speaking() True for good
+            self.speech.cancel()
             
         finally:
             self.processing = False
@@ -804,56 +902,19 @@ class AIInteractionModule:
             self.set_status("Error", f"API error: {str(e)[:30]}")
 
     def speak_text(self, text):
-        """Convert text to speech and play it.
+        """Convert text to speech and play it, sentence by sentence.
 
-        Uses OpenAI TTS (gpt-4o-mini-tts) as primary, falls back to gTTS.
+        Uses OpenAI TTS (gpt-4o-mini-tts) as primary, falls back to gTTS;
+        recurring sentences play from the TTS cache. Returns once spoken
+        or interrupted.
         """
         if not text:
             self.logger.warning("Empty text provided for TTS")
             return
 
-        temp_file = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "data", "response.mp3"
-        )
-        os.makedirs(os.path.dirname(temp_file), exist_ok=True)
-
-        try:
-            self.logger.info(f"Converting to speech: '{text[:50]}...'")
-
-            # Primary: OpenAI TTS
-            if self.client and self.has_openai_access:
-                try:
-                    response = self.client.audio.speech.create(
-                        model=TTS_MODEL,
-                        voice="alloy",
-                        input=text,
-                    )
-                    response.stream_to_file(temp_file)
-                    self.logger.info(f"Used OpenAI TTS ({TTS_MODEL})")
-                except Exception as e:
-                    self.logger.warning(f"OpenAI TTS failed, falling back to gTTS: {e}")
-                    tts = gTTS(text=text, lang='en', slow=False)
-                    tts.save(temp_file)
-            else:
-                # Fallback: gTTS
-                tts = gTTS(text=text, lang='en', slow=False)
-                tts.save(temp_file)
-
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-
-            speech = pygame.mixer.Sound(temp_file)
-            speech.set_volume(self.tts_volume)
-            speech.play()
-
-            pygame.time.wait(int(speech.get_length() * 1000))
-
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-        except Exception as e:
-            self.logger.error(f"Error in TTS: {e}")
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        self.logger.info(f"Converting to speech: '{text[:50]}...'")
+        if not self.speech.speak(text):
+            self.logger.info("Speech interrupted")
 
     def reinitialize_microphone(self):
         """Reinitialize the microphone if it has failed"""
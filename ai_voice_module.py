@@ -8,7 +8,10 @@ Conversation flow (live microphone):
     API and server-side semantic VAD detects when you finish speaking,
     commits the audio and generates a reply - no push-to-talk per turn.
   - While the mirror is speaking the mic is gated (chunks dropped) so it
-    does not hear its own speaker. No barge-in for now.
+    does not hear its own speaker, until the reply's last sample has
+    played (plus a short tail). If the server hears speech while a reply
+    is playing anyway (barge-in), or SPACE ends the conversation, the
+    rest of the reply is flushed and the response cancelled.
   - SPACE again ends the conversation; it also ends itself after
     conversation_timeout seconds without voice activity.
 
@@ -22,8 +25,28 @@ Default model is gpt-realtime-mini (best cost/latency for casual mirror
 conversation); set 'model' in config to gpt-realtime-2 for the smartest
 voice with reasoning.
 
+Connection: one background thread owns the WebSocket and walks a state
+machine - disconnected -> connecting -> session-configured -> ready,
+and backoff (jittered exponential delay) after any failure before the
+next connecting. Nothing waits for it: the constructor returns at once
+and a reconnect never blocks the caller. Events sent before the session
+is ready are buffered (bounded) and flushed in order once it is; events
+buffered for a session that is lost are dropped with it. Each state
+change is reported through set_status(), so the state listener sees
+"Connecting" / "Reconnecting" / "Ready". is_functional() tells the
+mirror whether to keep using the module: still connecting counts, but
+fail_after_attempts failed connects in a row, or a handshake refused
+with 401/403 (bad key), do not - the mirror then falls back to the
+text assistant until a session is ready again.
+
+Playback: reply audio goes to a voice_playback.PlaybackEngine - one
+aplay stream kept open for the life of the module, fed from a
+pre-allocated ring buffer through a small jitter buffer - instead of a
+new aplay process per reply. get_playback_stats() reports underruns,
+gaps and time to first audio.
+
 Avatar integration:
-  set_audio_sink(fn)      - fn(pcm_bytes) called as audio chunks reach playback
+  set_audio_sink(fn)      - fn(pcm_bytes) called as audio blocks are written to the speaker
   set_state_listener(fn)  - fn(status) called on every status change
 """
 
@@ -31,25 +54,26 @@ import json
 import os
 import pygame
 import logging
+import random
 import shutil
 import threading
 import base64
 import time
 import subprocess
+from collections import deque
 from queue import Queue, Empty
 import websocket
 
 from api_tracker import api_tracker
+from http_client import http_client
+from voice_playback import AplaySink, NullSink, PlaybackEngine
 
 # Resolve project root directory for relative paths
 _PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 _DATA_DIR = os.path.join(_PROJECT_DIR, "data")
 _DEBUG_DIR = os.path.join(_DATA_DIR, "debug")
 
-# Marker pushed onto the playback queue when a response finishes, so the
-# loop closes aplay's stdin only after all that reply's audio is queued.
-_RESPONSE_END = object()
-
+REALTIME_URL = "wss://api.openai.com/v1/realtime"
 DEFAULT_MODEL = "gpt-realtime-mini"
 DEFAULT_VOICE = "marin"
 DEFAULT_CAPTURE_DEVICE = "plughw:3,0"  # plughw = ALSA converts rate/format
@@ -89,6 +113,15 @@ MIC_CHUNK_SEC = 0.1       # mic read size (100 ms per append event)
 UNMUTE_TAIL_SEC = 0.35    # keep mic gated briefly after playback ends
 LIMIT_CHECK_EVERY_SEC = 5  # re-check rate limits mid-conversation
 
+# Connection states (see module docstring)
+CONN_DISCONNECTED = "disconnected"
+CONN_CONNECTING = "connecting"
+CONN_CONFIGURED = "session-configured"
+CONN_READY = "ready"
+CONN_BACKOFF = "backoff"
+
+STABLE_SESSION_SEC = 60   # a session up this long resets the backoff
+
 
 class AIVoiceModule:
     def __init__(self, config):
@@ -96,24 +129,65 @@ class AIVoiceModule:
         self.logger.info("Initializing AI Voice Module (Realtime API, GA)")
 
         self.config = config or {}
-        openai_cfg = self.config.get("openai", {})
-        audio_cfg = self.config.get("audio", {})
+        # The mirror passes the whole config entry; settings are in params
+        settings = self.config.get("params", self.config)
+        openai_cfg = settings.get("openai") or {}
+        audio_cfg = settings.get("audio") or {}
+        conn_cfg = settings.get("connection") or {}
         self.status = "Initializing"
         self.status_message = "Starting voice systems..."
         self.recording = False
         self.session_ready = False
+        self.connection_state = CONN_DISCONNECTED
         self.running = True
         self.audio_enabled = True
         self.capture_device = audio_cfg.get("alsa_device", DEFAULT_CAPTURE_DEVICE)
         # Speaker output: None = ALSA default, or a plughw: device.
         self.speaker_device = audio_cfg.get("speaker_device") or None
-        self._aplay = None
         self.conversation_timeout = audio_cfg.get("conversation_timeout", 25)
         self.max_conversation_sec = audio_cfg.get("max_conversation_seconds", 180)
 
         self.sample_rate = 24000  # Realtime API native PCM rate
         self.channels = 1
 
+        # Connection state machine (runs on the voice-ws thread)
+        self.connect_timeout = conn_cfg.get("connect_timeout_s", 10)
+        self.backoff_base = conn_cfg.get("backoff_base_s", 1.0)
+        self.backoff_max = conn_cfg.get("backoff_max_s", 60.0)
+        self.max_buffered = conn_cfg.get("max_buffered_events", 500)
+        self.fail_after = conn_cfg.get("fail_after_attempts", 3)
+        self.auth_failed = False        # handshake refused with 401/403
+        self._failed_attempts = 0       # failed connects since the last ready session
+        self.ws = None
+        self.ws_thread = None
+        self._conn_lock = threading.Lock()
+        self._outbox = deque()          # events waiting for a ready session
+        self._wake = threading.Event()  # cuts a backoff short
+        self._attempt = 0
+        self._ready_at = None
+        self._retry_at = None
+        self._rng = random.Random()
+        self.conn_stats = {"connects": 0, "sessions": 0, "failures": 0,
+                           "buffered": 0, "flushed": 0, "dropped": 0,
+                           "last_error": None, "last_backoff_s": None}
+
+        # Playback: one persistent output stream, started in initialize()
+        playback_cfg = settings.get("playback") or {}
+        self._playback_active = False   # echo gate: mute mic while speaking
+        self._mute_until = 0.0
+        self._response_active = False  # between response.created and .done
+        self._reply_cancelled = False  # barge-in: ignore the rest of its audio
+        self._audio_sink = None
+        self.player = PlaybackEngine(
+            self.sample_rate, self.channels, sink=self._speaker_sink(),
+            period_ms=playback_cfg.get("period_ms", 25),
+            jitter_ms=playback_cfg.get("jitter_ms", 80),
+            buffer_s=playback_cfg.get("buffer_s", 60),
+            on_start=self._on_playback_start,
+            on_drained=self._on_playback_drained,
+            tap=self._on_playback_audio,
+        )
+
         self.api_key = openai_cfg.get("api_key")
         if not self.api_key:
             self.api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI_VOICE_KEY")
@@ -125,11 +199,11 @@ class AIVoiceModule:
         self.model = openai_cfg.get("model") or DEFAULT_MODEL
         self.voice = openai_cfg.get("voice") or DEFAULT_VOICE
         self.instructions = _load_instructions(self.logger)
-        self.ws_url = f"wss://api.openai.com/v1/realtime?model={self.model}"
+        stream_url = http_client.resolve_url(f"{REALTIME_URL}?model={self.model}")
+        self.ws_url = "ws" + stream_url[4:] if stream_url.startswith("http") else stream_url
 
         self.send_queue = Queue()
         self.retry_count = 0
-        self.reconnecting = False
 
         # Live conversation state
         self.live_mic = False           # determined during init
@@ -138,8 +212,6 @@ class AIVoiceModule:
         self._mic_thread = None
         self._last_voice_activity = 0.0
         self._conversation_started = 0.0
-        self._playback_active = False   # echo gate: mute mic while speaking
-        self._mute_until = 0.0
         self._response_audio_bytes = 0  # for per-response cost estimation
         self._response_text = ""        # accumulated spoken transcript
 
@@ -159,19 +231,13 @@ class AIVoiceModule:
             except Exception as e:
                 self.logger.warning(f"Could not set up voice history log: {e}")
 
-        # Playback pipeline: audio deltas land here, a dedicated thread
-        # feeds them to a pygame channel back-to-back for gapless speech
-        self._playback_queue = Queue()
-        self._playback_thread = None
-
-        # Avatar hooks
-        self._audio_sink = None
+        # Avatar hooks (the audio sink is set up with the player above)
         self._state_listener = None
         # Mirror command hook: receives each user speech transcript
         self._command_listener = None
 
         # Debug file writing is expensive on the Pi SD card; opt-in only
-        self.debug_write_enabled = self.config.get("debug_write", False)
+        self.debug_write_enabled = settings.get("debug_write", False)
 
         self.initialize()
 
@@ -213,12 +279,8 @@ class AIVoiceModule:
                     "No usable microphone/arecord - falling back to test "
                     "WAV input (manual commit mode)"
                 )
-            self.connect_websocket_thread()
-            self._playback_thread = threading.Thread(
-                target=self._playback_loop, daemon=True, name="voice-playback"
-            )
-            self._playback_thread.start()
-            self.set_status("Ready", "Press SPACE to talk")
+            self.player.start()
+            self.start_connection()
             self.logger.info("AIVoiceModule initialization complete")
         except Exception as e:
             self.logger.error(f"AIVoiceModule initialization failed: {e}")
@@ -248,21 +310,13 @@ class AIVoiceModule:
     # WebSocket lifecycle (GA protocol)
     # ------------------------------------------------------------------
 
-    def connect_websocket_thread(self):
-        headers = [f"Authorization: Bearer {self.api_key}"]
+    def start_connection(self):
+        """Start the connection and send threads; returns immediately."""
+        if self.ws_thread is not None:
+            return
         self.logger.info(f"Connecting to Realtime API: model={self.model}")
-
-        self.ws = websocket.WebSocketApp(
-            self.ws_url,
-            header=headers,
-            on_open=self.on_ws_open,
-            on_message=self.on_ws_message,
-            on_error=self.on_ws_error,
-            on_close=self.on_ws_close,
-        )
-
         self.ws_thread = threading.Thread(
-            target=self.ws.run_forever, daemon=True, name="voice-ws"
+            target=self._connection_loop, daemon=True, name="voice-ws"
         )
         self.ws_thread.start()
         self.ws_thread_send = threading.Thread(
@@ -270,15 +324,146 @@ class AIVoiceModule:
         )
         self.ws_thread_send.start()
 
-        start_time = time.time()
-        while not self.session_ready and time.time() - start_time < 10:
-            time.sleep(0.25)
-        if not self.session_ready:
-            self.logger.warning("Realtime session not ready after timeout")
+    def _set_connection(self, state, message=None):
+        """Enter a connection state and report it through set_status()."""
+        if state == self.connection_state:
+            return
+        self.logger.info(f"Connection: {self.connection_state} -> {state}")
+        self.connection_state = state
+        if state == CONN_CONNECTING:
+            self.set_status("Connecting", message or "Connecting to OpenAI...")
+        elif state == CONN_CONFIGURED:
+            self.set_status("Connecting", message or "Configuring session...")
+        elif state == CONN_READY:
+            if not self.conversation_active and not self.recording:
+                self.set_status("Ready", "Press SPACE to talk")
+        elif state == CONN_BACKOFF:
+            self.set_status("Reconnecting", message or "Connection lost")
+        else:
+            self.set_status("disconnected", message or "Voice offline")
 
-    def on_ws_open(self, ws):
-        self.logger.info("WebSocket connected")
+    def _connection_loop(self):
+        """connecting -> session -> backoff, until cleanup()."""
+        while self.running:
+            if not api_tracker.allow("ai_voice", "openai-realtime"):
+                self.conn_stats["last_error"] = "rate limited"
+                self._failed_attempts += 1
+                self._backoff()
+                continue
+            self._set_connection(CONN_CONNECTING)
+            try:
+                self._run_session()
+            except Exception as e:
+                if self.running:
+                    if isinstance(e, websocket.WebSocketBadStatusException):
+                        self.auth_failed = e.status_code in (401, 403)
+                        e = f"handshake HTTP {e.status_code}"   # not the whole error page
+                    self._failed_attempts += 1
+                    self.conn_stats["failures"] += 1
+                    self.conn_stats["last_error"] = str(e) or type(e).__name__
+                    self.logger.warning(f"Realtime connection failed: {e}")
+                    api_tracker.failure("ai_voice", "openai-realtime")
+            finally:
+                self._session_ended()
+            if self.running:
+                self._backoff()
+        self._set_connection(CONN_DISCONNECTED)
+
+    def _backoff(self):
+        """Wait a jittered, doubling delay (cut short by reconnect_websocket())."""
+        if self._ready_at is not None and time.monotonic() - self._ready_at > STABLE_SESSION_SEC:
+            self._attempt = 0   # it was up for a while: reconnect promptly
+        self._ready_at = None
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** self._attempt))
+        delay = ceiling * self._rng.uniform(0.5, 1.0)
+        self._attempt += 1
+        self.conn_stats["last_backoff_s"] = round(delay, 2)
+        self._retry_at = time.monotonic() + delay
+        self._set_connection(CONN_BACKOFF, f"Retrying in {delay:.0f}s")
+        self._wake.wait(delay)
+        self._wake.clear()
+        self._retry_at = None
+
+    def _run_session(self):
+        """One WebSocket session: connect, configure, then read events."""
+        ws = websocket.create_connection(
+            self.ws_url, header=[f"Authorization: Bearer {self.api_key}"],
+            timeout=self.connect_timeout,
+        )
         self.ws = ws
+        self.conn_stats["connects"] += 1
+        deadline = time.monotonic() + self.connect_timeout
+        ws.settimeout(0.5)
+        while self.running:
+            try:
+                message = ws.recv()
+            except websocket.WebSocketTimeoutException:
+                if self.connection_state != CONN_READY and time.monotonic() > deadline:
+                    raise TimeoutError(f"session not ready after {self.connect_timeout}s")
+                continue
+            if not message:
+                raise ConnectionError("closed by server")
+            self.on_ws_message(ws, message)
+
+    def _session_ready(self):
+        """session.updated: flush what was buffered, then go ready."""
+        with self._conn_lock:
+            while self._outbox:
+                self.send_queue.put(self._outbox.popleft())
+                self.conn_stats["flushed"] += 1
+            self.session_ready = True
+            self.auth_failed = False
+            self._failed_attempts = 0
+            self._ready_at = time.monotonic()
+            self.conn_stats["sessions"] += 1
+        self._set_connection(CONN_READY)
+
+    def is_functional(self):
+        """Ready, or still expected to get there on its own."""
+        if self.session_ready:
+            return True
+        if self.auth_failed or not self.running or self.ws_thread is None:
+            return False   # bad key, or the connection thread is not running
+        return self._failed_attempts < self.fail_after
+
+    def _session_ended(self):
+        """Socket gone: drop anything queued for it, end a live conversation."""
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        with self._conn_lock:
+            was_ready = self.session_ready
+            self.session_ready = False
+            dropped = 0
+            while True:
+                try:
+                    self.send_queue.get_nowait()
+                    dropped += 1
+                except Empty:
+                    break
+            if was_ready:
+                dropped += len(self._outbox)
+                self._outbox.clear()
+            self.conn_stats["dropped"] += dropped
+        # No more deltas will come for a reply in progress: play what we have
+        self._response_active = False
+        self.player.end_response()
+        if was_ready and self.running:
+            self.logger.info("Realtime session lost")
+            # A live conversation cannot survive a new session
+            if self.conversation_active:
+                self.stop_conversation(reason="connection lost")
+
+    def get_connection_stats(self):
+        with self._conn_lock:
+            stats = dict(self.conn_stats, buffered_now=len(self._outbox))
+        stats["state"] = self.connection_state
+        retry_at = self._retry_at
+        stats["retry_in_s"] = round(max(0.0, retry_at - time.monotonic()), 2) if retry_at else None
+        return stats
 
     def _session_config(self):
         """GA session.update payload (note required type: 'realtime').
@@ -321,14 +506,21 @@ class AIVoiceModule:
 
             if event_type == "session.created":
                 self.logger.info("Realtime session created")
-                self.session_ready = True
-                self.send_ws_message(self._session_config())
+                # Straight onto the socket: the send queue holds events
+                # back until the session is configured
+                ws.send(json.dumps(self._session_config()))
+                self._set_connection(CONN_CONFIGURED)
             elif event_type == "session.updated":
                 src = "voice_prompt.txt" if os.path.exists(_PROMPT_FILE) else (
                     "VOICE_PROMPT env" if os.getenv("VOICE_PROMPT") else "default persona")
                 self.logger.info(f"Session configured (persona: {src}, voice: {self.voice})")
+                if self.connection_state != CONN_READY:
+                    self._session_ready()
             elif event_type == "input_audio_buffer.speech_started":
                 self._last_voice_activity = time.time()
+                if self.player.is_playing():
+                    self.logger.info("Speech during reply: barge-in")
+                    self._interrupt_reply()
                 if self.conversation_active:
                     self.set_status("Listening", "Hearing you...")
             elif event_type == "input_audio_buffer.speech_stopped":
@@ -347,20 +539,24 @@ class AIVoiceModule:
                         self._command_listener(transcript)
                     except Exception as e:
                         self.logger.debug(f"Command listener error: {e}")
+            elif event_type == "response.created":
+                self._response_active = True
+                self._reply_cancelled = False
             elif event_type == "response.output_audio.delta":
                 audio_data = base64.b64decode(data.get("delta", ""))
-                if audio_data:
+                if audio_data and not self._reply_cancelled:
                     self._response_audio_bytes += len(audio_data)
-                    self._playback_queue.put(audio_data)
+                    self.player.write(audio_data)
             elif event_type == "response.output_audio_transcript.delta":
                 # Transcript of the spoken reply, streamed in pieces
                 self._response_text += data.get("delta", "")
             elif event_type == "response.output_text.delta":
                 self._response_text += data.get("delta", "")
             elif event_type == "response.done":
-                # All audio deltas for this response are already queued;
-                # the marker tells playback to close aplay's input now
-                self._playback_queue.put(_RESPONSE_END)
+                # All audio for this response is buffered; let it play out
+                self._response_active = False
+                self._reply_cancelled = False
+                self.player.end_response()
                 self._on_response_done(data)
             elif event_type == "error":
                 err = data.get("error", {})
@@ -425,63 +621,50 @@ class AIVoiceModule:
         except Exception:
             pass
 
-    def on_ws_error(self, ws, error):
-        self.logger.error(f"WebSocket error: {error}")
-        self.session_ready = False
-        api_tracker.failure("ai_voice", "openai-realtime")
-        if not self.reconnecting:
-            threading.Thread(target=self.reconnect_websocket, daemon=True).start()
-
-    def on_ws_close(self, ws, close_status_code, close_msg):
-        self.logger.info(f"WebSocket closed: {close_status_code} - {close_msg}")
-        self.session_ready = False
-        if self.running and not self.reconnecting:
-            threading.Thread(target=self.reconnect_websocket, daemon=True).start()
-
     def _send_loop(self):
         while self.running:
             try:
-                if not self.session_ready or not hasattr(self, "ws"):
-                    time.sleep(0.1)
-                    continue
                 message = self.send_queue.get(timeout=1.0)
-                self.ws.send(json.dumps(message))
-                self.send_queue.task_done()
             except Empty:
                 continue
+            ws = self.ws
+            try:
+                if ws is None:
+                    with self._conn_lock:
+                        self.conn_stats["dropped"] += 1
+                    continue
+                ws.send(json.dumps(message))
             except Exception as e:
                 self.logger.error(f"Send loop error: {e}")
-                if not self.reconnecting:
-                    threading.Thread(target=self.reconnect_websocket, daemon=True).start()
+                # The reading side sees the broken socket and reconnects
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+            finally:
+                self.send_queue.task_done()
 
     def send_ws_message(self, data):
-        self.send_queue.put(data)
+        """Send now if the session is ready, else buffer for the next one."""
+        with self._conn_lock:
+            if self.session_ready:
+                self.send_queue.put(data)
+                return
+            if len(self._outbox) >= self.max_buffered:
+                self._outbox.popleft()
+                self.conn_stats["dropped"] += 1
+            self._outbox.append(data)
+            self.conn_stats["buffered"] += 1
 
     def reconnect_websocket(self):
-        if not self.running or self.reconnecting:
-            return
-        if not api_tracker.allow("ai_voice", "openai-realtime"):
-            self.set_status("Error", "Rate limited")
-            return
-        self.reconnecting = True
-        self.logger.info("Reconnecting WebSocket...")
-        # A live conversation cannot survive a new session
-        if self.conversation_active:
-            self.stop_conversation(reason="connection lost")
-        if hasattr(self, "ws"):
+        """Drop the current session (if any) and reconnect now. Non-blocking."""
+        ws = self.ws
+        if ws is not None:
             try:
-                self.ws.close()
+                ws.close()
             except Exception:
                 pass
-        time.sleep(2)
-        self.connect_websocket_thread()
-        if self.session_ready:
-            self.logger.info("WebSocket reconnected successfully")
-            self.set_status("Ready", "Press SPACE to talk")
-        else:
-            self.logger.error("Failed to reconnect WebSocket")
-            self.set_status("Error", "Connection failed")
-        self.reconnecting = False
+        self._wake.set()
 
     # ------------------------------------------------------------------
     # Conversation flow
@@ -489,10 +672,14 @@ class AIVoiceModule:
 
     def on_button_press(self):
         self.logger.info("Voice interaction triggered")
-        if not self.session_ready:
-            self.logger.warning("Realtime session not ready")
+        if self.connection_state == CONN_DISCONNECTED:
+            self.logger.warning("Realtime connection not running")
             self.set_status("Error", "Not connected")
             return
+        if self.connection_state == CONN_BACKOFF:
+            # Retry now rather than at the end of the backoff; events
+            # sent meanwhile are buffered for the new session
+            self._wake.set()
         if self.live_mic:
             if self.conversation_active:
                 self.stop_conversation(reason="user ended")
@@ -525,6 +712,8 @@ class AIVoiceModule:
         self.conversation_active = False
         self.recording = False
         self._stop_mic_proc()
+        if reason == "user ended":
+            self._interrupt_reply()
         self.send_ws_message({"type": "input_audio_buffer.clear"})
         self.set_status("Ready", "Press SPACE to talk")
 
@@ -677,31 +866,27 @@ class AIVoiceModule:
             self.recording = False
 
     # ------------------------------------------------------------------
-    # Playback (gapless, with avatar lipsync feed and mic echo gate)
+    # Playback (persistent stream, avatar lipsync feed, mic echo gate)
     # ------------------------------------------------------------------
 
-    def _aplay_cmd(self):
-        cmd = [
-            "aplay", "-q", "-t", "raw", "-f", "S16_LE",
-            "-r", str(self.sample_rate), "-c", str(self.channels),
-        ]
-        if self.speaker_device:
-            cmd += ["-D", self.speaker_device]
-        return cmd
+    def _speaker_sink(self):
+        """aplay on the Pi; a silent sink where there is none (dev hosts)."""
+        if os.name != "nt" and shutil.which("aplay"):
+            return AplaySink(self.sample_rate, self.channels, device=self.speaker_device)
+        self.logger.warning("aplay not found - voice replies will not be audible")
+        return NullSink()
+
+    def _on_playback_start(self):
+        """First sample of a reply written to the speaker: close the mic gate."""
+        self._playback_active = True
+        self.set_status("Speaking", "Playing response...")
 
-    def _maybe_finish_playback(self):
-        """Release the echo gate once a finished response has fully drained.
+    def _on_playback_drained(self, flushed):
+        """Last sample of a reply heard: reopen the mic after a short tail.
 
-        Called when the response-end marker arrives and on idle ticks. The
-        gate stays closed (mic muted) until aplay has read EOF and played
-        out its buffer, so the mic never catches the tail of the reply.
+        Driven by the player's playback position, not by when the audio
+        was written, so the mic never catches the end of the reply.
         """
-        if not self._playback_active:
-            return
-        proc = self._aplay
-        if proc is not None and proc.poll() is None:
-            return  # still playing buffered audio
-        self._aplay = None
         self._playback_active = False
         self._mute_until = time.time() + UNMUTE_TAIL_SEC
         self._last_voice_activity = time.time()
@@ -710,61 +895,22 @@ class AIVoiceModule:
         else:
             self.set_status("Ready", "Press SPACE to talk")
 
-    def _playback_loop(self):
-        """Pipe PCM reply chunks to ALSA via aplay.
-
-        pygame's mixer can't be used: the app runs with SDL_AUDIODRIVER=
-        dummy (set so pygame doesn't grab the audio device at display
-        init), so mixer output is silent. aplay talks to ALSA directly,
-        like the mic's arecord. Audio is forwarded to the avatar sink for
-        lipsync. aplay's stdin is only closed when the response actually
-        ends (the _RESPONSE_END marker), not on brief mid-reply gaps -
-        closing it early would drop the rest of the reply.
-        """
-        while self.running:
-            try:
-                item = self._playback_queue.get(timeout=0.5)
-            except Empty:
-                self._maybe_finish_playback()
-                continue
-
-            # End-of-response marker: stop the input stream so aplay drains
-            if item is _RESPONSE_END:
-                proc = self._aplay
-                if proc is not None and proc.stdin and not proc.stdin.closed:
-                    try:
-                        proc.stdin.close()
-                    except Exception:
-                        pass
-                self._maybe_finish_playback()
-                continue
+    def _on_playback_audio(self, chunk):
+        """Each audio block as it goes to the speaker: avatar lipsync."""
+        if self._audio_sink:
+            self._audio_sink(chunk)
 
-            chunk = item
-            try:
-                if len(chunk) < 4:
-                    continue
+    def _interrupt_reply(self):
+        """Barge-in: silence the reply now and stop the server generating it."""
+        self.player.flush()
+        if self._response_active:
+            # Deltas already in flight are dropped until response.done
+            self._response_active = False
+            self._reply_cancelled = True
+            self.send_ws_message({"type": "response.cancel"})
 
-                if not self._playback_active:
-                    self._playback_active = True
-                    self.set_status("Speaking", "Playing response...")
-
-                if self._audio_sink:
-                    try:
-                        self._audio_sink(chunk)
-                    except Exception as e:
-                        self.logger.debug(f"Avatar audio sink error: {e}")
-
-                # (Re)start aplay if needed and stream this chunk to it
-                if (self._aplay is None or self._aplay.poll() is not None
-                        or self._aplay.stdin is None or self._aplay.stdin.closed):
-                    self._aplay = subprocess.Popen(
-                        self._aplay_cmd(), stdin=subprocess.PIPE,
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                    )
-                self._aplay.stdin.write(chunk)
-                self._aplay.stdin.flush()
-            except Exception as e:
-                self.logger.error(f"Playback error: {e}")
+    def get_playback_stats(self):
+        return self.player.stats()
 
     # ------------------------------------------------------------------
     # Status / drawing / cleanup
@@ -780,6 +926,10 @@ class AIVoiceModule:
             except Exception as e:
                 self.logger.debug(f"State listener error: {e}")
 
+    def is_animating(self):
+        """Frame-scheduler hook: the Live indicator pulses."""
+        return self.conversation_active
+
     def update(self):
         pass
 
@@ -794,7 +944,7 @@ class AIVoiceModule:
                 width = 300
 
             # Only draw when actively doing something
-            if not self.recording and self.status in ("Ready", "idle", "disconnected", ""):
+            if not self.recording and self.status in ("Ready", "idle", "disconnected", "Connecting", ""):
                 return
 
             if not hasattr(self, "_voice_font_ready") or not self._voice_font_ready:
@@ -828,17 +978,9 @@ class AIVoiceModule:
         self.running = False
         self.conversation_active = False
         self._stop_mic_proc()
-        if self._aplay is not None:
-            try:
-                self._aplay.terminate()
-            except Exception:
-                pass
-        if hasattr(self, "ws"):
-            try:
-                self.ws.close()
-            except Exception:
-                pass
-        for attr in ("audio_thread", "_mic_thread", "ws_thread_send", "_playback_thread"):
+        self.player.stop()
+        self.reconnect_websocket()   # closes the socket, ends any backoff
+        for attr in ("audio_thread", "_mic_thread", "ws_thread", "ws_thread_send"):
             t = getattr(self, attr, None)
             if t is not None and t.is_alive():
                 t.join(timeout=2)
@@ -94,6 +94,17 @@ class AnimationManager:
         fade = self._get_fade(name)
         return abs(fade['alpha'] - fade['target']) > 1
 
+    def is_animating(self):
+        """True while a fade, state transition or notification fade runs."""
+        if self._transitioning:
+            return True
+        if any(n['phase'] != 'display' for n in self._notifications):
+            return True
+        return any(
+            fade.get('delay', 0) > 0 or abs(fade['alpha'] - fade['target']) > 1
+            for fade in self._module_fades.values()
+        )
+
     # ----- State transitions -----
 
     def begin_state_transition(self, from_state, to_state):
@@ -125,6 +136,19 @@ class AnimationManager:
         })
         logger.info(f"Notification pushed: {text}")
 
+    def get_notification_rect(self):
+        """Screen band the notifications may paint into, or None.
+
+        Text width varies per message, so this is the full-width band
+        covering the (up to three) visible lines.
+        """
+        if not self._notifications:
+            return None
+        self._ensure_fonts()
+        line_h = self._notification_font.get_linesize() + 10
+        lines = min(len(self._notifications), 3)
+        return pygame.Rect(0, self.screen_height // 4, self.screen_width, lines * line_h)
+
     # ----- Update -----
 
     def update(self, dt_ms=None):
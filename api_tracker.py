@@ -3,9 +3,19 @@
 Tracks all external API calls across modules, enforces hourly/daily limits,
 estimates costs, and writes a periodic summary to api_usage.log.
 
-Call records are persisted to api_tracker_state.json so that daily limits
-survive application restarts (important for tight free-tier budgets like
-Alpha Vantage's 25 calls/day).
+Usage is kept per service in minute buckets (a 1440-slot ring covering
+24h) with running hourly and daily totals, so allow(), record() and the
+summaries cost the same whatever the day's traffic. Windows therefore
+have one-minute resolution: "last hour" is the current minute plus the
+59 before it.
+
+Usage survives application restarts (important for tight free-tier
+budgets like Alpha Vantage's 25 calls/day) via an append-only journal:
+each record() appends one short line to api_tracker_state.journal, and
+when the journal passes JOURNAL_MAX_BYTES (or on shutdown) it is folded
+into the api_tracker_state.json bucket snapshot and started afresh.
+Startup replays snapshot + journal; a torn last line from a crash or
+power cut is dropped and cut off the file.
 
 Usage in any module:
     from api_tracker import api_tracker
@@ -29,6 +39,7 @@ logger = logging.getLogger("APITracker")
 
 _PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
 _STATE_FILE = os.path.join(_PROJECT_DIR, 'api_tracker_state.json')
+_USAGE_LOG = 'api_usage.log'
 
 # Default limits per service (calls per hour)
 DEFAULT_LIMITS = {
@@ -51,10 +62,87 @@ DEFAULT_LIMITS = {
 }
 
 
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = 1440
+
+
+class RateCounter:
+    """Per-service call counts and costs in a 24h ring of minute buckets.
+
+    Running hour/day totals are adjusted as buckets fall out of each
+    window, so add() and the totals are O(1) (amortised over elapsed
+    minutes, bounded by the ring size after a long gap).
+    """
+
+    __slots__ = ('counts', 'costs', 'minutes', 'current', 'hour_count',
+                 'day_count', 'day_cost')
+
+    def __init__(self):
+        self.counts = [0] * MINUTES_PER_DAY
+        self.costs = [0.0] * MINUTES_PER_DAY
+        self.minutes = [-1] * MINUTES_PER_DAY  # absolute minute held per slot
+        self.current = None                    # latest minute advanced to
+        self.hour_count = 0
+        self.day_count = 0
+        self.day_cost = 0.0
+
+    def advance(self, minute):
+        """Expire buckets that left the hour/day windows by `minute`."""
+        if self.current is None:
+            self.current = minute
+            return
+        if minute <= self.current:
+            return
+        if minute - self.current >= MINUTES_PER_DAY:
+            self.__init__()
+            self.current = minute
+            return
+        counts, minutes = self.counts, self.minutes
+        for m in range(self.current + 1, minute + 1):
+            old = m - MINUTES_PER_HOUR
+            slot = old % MINUTES_PER_DAY
+            if minutes[slot] == old:
+                self.hour_count -= counts[slot]
+            slot = m % MINUTES_PER_DAY
+            if minutes[slot] != -1:
+                # Slot still holds the minute 24h ago: it leaves the day
+                self.day_count -= counts[slot]
+                self.day_cost -= self.costs[slot]
+                counts[slot] = 0
+                self.costs[slot] = 0.0
+                minutes[slot] = -1
+        if not self.day_count:
+            self.day_cost = 0.0  # no float residue once the day is empty
+        self.current = minute
+
+    def add(self, minute, count=1, cost=0.0):
+        """Count calls at `minute` (may be an earlier minute still in the day)."""
+        self.advance(minute)
+        if minute <= self.current - MINUTES_PER_DAY:
+            return
+        slot = minute % MINUTES_PER_DAY
+        self.counts[slot] += count
+        self.costs[slot] += cost
+        self.minutes[slot] = minute
+        self.day_count += count
+        self.day_cost += cost
+        if minute > self.current - MINUTES_PER_HOUR:
+            self.hour_count += count
+
+    def buckets(self):
+        """Non-empty [minute, count, cost] buckets, oldest first."""
+        return sorted(
+            [m, self.counts[i], self.costs[i]]
+            for i, m in enumerate(self.minutes) if m != -1
+        )
+
+
 class APITracker:
     """Singleton API call tracker with rate limiting and cost tracking.
 
-    Persists call records to disk so limits are enforced across restarts.
+    Persists the minute buckets to disk so limits are enforced across
+    restarts. state_file=None keeps everything in memory; usage_log=None
+    writes no usage log (tests and benchmarks pass both).
     """
 
     # Circuit breaker: after this many consecutive failures a service is
@@ -63,97 +151,250 @@ class APITracker:
     BREAKER_THRESHOLD = 3
     BREAKER_COOLDOWN = 1800  # 30 minutes
 
-    def __init__(self):
+    # Fold the journal into the snapshot once it grows past this
+    JOURNAL_MAX_BYTES = 64 * 1024
+
+    def __init__(self, state_file=_STATE_FILE, clock=time.time, usage_log=_USAGE_LOG):
         self._lock = threading.Lock()
-        self._calls = []  # list of (timestamp, module, service, cost)
+        self._state_file = state_file
+        self._clock = clock
+        self._counters = {}  # service -> RateCounter
         self._blocked = defaultdict(int)  # service -> blocked count
         self._failures = defaultdict(int)  # service -> consecutive failures
         self._breaker_opened = {}  # service -> unix time circuit opened
         self._limits = dict(DEFAULT_LIMITS)
         self._daily_cost = 0.0
         self._session_start = datetime.now()
-        self._last_summary = time.time()
+        self._last_summary = clock()
         self._summary_interval = 300  # log summary every 5 minutes
-        self._last_persist = 0
-        self._persist_interval = 30  # save to disk at most every 30 seconds
-
-        # Dedicated log file for API usage
-        self._usage_logger = logging.getLogger("APIUsage")
-        self._usage_logger.setLevel(logging.INFO)
-        self._usage_logger.propagate = False
-        if not self._usage_logger.handlers:
-            handler = RotatingFileHandler(
-                'api_usage.log', maxBytes=500000, backupCount=3
-            )
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-            self._usage_logger.addHandler(handler)
+        self._journal_file = (
+            os.path.splitext(state_file)[0] + '.journal' if state_file else None
+        )
+        self._journal = None       # append handle
+        self._journal_gen = 0      # generation the snapshot expects next
+        self._journal_bytes = 0
+        self._io = {'journal_bytes_written': 0, 'snapshot_bytes_written': 0,
+                    'compactions': 0, 'recovered_tail_bytes': 0}
+
+        # Dedicated log file for API usage, shared by every tracker that
+        # writes one; without it, an unregistered logger that goes nowhere
+        if usage_log is None:
+            self._usage_logger = logging.Logger("APIUsage")
+            self._usage_logger.disabled = True
+        else:
+            self._usage_logger = logging.getLogger("APIUsage")
+            self._usage_logger.setLevel(logging.INFO)
+            self._usage_logger.propagate = False
+            if not self._usage_logger.handlers:
+                handler = RotatingFileHandler(
+                    usage_log, maxBytes=500000, backupCount=3
+                )
+                handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+                self._usage_logger.addHandler(handler)
 
         # Load persisted state from previous sessions
         self._load_state()
 
         self._usage_logger.info("=== API Tracker session started ===")
-        if self._calls:
+        loaded = sum(c.day_count for c in self._counters.values())
+        if loaded:
             self._usage_logger.info(
-                f"Loaded {len(self._calls)} call records from previous sessions"
+                f"Loaded {loaded} call records from previous sessions"
             )
 
+    def _counter(self, service, minute):
+        """RateCounter for service, advanced to minute. Lock held."""
+        counter = self._counters.get(service)
+        if counter is None:
+            counter = self._counters[service] = RateCounter()
+        counter.advance(minute)
+        return counter
+
+    def _advance_all(self, minute):
+        """Advance every counter to minute. Lock held."""
+        for counter in self._counters.values():
+            counter.advance(minute)
+
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
     def _load_state(self):
-        """Load call records from disk, pruning anything older than 24h."""
+        """Rebuild the buckets from the snapshot plus the journal.
+
+        Drops anything older than 24h. Also reads the older snapshot
+        format ({'calls': [[ts, module, service, cost], ...]}) written
+        before the minute buckets.
+        """
+        if not self._state_file:
+            return
+        now_min = int(self._clock() // 60)
         try:
-            if not os.path.exists(_STATE_FILE):
-                return
-            with open(_STATE_FILE, 'r') as f:
-                data = json.load(f)
-
-            now = time.time()
-            cutoff = now - 86400
-            loaded = []
-            cost = 0.0
-            for rec in data.get('calls', []):
-                ts = rec[0]
-                if ts > cutoff:
-                    loaded.append(tuple(rec))
-                    cost += rec[3] if len(rec) > 3 else 0.0
-
-            self._calls = loaded
-            self._daily_cost = cost
-            logger.info(
-                f"Loaded {len(loaded)} API call records from disk "
-                f"(cost so far: ${cost:.4f})"
-            )
+            if os.path.exists(self._state_file):
+                with open(self._state_file, 'r') as f:
+                    data = json.load(f)
+                self._journal_gen = data.get('journal_gen', 0)
+                for service, buckets in data.get('buckets', {}).items():
+                    counter = self._counter(service, now_min)
+                    for minute, count, bucket_cost in buckets:
+                        counter.add(int(minute), count, bucket_cost)
+                for rec in data.get('calls', []):
+                    counter = self._counter(rec[2], now_min)
+                    counter.add(int(rec[0] // 60), 1, rec[3] if len(rec) > 3 else 0.0)
         except Exception as e:
             logger.warning(f"Could not load API tracker state: {e}")
 
+        replayed = self._replay_journal(now_min)
+        cost = sum(c.day_cost for c in self._counters.values())
+        loaded = sum(c.day_count for c in self._counters.values())
+        self._daily_cost = cost
+        logger.info(
+            f"Loaded {loaded} API call records from disk "
+            f"({replayed} from the journal, cost so far: ${cost:.4f})"
+        )
+
+    def _replay_journal(self, now_min):
+        """Apply journal lines of the snapshot's generation; returns count.
+
+        Lines are "<minute> <service>[ <cost>]". The first line is the
+        generation header; a journal from another generation was already
+        folded into the snapshot (crash mid-compaction) and is ignored.
+        """
+        path = self._journal_file
+        try:
+            if not os.path.exists(path):
+                return 0
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            logger.warning(f"Could not read API journal: {e}")
+            return 0
+
+        good_end = raw.rfind(b'\n') + 1
+        lines = raw[:good_end].decode('utf-8', errors='replace').splitlines()
+        if not lines or lines[0] != f"#gen {self._journal_gen}":
+            return 0
+
+        replayed = 0
+        for line in lines[1:]:
+            parts = line.split(' ')
+            try:
+                minute = int(parts[0])
+                cost = float(parts[2]) if len(parts) > 2 else 0.0
+                self._counter(parts[1], now_min).add(minute, 1, cost)
+                replayed += 1
+            except (IndexError, ValueError):
+                logger.warning(f"Skipping bad API journal line: {line!r}")
+
+        if good_end < len(raw):
+            # Torn write: cut the partial line so appends start clean
+            self._io['recovered_tail_bytes'] += len(raw) - good_end
+            logger.warning(
+                f"API journal: dropped {len(raw) - good_end} bytes of truncated tail"
+            )
+            try:
+                with open(path, 'r+b') as f:
+                    f.truncate(good_end)
+            except OSError as e:
+                logger.warning(f"Could not trim API journal: {e}")
+        self._journal_bytes = good_end
+        return replayed
+
+    def _open_journal(self):
+        """Append handle for the current generation's journal. Lock held."""
+        if self._journal is not None:
+            return self._journal
+        header = f"#gen {self._journal_gen}\n"
+        try:
+            current = None
+            if os.path.exists(self._journal_file):
+                with open(self._journal_file, 'r') as f:
+                    current = f.readline()
+            if current != header:
+                # Start this generation's journal atomically
+                tmp = self._journal_file + '.tmp'
+                with open(tmp, 'w') as f:
+                    f.write(header)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self._journal_file)
+                self._journal_bytes = len(header)
+                self._io['journal_bytes_written'] += len(header)
+            self._journal = open(self._journal_file, 'a', encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Could not open API journal: {e}")
+        return self._journal
+
+    def _append_journal(self, minute, service, cost):
+        """Append one call to the journal. Lock held."""
+        if not self._journal_file:
+            return
+        journal = self._open_journal()
+        if journal is None:
+            return
+        line = f"{minute} {service} {cost!r}\n" if cost else f"{minute} {service}\n"
+        try:
+            journal.write(line)
+            journal.flush()
+        except OSError as e:
+            logger.warning(f"Could not append to API journal: {e}")
+            return
+        size = len(line.encode('utf-8'))
+        self._journal_bytes += size
+        self._io['journal_bytes_written'] += size
+
     def _save_state(self):
-        """Persist current call records to disk."""
+        """Compact: write the bucket snapshot and start a fresh journal.
+
+        The snapshot names the next journal generation before the old
+        journal is replaced, so a crash in between can never replay the
+        folded entries twice.
+        """
+        if not self._state_file:
+            return
         try:
-            now = time.time()
-            cutoff = now - 86400
+            now = self._clock()
             with self._lock:
-                # Only save records from last 24h
-                records = [
-                    list(rec) for rec in self._calls
-                    if rec[0] > cutoff
-                ]
-            data = {'calls': records, 'saved_at': now}
-            # Write atomically: write to temp file then rename
-            tmp = _STATE_FILE + '.tmp'
-            with open(tmp, 'w') as f:
-                json.dump(data, f)
-            os.replace(tmp, _STATE_FILE)
+                self._advance_all(int(now // 60))
+                buckets = {
+                    service: counter.buckets()
+                    for service, counter in self._counters.items()
+                    if counter.day_count
+                }
+                self._journal_gen += 1
+                data = json.dumps({
+                    'buckets': buckets,
+                    'journal_gen': self._journal_gen,
+                    'saved_at': now,
+                })
+                # Write atomically: write to temp file then rename
+                tmp = self._state_file + '.tmp'
+                with open(tmp, 'w') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self._state_file)
+                self._io['snapshot_bytes_written'] += len(data)
+                self._io['compactions'] += 1
+
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                self._open_journal()
         except Exception as e:
             logger.warning(f"Could not save API tracker state: {e}")
 
-    def _maybe_persist(self):
-        """Save to disk if enough time has passed since last save."""
-        now = time.time()
-        if now - self._last_persist >= self._persist_interval:
+    def _maybe_compact(self):
+        """Fold the journal into the snapshot once it passes its size cap."""
+        if self._journal_bytes >= self.JOURNAL_MAX_BYTES:
             self._save_state()
-            self._last_persist = now
+
+    def get_persistence_stats(self):
+        """Bytes written to the journal/snapshot and compaction count."""
+        stats = dict(self._io)
+        stats['journal_bytes'] = self._journal_bytes
+        stats['journal_gen'] = self._journal_gen
+        return stats
 
     # ------------------------------------------------------------------
     # Rate limiting
@@ -176,7 +417,7 @@ class APITracker:
         Returns True if allowed, False if rate-limited.
         """
         limits = self._limits.get(service, {'hourly': 100, 'daily': 1000, 'daily_cost': 0})
-        now = time.time()
+        now = self._clock()
 
         with self._lock:
             # Circuit breaker: service recently failed repeatedly
@@ -195,17 +436,9 @@ class APITracker:
                 del self._breaker_opened[service]
                 self._failures[service] = self.BREAKER_THRESHOLD - 1
 
-            hour_ago = now - 3600
-            day_ago = now - 86400
-
-            hourly_count = sum(
-                1 for ts, m, s, c in self._calls
-                if s == service and ts > hour_ago
-            )
-            daily_count = sum(
-                1 for ts, m, s, c in self._calls
-                if s == service and ts > day_ago
-            )
+            counter = self._counter(service, int(now // 60))
+            hourly_count = counter.hour_count
+            daily_count = counter.day_count
 
             if hourly_count >= limits['hourly']:
                 self._blocked[service] += 1
@@ -246,29 +479,24 @@ class APITracker:
             service: Service name (e.g. 'openai', 'open-meteo').
             estimated_cost: Estimated USD cost of this call.
         """
-        now = time.time()
+        now = self._clock()
         with self._lock:
-            self._calls.append((now, module, service, estimated_cost))
+            minute = int(now // 60)
+            self._counter(service, minute).add(minute, 1, estimated_cost)
             self._daily_cost += estimated_cost
+            self._append_journal(minute, service, estimated_cost)
 
             # Successful call closes the circuit breaker for this service
             self._failures[service] = 0
             self._breaker_opened.pop(service, None)
 
-            # Prune calls older than 24 hours
-            cutoff = now - 86400
-            self._calls = [
-                (ts, m, s, c) for ts, m, s, c in self._calls
-                if ts > cutoff
-            ]
-
         self._usage_logger.info(
             f"CALL {module} -> {service}"
             + (f" (${estimated_cost:.4f})" if estimated_cost > 0 else "")
         )
 
-        # Periodic persist to disk
-        self._maybe_persist()
+        # Keep the journal bounded
+        self._maybe_compact()
 
         # Periodic summary
         if now - self._last_summary > self._summary_interval:
@@ -285,7 +513,7 @@ class APITracker:
             self._failures[service] += 1
             count = self._failures[service]
             if count >= self.BREAKER_THRESHOLD and service not in self._breaker_opened:
-                self._breaker_opened[service] = time.time()
+                self._breaker_opened[service] = self._clock()
                 logger.warning(
                     f"Circuit opened for {service} after {count} consecutive "
                     f"failures (reported by {module}); backing off "
@@ -295,32 +523,29 @@ class APITracker:
                     f"BREAKER OPEN {service} ({count} failures, from {module})"
                 )
 
+    def _window_totals(self):
+        """(hourly, daily, daily_cost) dicts for services used in the last 24h."""
+        minute = int(self._clock() // 60)
+        with self._lock:
+            self._advance_all(minute)
+            active = [(s, c) for s, c in self._counters.items() if c.day_count]
+            hourly = {s: c.hour_count for s, c in active if c.hour_count}
+            daily = {s: c.day_count for s, c in active}
+            daily_cost = {s: c.day_cost for s, c in active}
+        return hourly, daily, daily_cost
+
     def _log_summary(self):
         """Write a summary of API usage to the log."""
-        now = time.time()
-        hour_ago = now - 3600
-
+        hourly, daily, daily_cost = self._window_totals()
         with self._lock:
-            calls_copy = list(self._calls)
             blocked_copy = dict(self._blocked)
 
-        # Hourly breakdown by service
-        hourly = defaultdict(int)
-        daily = defaultdict(int)
-        daily_cost = defaultdict(float)
-
-        for ts, module, service, cost in calls_copy:
-            daily[service] += 1
-            daily_cost[service] += cost
-            if ts > hour_ago:
-                hourly[service] += 1
-
         uptime = datetime.now() - self._session_start
         hours = uptime.total_seconds() / 3600
 
         lines = [
             f"=== API Usage Summary (uptime: {hours:.1f}h) ===",
-            f"Total calls (24h): {len(calls_copy)}",
+            f"Total calls (24h): {sum(daily.values())}",
             f"Total estimated cost: ${self._daily_cost:.4f}",
         ]
 
@@ -349,24 +574,9 @@ class APITracker:
 
     def get_summary(self):
         """Return a dict summary for display or debugging."""
-        now = time.time()
-        hour_ago = now - 3600
-
-        with self._lock:
-            calls_copy = list(self._calls)
-
-        hourly = defaultdict(int)
-        daily = defaultdict(int)
-        daily_cost = defaultdict(float)
-
-        for ts, module, service, cost in calls_copy:
-            daily[service] += 1
-            daily_cost[service] += cost
-            if ts > hour_ago:
-                hourly[service] += 1
-
+        hourly, daily, daily_cost = self._window_totals()
         return {
-            'total_calls_24h': len(calls_copy),
+            'total_calls_24h': sum(daily.values()),
             'total_cost': self._daily_cost,
             'by_service': {
                 svc: {
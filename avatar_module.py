@@ -23,10 +23,12 @@ offline on the dev PC) which has explicit eye-close and lip-open
 retargeting. More frames = smoother mouth; even just neutral + open
 reads as talking.
 
-Lipsync: the voice playback thread calls feed_audio(pcm); loudness (RMS)
-picks how open the mouth is, zero-crossing rate separates hissy
-consonants from open vowels. Blinks are random (2-6 s), a smile plays
-when the conversation ends.
+Lipsync: the voice playback thread calls feed_audio(pcm); LipSyncAnalyzer
+cuts it into 25 ms windows and analyses them all at once with numpy.
+Loudness (RMS) picks how open the mouth is, zero-crossing rate separates
+hissy consonants from open vowels, and with lipsync_bands the share of
+energy below 1 kHz marks rounded oo/oh sounds. Blinks are random
+(2-6 s), a smile plays when the conversation ends.
 
 Falls back to a simple procedural face if no frames are found, so the
 module still works before assets exist.
@@ -58,6 +60,9 @@ DEFAULT_ASSETS_PATH = os.path.join(_PROJECT_DIR, "assets", "avatar")
 # Envelope analysis window (seconds of audio per mouth sample)
 WINDOW_SEC = 0.025
 SAMPLE_RATE = 24000
+# Band edges (Hz) for viseme hints: vowel energy low, sibilants high
+LOW_BAND = (80.0, 1000.0)
+HIGH_BAND = (3000.0, 8000.0)
 
 # How long the face stays visible after the conversation ends
 LINGER_SEC = 5.0
@@ -78,9 +83,63 @@ FRAME_FILES = {
 }
 
 
+class LipSyncAnalyzer:
+    """Mouth envelope from 16-bit mono PCM, a whole chunk at a time.
+
+    The samples are viewed as a (windows, window) array - a strided view,
+    no copy - and RMS and zero-crossing rate are computed along the rows
+    in one pass each. With bands=True an rfft of the same rows gives the
+    fraction of each window's energy in LOW_BAND and HIGH_BAND. Samples
+    that don't fill a window are carried over to the next call, so a
+    stream cut into odd-sized chunks yields the same windows as one
+    long chunk.
+
+    analyse() returns a float array with one row per complete window:
+    (rms, zcr) or (rms, zcr, low, high).
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, window_sec=WINDOW_SEC, bands=False):
+        self.sample_rate = sample_rate
+        self.window = max(2, int(sample_rate * window_sec))
+        self.bands = bands
+        self._carry = np.empty(0, dtype=np.int16)
+        if bands:
+            freqs = np.fft.rfftfreq(self.window, 1.0 / sample_rate)
+            self._low = (freqs >= LOW_BAND[0]) & (freqs < LOW_BAND[1])
+            self._high = (freqs >= HIGH_BAND[0]) & (freqs < HIGH_BAND[1])
+
+    def reset(self):
+        self._carry = np.empty(0, dtype=np.int16)
+
+    def analyse(self, pcm_bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16, count=len(pcm_bytes) // 2)
+        if len(self._carry):
+            samples = np.concatenate((self._carry, samples))
+        n = len(samples) // self.window
+        self._carry = samples[n * self.window:].copy()
+        if not n:
+            return np.empty((0, 4 if self.bands else 2), dtype=np.float64)
+
+        ints = samples[:n * self.window].reshape(n, self.window)
+        frames = ints.astype(np.float32)
+        rms = np.sqrt(np.square(frames).sum(axis=1, dtype=np.float64) / self.window)
+        # A crossing is any change of sign (-1/0/+1) between neighbours
+        sign = np.sign(ints)
+        zcr = np.count_nonzero(sign[:, 1:] != sign[:, :-1], axis=1) / (self.window - 1)
+        if not self.bands:
+            return np.column_stack((rms, zcr))
+
+        spectrum = np.fft.rfft(frames, axis=1)
+        energy = spectrum.real ** 2 + spectrum.imag ** 2
+        total = np.maximum(energy.sum(axis=1), 1e-9)
+        low = energy[:, self._low].sum(axis=1) / total
+        high = energy[:, self._high].sum(axis=1) / total
+        return np.column_stack((rms, zcr, low, high))
+
+
 class AvatarModule:
     def __init__(self, size=420, assets_path=None, transparency=205,
-                 scanlines=True, **kwargs):
+                 scanlines=True, lipsync_bands=False, **kwargs):
         """
         Args:
             size: max face height/width in pixels.
@@ -88,6 +147,9 @@ class AvatarModule:
             transparency: 0-255 alpha while speaking (semi-transparent
                           ghost look; idle is drawn slightly fainter).
             scanlines: subtle CRT scanline overlay for the retro look.
+            lipsync_bands: use low/high band energies to pick the round
+                           and narrow mouth shapes (needs numpy's FFT;
+                           about twice the CPU per 25 ms block).
         """
         self.size = size
         self.assets_path = assets_path or DEFAULT_ASSETS_PATH
@@ -99,12 +161,16 @@ class AvatarModule:
         self._last_active = 0.0
         self._last_frame = time.monotonic()
 
-        # Lipsync envelope: deque of (rms, zcr) samples, one per WINDOW_SEC
+        # Lipsync envelope: deque of (rms, zcr[, low, high]) samples,
+        # one per WINDOW_SEC
         self._envelope = deque(maxlen=2000)
+        self._analyzer = LipSyncAnalyzer(bands=lipsync_bands) if np is not None else None
         self._env_clock = 0.0
         self._level_max = 1500.0  # running loudness ceiling for normalisation
         self._openness = 0.0      # smoothed mouth openness 0..1
         self._narrow = 0.0        # smoothed narrowing 0..1 (fricatives)
+        self._round = 0.0         # smoothed rounding 0..1 (oo/oh, band energies)
+        self._has_bands = False
 
         # Idle behaviours
         self._blink_until = 0.0
@@ -206,19 +272,16 @@ class AvatarModule:
     def feed_audio(self, pcm_bytes, sample_rate=SAMPLE_RATE):
         """Analyse a 16-bit mono PCM chunk into mouth envelope samples.
 
-        Called from the voice playback thread as each chunk is scheduled,
-        so the envelope leads the heard audio by at most one chunk.
+        Called from the voice playback thread as each block is written to
+        the speaker, so the envelope leads the heard audio by at most one
+        block. A partial window waits for the next chunk.
         """
         try:
-            if np is None or len(pcm_bytes) < 4:
+            if self._analyzer is None or len(pcm_bytes) < 2:
                 return
-            samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
-            window = max(1, int(sample_rate * WINDOW_SEC))
-            for i in range(0, len(samples) - window + 1, window):
-                seg = samples[i:i + window]
-                rms = float(np.sqrt(np.mean(seg * seg)))
-                zcr = float(np.mean(np.abs(np.diff(np.sign(seg))) > 0))
-                self._envelope.append((rms, zcr))
+            if sample_rate != self._analyzer.sample_rate:
+                self._analyzer = LipSyncAnalyzer(sample_rate, bands=self._analyzer.bands)
+            self._envelope.extend(map(tuple, self._analyzer.analyse(pcm_bytes).tolist()))
         except Exception as e:
             logger.debug(f"feed_audio error: {e}")
 
@@ -241,6 +304,8 @@ class AvatarModule:
             self.state = "hidden"
             self._envelope.clear()
             self._env_clock = 0.0
+            if self._analyzer is not None:
+                self._analyzer.reset()
 
         if now >= self._next_blink:
             self._blink_until = now + 0.13
@@ -251,6 +316,7 @@ class AvatarModule:
         # Consume envelope in real time while speaking
         target_open = 0.0
         target_narrow = 0.0
+        target_round = 0.0
         if self.state == "speaking" and self._envelope:
             self._env_clock += dt
             consumed = None
@@ -258,14 +324,22 @@ class AvatarModule:
                 consumed = self._envelope.popleft()
                 self._env_clock -= WINDOW_SEC
             if consumed:
-                rms, zcr = consumed
+                rms, zcr = consumed[:2]
                 self._level_max = max(self._level_max * 0.999, rms, 500.0)
                 target_open = min(1.0, rms / self._level_max)
                 target_narrow = min(1.0, max(0.0, zcr * 1.8 - 0.3))
+                self._has_bands = len(consumed) == 4
+                if self._has_bands:
+                    low, high = consumed[2:]
+                    # Sibilant energy narrows the mouth even when ZCR is low;
+                    # energy all below 1 kHz (oo/oh) rounds it
+                    target_narrow = max(target_narrow, min(1.0, max(0.0, high * 1.2 - 0.2)))
+                    target_round = min(1.0, max(0.0, (low - 0.75) / 0.2))
 
         rate = 18.0 if target_open > self._openness else 10.0
         self._openness += (target_open - self._openness) * min(1.0, rate * dt)
         self._narrow += (target_narrow - self._narrow) * min(1.0, 8.0 * dt)
+        self._round += (target_round - self._round) * min(1.0, 8.0 * dt)
 
     def _pick_frame(self, now):
         """Choose which face frame to show this frame."""
@@ -281,7 +355,8 @@ class AvatarModule:
             if o < 0.35:
                 return self._first_available("small", "round", "open")
             if o < 0.7:
-                if self._narrow < 0.25 and "round" in self._frames and o < 0.5:
+                rounded = self._round > 0.5 if self._has_bands else self._narrow < 0.25
+                if rounded and "round" in self._frames and o < 0.5:
                     return "round"
                 return self._first_available("open", "wide", "small")
             return self._first_available("wide", "open", "small")
@@ -298,6 +373,10 @@ class AvatarModule:
                 return k
         return "neutral"
 
+    def is_animating(self):
+        """Frame-scheduler hook: the face moves whenever it is on screen."""
+        return self.alpha > 0.01 or self.state in ("listening", "thinking", "speaking")
+
     def draw(self, screen, position):
         try:
             if self.alpha <= 0.01:
@@ -1,8 +1,8 @@
 """Background fetch helper for AI-Mirror display modules.
 
 Network calls must never run on the main render loop (30 FPS target).
-Modules submit a fetch function here; it runs in a daemon thread and the
-result is collected on a later frame via take_result().
+Modules submit a fetch function here; it runs on a shared worker pool
+and the result is collected on a later frame via take_result().
 
 Usage in a module's update():
     if self._fetcher.idle and time_to_refresh:
@@ -12,55 +12,339 @@ Usage in a module's update():
         ok, value = result
         if ok:
             self.data = value
+
+All fetchers share one FetchScheduler (module-level fetch_scheduler):
+a fixed pool of worker threads with a per-name in-flight limit, two
+priority classes (PRIORITY_USER jumps ahead of PRIORITY_BACKGROUND
+polling), start deadlines and cancellation. Queue depth, wait time and
+run time per job name are available from fetch_scheduler.get_stats()
+(web panel /api/fetch).
 """
 
+import itertools
 import logging
 import threading
+import time
+
+from config import CONFIG
 
 logger = logging.getLogger("BackgroundFetcher")
 
+PRIORITY_USER = 0         # explicit refreshes (voice, web panel)
+PRIORITY_BACKGROUND = 1   # periodic polling from update()
+
+
+class FetchDeadlineExceeded(Exception):
+    """A queued fetch was not started before its deadline."""
+
+
+class FetchJob:
+    """One submitted fetch; owned by the scheduler until it finishes."""
+
+    __slots__ = ('name', 'fn', 'priority', 'seq', 'deadline', 'on_done',
+                 'submitted', 'started', 'cancelled')
+
+    def __init__(self, name, fn, priority, seq, deadline, on_done):
+        self.name = name
+        self.fn = fn
+        self.priority = priority
+        self.seq = seq
+        self.deadline = deadline      # monotonic start-by time, or None
+        self.on_done = on_done        # callback(job, (ok, value))
+        self.submitted = time.monotonic()
+        self.started = None
+        self.cancelled = False
+
+
+class _JobStats:
+    """Counters and wait/run timings for one job name."""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+        self.cancelled = 0
+        self.late = 0            # finished after its deadline had passed
+        self.queued = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+        self.started = 0
+
+    def as_dict(self):
+        started = max(self.started, 1)
+        finished = max(self.completed + self.failed, 1)
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'expired': self.expired,
+            'cancelled': self.cancelled,
+            'late': self.late,
+            'queued': self.queued,
+            'in_flight': self.in_flight,
+            'wait_ms_mean': round(self.wait_total / started * 1000, 1),
+            'wait_ms_max': round(self.wait_max * 1000, 1),
+            'run_ms_mean': round(self.run_total / finished * 1000, 1),
+            'run_ms_max': round(self.run_max * 1000, 1),
+        }
+
+
+class FetchScheduler:
+    """Fixed worker pool shared by every BackgroundFetcher.
+
+    Workers take the queued job with the best (priority, submit order)
+    whose name is below its in-flight limit. A job still queued at its
+    deadline is dropped and reported as FetchDeadlineExceeded; a running
+    job cannot be interrupted, so one that overruns is only counted late.
+    """
+
+    def __init__(self, workers=3, default_limit=1, limits=None,
+                 default_deadline_s=None):
+        self.workers = max(1, int(workers))
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self.default_deadline_s = default_deadline_s
+
+        self._cond = threading.Condition()
+        self._queue = []                 # FetchJob, unordered (small)
+        self._in_flight = {}             # name -> running jobs
+        self._stats = {}                 # name -> _JobStats
+        self._seq = itertools.count()
+        self._threads = []
+        self._stopping = False
+
+    # ----- submission -----------------------------------------------------
+
+    def submit(self, name, fn, on_done, priority=PRIORITY_BACKGROUND,
+               deadline_s=None):
+        """Queue fn under name; on_done(job, (ok, value)) runs on a worker."""
+        if deadline_s is None:
+            deadline_s = self.default_deadline_s
+        with self._cond:
+            job = FetchJob(
+                name, fn, priority, next(self._seq),
+                time.monotonic() + deadline_s if deadline_s else None,
+                on_done,
+            )
+            stats = self._stats_for(name)
+            stats.submitted += 1
+            stats.queued += 1
+            self._queue.append(job)
+            self._ensure_workers()
+            self._cond.notify()
+        return job
+
+    def cancel(self, job):
+        """Drop a queued job, or discard the result of a running one."""
+        with self._cond:
+            if job.cancelled:
+                return False
+            job.cancelled = True
+            stats = self._stats_for(job.name)
+            stats.cancelled += 1
+            if job in self._queue:
+                self._queue.remove(job)
+                stats.queued -= 1
+            return True
+
+    def boost(self, name):
+        """Promote queued jobs for name to user priority."""
+        with self._cond:
+            for job in self._queue:
+                if job.name == name:
+                    job.priority = PRIORITY_USER
+
+    def shutdown(self, timeout=2.0):
+        """Stop the workers once their current jobs finish."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # ----- workers --------------------------------------------------------
+
+    def _ensure_workers(self):
+        # Called with the lock held; threads start on first use
+        self._stopping = False
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"fetch-worker-{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _limit(self, name):
+        return self.limits.get(name, self.default_limit)
+
+    def _next_job(self, expired):
+        """Best runnable job; overdue jobs are moved to expired. Lock held."""
+        now = time.monotonic()
+        best = None
+        for job in list(self._queue):
+            if job.deadline is not None and now > job.deadline:
+                self._queue.remove(job)
+                stats = self._stats_for(job.name)
+                stats.queued -= 1
+                stats.expired += 1
+                logger.warning(
+                    f"[{job.name}] fetch dropped: not started within its deadline "
+                    f"(queued {now - job.submitted:.1f}s)"
+                )
+                expired.append(job)
+                continue
+            if self._in_flight.get(job.name, 0) >= self._limit(job.name):
+                continue
+            if best is None or (job.priority, job.seq) < (best.priority, best.seq):
+                best = job
+        return best
+
+    def _worker(self):
+        while True:
+            expired = []
+            with self._cond:
+                job = self._next_job(expired)
+                while job is None and not expired:
+                    if self._stopping:
+                        return
+                    self._cond.wait(1.0)
+                    job = self._next_job(expired)
+                if job is not None:
+                    self._claim(job)
+
+            # Callbacks take the fetcher's lock, so never hold ours here
+            for dropped in expired:
+                self._finish(dropped, (False, FetchDeadlineExceeded(dropped.name)))
+            if job is not None:
+                self._run(job)
+
+    def _claim(self, job):
+        """Move job from the queue to in-flight. Lock held."""
+        self._queue.remove(job)
+        self._in_flight[job.name] = self._in_flight.get(job.name, 0) + 1
+        stats = self._stats_for(job.name)
+        stats.queued -= 1
+        stats.in_flight += 1
+        stats.started += 1
+        job.started = time.monotonic()
+        wait = job.started - job.submitted
+        stats.wait_total += wait
+        stats.wait_max = max(stats.wait_max, wait)
+
+    def _run(self, job):
+        try:
+            result = (True, job.fn())
+        except Exception as e:
+            logger.warning(f"[{job.name}] background fetch failed: {e}")
+            result = (False, e)
+        run = time.monotonic() - job.started
+
+        with self._cond:
+            stats = self._stats_for(job.name)
+            self._in_flight[job.name] -= 1
+            stats.in_flight -= 1
+            stats.run_total += run
+            stats.run_max = max(stats.run_max, run)
+            if result[0]:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+            if job.deadline is not None and time.monotonic() > job.deadline:
+                stats.late += 1
+            # A freed slot may unblock a queued job with the same name
+            self._cond.notify_all()
+        self._finish(job, result)
+
+    def _finish(self, job, result):
+        if job.cancelled or job.on_done is None:
+            return
+        try:
+            job.on_done(job, result)
+        except Exception as e:
+            logger.error(f"[{job.name}] fetch callback failed: {e}")
+
+    # ----- reporting ------------------------------------------------------
+
+    def _stats_for(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _JobStats()
+        return stats
+
+    def get_stats(self):
+        """Pool size, queue depth and per-name counters/timings."""
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'busy': sum(self._in_flight.values()),
+                'queued': len(self._queue),
+                'jobs': {name: s.as_dict() for name, s in sorted(self._stats.items())},
+            }
+
+
+_cfg = CONFIG.get('fetch_scheduler', {})
+fetch_scheduler = FetchScheduler(
+    workers=_cfg.get('workers', 3),
+    default_limit=_cfg.get('default_limit', 1),
+    limits=_cfg.get('limits'),
+    default_deadline_s=_cfg.get('deadline_s'),
+)
+
 
 class BackgroundFetcher:
-    """Runs one fetch function at a time in a daemon thread.
+    """Runs one fetch function at a time on the shared worker pool.
 
-    submit() is a no-op while a fetch is in flight, so calling it every
-    frame is safe. take_result() returns (ok, value_or_exception) exactly
-    once per completed fetch, or None if nothing has finished.
+    submit() is a no-op while a fetch is queued or running, so calling it
+    every frame is safe. take_result() returns (ok, value_or_exception)
+    exactly once per completed fetch, or None if nothing has finished.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, scheduler=None):
         self.name = name
+        self.scheduler = scheduler or fetch_scheduler
         self._lock = threading.Lock()
-        self._thread = None
+        self._job = None     # pending FetchJob
         self._result = None  # (ok, value) tuple, consumed by take_result
 
     @property
     def idle(self):
-        """True when no fetch is running."""
+        """True when no fetch is queued or running."""
         with self._lock:
-            return self._thread is None or not self._thread.is_alive()
+            return self._job is None
 
-    def submit(self, fn):
-        """Start fn in a background thread. Returns False if already busy."""
+    def submit(self, fn, priority=PRIORITY_BACKGROUND, deadline_s=None):
+        """Queue fn on the worker pool. Returns False if already busy."""
         with self._lock:
-            if self._thread is not None and self._thread.is_alive():
+            if self._job is not None:
                 return False
-            self._thread = threading.Thread(
-                target=self._run, args=(fn,),
-                name=f"fetch-{self.name}", daemon=True,
+            self._job = self.scheduler.submit(
+                self.name, fn, self._done, priority=priority, deadline_s=deadline_s,
             )
-            self._thread.start()
             return True
 
-    def _run(self, fn):
-        try:
-            value = fn()
-            with self._lock:
-                self._result = (True, value)
-        except Exception as e:
-            logger.warning(f"[{self.name}] background fetch failed: {e}")
-            with self._lock:
-                self._result = (False, e)
+    def boost(self):
+        """Move a queued fetch ahead of background polling."""
+        self.scheduler.boost(self.name)
+
+    def cancel(self):
+        """Cancel the pending fetch; its result (if any) is discarded."""
+        with self._lock:
+            job, self._job = self._job, None
+        return job is not None and self.scheduler.cancel(job)
+
+    def _done(self, job, result):
+        with self._lock:
+            if job is not self._job:
+                return  # cancelled and replaced
+            self._job = None
+            self._result = result
 
     def take_result(self):
         """Return and clear the last completed result, or None."""
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""APITracker microbenchmark: minute-bucket counters vs the old call list.
+
+Replays a simulated day of API traffic on a fake clock through both the
+bucketed APITracker and a copy of the previous list-based algorithm
+(allow() summed the whole 24h call list; record() appended and rebuilt
+it to prune). At checkpoints through the day it times allow()+record()
+pairs and get_summary() against the state accumulated so far. The list
+version grows with the day's traffic; the buckets stay flat.
+
+It then measures disk writes over a simulated day: the old persistence
+re-dumped the whole 24h call list as JSON at most every 30 s whenever a
+call was recorded; the journal appends one line per call and rewrites
+the bucket snapshot only when it compacts.
+
+    python benchmarks/bench_api_tracker.py
+    python benchmarks/bench_api_tracker.py --calls-per-day 30000 --out data/bench/api.json
+    python benchmarks/bench_api_tracker.py --io-calls-per-day 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api_tracker import APITracker, DEFAULT_LIMITS  # noqa: E402
+
+SERVICES = sorted(DEFAULT_LIMITS)
+DAY_START = 1_800_000_000.0
+
+
+class ListTracker:
+    """The pre-bucket algorithm: a flat list of (ts, module, service, cost)."""
+
+    def __init__(self, clock):
+        self._calls = []
+        self._clock = clock
+
+    def allow(self, module, service):
+        now = self._clock()
+        hour_ago, day_ago = now - 3600, now - 86400
+        hourly = sum(1 for ts, m, s, c in self._calls if s == service and ts > hour_ago)
+        daily = sum(1 for ts, m, s, c in self._calls if s == service and ts > day_ago)
+        return hourly < 10 ** 9 and daily < 10 ** 9
+
+    def record(self, module, service, estimated_cost=0.0):
+        now = self._clock()
+        self._calls.append((now, module, service, estimated_cost))
+        cutoff = now - 86400
+        self._calls = [(ts, m, s, c) for ts, m, s, c in self._calls if ts > cutoff]
+
+    def get_summary(self):
+        hour_ago = self._clock() - 3600
+        hourly, daily = defaultdict(int), defaultdict(int)
+        for ts, m, s, c in list(self._calls):
+            daily[s] += 1
+            if ts > hour_ago:
+                hourly[s] += 1
+        return hourly, daily
+
+
+def make_bucketed(clock):
+    # Time the counters, not file I/O
+    tracker = APITracker(state_file=None, clock=clock, usage_log=None)
+    tracker._summary_interval = float('inf')
+    for service in SERVICES:
+        tracker.set_limit(service, hourly=10 ** 9, daily=10 ** 9, daily_cost=0)
+    return tracker
+
+
+def time_ops(tracker, samples):
+    """us per allow()+record() pair and per get_summary() at this point."""
+    start = time.perf_counter()
+    for i in range(samples):
+        service = SERVICES[i % len(SERVICES)]
+        tracker.allow("bench", service)
+        tracker.record("bench", service)
+    pair_us = (time.perf_counter() - start) / samples * 1e6
+    start = time.perf_counter()
+    for _ in range(20):
+        tracker.get_summary()
+    summary_us = (time.perf_counter() - start) / 20 * 1e6
+    return pair_us, summary_us
+
+
+def simulate(calls_per_day, checkpoints, samples):
+    clock_box = [DAY_START]
+    clock = lambda: clock_box[0]  # noqa: E731
+    trackers = {'list': ListTracker(clock), 'buckets': make_bucketed(clock)}
+    step = 86400.0 / calls_per_day
+    per_checkpoint = calls_per_day // checkpoints
+    rows = []
+    done = 0
+    for cp in range(1, checkpoints + 1):
+        # Replay traffic up to this point of the day (not timed)
+        for i in range(done, cp * per_checkpoint):
+            clock_box[0] = DAY_START + i * step
+            service = SERVICES[i % len(SERVICES)]
+            for tracker in trackers.values():
+                tracker.record("sim", service)
+        done = cp * per_checkpoint
+        row = {'hour': round(clock_box[0] - DAY_START) / 3600, 'calls_so_far': done}
+        for name, tracker in trackers.items():
+            pair_us, summary_us = time_ops(tracker, samples)
+            row[f'{name}_pair_us'] = round(pair_us, 2)
+            row[f'{name}_summary_us'] = round(summary_us, 1)
+        rows.append(row)
+    return rows
+
+
+def old_persist_bytes(calls_per_day):
+    """Bytes the 30 s full-state dump wrote for one day of traffic."""
+    step = 86400.0 / calls_per_day
+    calls, written, last_persist = [], 0, 0.0
+    for i in range(calls_per_day):
+        now = DAY_START + i * step
+        calls.append([now, "sim", SERVICES[i % len(SERVICES)], 0.0])
+        if now - last_persist >= 30:
+            last_persist = now
+            written += len(json.dumps({'calls': calls, 'saved_at': now}))
+    return written, 0
+
+
+def journal_bytes(calls_per_day):
+    """Bytes the journal + compacted snapshot wrote for one day of traffic."""
+    clock_box = [DAY_START]
+    step = 86400.0 / calls_per_day
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = APITracker(state_file=os.path.join(tmp, 'state.json'),
+                             clock=lambda: clock_box[0], usage_log=None)
+        tracker._summary_interval = float('inf')
+        for service in SERVICES:
+            tracker.set_limit(service, hourly=10 ** 9, daily=10 ** 9, daily_cost=0)
+        for i in range(calls_per_day):
+            clock_box[0] = DAY_START + i * step
+            tracker.record("sim", SERVICES[i % len(SERVICES)])
+        stats = tracker.get_persistence_stats()
+    return stats['journal_bytes_written'] + stats['snapshot_bytes_written'], stats['compactions']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls-per-day', type=int, default=10000)
+    parser.add_argument('--checkpoints', type=int, default=8)
+    parser.add_argument('--samples', type=int, default=200,
+                        help='allow()+record() pairs timed per checkpoint')
+    parser.add_argument('--io-calls-per-day', type=int, default=3000,
+                        help='traffic for the bytes-written comparison')
+    parser.add_argument('--out', help='write results as JSON')
+    args = parser.parse_args()
+
+    rows = simulate(args.calls_per_day, args.checkpoints, args.samples)
+    print(f"{'hour':>5} {'calls':>7} | {'list us/op':>10} {'bucket us/op':>12} | "
+          f"{'list summary':>12} {'bucket summary':>14}")
+    for row in rows:
+        print(f"{row['hour']:>5.1f} {row['calls_so_far']:>7} | {row['list_pair_us']:>10.2f} "
+              f"{row['buckets_pair_us']:>12.2f} | {row['list_summary_us']:>10.1f}us "
+              f"{row['buckets_summary_us']:>12.1f}us")
+
+    old_bytes, _ = old_persist_bytes(args.io_calls_per_day)
+    new_bytes, compactions = journal_bytes(args.io_calls_per_day)
+    print(f"\nBytes written per day at {args.io_calls_per_day} calls/day:")
+    print(f"  30s full-state dump: {old_bytes / 1024:>10.1f} KB")
+    print(f"  journal + snapshot:  {new_bytes / 1024:>10.1f} KB "
+          f"({compactions} compactions, {old_bytes / max(new_bytes, 1):.0f}x less)")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump({'calls_per_day': args.calls_per_day, 'checkpoints': rows,
+                       'io': {'calls_per_day': args.io_calls_per_day,
+                              'full_dump_bytes': old_bytes, 'journal_bytes': new_bytes,
+                              'compactions': compactions}}, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""Mirror boot: time to first frame with lazy vs eager module loading.
+
+Each run is a fresh interpreter (so every import is cold) that builds a
+ModuleRegistry from the real CONFIG the way MagicMirror does:
+
+  eager   every registered module imported and constructed before the
+          first frame (module_loading.lazy = False, the old behaviour)
+  lazy    only module_loading.eager before the first frame; then one
+          simulated frame every 1/frame_rate s, each requesting the
+          visible modules and pump()ing within frame_budget_ms, with
+          the remaining imports pre-warmed on a background thread
+
+Times are from the child's first line to the first frame, to every
+visible module loaded ("settled"), and the longest main-loop stall after
+the first frame. Modules whose dependencies are missing fail fast in
+both modes and show as FAILED in the timeline.
+
+    python benchmarks/bench_boot.py
+    python benchmarks/bench_boot.py --runs 9 --timeline
+    python benchmarks/bench_boot.py --out data/bench/boot.json
+"""
+
+import time
+
+_T0 = time.perf_counter()
+
+import os  # noqa: E402
+import sys  # noqa: E402
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import shutil  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import tempfile  # noqa: E402
+
+
+def child(mode, work):
+    """One boot; prints a JSON result line and exits without joining threads."""
+    import logging
+    logging.disable(logging.CRITICAL)
+    import pygame
+    import data_cache as data_cache_module
+    import price_history as price_history_module
+    from config import CONFIG
+    from module_manager import ModuleRegistry
+
+    data_cache_module._CACHE_DIR = os.path.join(work, "cache")
+    price_history_module._HISTORY_DIR = os.path.join(work, "prices")
+    pygame.init()
+    pygame.display.set_mode((1080, 1920))
+
+    loading = CONFIG.get('module_loading', {})
+    registry = ModuleRegistry(frame_budget_ms=loading.get('frame_budget_ms', 40))
+    registry._boot = _T0
+    registry.register_from_config(skip=loading.get('skip', ['eleven_voice']))
+    screensaver = CONFIG.get('screensaver_modules', ['retro_characters'])
+    visible = [n for n in registry.names() if n not in screensaver]
+
+    if mode == 'eager':
+        for name in registry.names():
+            registry.load(name, 'boot')
+    else:
+        for name in loading.get('eager', ['clock']):
+            registry.load(name, 'boot')
+    first_frame = time.perf_counter() - _T0
+    registry.first_frame(prewarm=(mode == 'lazy'))
+
+    frame_s = 1.0 / CONFIG.get('frame_rate', 30)
+    stall = 0.0
+    while True:
+        start = time.perf_counter()
+        for name in visible:
+            registry.request(name)
+        registry.pump()
+        stall = max(stall, time.perf_counter() - start)
+        if registry.settled():
+            break
+        time.sleep(max(0.0, frame_s - (time.perf_counter() - start)))
+    settled = time.perf_counter() - _T0
+
+    print(json.dumps({
+        'first_frame_ms': round(first_frame * 1000.0, 1),
+        'settled_ms': round(settled * 1000.0, 1),
+        'max_stall_ms': round(stall * 1000.0, 1),
+        'loaded': len(registry.modules),
+        'report': registry.report(),
+    }))
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def run(mode, work):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, work],
+                          capture_output=True, text=True, timeout=300, cwd=ROOT)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    raise RuntimeError(f"{mode} boot failed:\n{proc.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='boots per mode')
+    parser.add_argument('--timeline', action='store_true', help='print the last lazy timeline')
+    parser.add_argument('--out', help='write results as JSON')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+
+    work = tempfile.mkdtemp(prefix="bench-boot-")
+    runs = {'eager': [], 'lazy': []}
+    try:
+        for _ in range(args.runs):
+            for mode in runs:
+                runs[mode].append(run(mode, work))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    result = {'runs': args.runs}
+    print(f"Mirror boot (median of {args.runs} fresh interpreters):")
+    print(f"  {'':>6} {'first frame':>12} {'settled':>9} {'max stall':>10}  loaded")
+    for mode, samples in runs.items():
+        row = {key: round(statistics.median(s[key] for s in samples), 1)
+               for key in ('first_frame_ms', 'settled_ms', 'max_stall_ms')}
+        row['loaded'] = samples[-1]['loaded']
+        result[mode] = row
+        print(f"  {mode:>6} {row['first_frame_ms']:9.1f} ms {row['settled_ms']:6.1f} ms "
+              f"{row['max_stall_ms']:7.1f} ms  {row['loaded']}")
+    if args.timeline:
+        print(runs['lazy'][-1]['report'])
+    result['timeline'] = runs['lazy'][-1]['report']
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+"""Headless frame-time benchmark for the mirror render path.
+
+Builds the layout from design_preview's fake data (no display, no
+network), then drives MagicMirror.update_modules() and draw_modules()
+for N frames per scenario and reports p50/p95/p99 frame times plus a
+per-module update/draw breakdown.
+
+    python benchmarks/bench_frame.py                      # all scenarios
+    python benchmarks/bench_frame.py -s weather_rain -n 600
+    python benchmarks/bench_frame.py --out data/bench/frame.json
+    python benchmarks/bench_frame.py --baseline data/bench/frame.json
+    python benchmarks/bench_frame.py --profiler   # with ModuleProfiler on
+
+With --baseline the run is compared scenario by scenario and exits 1 when
+p50 or p95 regresses by more than --threshold (default 15%). Frame times
+include the compositor, so a scenario that only touches the ticker costs
+less than one that repaints the whole screen - as it does on the Pi.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import importlib.util
+import json
+import math
+import platform
+import random
+import time
+from datetime import date, datetime, timezone
+from queue import Queue
+
+import pygame
+
+import design_preview
+import weather_animations
+from config import CONFIG
+from layout_manager import LayoutManager
+
+WIDTH, HEIGHT = design_preview.WIDTH, design_preview.HEIGHT
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_mirror_class():
+    """Import MagicMirror from AI-Mirror.py (the hyphen blocks a plain import)."""
+    spec = importlib.util.spec_from_file_location(
+        "ai_mirror", os.path.join(ROOT, "AI-Mirror.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.MagicMirror
+
+
+# ----- harness ------------------------------------------------------------
+
+class ModuleTimer:
+    """Wraps module methods on the instance and sums their time per frame."""
+
+    def __init__(self):
+        self._frame = {}
+        self.samples = {}   # key -> per-frame seconds (0.0 when not called)
+        self.frames = 0
+
+    def wrap(self, obj, method, key):
+        if not hasattr(obj, method):
+            return
+        fn = getattr(obj, method)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._frame[key] = self._frame.get(key, 0.0) + time.perf_counter() - start
+
+        setattr(obj, method, timed)
+
+    def end_frame(self, record=True):
+        if record:
+            for key in set(self.samples) | set(self._frame):
+                series = self.samples.setdefault(key, [0.0] * self.frames)
+                series.append(self._frame.get(key, 0.0))
+            self.frames += 1
+        self._frame = {}
+
+
+def make_mirror(mirror_cls, screen, modules):
+    """A MagicMirror with just the state the update/draw path uses.
+
+    MagicMirror.__init__ opens the display, audio and web panel; here the
+    same attributes are wired by hand around the fake modules.
+    """
+    from animation_manager import AnimationManager
+    from compositor import FrameCompositor
+    from module_base import LayerCache
+    from module_manager import ModuleManager, ModuleRegistry
+
+    mirror = mirror_cls.__new__(mirror_cls)
+    mirror.screen = screen
+    mirror.registry = ModuleRegistry(config={})
+    mirror.registry.adopt(modules)
+    mirror.modules = modules
+    mirror.load_order = list(modules)
+    mirror.state = "active"
+    mirror.debug_layout = False
+    mirror.debug_mode = False
+    mirror.web_panel = None
+    mirror.voice_command_queue = Queue()
+    mirror.layout_manager = LayoutManager(WIDTH, HEIGHT)
+    mirror.module_positions = {
+        name: mirror.layout_manager.get_module_position(name) for name in modules
+    }
+    mirror.module_manager = ModuleManager(initialized_modules=modules)
+    mirror.animation_manager = AnimationManager(WIDTH, HEIGHT)
+    comp_cfg = CONFIG.get('compositor', {})
+    mirror.compositor = FrameCompositor(
+        screen,
+        full_update_ratio=comp_cfg.get('full_update_ratio', 0.6),
+        enabled=comp_cfg.get('enabled', True),
+    )
+    mirror.layer_cache = LayerCache()
+    return mirror
+
+
+def keep_offline(modules):
+    """Mark every fetching module as freshly updated so no fetch starts."""
+    now = datetime.now()
+    for module in modules.values():
+        for attr in ("last_update", "last_fetch"):
+            if isinstance(getattr(module, attr, None), datetime):
+                setattr(module, attr, now)
+    if "quote" in modules:
+        modules["quote"].last_fetch_date = date.today()
+    stocks = modules.get("stocks")
+    if stocks is not None:
+        stocks._last_csv_check = time.time()
+        stocks._fetch_day = datetime.now(timezone.utc).date()
+        stocks._initial_fetch_done = True
+        stocks._last_round_hour = stocks._is_fetch_window()
+        stocks._fetch_queue = []
+
+
+# ----- scenarios ----------------------------------------------------------
+
+def _weather(cls_name, **kwargs):
+    def setup(mirror):
+        cls = getattr(weather_animations, cls_name)
+        mirror.modules["weather"].animation = cls(WIDTH, HEIGHT, **kwargs)
+    return setup
+
+
+def _no_weather(mirror):
+    mirror.modules["weather"].animation = None
+
+
+def _long_ticker(mirror):
+    _no_weather(mirror)
+    stocks = mirror.modules["stocks"]
+    rng = random.Random(4)
+    for i in range(60):
+        stocks.stock_data[f"SYM{i:02d}"] = {
+            "price": round(rng.uniform(5, 900), 2),
+            "percent_change": round(rng.uniform(-6, 6), 2),
+            "currency": "$",
+        }
+
+
+def _dashboard(mirror):
+    _no_weather(mirror)
+    smarthome = mirror.modules["smarthome"]
+    smarthome.show_dashboard()
+    smarthome._dashboard_until = time.monotonic() + 3600
+    smarthome._dash_alpha = 1.0
+
+
+def _notifications(mirror):
+    _no_weather(mirror)
+    for text in ("AAPL UP 5.2%", "Timer: TIME UP!", "[panel] news: OFF"):
+        mirror.animation_manager.push_notification(text, duration_ms=3600 * 1000)
+
+
+def _avatar(mirror):
+    _no_weather(mirror)
+    from avatar_module import AvatarModule
+    avatar = AvatarModule(**CONFIG["avatar"]["params"])
+    mirror.modules["avatar"] = avatar
+    mirror.module_manager.module_visibility["avatar"] = True
+    mirror.module_positions["avatar"] = mirror.layout_manager.get_module_position("avatar")
+    avatar.set_voice_state("speaking")
+    avatar.alpha = 1.0
+
+
+def _avatar_frame(mirror, frame):
+    """Feed 1/30 s of syllable-shaped speech per frame, as playback does."""
+    import numpy as np
+    rate = 24000
+    t = (np.arange(rate // 30) + frame * (rate // 30)) / rate
+    pcm = (np.sin(2 * np.pi * 180 * t) * np.abs(np.sin(2 * np.pi * 3 * t)) * 12000)
+    mirror.modules["avatar"].feed_audio(pcm.astype(np.int16).tobytes(), rate)
+
+
+# name -> (setup, per-frame hook or None)
+SCENARIOS = {
+    "idle": (_no_weather, None),
+    "weather_sun": (_weather("SunAnimation"), None),
+    "weather_moon": (_weather("MoonAnimation", cloudy=True), None),
+    "weather_cloud": (_weather("CloudAnimation", partly=True), None),
+    "weather_rain": (_weather("RainAnimation", heavy=True), None),
+    "weather_storm": (_weather("StormAnimation"), None),
+    "weather_snow": (_weather("SnowAnimation"), None),
+    "ticker_long": (_long_ticker, None),
+    "dashboard": (_dashboard, None),
+    "notifications": (_notifications, None),
+    "avatar_speaking": (_avatar, _avatar_frame),
+}
+
+
+# ----- measurement --------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _ms(seconds):
+    return round(seconds * 1000.0, 3)
+
+
+def run_scenario(mirror_cls, name, frames, warmup, profile=False):
+    setup, per_frame = SCENARIOS[name]
+    random.seed(0)
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    modules = design_preview.build_modules()
+    mirror = make_mirror(mirror_cls, screen, modules)
+    setup(mirror)
+    keep_offline(mirror.modules)
+
+    profiler = None
+    if profile:
+        from module_profiler import ModuleProfiler
+        profiler = ModuleProfiler(log_interval_s=0)
+        profiler.instrument(mirror.modules, mirror.animation_manager)
+
+    timer = ModuleTimer()
+    for mod_name, module in mirror.modules.items():
+        timer.wrap(module, "update", f"{mod_name}.update")
+        timer.wrap(module, "draw", f"{mod_name}.draw")
+    timer.wrap(mirror.modules["stocks"], "draw_scrolling_ticker", "stocks.ticker")
+    timer.wrap(mirror.modules["smarthome"], "draw_dashboard", "smarthome.dashboard")
+    timer.wrap(mirror.animation_manager, "draw_notifications", "notifications.draw")
+
+    frame_times = []
+    for frame in range(warmup + frames):
+        if per_frame:
+            per_frame(mirror, frame)
+        start = time.perf_counter()
+        mirror.update_modules()
+        mirror.draw_modules()
+        if profiler:
+            profiler.end_frame(time.perf_counter() - start)
+        elapsed = time.perf_counter() - start
+        pygame.event.pump()
+        if frame >= warmup:
+            frame_times.append(elapsed)
+        timer.end_frame(record=frame >= warmup)
+
+    ordered = sorted(frame_times)
+    modules_report = {}
+    for key, series in sorted(timer.samples.items()):
+        if not any(series):
+            continue
+        modules_report[key] = {
+            "mean_ms": _ms(sum(series) / len(series)),
+            "p95_ms": _ms(percentile(sorted(series), 95)),
+            "max_ms": _ms(max(series)),
+        }
+    result = {
+        "frames": len(frame_times),
+        "mean_ms": _ms(sum(frame_times) / max(len(frame_times), 1)),
+        "p50_ms": _ms(percentile(ordered, 50)),
+        "p95_ms": _ms(percentile(ordered, 95)),
+        "p99_ms": _ms(percentile(ordered, 99)),
+        "max_ms": _ms(ordered[-1] if ordered else 0.0),
+        "screen_fraction": mirror.compositor.get_stats()["avg_screen_fraction"],
+        "modules": modules_report,
+    }
+    if profiler:
+        result["profiler_overhead"] = profiler.get_stats()["overhead"]
+    return result
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """Scenarios whose p50/p95 got slower than baseline by > threshold."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = old.get(metric, 0.0), result[metric]
+            if after - before > min_delta_ms and after > before * (1.0 + threshold):
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI-Mirror frame-time benchmark")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default all)")
+    parser.add_argument("-n", "--frames", type=int, default=300,
+                        help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=30,
+                        help="unmeasured frames first (font loads, first full repaint)")
+    parser.add_argument("--out", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed relative slowdown before failing (0.15 = 15%%)")
+    parser.add_argument("--profiler", action="store_true",
+                        help="run with ModuleProfiler wrapping every module (overhead check)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args()
+
+    pygame.init()
+    mirror_cls = _load_mirror_class()
+    names = args.scenario or list(SCENARIOS)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "resolution": [WIDTH, HEIGHT],
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "profiler": args.profiler,
+        },
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':<18}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  slowest module")
+    for name in names:
+        result = run_scenario(mirror_cls, name, args.frames, args.warmup, args.profiler)
+        report["scenarios"][name] = result
+        slowest = max(result["modules"].items(), key=lambda kv: kv[1]["mean_ms"],
+                      default=("-", {"mean_ms": 0.0}))
+        print(f"{name:<18}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+              f"{result['p99_ms']:>9.2f}{result['max_ms']:>9.2f}  "
+              f"{slowest[0]} ({slowest[1]['mean_ms']:.2f} ms)")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\nREGRESSIONS (> {args.threshold:.0%} slower than {args.baseline}):")
+            for name, metric, before, after in regressions:
+                print(f"  {name:<18}{metric:<8}{before:>8.2f} -> {after:.2f} ms")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Tracked-text benchmark: per-glyph font.render() vs the shared GlyphAtlas.
+
+Renders the strings the mirror actually letter-spaces (module titles and
+the clock date) both ways and reports microseconds per string and the
+speed-up. Both paths are checked to produce identical pixels first.
+
+    python benchmarks/bench_glyphs.py
+    python benchmarks/bench_glyphs.py -n 5000 --out data/bench/glyphs.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame  # noqa: E402
+
+pygame.init()
+
+from config import (  # noqa: E402
+    load_font, FONT_SIZE_LABEL, FONT_SIZE_SMALL, LABEL_TRACKING,
+    COLOR_ACCENT_PRIMARY, COLOR_TEXT_SECONDARY,
+)
+from module_base import ModuleDrawHelper  # noqa: E402
+
+CASES = [
+    ("title", 'medium', FONT_SIZE_LABEL, COLOR_ACCENT_PRIMARY, LABEL_TRACKING,
+     ["WEATHER", "CALENDAR", "STOCKS", "NEWS", "SMART HOME", "SYSTEM"]),
+    ("clock_date", 'regular', FONT_SIZE_SMALL, COLOR_TEXT_SECONDARY, 2,
+     ["FRIDAY, 16 OCTOBER 2026", "SATURDAY, 17 OCTOBER 2026"]),
+]
+
+
+def render_per_glyph(font, text, color, tracking):
+    """The pre-atlas render_tracked: one font.render() per character."""
+    glyphs = [font.render(ch, True, color) for ch in text]
+    width = sum(g.get_width() for g in glyphs) + tracking * (len(glyphs) - 1)
+    height = max(g.get_height() for g in glyphs)
+    surf = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
+    x = 0
+    for g in glyphs:
+        surf.blit(g, (x, 0))
+        x += g.get_width() + tracking
+    return surf
+
+
+def time_us(fn, strings, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(strings[i % len(strings)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_case(name, weight, size, color, tracking, strings, iterations):
+    font = load_font(weight, size)
+
+    def old(text):
+        return render_per_glyph(font, text, color, tracking)
+
+    def new(text):
+        return ModuleDrawHelper.render_tracked(font, text, color, tracking)
+
+    identical = all(
+        pygame.image.tostring(old(t), "RGBA") == pygame.image.tostring(new(t), "RGBA")
+        for t in strings
+    )
+    per_glyph_us = time_us(old, strings, iterations)
+    atlas_us = time_us(new, strings, iterations)
+    return {
+        'case': name,
+        'strings': len(strings),
+        'identical': identical,
+        'per_glyph_us': round(per_glyph_us, 2),
+        'atlas_us': round(atlas_us, 2),
+        'speedup': round(per_glyph_us / atlas_us, 2) if atlas_us else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--iterations', type=int, default=2000)
+    parser.add_argument('--out', help='write results as JSON')
+    args = parser.parse_args()
+
+    rows = [run_case(*case, args.iterations) for case in CASES]
+    print(f"{'case':<12} {'per-glyph us':>13} {'atlas us':>10} {'speed-up':>9}  pixels")
+    for row in rows:
+        print(f"{row['case']:<12} {row['per_glyph_us']:>13.2f} {row['atlas_us']:>10.2f} "
+              f"{row['speedup']:>8.2f}x  {'identical' if row['identical'] else 'DIFFER'}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump({'iterations': args.iterations, 'cases': rows}, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0 if all(row['identical'] for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
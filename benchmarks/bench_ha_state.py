@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""Home Assistant state bus load test against the fake HA server.
+
+Starts tests/fake_ha_server.py with a large generated house and compares
+the two ways the mirror can follow it:
+
+  - polling: SmartHome and Phone each download and parse the full
+    /api/states snapshot on their own timers (2 and 5 minutes), as they
+    did before the shared store;
+  - stream: one HAStateStore takes a snapshot, then receives only
+    state_changed events over the WebSocket while the server changes
+    --rate entities per second.
+
+Reports bytes per hour for each, the cost of one snapshot parse, and
+the event-to-consumer latency measured by draining a subscription at
+the mirror's frame rate like a module's update() does.
+
+    python benchmarks/bench_ha_state.py
+    python benchmarks/bench_ha_state.py --entities 10000 --rate 50 --seconds 20
+
+Offline: no Home Assistant needed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import ha_state  # noqa: E402
+import http_client  # noqa: E402
+from api_tracker import APITracker  # noqa: E402
+from config import CONFIG  # noqa: E402
+from ha_state import HAStateStore  # noqa: E402
+from tests.fake_ha_server import FakeHAServer  # noqa: E402
+
+POLLS_PER_HOUR = 3600 / 120 + 3600 / 300   # smarthome 2 min + phone 5 min
+
+
+def measure_snapshot(url, token, repeats=5):
+    """Bytes and ms (download + JSON parse) for one /api/states call."""
+    headers = {"Authorization": f"Bearer {token}"}
+    times, size = [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        resp = requests.get(f"{url}/api/states", headers=headers, timeout=30)
+        resp.json()
+        times.append((time.perf_counter() - start) * 1000.0)
+        size = len(resp.content)
+    return size, sorted(times)[len(times) // 2]
+
+
+def run_stream(server, url, rate, seconds, frame_rate):
+    store = HAStateStore(url, server.token)
+    sub = store.subscribe()
+    end = time.monotonic() + 10
+    while store.mode != "websocket" and time.monotonic() < end:
+        time.sleep(0.01)
+    sub.take_changes()
+    ws_bytes_before = store.get_stats()["ws_bytes"]
+
+    latencies, take_ms = [], []
+    period = 1.0 / frame_rate
+    per_frame = rate / frame_rate
+    owed = 0.0
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        frame_start = time.perf_counter()
+        owed += per_frame
+        if owed >= 1:
+            server.mutate(int(owed))
+            owed -= int(owed)
+        t0 = time.perf_counter()
+        changes = sub.take_changes()
+        now = time.perf_counter()
+        take_ms.append((now - t0) * 1000.0)
+        for state in changes.values():
+            sent = server.sent_at.get((state or {}).get("context", {}).get("id"))
+            if sent is not None:
+                latencies.append((now - sent) * 1000.0)
+        time.sleep(max(0.0, period - (time.perf_counter() - frame_start)))
+
+    elapsed = time.monotonic() - start
+    stats = store.get_stats()
+    store.shutdown()
+    latencies.sort()
+    take_ms.sort()
+
+    def pct(values, p):
+        return round(values[min(len(values) - 1, int(len(values) * p))], 2) if values else 0.0
+
+    return {
+        "events": stats["events"],
+        "stream_bytes_per_hour": int((stats["ws_bytes"] - ws_bytes_before) / elapsed * 3600),
+        "latency_p50_ms": pct(latencies, 0.5),
+        "latency_p99_ms": pct(latencies, 0.99),
+        "take_p99_ms": pct(take_ms, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=5.0, help="state changes per second")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    # Keep the bench out of the real API budget and usage log
+    tracker = APITracker(state_file=None, usage_log=None)
+    tracker.set_limit("home-assistant", hourly=10 ** 6, daily=10 ** 6, daily_cost=0)
+    real_trackers = (ha_state.api_tracker, http_client.api_tracker)
+    ha_state.api_tracker = http_client.api_tracker = tracker
+    server = FakeHAServer(entities=args.entities)
+    url = server.start()
+    try:
+        size, parse_ms = measure_snapshot(url, server.token)
+        result = {"entities": args.entities, "rate": args.rate,
+                  "snapshot_bytes": size, "snapshot_ms": round(parse_ms, 1),
+                  "poll_bytes_per_hour": int(size * POLLS_PER_HOUR)}
+        result.update(run_stream(server, url, args.rate, args.seconds,
+                                 CONFIG.get("frame_rate", 30)))
+    finally:
+        server.stop()
+        ha_state.api_tracker, http_client.api_tracker = real_trackers
+
+    print(f"{args.entities} entities, snapshot {size / 1024:.0f} KB "
+          f"({result['snapshot_ms']} ms to fetch + parse)")
+    print(f"  polling (two modules): {result['poll_bytes_per_hour'] / 1e6:>8.1f} MB/h, "
+          f"{POLLS_PER_HOUR:.0f} full parses/h")
+    print(f"  stream at {args.rate:g} changes/s: {result['stream_bytes_per_hour'] / 1e6:>6.1f} MB/h, "
+          f"1 snapshot + {result['events']} events")
+    print(f"  event -> consumer latency p50 {result['latency_p50_ms']} ms, "
+          f"p99 {result['latency_p99_ms']} ms; take_changes() p99 {result['take_p99_ms']} ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
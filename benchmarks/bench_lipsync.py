@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""Avatar lip-sync analysis: per-window Python loop vs LipSyncAnalyzer.
+
+Feeds the same synthetic speech-like PCM (24 kHz, 16-bit mono: a
+voiced tone with syllable envelope plus noise bursts) through:
+
+  loop       the old AvatarModule.feed_audio: a Python loop over 25 ms
+             windows, numpy RMS and ZCR per window, partial windows lost
+  vector     LipSyncAnalyzer(bands=False): all windows at once
+  bands      LipSyncAnalyzer(bands=True): plus low/high band energies
+
+at several chunk sizes (25 ms is the playback engine's block, 100 ms a
+typical Realtime delta). Reports throughput in seconds of audio analysed
+per CPU second, and exits 1 if loop and vector disagree on RMS or ZCR.
+
+    python benchmarks/bench_lipsync.py
+    python benchmarks/bench_lipsync.py --seconds 120 --chunks 25,100,1000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from avatar_module import SAMPLE_RATE, WINDOW_SEC, LipSyncAnalyzer  # noqa: E402
+
+
+def feed_loop(pcm_bytes, sample_rate=SAMPLE_RATE):
+    """The pre-vectorised feed_audio, returning its envelope rows."""
+    rows = []
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
+    window = max(1, int(sample_rate * WINDOW_SEC))
+    for i in range(0, len(samples) - window + 1, window):
+        seg = samples[i:i + window]
+        rms = float(np.sqrt(np.mean(seg * seg)))
+        zcr = float(np.mean(np.abs(np.diff(np.sign(seg))) > 0))
+        rows.append((rms, zcr))
+    return rows
+
+
+def speech_like(seconds, seed=7):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    syllables = 0.5 + 0.5 * np.sin(2 * np.pi * 4.0 * t) ** 2
+    voiced = np.sin(2 * np.pi * 180 * t) + 0.4 * np.sin(2 * np.pi * 720 * t)
+    hiss = rng.standard_normal(len(t)) * (np.sin(2 * np.pi * 0.7 * t) > 0.8)
+    pcm = (syllables * voiced * 6000 + hiss * 2500).clip(-32768, 32767)
+    return pcm.astype(np.int16).tobytes()
+
+
+def throughput(fn, chunks, audio_s, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for chunk in chunks:
+            fn(chunk)
+        best = min(best, time.process_time() - start)
+    return audio_s / best if best > 0 else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio analysed per run")
+    parser.add_argument("--chunks", default="25,100,1000", help="chunk sizes in ms")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    pcm = speech_like(args.seconds)
+    window_bytes = int(SAMPLE_RATE * WINDOW_SEC) * 2
+    aligned = pcm[:len(pcm) // window_bytes * window_bytes]
+    reference = np.array(feed_loop(aligned))
+    vector = LipSyncAnalyzer(bands=False).analyse(aligned)
+    rms_err = float(np.max(np.abs(vector[:, 0] - reference[:, 0]) / np.maximum(reference[:, 0], 1.0)))
+    zcr_err = float(np.max(np.abs(vector[:, 1] - reference[:, 1])))
+    agree = rms_err < 1e-4 and zcr_err < 1e-9
+
+    result = {"audio_s": args.seconds, "rms_rel_err": rms_err, "zcr_err": zcr_err, "chunks": {}}
+    print(f"Lip-sync analysis, {args.seconds:.0f} s of 24 kHz speech-like audio "
+          f"(seconds of audio per CPU second, best of {args.repeat}):")
+    print(f"  {'chunk':>8} {'loop':>10} {'vector':>10} {'bands':>10} {'speedup':>8}")
+    for chunk_ms in (int(c) for c in args.chunks.split(",")):
+        size = int(SAMPLE_RATE * chunk_ms / 1000) * 2
+        chunks = [pcm[i:i + size] for i in range(0, len(pcm), size)]
+        plain, banded = LipSyncAnalyzer(bands=False), LipSyncAnalyzer(bands=True)
+        row = {
+            "loop": throughput(feed_loop, chunks, args.seconds, args.repeat),
+            "vector": throughput(plain.analyse, chunks, args.seconds, args.repeat),
+            "bands": throughput(banded.analyse, chunks, args.seconds, args.repeat),
+        }
+        row = {k: round(v, 0) for k, v in row.items()}
+        row["speedup"] = round(row["vector"] / row["loop"], 1)
+        result["chunks"][chunk_ms] = row
+        print(f"  {chunk_ms:>5} ms {row['loop']:>10.0f} {row['vector']:>10.0f} "
+              f"{row['bands']:>10.0f} {row['speedup']:>7.1f}x")
+    print(f"  loop vs vector: max RMS rel err {rms_err:.1e}, max ZCR err {zcr_err:.1e}"
+          f" -> {'OK' if agree else 'MISMATCH'}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0 if agree else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""Octopus ingest: API calls per month of refreshes, and the cost join.
+
+Part 1 replays a month of hourly consumption refreshes against an
+in-memory paginated Octopus API (half-hourly data landing as simulated
+time advances) and counts the requests each strategy makes:
+
+  today      the old module: one page_size=100 request for today only
+             (no history; cost estimated as kWh x current rate)
+  window     re-paging the full --days window every refresh at
+             page_size=100, following "next" links
+  ledger     OctopusEnergyModule._fetch_consumption with EnergyLedger:
+             the window once, then the new half-hours plus the
+             trailing 24 h refetch window
+
+Part 2 times EnergyLedger.cost() (numpy searchsorted join) against
+cost_loop() (bisect per interval) over a month of half-hourly
+consumption and Agile-style rates.
+
+    python benchmarks/bench_octopus.py
+    python benchmarks/bench_octopus.py --days 62 --repeat 500
+    python benchmarks/bench_octopus.py --out data/bench/octopus.json
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import logging  # noqa: E402
+import shutil  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from urllib.parse import parse_qs, urlencode, urlsplit  # noqa: E402
+
+import data_cache as data_cache_module  # noqa: E402
+import octopus_energy_module  # noqa: E402
+from api_tracker import APITracker  # noqa: E402
+from energy_ledger import HALF_HOUR, EnergyLedger, parse_time  # noqa: E402
+from octopus_energy_module import BASE_URL, OctopusEnergyModule  # noqa: E402
+
+CONSUMPTION = "/electricity-meter-points/1200000000001/meters/21L0000001/consumption/"
+
+
+def iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+class PagedAPI:
+    """Consumption endpoint over synthetic half-hours up to clock()."""
+
+    def __init__(self, first, clock):
+        self.first = first
+        self.clock = clock
+        self.requests = 0
+        self.results = 0
+
+    def get(self, path, auth=True):
+        self.requests += 1
+        parts = urlsplit(path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        start = max(self.first, parse_time(query['period_from']))
+        start = -(-start // HALF_HOUR) * HALF_HOUR
+        end = int(self.clock()) // HALF_HOUR * HALF_HOUR
+        size = int(query.get('page_size', 100))
+        page = int(query.get('page', 1))
+        lo = start + (page - 1) * size * HALF_HOUR
+        hi = min(end, lo + size * HALF_HOUR)
+        rows = [{'interval_start': iso(s), 'consumption': 0.2 + (s // HALF_HOUR % 5) * 0.1}
+                for s in range(lo, hi, HALF_HOUR)]
+        self.results += len(rows)
+        nxt = None
+        if hi < end:
+            nxt = f"{BASE_URL}{parts.path}?" + urlencode({**query, 'page': page + 1})
+        return {'next': nxt, 'results': rows}
+
+
+def paged(api, path):
+    """Follow "next" links as a client re-reading the whole window would."""
+    while path:
+        path = api.get(path).get('next')
+
+
+def count_requests(days, refreshes, page_size):
+    start = 1_750_000_000 // 86400 * 86400
+    clock = [float(start)]
+    results = {}
+
+    api = PagedAPI(start - days * 86400, lambda: clock[0])
+    for _ in range(refreshes):
+        clock[0] += 3600
+        today = int(clock[0]) // 86400 * 86400
+        api.get(f"{CONSUMPTION}?period_from={iso(today)}&page_size=100")
+    results['today'] = (api.requests, api.results)
+
+    clock[0] = float(start)
+    api = PagedAPI(start - days * 86400, lambda: clock[0])
+    for _ in range(refreshes):
+        clock[0] += 3600
+        paged(api, f"{CONSUMPTION}?period_from={iso(clock[0] - days * 86400)}"
+                   f"&order_by=period&page_size=100")
+    results['window'] = (api.requests, api.results)
+
+    clock[0] = float(start)
+    api = PagedAPI(start - days * 86400, lambda: clock[0])
+    octo = OctopusEnergyModule(api_key='bench', page_size=page_size)
+    octo._ledger = EnergyLedger(window_days=days, clock=lambda: clock[0])
+    octo._ledger.load(("1200000000001", "21L0000001"), None)
+    octo._mpan, octo._serial = "1200000000001", "21L0000001"
+    octo._get = api.get
+    for _ in range(refreshes):
+        clock[0] += 3600
+        octo._fetch_consumption()
+    results['ledger'] = (api.requests, api.results)
+    return results
+
+
+def time_join(days, repeat):
+    end = 1_750_000_000 // 86400 * 86400
+    start = end - days * 86400
+    ledger = EnergyLedger(window_days=days + 1, clock=lambda: end)
+    ledger.add_consumption([{'interval_start': iso(s), 'consumption': 0.3}
+                            for s in range(start, end, HALF_HOUR)])
+    ledger.add_rates([{'valid_from': iso(s), 'valid_to': iso(s + HALF_HOUR),
+                       'value_inc_vat': 5.0 + (s // HALF_HOUR % 48)}
+                      for s in range(start, end, HALF_HOUR)], end)
+    timings = {}
+    for name, fn in (('vectorised', ledger.cost), ('loop', ledger.cost_loop)):
+        fn(start, end)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            result = fn(start, end)
+        timings[name] = ((time.perf_counter() - t0) / repeat * 1e6, result)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        ledger._arrays = None      # as after each ingest
+        ledger.cost(start, end)
+    timings['vectorised_rebuild'] = ((time.perf_counter() - t0) / repeat * 1e6, None)
+    return ledger.counts()['consumption'], timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=31, help='history window')
+    parser.add_argument('--refreshes', type=int, default=720, help='hourly refreshes (720 = 30 days)')
+    parser.add_argument('--page-size', type=int, default=octopus_energy_module.PAGE_SIZE)
+    parser.add_argument('--repeat', type=int, default=200, help='cost() calls per timing')
+    parser.add_argument('--out', help='write results as JSON')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    work = tempfile.mkdtemp(prefix="bench-octopus-")
+    data_cache_module._CACHE_DIR = work
+    tracker = APITracker(state_file=None, usage_log=None)
+    tracker.set_limit("octopus-energy", hourly=10 ** 6, daily=10 ** 6)
+    octopus_energy_module.api_tracker = tracker
+    try:
+        calls = count_requests(args.days, args.refreshes, args.page_size)
+        intervals, timings = time_join(args.days, args.repeat)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    result = {'days': args.days, 'refreshes': args.refreshes, 'calls': {}, 'join_us': {}}
+    print(f"Consumption requests over {args.refreshes} hourly refreshes, {args.days}-day window:")
+    for name, label in (('today', 'today only (old)'), ('window', 'full window, 100/page'),
+                        ('ledger', f'ledger, {args.page_size}/page')):
+        requests, rows = calls[name]
+        result['calls'][name] = {'requests': requests, 'results': rows}
+        print(f"  {label:>22}: {requests:6d} requests, {rows:8d} intervals transferred")
+
+    loop_us = timings['loop'][0]
+    print(f"Cost join over {intervals} half-hours (mean of {args.repeat}):")
+    for name in ('vectorised', 'vectorised_rebuild', 'loop'):
+        us = timings[name][0]
+        result['join_us'][name] = round(us, 1)
+        print(f"  {name:>22}: {us:9.1f} us  ({loop_us / us:5.1f}x vs loop)")
+    fast, slow = timings['vectorised'][1], timings['loop'][1]
+    if abs(fast['pence'] - slow['pence']) > 1e-6 or fast['unpriced'] != slow['unpriced']:
+        print(f"MISMATCH: {fast} vs {slow}")
+        return 1
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
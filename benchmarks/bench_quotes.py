@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Full-watchlist stock refresh: wall time and main-loop impact.
+
+Runs one fetch round of StocksModule's background quote engine against
+the real providers (yfinance, plus Alpha Vantage if a key is given),
+calling update() at the mirror's frame rate exactly as the main loop
+does. Reports how long the round took and the worst update() time,
+which should stay well under a frame since no network I/O happens on
+the calling thread.
+
+    python benchmarks/bench_quotes.py                  # watchlist CSV / override
+    python benchmarks/bench_quotes.py -t AAPL MSFT RR.L --batch-size 10
+    python benchmarks/bench_quotes.py --no-pacing       # ignore per-batch intervals
+
+Needs network access. Uses (and counts against) the real API budgets.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame  # noqa: E402
+
+pygame.init()
+
+import stocks_module  # noqa: E402
+from config import CONFIG  # noqa: E402
+
+
+def run_round(module, frame_rate, timeout):
+    period = 1.0 / frame_rate
+    update_ms = []
+    module._is_fetch_window = lambda: None  # one round only
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        t0 = time.perf_counter()
+        module.update()
+        update_ms.append((time.perf_counter() - t0) * 1000.0)
+        stats = module.get_quote_stats()
+        if stats['last_round_s'] is not None:
+            break
+        time.sleep(max(0.0, period - (time.perf_counter() - t0)))
+    wall = time.perf_counter() - start
+    update_ms.sort()
+    return {
+        'symbols': len(module.tickers),
+        'quotes': sum(1 for d in module.stock_data.values()
+                      if isinstance(d.get('price'), (int, float))),
+        'round_s': round(wall, 2),
+        'completed': module.get_quote_stats()['last_round_s'] is not None,
+        'batches': module.get_quote_stats()['batches'],
+        'updates': len(update_ms),
+        'update_p99_ms': round(update_ms[int(len(update_ms) * 0.99) - 1], 3) if update_ms else 0.0,
+        'update_max_ms': round(update_ms[-1], 3) if update_ms else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-t', '--tickers', nargs='+', help='symbols (default: watchlist)')
+    parser.add_argument('--batch-size', type=int, default=stocks_module.YF_BATCH_SIZE)
+    parser.add_argument('--av-key', default='', help='Alpha Vantage key (default: none)')
+    parser.add_argument('--no-pacing', action='store_true',
+                        help='submit batches back to back (no AV/yfinance intervals)')
+    parser.add_argument('--timeout', type=float, default=900.0)
+    parser.add_argument('--out', help='write results as JSON')
+    args = parser.parse_args()
+
+    stocks_module.YF_BATCH_SIZE = args.batch_size
+    if args.no_pacing:
+        stocks_module.AV_CALL_INTERVAL = 0
+        stocks_module.YF_CALL_INTERVAL = 0
+
+    module = stocks_module.StocksModule(
+        tickers=args.tickers or CONFIG.get('stocks', {}).get('params', {}).get('tickers', []),
+        alpha_vantage_key=args.av_key,
+    )
+    if args.tickers:
+        module._save_ticker_override = lambda tickers: None
+        module.set_tickers(args.tickers)
+
+    result = run_round(module, CONFIG.get('frame_rate', 30), args.timeout)
+    result['batch_size'] = args.batch_size
+    print(f"{result['quotes']}/{result['symbols']} quotes in {result['round_s']}s "
+          f"({result['batches']} batches); update() p99 {result['update_p99_ms']} ms, "
+          f"max {result['update_max_ms']} ms over {result['updates']} frames")
+    if not result['completed']:
+        print("Round did not finish before --timeout")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0 if result['completed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""Fallback assistant speech: whole-reply and serial TTS vs the speech pipeline.
+
+Speaks the same streamed chat replies three ways through the fake TTS
+backend and speaker in tests/fake_tts.py (synthesis costs --latency-ms
+plus --synth-ms-per-char, speech lasts --speech-ms-per-char):
+
+  whole      the old process_with_ai: wait for the whole reply, one TTS
+             call for all of it, then play it
+  serial     the old speak_chunk per sentence: synthesise a sentence,
+             play it to the end, then send the next one
+  pipeline   speech_pipeline.SpeechPipeline: sentences synthesised as
+             the reply streams in, N+1 while N plays
+
+The reply streams at --chars-per-s, like a chat completion. Reports time
+to first word (request -> first sound), silence between sentences, and
+total time until the reply has been spoken. --speed divides every delay
+so a run takes seconds, not minutes; results are printed at full scale.
+
+    python benchmarks/bench_speech_pipeline.py
+    python benchmarks/bench_speech_pipeline.py --latency-ms 600 --speed 1
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from speech_pipeline import SentenceSplitter, SpeechPipeline  # noqa: E402
+from tests.fake_tts import FakeSpeechPlayer, FakeTTS  # noqa: E402
+
+REPLIES = [
+    "Good morning! It's seven degrees and cloudy outside. Rain is expected after lunch, "
+    "so take a coat. Your first meeting is at half past nine.",
+    "The Octopus agile price is low until six this evening. That would be a good time to run "
+    "the dishwasher. Prices rise again after eight.",
+    "Apple is up two percent today. Microsoft is flat. The FTSE 100 closed slightly lower, "
+    "mostly on energy stocks.",
+    "Sure. I've turned the living room lights off. The hallway light is still on. "
+    "Would you like me to turn that off as well?",
+]
+
+
+def stream(text, chars_per_s, scale):
+    """Yield the reply in small deltas at chars_per_s."""
+    step = 8
+    delay = step / chars_per_s / scale
+    for i in range(0, len(text), step):
+        time.sleep(delay)
+        yield text[i:i + step]
+
+
+def play_blocking(player, path):
+    length = player.play(path)
+    time.sleep(length)
+
+
+def run_whole(text, tts, player, args, scale):
+    reply = "".join(stream(text, args.chars_per_s, scale))
+    play_blocking(player, tts(reply))
+
+
+def run_serial(text, tts, player, args, scale):
+    splitter = SentenceSplitter()
+    for delta in stream(text, args.chars_per_s, scale):
+        for sentence in splitter.feed(delta):
+            play_blocking(player, tts(sentence))
+    for sentence in splitter.flush():
+        play_blocking(player, tts(sentence))
+
+
+def run_pipeline(speech):
+    def run(text, tts, player, args, scale):
+        speech.begin()
+        for delta in stream(text, args.chars_per_s, scale):
+            speech.feed(delta)
+        speech.end()
+        speech.wait()
+    return run
+
+
+def measure(run, tts, player, args, scale):
+    ttfw, gaps, totals = [], [], []
+    for text in REPLIES * args.rounds:
+        start = time.monotonic()
+        run(text, tts, player, args, scale)
+        totals.append((player.last_end(start) - start) * scale)
+        ttfw.append((player.first_start(start) - start) * scale)
+        gaps.extend(g * scale for g in player.gaps_ms(start))
+        time.sleep(0.02)
+    return {
+        "ttfw_p50_ms": round(statistics.median(ttfw) * 1000.0, 0),
+        "ttfw_max_ms": round(max(ttfw) * 1000.0, 0),
+        "gap_p50_ms": round(statistics.median(gaps), 0) if gaps else 0.0,
+        "gap_max_ms": round(max(gaps), 0) if gaps else 0.0,
+        "total_p50_s": round(statistics.median(totals), 2),
+        "synth_calls": len(tts.calls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="TTS round-trip")
+    parser.add_argument("--synth-ms-per-char", type=float, default=3.0)
+    parser.add_argument("--speech-ms-per-char", type=float, default=65.0, help="~15 chars/s spoken")
+    parser.add_argument("--chars-per-s", type=float, default=300.0, help="chat stream rate")
+    parser.add_argument("--depth", type=int, default=2, help="pipeline queue depth")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--speed", type=float, default=10.0, help="divide every delay by this")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    scale = args.speed
+    result = {"latency_ms": args.latency_ms, "speech_ms_per_char": args.speech_ms_per_char,
+              "chars_per_s": args.chars_per_s, "replies": len(REPLIES) * args.rounds}
+    root = tempfile.mkdtemp()
+    try:
+        def backend():
+            return FakeTTS(root, latency_ms=args.latency_ms / scale,
+                           synth_ms_per_char=args.synth_ms_per_char / scale,
+                           speech_ms_per_char=args.speech_ms_per_char / scale)
+
+        for name in ("whole", "serial", "pipeline"):
+            tts, player = backend(), FakeSpeechPlayer()
+            speech = None
+            if name == "pipeline":
+                speech = SpeechPipeline(tts, player, depth=args.depth)
+                run = run_pipeline(speech)
+            else:
+                run = run_whole if name == "whole" else run_serial
+            result[name] = measure(run, tts, player, args, scale)
+            if speech is not None:
+                stats = speech.stats()
+                result[name]["ttfw_reported_ms"] = round(stats["ttfw_ms_p50"] * scale, 0)
+                result[name]["gap_reported_max_ms"] = round(stats["gap_ms_max"] * scale, 0)
+                speech.stop()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"Speaking {result['replies']} streamed replies ({args.latency_ms:.0f} ms + "
+          f"{args.synth_ms_per_char:g} ms/char TTS, {args.speech_ms_per_char:g} ms/char speech):")
+    print(f"  {'':>9} {'first word p50':>15} {'max':>8} {'gap p50':>9} {'gap max':>9} {'reply p50':>10}")
+    for name in ("whole", "serial", "pipeline"):
+        row = result[name]
+        print(f"  {name:>9} {row['ttfw_p50_ms']:12.0f} ms {row['ttfw_max_ms']:5.0f} ms "
+              f"{row['gap_p50_ms']:6.0f} ms {row['gap_max_ms']:6.0f} ms {row['total_p50_s']:8.2f} s")
+    row = result["pipeline"]
+    print(f"  pipeline counters: first word {row['ttfw_reported_ms']:.0f} ms, "
+          f"worst gap {row['gap_reported_max_ms']:.0f} ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Fallback assistant speech: synthesis per sentence vs the TTS cache.
+
+Speaks a stream of sentences where a few recur (greetings, offline
+replies, the listed prewarm phrases) and the rest are one-offs, the way
+the fallback assistant's replies look over a day. Synthesis is a fake
+engine that waits --latency-ms (a TTS round-trip) and writes --kb of
+audio. Three runs over the same stream:
+
+  uncached   the old path: every sentence synthesised
+  cold       tts_cache.TTSCache starting empty
+  prewarmed  the same cache after prewarm() of the recurring phrases
+
+Reports synthesis calls, hit rate, and the time from "speak this" to
+having a file to play (p50 over all sentences and over the recurring
+ones), plus the latency_saved_ms the cache itself counted.
+
+    python benchmarks/bench_tts_cache.py
+    python benchmarks/bench_tts_cache.py --sentences 300 --recurring 0.5 --latency-ms 400
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tts_cache import TTSCache  # noqa: E402
+
+PHRASES = [
+    "Hello! How can I help you today?",
+    "I can show you the time on the clock module.",
+    "You can check the weather module for current conditions.",
+    "I can help you with basic mirror functions and information.",
+    "I'm sorry, I can only help with basic functions at the moment.",
+    "I'm sorry, I didn't catch that.",
+]
+
+
+def stream(args, rng):
+    """Sentences to speak: recurring phrases (Zipf-ish) mixed with one-offs."""
+    weights = [1.0 / (i + 1) for i in range(len(PHRASES))]
+    out = []
+    for i in range(args.sentences):
+        if rng.random() < args.recurring:
+            out.append(rng.choices(PHRASES, weights)[0])
+        else:
+            out.append(f"Here is one-off sentence number {i} about something else.")
+    return out
+
+
+class Synth:
+    def __init__(self, latency_s, size):
+        self.latency_s = latency_s
+        self.size = size
+        self.calls = 0
+
+    def __call__(self, text, path):
+        self.calls += 1
+        time.sleep(self.latency_s)
+        with open(path, "wb") as f:
+            f.write(b"\xff\xf3" * (self.size // 2))
+
+
+def run(sentences, synth, cache=None):
+    """ms from request to playable file, per sentence."""
+    waits = []
+    for text in sentences:
+        start = time.perf_counter()
+        if cache is None:
+            path = os.path.join(tempfile.gettempdir(), "bench_tts_uncached.mp3")
+            synth(text, path)
+            os.remove(path)
+        else:
+            path, _ = cache.fetch("fake", "voice", text, lambda p, t=text: synth(t, p))
+            cache.discard(path)
+        waits.append((time.perf_counter() - start) * 1000.0)
+    return waits
+
+
+def summary(waits, sentences, synth, cache=None):
+    recurring = [w for w, text in zip(waits, sentences) if text in PHRASES]
+    row = {
+        "synth_calls": synth.calls,
+        "wait_p50_ms": round(statistics.median(waits), 2),
+        "recurring_p50_ms": round(statistics.median(recurring), 2),
+        "total_s": round(sum(waits) / 1000.0, 2),
+    }
+    if cache is not None:
+        stats = cache.get_stats()
+        row.update(hit_rate=stats["hit_rate"], latency_saved_ms=stats["latency_saved_ms"],
+                   cache_kb=round(stats["bytes"] / 1024, 1))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=120)
+    parser.add_argument("--recurring", type=float, default=0.4, help="share of sentences that recur")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="fake TTS round-trip")
+    parser.add_argument("--kb", type=int, default=24, help="audio per sentence")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    sentences = stream(args, random.Random(args.seed))
+    result = {"sentences": args.sentences, "recurring": args.recurring, "latency_ms": args.latency_ms}
+    size = args.kb * 1024
+    latency_s = args.latency_ms / 1000.0
+
+    synth = Synth(latency_s, size)
+    result["uncached"] = summary(run(sentences, synth), sentences, synth)
+
+    for name, warm in (("cold", False), ("prewarmed", True)):
+        root = tempfile.mkdtemp()
+        try:
+            cache = TTSCache(root=root)
+            if warm:
+                cache.prewarm("fake", "voice", PHRASES, Synth(latency_s, size))
+            synth = Synth(latency_s, size)
+            result[name] = summary(run(sentences, synth, cache), sentences, synth, cache)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"Speaking {args.sentences} sentences ({args.recurring:.0%} recurring), "
+          f"{args.latency_ms:.0f} ms per synthesis:")
+    print(f"  {'':>10} {'synth calls':>12} {'hit rate':>9} {'wait p50':>10} {'recurring':>10} {'total':>8}")
+    for name in ("uncached", "cold", "prewarmed"):
+        row = result[name]
+        hit_rate = f"{row['hit_rate']:.0%}" if "hit_rate" in row else "-"
+        print(f"  {name:>10} {row['synth_calls']:12d} {hit_rate:>9} {row['wait_p50_ms']:7.1f} ms "
+              f"{row['recurring_p50_ms']:7.2f} ms {row['total_s']:6.1f} s")
+    for name in ("cold", "prewarmed"):
+        row = result[name]
+        print(f"  {name}: cache counted {row['latency_saved_ms'] / 1000.0:.1f} s saved, "
+              f"{row['cache_kb']:.0f} KB on disk")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+"""Fetch throughput and main-loop jank under slow or failing upstreams.
+
+Serves upstream fixtures from upstream_replay.ReplayServer and points
+the shared http_client at it, then runs the real Weather, News and
+Quote modules plus a Home Assistant state store (polling, as the replay
+server has no WebSocket) for --seconds per scenario. Every module is
+made to refetch as soon as its previous fetch lands, so the fetch path
+is saturated, while the main loop calls update() at the mirror's frame
+rate and drains the HA subscription like SmartHome does.
+
+    python benchmarks/bench_upstream.py
+    python benchmarks/bench_upstream.py -s flaky --seconds 20
+    python benchmarks/bench_upstream.py --fixtures data/fixtures   # recorded upstreams
+    python benchmarks/bench_upstream.py --out data/bench/upstream.json
+
+Without --fixtures a small synthetic set is generated (Open-Meteo,
+three RSS feeds, zenquotes, /api/states). Reports fetches completed
+per second and failures per module, plus update() p50/p99/max and the
+number of frames over budget. The scenarios are seeded, so two runs on
+the same machine replay identical latency and error sequences.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import logging  # noqa: E402
+import shutil  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+import http_client as http_client_module  # noqa: E402
+from api_tracker import APITracker  # noqa: E402
+from background_fetcher import BackgroundFetcher, FetchScheduler  # noqa: E402
+from config import CONFIG  # noqa: E402
+from data_cache import data_cache  # noqa: E402
+from ha_state import HAStateStore  # noqa: E402
+from upstream_replay import ReplayServer, save_fixture  # noqa: E402
+
+HA_URL = "http://homeassistant.local:8123"
+FEEDS = [{"name": name, "url": f"https://{host}/rss.xml"}
+         for name, host in (("BBC", "feeds.bbc.test"), ("Guardian", "guardian.test"),
+                            ("Sky", "sky.test"))]
+
+# name: ReplayServer settings
+SCENARIOS = {
+    'fast': {},
+    'slow': {'latency_ms': 800, 'jitter_ms': 300},
+    'flaky': {'latency_ms': 2000, 'jitter_ms': 500, 'error_rate': 0.2},
+    'heavy': {'latency_ms': 300, 'jitter_ms': 100, 'json_scale': 10, 'rss_items': 500},
+}
+
+
+class _Recorded:
+    """Just enough of a requests.Response for save_fixture()."""
+
+    def __init__(self, body, content_type):
+        self.status_code = 200
+        self.headers = {'Content-Type': content_type}
+        self.content = body.encode('utf-8')
+
+
+def synthetic_fixtures(root, entities=300, items=20):
+    save_fixture(root, 'GET', "https://geocoding-api.open-meteo.com/v1/search?name=Leeds",
+                 _Recorded(json.dumps({"results": [{"name": "Leeds", "latitude": 53.8,
+                                                    "longitude": -1.55, "country_code": "GB"}]}),
+                           "application/json"))
+    save_fixture(root, 'GET', "https://api.open-meteo.com/v1/forecast",
+                 _Recorded(json.dumps({"current": {
+                     "temperature_2m": 11.2, "relative_humidity_2m": 81,
+                     "apparent_temperature": 9.6, "weather_code": 61, "wind_speed_10m": 4.1,
+                     "pressure_msl": 1008, "cloud_cover": 90}}), "application/json"))
+    for feed in FEEDS:
+        body = ("<?xml version='1.0'?><rss><channel><title>" + feed["name"] + "</title>"
+                + "".join(f"<item><title>{feed['name']} story {i}</title>"
+                          f"<link>{feed['url']}/{i}</link><guid>{i}</guid>"
+                          f"<description>{'Lorem ipsum dolor sit amet. ' * 8}</description>"
+                          f"</item>" for i in range(items))
+                + "</channel></rss>")
+        save_fixture(root, 'GET', feed["url"], _Recorded(body, "application/rss+xml"))
+    save_fixture(root, 'GET', "https://zenquotes.io/api/today",
+                 _Recorded(json.dumps([{"q": "Simplicity is prerequisite for reliability.",
+                                        "a": "Edsger Dijkstra"}]), "application/json"))
+    states = [{"entity_id": f"{domain}.device_{i}", "state": "on",
+               "attributes": {"friendly_name": f"Device {i}", "icon": "mdi:lightbulb"},
+               "last_changed": "2026-01-01T00:00:00+00:00",
+               "last_updated": "2026-01-01T00:00:00+00:00", "context": {"id": f"c{i}"}}
+              for i, domain in zip(range(entities), ("light", "switch", "sensor") * entities)]
+    save_fixture(root, 'GET', f"{HA_URL}/api/states",
+                 _Recorded(json.dumps(states), "application/json"))
+
+
+def build_modules(scheduler):
+    from news_module import NewsModule
+    from quote_module import QuoteModule
+    from weather_module import WeatherModule
+
+    weather = WeatherModule(api_key=None, city="Leeds,GB")
+    news = NewsModule(feeds=FEEDS)
+    quote = QuoteModule()
+    for module, name in ((weather, "weather"), (quote, "quote")):
+        module._fetcher = BackgroundFetcher(name, scheduler=scheduler)
+    for feed in news._feeds:
+        feed.fetcher = BackgroundFetcher("news", scheduler=scheduler)
+    return weather, news, quote
+
+
+def run_scenario(fixtures, settings, seconds, frame_rate, seed):
+    server = ReplayServer(fixtures, seed=seed, **settings)
+    client = http_client_module.http_client
+    client.replay_url = server.start()
+    scheduler = FetchScheduler(workers=3, limits=CONFIG['fetch_scheduler'].get('limits'))
+    weather, news, quote = build_modules(scheduler)
+    store = HAStateStore(HA_URL, "bench-token", poll_interval_s=1.0)
+    sub = store.subscribe(poll_interval_s=1.0)
+
+    frame_ms, over = [], 0
+    budget = 1000.0 / frame_rate
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        frame_start = time.perf_counter()
+        for module in (weather, news, quote):
+            module.update()
+        sub.take_changes()
+        # Refetch as soon as each fetch lands: saturate the fetch path
+        weather.last_update = weather._retry_after = datetime.min
+        news.last_fetch = datetime.min
+        quote.last_fetch_date = None
+        elapsed = (time.perf_counter() - frame_start) * 1000.0
+        frame_ms.append(elapsed)
+        over += elapsed > budget
+        time.sleep(max(0.0, budget / 1000.0 - (time.perf_counter() - frame_start)))
+    wall = time.monotonic() - start
+
+    store.shutdown()
+    scheduler.shutdown(timeout=3.0)
+    jobs = scheduler.get_stats()['jobs']
+    replay = server.get_stats()
+    server.stop()
+    client.replay_url = None
+
+    frame_ms.sort()
+    result = {
+        'frames': len(frame_ms),
+        'update_ms_p50': round(frame_ms[len(frame_ms) // 2], 2),
+        'update_ms_p99': round(frame_ms[min(len(frame_ms) - 1, int(len(frame_ms) * 0.99))], 2),
+        'update_ms_max': round(frame_ms[-1], 2),
+        'frames_over_budget': over,
+        'upstream_requests': replay['requests'],
+        'upstream_errors': replay['errors'],
+        'ha_snapshots': store.get_stats()['snapshots'],
+        'fetches': {},
+    }
+    for name in ('weather', 'news', 'quote'):
+        s = jobs.get(name, {})
+        result['fetches'][name] = {
+            'per_s': round(s.get('completed', 0) / wall, 2),
+            'failed': s.get('failed', 0),
+            'run_ms_mean': s.get('run_ms_mean', 0.0),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-s', '--scenario', choices=sorted(SCENARIOS), action='append',
+                        help='scenario to run (repeatable, default all)')
+    parser.add_argument('--seconds', type=float, default=8.0, help='per scenario')
+    parser.add_argument('--fixtures', help='recorded fixture directory (default: synthetic)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='write results as JSON')
+    args = parser.parse_args()
+
+    import pygame
+    pygame.init()
+    logging.disable(logging.WARNING)   # injected 503s and the missing WebSocket are expected
+    # Keep the bench out of the real API budget and last-good cache
+    tracker = APITracker(state_file=None, usage_log=None)
+    for service in ("open-meteo", "zenquotes", "home-assistant"):
+        tracker.set_limit(service, hourly=10 ** 6, daily=10 ** 6, daily_cost=0)
+    http_client_module.api_tracker = tracker
+    data_cache.save = lambda name, payload: None
+    http_client_module.http_client.revalidate = False   # every fetch pays full latency
+
+    fixtures = args.fixtures
+    if fixtures is None:
+        fixtures = tempfile.mkdtemp(prefix="bench-upstream-")
+        synthetic_fixtures(fixtures)
+
+    results = {}
+    frame_rate = CONFIG.get("frame_rate", 30)
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            r = results[name] = run_scenario(fixtures, SCENARIOS[name], args.seconds,
+                                             frame_rate, args.seed)
+            fetches = "  ".join(f"{m} {f['per_s']:.2f}/s ({f['failed']} failed)"
+                                for m, f in r['fetches'].items())
+            print(f"{name:>6}: update() p50 {r['update_ms_p50']:.2f} ms, "
+                  f"p99 {r['update_ms_p99']:.2f} ms, max {r['update_ms_max']:.1f} ms, "
+                  f"{r['frames_over_budget']}/{r['frames']} frames over budget")
+            print(f"        {fetches}  HA snapshots {r['ha_snapshots']}, "
+                  f"{r['upstream_requests']} upstream requests ({r['upstream_errors']} errors)")
+    finally:
+        if args.fixtures is None:
+            shutil.rmtree(fixtures, ignore_errors=True)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump({'seconds': args.seconds, 'seed': args.seed, 'scenarios': results},
+                      f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
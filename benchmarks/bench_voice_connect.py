@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""Realtime voice connection: boot time and frame latency in a reconnect storm.
+
+Runs AIVoiceModule against tests/fake_realtime_server.py (no OpenAI key
+or network needed) and measures what the main loop sees:
+
+  boot     constructor time and time until the session is ready, with
+           the server waiting --latency-ms before session.created; and
+           the constructor against a server that never finishes the
+           handshake (the old module waited up to 10 s here)
+  storm    a simulated --fps main loop calling update(), draw() and
+           send_ws_message() (as the mic loop does) while the server
+           drops every session --drop-s after it is ready, for
+           --storm-s seconds
+
+Reports frame time p50/p99/max, connects, sessions, failures and the
+events buffered, flushed and dropped across the reconnects.
+
+    python benchmarks/bench_voice_connect.py
+    python benchmarks/bench_voice_connect.py --latency-ms 800 --storm-s 10
+    python benchmarks/bench_voice_connect.py --out data/bench/voice_connect.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame  # noqa: E402
+
+import ai_voice_module  # noqa: E402
+from ai_voice_module import AIVoiceModule  # noqa: E402
+from api_tracker import APITracker  # noqa: E402
+from http_client import http_client  # noqa: E402
+from tests.fake_realtime_server import FakeRealtimeServer  # noqa: E402
+
+OPENAI = "wss://api.openai.com"
+
+
+def voice_config(connect_timeout_s=10):
+    return {"class": "AIVoiceModule", "params": {
+        "openai": {"api_key": "sk-bench", "model": "gpt-realtime-mini"},
+        "audio": {},
+        "connection": {"connect_timeout_s": connect_timeout_s,
+                       "backoff_base_s": 0.25, "backoff_max_s": 2.0},
+    }}
+
+
+def wait_until(predicate, timeout):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.002)
+    return False
+
+
+def ms(seconds):
+    return round(seconds * 1000.0, 1)
+
+
+def boot(server, latency_ms):
+    server.mode = "ok"
+    server.handshake_delay_s = latency_ms / 1000.0
+    start = time.perf_counter()
+    voice = AIVoiceModule(voice_config())
+    constructed = time.perf_counter() - start
+    ready = wait_until(lambda: voice.connection_state == "ready", 10 + latency_ms / 1000.0)
+    to_ready = time.perf_counter() - start
+    voice.cleanup()
+
+    server.mode = "stall"
+    start = time.perf_counter()
+    stalled = AIVoiceModule(voice_config())
+    stalled_constructed = time.perf_counter() - start
+    stalled.cleanup()
+    server.mode = "ok"
+    return {
+        "constructor_ms": ms(constructed),
+        "ready_ms": ms(to_ready) if ready else None,
+        "stalled_constructor_ms": ms(stalled_constructed),
+    }
+
+
+def storm(server, seconds, drop_s, fps):
+    server.handshake_delay_s = 0.05
+    server.drop_after_s = drop_s
+    screen = pygame.display.set_mode((1080, 1920))
+    voice = AIVoiceModule(voice_config(connect_timeout_s=2))
+    frame_s = 1.0 / fps
+    frames = []
+    states = set()
+    chunk = {"type": "input_audio_buffer.append", "audio": "AAAA" * 256}
+    end = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            voice.update()
+            voice.draw(screen, {"x": 0, "y": 1500, "width": 1080})
+            for _ in range(3):          # ~100 ms of mic audio per frame at 24 kHz
+                voice.send_ws_message(chunk)
+            states.add(voice.connection_state)
+            took = time.perf_counter() - start
+            frames.append(took)
+            time.sleep(max(0.0, frame_s - took))
+        stats = voice.get_connection_stats()
+    finally:
+        voice.cleanup()
+        server.drop_after_s = None
+    frames.sort()
+    return {
+        "frames": len(frames),
+        "frame_p50_ms": ms(statistics.median(frames)),
+        "frame_p99_ms": ms(frames[int(len(frames) * 0.99) - 1]),
+        "frame_max_ms": ms(frames[-1]),
+        "states_seen": sorted(states),
+        "connects": stats["connects"],
+        "sessions": stats["sessions"],
+        "failures": stats["failures"],
+        "buffered": stats["buffered"],
+        "flushed": stats["flushed"],
+        "dropped": stats["dropped"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="server delay before session.created")
+    parser.add_argument("--storm-s", type=float, default=6.0, help="length of the reconnect storm")
+    parser.add_argument("--drop-s", type=float, default=0.2, help="server drops each session after this long")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    pygame.init()
+    tracker = APITracker(state_file=None, usage_log=None)
+    tracker.set_limit("openai-realtime", hourly=10 ** 6, daily=10 ** 6, daily_cost=0)
+    tracker.BREAKER_THRESHOLD = 10 ** 6
+    real_tracker, ai_voice_module.api_tracker = ai_voice_module.api_tracker, tracker
+    # AIVoiceModule only adds its voice_history.log handler to a bare logger
+    logging.getLogger("VoiceHistory").addHandler(logging.NullHandler())
+    real_overrides = http_client.base_url_overrides
+    server = FakeRealtimeServer()
+    try:
+        http_client.base_url_overrides = [(OPENAI, server.start())]
+        result = {"boot": boot(server, args.latency_ms),
+                  "storm": storm(server, args.storm_s, args.drop_s, args.fps)}
+    finally:
+        server.stop()
+        http_client.base_url_overrides = real_overrides
+        ai_voice_module.api_tracker = real_tracker
+
+    b, s = result["boot"], result["storm"]
+    print(f"Boot (server latency {args.latency_ms:.0f} ms):")
+    print(f"  constructor {b['constructor_ms']} ms, session ready after {b['ready_ms']} ms")
+    print(f"  constructor against a stalled handshake: {b['stalled_constructor_ms']} ms")
+    print(f"Reconnect storm ({args.storm_s:.0f} s, sessions dropped after {args.drop_s} s, {args.fps} fps):")
+    print(f"  {s['frames']} frames: p50 {s['frame_p50_ms']} ms, p99 {s['frame_p99_ms']} ms, "
+          f"max {s['frame_max_ms']} ms")
+    print(f"  {s['connects']} connects, {s['sessions']} sessions, {s['failures']} failures; "
+          f"events buffered {s['buffered']}, flushed {s['flushed']}, dropped {s['dropped']}")
+    print(f"  states seen: {', '.join(s['states_seen'])}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
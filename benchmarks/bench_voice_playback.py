@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""Voice reply playback: time to first audio and gaps, per-reply player vs engine.
+
+Plays the same stream of reply audio deltas through two playback paths
+into tests/fake_audio_sink.py, a wall-clock model of a sound card, and
+measures what a listener would hear:
+
+  per-reply   the old path: a player process opened for every reply
+              (--open-ms for the spawn and ALSA open), deltas written
+              as they arrive, closed when the reply ends. Like aplay
+              with its defaults, the device starts once its 500 ms
+              buffer is full or the reply has ended.
+  engine      voice_playback.PlaybackEngine: one stream opened once
+              (100 ms device buffer, as AplaySink asks for), fed from the
+              ring through the jitter buffer.
+
+Deltas of --chunk-ms audio arrive at real-time pace (--pace 1.0) plus
+up to --jitter-ms of random delay each, --replies times. Reports time to
+first audio (first delta in -> first sample heard) and the silence heard
+inside each reply, then how long the engine keeps playing after flush().
+
+    python benchmarks/bench_voice_playback.py
+    python benchmarks/bench_voice_playback.py --jitter-ms 150 --open-ms 120
+    python benchmarks/bench_voice_playback.py --out data/bench/voice_playback.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tests.fake_audio_sink import FakeAudioSink  # noqa: E402
+from tests.fake_realtime_server import SAMPLE_RATE, tone  # noqa: E402
+from voice_playback import PlaybackEngine  # noqa: E402
+
+APLAY_DEFAULT_BUFFER_MS = 500
+
+
+class PerReplyPlayer:
+    """The pre-engine path: a new player per reply, written as deltas arrive."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self._open = False
+
+    def write(self, pcm):
+        if not self._open:
+            self.sink.open()
+            self._open = True
+        self.sink.write(pcm)
+
+    def end_response(self):
+        if self._open:
+            self.sink.close()
+            self._open = False
+
+
+def schedule(args, rng):
+    """Arrival offsets (s) of each delta in each reply."""
+    chunk_s = args.chunk_ms / 1000.0
+    replies = []
+    for _ in range(args.replies):
+        arrivals, last = [], 0.0
+        for i in range(args.chunks):
+            at = max(last, i * chunk_s * args.pace + rng.uniform(0.0, args.jitter_ms / 1000.0))
+            arrivals.append(at)
+            last = at
+        replies.append(arrivals)
+    return replies
+
+
+def play(player, sink, replies, pcm, idle_s, drained=None):
+    """Feed every reply on its schedule; returns (ttfa_ms, gap_ms) per reply."""
+    windows, first_in = [], []
+    for arrivals in replies:
+        start = time.monotonic()
+        for i, at in enumerate(arrivals):
+            time.sleep(max(0.0, start + at - time.monotonic()))
+            if i == 0:
+                first_in.append(time.monotonic())
+            player.write(pcm)
+        player.end_response()
+        if drained is not None:
+            drained()
+        time.sleep(idle_s)
+        windows.append(start)
+    windows.append(time.monotonic())
+    ttfa, gaps = [], []
+    for start, end, arrived in zip(windows, windows[1:], first_in):
+        first = sink.first_audible(start)
+        last = sink.last_audible_end(start, end)
+        ttfa.append((first - arrived) * 1000.0)
+        gaps.append(sink.gap_ms(first, last))
+    return ttfa, gaps
+
+
+def wait_idle(engine, timeout=10.0):
+    end = time.monotonic() + timeout
+    while engine.is_playing() and time.monotonic() < end:
+        time.sleep(0.005)
+
+
+def summary(ttfa, gaps):
+    return {
+        "ttfa_p50_ms": round(statistics.median(ttfa), 1),
+        "ttfa_max_ms": round(max(ttfa), 1),
+        "gap_total_ms": round(sum(gaps), 1),
+        "replies_with_gaps": sum(1 for g in gaps if g >= 1.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replies", type=int, default=8)
+    parser.add_argument("--chunks", type=int, default=12, help="deltas per reply")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="audio per delta")
+    parser.add_argument("--pace", type=float, default=1.0, help="delta spacing / audio length (<1 = faster than real time)")
+    parser.add_argument("--jitter-ms", type=float, default=60.0, help="max random delay per delta")
+    parser.add_argument("--open-ms", type=float, default=60.0, help="per-reply player spawn + device open")
+    parser.add_argument("--engine-jitter-ms", type=int, default=80, help="engine jitter buffer")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    replies = schedule(args, random.Random(args.seed))
+    pcm = tone(args.chunk_ms)
+    idle_s = 0.3
+    result = {"replies": args.replies, "jitter_ms": args.jitter_ms, "open_ms": args.open_ms}
+
+    sink = FakeAudioSink(SAMPLE_RATE, open_ms=args.open_ms,
+                         device_buffer_ms=APLAY_DEFAULT_BUFFER_MS,
+                         start_threshold_ms=APLAY_DEFAULT_BUFFER_MS)
+    legacy = PerReplyPlayer(sink)
+    result["per_reply"] = dict(summary(*play(legacy, sink, replies, pcm, idle_s + 0.6)),
+                               opens=sink.opened)
+
+    sink = FakeAudioSink(SAMPLE_RATE, open_ms=args.open_ms,
+                         device_buffer_ms=100, start_threshold_ms=100)
+    engine = PlaybackEngine(SAMPLE_RATE, sink=sink, jitter_ms=args.engine_jitter_ms)
+    engine.start()
+    try:
+        while not sink.opened:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        ttfa, gaps = play(engine, sink, replies, pcm, idle_s, drained=lambda: wait_idle(engine))
+        stats = engine.stats()
+        result["engine"] = dict(summary(ttfa, gaps), opens=sink.opened,
+                                underruns=stats["underruns"], gap_ms_reported=stats["gap_ms"],
+                                first_audio_ms_reported=stats["first_audio_ms_max"])
+
+        # Barge-in: how long audio continues after flush()
+        for _ in range(30):
+            engine.write(pcm)
+        time.sleep(0.6)
+        flushed_at = time.monotonic()
+        engine.flush()
+        wait_idle(engine)
+        result["engine"]["flush_tail_ms"] = round(
+            (sink.last_audible_end(flushed_at - 1.0) - flushed_at) * 1000.0, 1)
+    finally:
+        engine.stop()
+
+    print(f"Reply playback ({args.replies} replies of {args.chunks} x {args.chunk_ms} ms deltas, "
+          f"up to {args.jitter_ms:.0f} ms arrival jitter, {args.open_ms:.0f} ms player open):")
+    print(f"  {'':>10} {'first audio p50':>16} {'max':>8} {'gaps heard':>11} {'replies w/ gaps':>16} {'opens':>6}")
+    for name in ("per_reply", "engine"):
+        row = result[name]
+        print(f"  {name:>10} {row['ttfa_p50_ms']:13.1f} ms {row['ttfa_max_ms']:5.0f} ms "
+              f"{row['gap_total_ms']:8.0f} ms {row['replies_with_gaps']:16d} {row['opens']:6d}")
+    e = result["engine"]
+    print(f"  engine counters: {e['underruns']} underruns, {e['gap_ms_reported']} ms gap, "
+          f"worst first audio {e['first_audio_ms_reported']} ms")
+    print(f"  engine flush(): audio stops {e['flush_tail_ms']} ms later")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
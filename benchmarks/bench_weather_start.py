@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Weather panel cold start: time to first rendered forecast.
+
+Starts a WeatherModule the way the mirror does after a restart and
+drives update()/draw() at the frame rate until a forecast is on screen,
+with the Open-Meteo geocoding and forecast endpoints served by
+upstream_replay.ReplayServer at a fixed --latency-ms. Each run uses an
+empty data cache (no last-good forecast) and either no geocode cache
+(cold) or the entry the previous run stored (warm).
+
+    python benchmarks/bench_weather_start.py
+    python benchmarks/bench_weather_start.py --latency-ms 600 --runs 9
+    python benchmarks/bench_weather_start.py --out data/bench/weather_start.json
+
+Reports the median time to first render and upstream requests per start.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import shutil  # noqa: E402
+import statistics  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+
+import pygame  # noqa: E402
+
+import data_cache as data_cache_module  # noqa: E402
+import http_client as http_client_module  # noqa: E402
+import weather_module  # noqa: E402
+from api_tracker import APITracker  # noqa: E402
+from config import CONFIG  # noqa: E402
+from upstream_replay import ReplayServer, save_fixture  # noqa: E402
+
+CITY = "Birmingham,UK"
+POSITION = {"x": 20, "y": 20, "width": 300, "height": 200}
+
+
+class _Recorded:
+    """Just enough of a requests.Response for save_fixture()."""
+
+    def __init__(self, payload):
+        self.status_code = 200
+        self.headers = {'Content-Type': 'application/json'}
+        self.content = json.dumps(payload).encode('utf-8')
+
+
+def write_fixtures(root):
+    save_fixture(root, 'GET', "https://geocoding-api.open-meteo.com/v1/search?name=Birmingham",
+                 _Recorded({"results": [{"name": "Birmingham", "latitude": 52.48,
+                                         "longitude": -1.90, "country_code": "GB"}]}))
+    save_fixture(root, 'GET', "https://api.open-meteo.com/v1/forecast",
+                 _Recorded({"current": {"temperature_2m": 12.5, "relative_humidity_2m": 70,
+                                        "apparent_temperature": 11.0, "weather_code": 2,
+                                        "wind_speed_10m": 3.0, "pressure_msl": 1015,
+                                        "cloud_cover": 40}}))
+
+
+def one_start(screen, server, frame_s):
+    """Seconds from module construction to the first forecast drawn."""
+    weather_module.geocode_cache = weather_module.GeocodeCache()   # as in a new process
+    before = server.get_stats()['requests']
+    start = time.perf_counter()
+    module = weather_module.WeatherModule(api_key=None, city=CITY)
+    while time.perf_counter() - start < 30:
+        module.update()
+        module.draw(screen, POSITION)
+        if module.weather_data:
+            elapsed = time.perf_counter() - start
+            module._fetcher.cancel()
+            return elapsed, server.get_stats()['requests'] - before
+        time.sleep(frame_s)
+    raise RuntimeError("no forecast within 30 s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='per upstream request')
+    parser.add_argument('--runs', type=int, default=5, help='starts per mode')
+    parser.add_argument('--out', help='write results as JSON')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.Surface((800, 480))
+    work = tempfile.mkdtemp(prefix="bench-weather-")
+    fixtures = os.path.join(work, "fixtures")
+    write_fixtures(fixtures)
+    data_cache_module._CACHE_DIR = os.path.join(work, "cache")
+    tracker = APITracker(state_file=None, usage_log=None)
+    http_client_module.api_tracker = tracker
+    client = http_client_module.http_client
+    client.revalidate = False
+    server = ReplayServer(fixtures, latency_ms=args.latency_ms)
+    client.replay_url = server.start()
+    frame_s = 1.0 / CONFIG.get("frame_rate", 30)
+
+    geocode_file = os.path.join(data_cache_module._CACHE_DIR, "geocode.json")
+    weather_file = os.path.join(data_cache_module._CACHE_DIR, "weather.json")
+    runs = {'cold': [], 'warm': []}
+    requests = {}
+    try:
+        for mode in ('cold', 'warm'):
+            for _ in range(args.runs):
+                if os.path.exists(weather_file):
+                    os.remove(weather_file)
+                if mode == 'cold' and os.path.exists(geocode_file):
+                    os.remove(geocode_file)
+                elapsed, calls = one_start(screen, server, frame_s)
+                runs[mode].append(elapsed * 1000.0)
+                requests[mode] = calls
+    finally:
+        server.stop()
+        shutil.rmtree(work, ignore_errors=True)
+
+    result = {'latency_ms': args.latency_ms, 'runs': args.runs}
+    print(f"Time to first weather render, {args.latency_ms:g} ms upstream latency "
+          f"(median of {args.runs}):")
+    for mode, label in (('cold', 'no geocode cache'), ('warm', 'geocode cache')):
+        median = statistics.median(runs[mode])
+        result[mode] = {'median_ms': round(median, 1), 'upstream_requests': requests[mode]}
+        print(f"  {label:>17}: {median:7.1f} ms, {requests[mode]} upstream requests")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
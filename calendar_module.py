@@ -12,6 +12,7 @@ from api_tracker import api_tracker
 from google_auth_oauthlib.flow import Flow
 from config import FONT_NAME, COLOR_FONT_DEFAULT, COLOR_PASTEL_RED, TRANSPARENCY, CONFIG, COLOR_TEXT_DIM, COLOR_TEXT_SECONDARY
 from background_fetcher import BackgroundFetcher
+from module_base import RetainedLayer
 import time
 
 # Google Calendar color mapping - these match the standard Google Calendar colors
@@ -38,7 +39,7 @@ DEFAULT_CALENDAR_COLORS = [
     (240, 140, 140)   # Red
 ]
 
-class CalendarModule:
+class CalendarModule(RetainedLayer):
     def __init__(self, config):
         self.SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
         self.config = config
@@ -159,6 +160,7 @@ class CalendarModule:
                 self.events = events
                 if color_map:
                     self.color_map = color_map
+                self.mark_dirty()
                 from data_cache import data_cache
                 data_cache.save("calendar", self.events)
                 logging.info(f"Calendar updated: {len(self.events)} events")
@@ -174,6 +176,10 @@ class CalendarModule:
             return
         self._fetcher.submit(self._fetch_events_blocking)
 
+    def content_version(self):
+        """Retained layer: new events, or a new day (today highlight)."""
+        return (self._layer_version, datetime.date.today())
+
     def draw(self, screen, position):
         """Draw calendar with floating text on black -- no background."""
         try:
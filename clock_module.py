@@ -15,9 +15,10 @@ import pytz
 from config import (
     FONT_NAME, FONT_SIZE_CLOCK, FONT_SIZE_SMALL, FONT_SIZE_LABEL,
     COLOR_CLOCK_FACE, COLOR_TEXT_SECONDARY, COLOR_TEXT_DIM,
-    COLOR_ACCENT_PRIMARY, TRANSPARENCY, ANIMATION, LABEL_TRACKING,
+    COLOR_ACCENT_PRIMARY, TRANSPARENCY, ANIMATION,
     load_font,
 )
+from module_base import ModuleDrawHelper
 
 logger = logging.getLogger("Clock")
 
@@ -51,6 +52,7 @@ class ClockModule:
         self._cached_date = None
         self._cached_date_surf = None
         self._hairline = None
+        self._drawn_second = None  # second shown by the last draw (compositor)
 
     def set_status_indicators(self, text):
         """Set status text displayed in the top bar (e.g. weather summary)."""
@@ -62,18 +64,16 @@ class ClockModule:
             if self.total_width > 0 and self.scroll_position < -self.total_width:
                 self.scroll_position = self.screen_width
 
-    def _render_tracked(self, font, text, color, tracking=LABEL_TRACKING):
-        glyphs = [font.render(ch, True, color) for ch in text]
-        if not glyphs:
-            return pygame.Surface((1, 1), pygame.SRCALPHA)
-        width = sum(g.get_width() for g in glyphs) + tracking * (len(glyphs) - 1)
-        height = max(g.get_height() for g in glyphs)
-        surf = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
-        gx = 0
-        for g in glyphs:
-            surf.blit(g, (gx, 0))
-            gx += g.get_width() + tracking
-        return surf
+    def needs_redraw(self):
+        """Compositor hook: the static banner only changes once a second."""
+        if self.scrolling:
+            return True
+        now = datetime.now(self.tz) if self.tz else datetime.now()
+        return (now.strftime('%S'), self._status_text) != self._drawn_second
+
+    def is_animating(self):
+        """Frame-scheduler hook: only the legacy scrolling bar moves."""
+        return self.scrolling
 
     def draw(self, screen, position):
         try:
@@ -107,6 +107,7 @@ class ClockModule:
         hhmm = now.strftime('%H:%M')
         secs = now.strftime('%S')
         pad = 22
+        self._drawn_second = (secs, self._status_text)
 
         # HH:MM (cached per minute)
         if hhmm != self._cached_hhmm:
@@ -128,7 +129,7 @@ class ClockModule:
         date_text = self.get_current_date().upper()
         if date_text != self._cached_date:
             self._cached_date = date_text
-            self._cached_date_surf = self._render_tracked(
+            self._cached_date_surf = ModuleDrawHelper.render_tracked(
                 self.date_font, date_text, COLOR_TEXT_SECONDARY, tracking=2
             )
             self._cached_date_surf.set_alpha(TRANSPARENCY)
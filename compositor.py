@@ -0,0 +1,222 @@
+"""Dirty-rectangle compositor for the AI-Mirror frame loop.
+
+Clearing the whole 1440x2560 surface and flipping it every frame is
+wasted work on the Pi: in a typical second only the clock, the stock
+ticker and the weather band change. Each frame the main loop registers
+its layers here in z-order (a module's screen regions, whether its
+content changed, and how to draw it). The compositor works out which
+screen regions are damaged, clears and repaints only those, and pushes
+them with pygame.display.update(rects).
+
+Regions come from the LayoutManager zones (module_positions), so a
+column module that reports no change is never cleared or re-blitted.
+
+Modules opt in with two optional hooks; without them a module is
+treated as changing every frame (always correct, just not cheaper):
+
+    def needs_redraw(self):          # False when the last frame still stands
+    def get_draw_rects(self, position):  # extra areas painted outside the zone
+
+Usage in the main loop:
+    compositor.begin_frame()
+    compositor.add_layer('weather', rects, dirty, draw_fn)
+    ...
+    compositor.present()
+"""
+
+import logging
+
+import pygame
+
+logger = logging.getLogger("Compositor")
+
+
+def position_rect(position):
+    """Convert a layout position dict into a pygame.Rect."""
+    return pygame.Rect(
+        position.get('x', 0), position.get('y', 0),
+        position.get('width', 0), position.get('height', 0),
+    )
+
+
+class FrameCompositor:
+    """Tracks per-layer screen regions and repaints only damaged areas.
+
+    A layer's draw function runs at most once per frame: damage rects
+    that touch the same layer are coalesced first, so draw() side effects
+    (animation steps, scroll offsets) never run twice.
+    """
+
+    def __init__(self, screen, full_update_ratio=0.6, enabled=True):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.full_update_ratio = full_update_ratio
+        self.enabled = enabled
+
+        self._layers = []          # this frame: (name, rects, dirty, draw_fn)
+        self._last_rects = {}      # name -> rects painted last frame
+        self._pending = []         # explicit invalidations for next frame
+        self._full = True          # first frame paints everything
+        self._last_damage = []
+
+        # Measurement counters (see get_stats)
+        self.frames = 0
+        self.full_frames = 0
+        self.skipped_frames = 0
+        self._pixels_pushed = 0
+
+    # ----- invalidation ---------------------------------------------------
+
+    def invalidate(self, rect=None):
+        """Mark a region (or the whole screen when rect is None) damaged."""
+        if rect is None:
+            self._full = True
+        else:
+            self._pending.append(pygame.Rect(rect))
+
+    # ----- per-frame registration ----------------------------------------
+
+    def begin_frame(self):
+        """Start collecting layers for a new frame."""
+        self._layers = []
+
+    def add_layer(self, name, rects, dirty, draw_fn):
+        """Register a layer in z-order (later layers draw on top).
+
+        rects: list of pygame.Rect the layer may paint into.
+        dirty: True if the layer's content changed since last frame.
+        draw_fn: callable that paints the layer onto the screen.
+        """
+        rects = [r.clip(self.screen_rect) for r in rects]
+        rects = [r for r in rects if r.width > 0 and r.height > 0]
+        if rects:
+            self._layers.append((name, rects, dirty, draw_fn))
+
+    # ----- compositing ----------------------------------------------------
+
+    def _collect_damage(self):
+        damage = list(self._pending)
+        current = {}
+        for name, rects, dirty, _ in self._layers:
+            current[name] = rects
+            previous = self._last_rects.get(name)
+            if dirty or previous != rects:
+                damage.extend(rects)
+            if previous and previous != rects:
+                damage.extend(previous)
+        # Layers that vanished (hidden, faded out) leave their area behind
+        for name, rects in self._last_rects.items():
+            if name not in current:
+                damage.extend(rects)
+        self._last_rects = current
+        damage = [r.clip(self.screen_rect) for r in damage]
+        return [r for r in damage if r.width > 0 and r.height > 0]
+
+    def _coalesce(self, damage):
+        """Merge damage rects until each layer touches at most one of them
+        and no two overlap (so nothing is filled or drawn twice)."""
+        rects = list(damage)
+        while True:
+            merged = False
+            for _, layer_rects, _, _ in self._layers:
+                hits = [i for i, r in enumerate(rects)
+                        if r.collidelist(layer_rects) != -1]
+                if len(hits) > 1:
+                    union = rects[hits[0]].unionall([rects[i] for i in hits[1:]])
+                    rects = [r for i, r in enumerate(rects) if i not in hits]
+                    rects.append(union)
+                    merged = True
+                    break
+            if not merged:
+                for i, r in enumerate(rects):
+                    j = r.collidelist(rects[i + 1:])
+                    if j != -1:
+                        other = rects.pop(i + 1 + j)
+                        rects[i] = r.union(other)
+                        merged = True
+                        break
+            if not merged:
+                return rects
+
+    def present(self):
+        """Repaint damaged regions and push them to the display.
+
+        Returns the list of rects that were updated (the full screen rect
+        on a full repaint, [] when nothing changed).
+        """
+        self.frames += 1
+        self._pending, pending_full = [], self._full
+        damage = self._collect_damage()
+        self._full = False
+
+        if not self.enabled or pending_full:
+            return self._present_full()
+        if not damage:
+            self.skipped_frames += 1
+            self._last_damage = []
+            return []
+
+        damage = self._coalesce(damage)
+        area = sum(r.width * r.height for r in damage)
+        if area >= self.full_update_ratio * self.screen_rect.width * self.screen_rect.height:
+            return self._present_full()
+
+        old_clip = self.screen.get_clip()
+        for rect in damage:
+            self.screen.set_clip(rect)
+            self.screen.fill((0, 0, 0), rect)
+            for name, layer_rects, _, draw_fn in self._layers:
+                if rect.collidelist(layer_rects) != -1:
+                    self._draw(name, draw_fn)
+        self.screen.set_clip(old_clip)
+
+        self._pixels_pushed += area
+        self._last_damage = damage
+        self._push(damage)
+        return damage
+
+    def _present_full(self):
+        self.full_frames += 1
+        self.screen.fill((0, 0, 0))
+        for name, _, _, draw_fn in self._layers:
+            self._draw(name, draw_fn)
+        self._pixels_pushed += self.screen_rect.width * self.screen_rect.height
+        self._last_damage = [self.screen_rect.copy()]
+        if self._is_display():
+            pygame.display.flip()
+        return list(self._last_damage)
+
+    @staticmethod
+    def _draw(name, draw_fn):
+        try:
+            draw_fn()
+        except Exception as e:
+            logger.error(f"Layer {name} failed to draw: {e}")
+
+    def _is_display(self):
+        return pygame.display.get_init() and pygame.display.get_surface() is self.screen
+
+    def _push(self, rects):
+        if self._is_display():
+            pygame.display.update(rects)
+
+    # ----- diagnostics ----------------------------------------------------
+
+    def get_layer_names(self):
+        """Names of the layers registered for the current frame."""
+        return [name for name, _, _, _ in self._layers]
+
+    def get_last_damage(self):
+        """Rects repainted in the most recent frame."""
+        return list(self._last_damage)
+
+    def get_stats(self):
+        """Counters for measuring how much of the screen is repainted."""
+        screen_px = self.screen_rect.width * self.screen_rect.height
+        frames = max(self.frames, 1)
+        return {
+            'frames': self.frames,
+            'full_frames': self.full_frames,
+            'skipped_frames': self.skipped_frames,
+            'avg_screen_fraction': round(self._pixels_pushed / (screen_px * frames), 4),
+        }
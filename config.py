@@ -268,7 +268,130 @@ CONFIG = {
         'frequency': 'daily'
     },
     'frame_rate': 30,
-    
+
+    # Dirty-rectangle compositor: repaint and push only the screen regions
+    # that changed. Above full_update_ratio of the screen it falls back to
+    # a full clear + flip (cheaper than many small updates).
+    'compositor': {
+        'enabled': True,
+        'full_update_ratio': 0.6,
+    },
+
+    # Rendered-text surfaces (module_base.SurfaceCache): one LRU byte budget
+    # shared by every module cache; least recently used text is evicted.
+    'surface_cache': {
+        'max_bytes': 32 * 1024 * 1024,
+        # Tracked-text glyph sheets, one per (font, colour), LRU
+        'max_glyph_atlases': 32,
+    },
+
+    # Shared worker pool behind every module's BackgroundFetcher.
+    # limits caps concurrent fetches per module name (default_limit
+    # otherwise); a fetch still queued after deadline_s is dropped.
+    'fetch_scheduler': {
+        'workers': 3,
+        'default_limit': 1,
+        'limits': {'news': 2},              # RSS feeds fetched in parallel
+        'deadline_s': 120,
+    },
+
+    # Shared HTTP client (http_client.py): one keep-alive session per host
+    # and ETag / Last-Modified revalidation of GETs. Turn pooling or
+    # revalidate off to measure the old per-call behaviour.
+    'http_client': {
+        'pooling': True,
+        'revalidate': True,
+        'pool_maxsize': 4,                  # connections kept per host
+        'cache_max_bytes': 4 * 1024 * 1024,  # remembered bodies for 304s
+        # Offline load testing (upstream_replay.py): record responses as
+        # fixtures, or send every upstream call to a replay server.
+        'record_dir': os.getenv('MIRROR_RECORD_DIR') or None,
+        'replay_url': os.getenv('MIRROR_REPLAY_URL') or None,
+        'base_url_overrides': {},           # {'https://api.x.com': 'http://127.0.0.1:9000'}
+    },
+
+    # Shared Home Assistant connection (ha_state.HAStateStore) behind the
+    # smarthome and phone modules: WebSocket state_changed stream, or
+    # /api/states polling while the socket is down. Subscribers can ask
+    # for a shorter poll interval than poll_interval_s.
+    'ha_state': {
+        'poll_interval_s': 120,
+        'reconnect_max_s': 300,
+    },
+
+    # Weather geocoding results (weather_module.GeocodeCache), kept in
+    # data/cache/geocode.json so a restart can fetch the forecast at once.
+    # locations pins coordinates for a city string and skips the lookup:
+    #   {'Birmingham,UK': {'lat': 52.48, 'lon': -1.90, 'name': 'Birmingham', 'country': 'GB'}}
+    'geocode': {
+        'ttl_days': 30,
+        'max_entries': 32,
+        'locations': {},
+    },
+
+    # Synthesised speech of the fallback assistant (tts_cache.py), kept in
+    # data/tts_cache/ keyed by engine, voice and text. Least recently
+    # played audio is evicted past max_bytes. prewarm_phrases are
+    # synthesised once the assistant has been idle for prewarm_idle_s.
+    'tts_cache': {
+        'enabled': True,
+        'max_bytes': 64 * 1024 * 1024,
+        'prewarm_idle_s': 20,
+        'prewarm_phrases': [
+            # The offline replies (AIInteractionModule.process_with_fallback)
+            "Hello! How can I help you today?",
+            "I can show you the time on the clock module.",
+            "You can check the weather module for current conditions.",
+            "I can help you with basic mirror functions and information.",
+            "I'm sorry, I can only help with basic functions at the moment.",
+        ],
+    },
+
+    # Fallback assistant speech (speech_pipeline.py): replies are spoken a
+    # sentence at a time, the next one synthesised while this one plays.
+    # depth caps clips synthesised ahead of the speaker; pieces shorter
+    # than min_chars join the next sentence, run-ons are cut at max_chars.
+    'speech_pipeline': {
+        'depth': 2,
+        'min_chars': 12,
+        'max_chars': 240,
+    },
+
+    # Adaptive frame rate: frame_rate only while something animates
+    # (fades, ticker, weather particles), idle_fps otherwise. max_fps caps
+    # each mirror state (the legacy scrolling clock crawls at the sleep
+    # ceiling); input and panel commands wake the loop at once.
+    'frame_scheduler': {
+        'enabled': True,
+        'max_fps': {'active': 30, 'screensaver': 30, 'sleep': 1},
+        'idle_fps': 4,
+        'wake_hold_ms': 1500,   # full rate after input / panel command
+        'input_poll_ms': 50,    # input check interval during long waits
+        'log_interval_s': 300,  # periodic rate summary in the log
+    },
+
+    # Per-module update/draw timing: rolling histograms served at
+    # /api/profile on the web panel and summarised in the log.
+    'profiler': {
+        'enabled': True,
+        'module_budget_ms': 5.0,  # one module's share of a frame
+        'window_s': 60,           # rolling histogram window
+        'log_interval_s': 300,
+    },
+
+    # Module loading: modules are imported and constructed when they
+    # first become visible (or a command needs them) instead of all at
+    # boot. After the first frame the remaining imports are pre-warmed on
+    # a background thread; /api/startup on the web panel shows the
+    # per-module import/init timeline.
+    'module_loading': {
+        'lazy': True,             # False: construct everything before the first frame
+        'eager': ['clock'],       # built before the first frame
+        'prewarm': True,          # import the rest in the background after it
+        'frame_budget_ms': 40,    # construction time per frame (at least one module)
+        'skip': ['eleven_voice'], # never constructed by the mirror
+    },
+
     # Module configurations
     'clock': {
         'class': 'ClockModule',
@@ -362,6 +485,26 @@ CONFIG = {
                 # Hard cap on any single conversation, idle or not
                 'max_conversation_seconds': 180,
             },
+            # Realtime WebSocket: connected on a background thread, never
+            # waited for. Failed attempts back off (doubling from base to
+            # max, jittered); events sent while connecting are buffered.
+            'connection': {
+                'connect_timeout_s': 10,
+                'backoff_base_s': 1.0,
+                'backoff_max_s': 60.0,
+                'max_buffered_events': 500,
+                # Failed connects in a row before the mirror falls back to
+                # the text assistant (a 401/403 handshake falls back at once)
+                'fail_after_attempts': 3,
+            },
+            # Reply playback: one aplay stream kept open, written a period
+            # at a time. A reply starts jitter_ms after its first audio so
+            # late deltas don't leave gaps; buffer_s of audio is held at most.
+            'playback': {
+                'period_ms': 25,
+                'jitter_ms': 80,
+                'buffer_s': 60,
+            },
             'debug_write': False,
         }
     },
@@ -371,6 +514,10 @@ CONFIG = {
             'size': 420,
             'transparency': 205,  # semi-transparent ghost-on-glass look
             'scanlines': True,    # faint CRT lines, Red Dwarf style
+            # Band energies pick round/narrow mouths; off because at the
+            # playback engine's 25 ms blocks the rfft costs about twice
+            # the RMS/ZCR analysis (benchmarks/bench_lipsync.py)
+            'lipsync_bands': False,
             # Face frames live in assets/avatar/ (see README.txt there)
         }
     },
@@ -479,6 +626,8 @@ CONFIG = {
         'params': {
             'api_key': os.getenv('OCTOPUS_API_KEY', ''),
             'account_number': os.getenv('OCTOPUS_ACCOUNT_NUMBER', ''),
+            'history_days': 31,     # half-hourly consumption/rates kept locally
+            'refetch_hours': 24,    # re-read each pass: meters upload late
         }
     },
 
@@ -12,11 +12,12 @@ from config import (
     CONFIG, FONT_NAME, COLOR_FONT_DEFAULT,
     COLOR_FONT_BODY, COLOR_FONT_SMALL, TRANSPARENCY,
 )
+from module_base import RetainedLayer
 
 logger = logging.getLogger("Countdown")
 
 
-class CountdownModule:
+class CountdownModule(RetainedLayer):
     """Displays countdowns to configured events and a voice-activated timer."""
 
     def __init__(self, events=None, **kwargs):
@@ -93,6 +94,11 @@ class CountdownModule:
             return 0
         return remaining
 
+    def is_animating(self):
+        """Frame-scheduler hook: a finished timer pulses TIME UP."""
+        remaining = self._get_timer_remaining()
+        return remaining is not None and remaining <= 0
+
     def update(self):
         # Push center notification when timer completes
         remaining = self._get_timer_remaining()
@@ -105,6 +111,18 @@ class CountdownModule:
                     duration_ms=8000,
                 )
 
+    def content_version(self):
+        """Retained layer: day counts change at midnight, a running timer
+        once a second, and the TIME UP pulse every frame."""
+        remaining = self._get_timer_remaining()
+        if remaining is None:
+            timer = None
+        elif remaining <= 0:
+            timer = pygame.time.get_ticks()
+        else:
+            timer = int(remaining)
+        return (timer, self.timer_label, datetime.now().date(), len(self.events))
+
     def draw(self, screen, position):
         try:
             if isinstance(position, dict):
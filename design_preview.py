@@ -50,8 +50,8 @@ from sysinfo_module import SysInfoModule
 from phone_module import PhoneModule
 
 
-def fake_weather(module):
-    main, desc, wind = CONDITION_DATA.get(CONDITION, CONDITION_DATA["partly"])
+def fake_weather(module, condition=None):
+    main, desc, wind = CONDITION_DATA.get(condition or CONDITION, CONDITION_DATA["partly"])
     module.weather_data = {
         "name": "Birmingham",
         "sys": {"country": "GB"},
@@ -126,18 +126,19 @@ def fake_stocks(module):
         }
 
 
-def main():
-    screen = pygame.Surface((WIDTH, HEIGHT))
-    screen.fill((0, 0, 0))
-    layout = LayoutManager(WIDTH, HEIGHT)
+def build_modules(condition=None):
+    """Create every previewed module, fed with fake data (no network).
 
+    Returns a name -> module dict including the clock and stocks bars.
+    Shared with benchmarks/bench_frame.py.
+    """
     clock = ClockModule(**CONFIG["clock"]["params"])
     clock.set_status_indicators("14C  partly cloudy")
 
     weather = WeatherModule(
         api_key="", city="Birmingham,UK", screen_width=WIDTH, screen_height=HEIGHT
     )
-    fake_weather(weather)
+    fake_weather(weather, condition)
 
     cal = CalendarModule(dict(CONFIG["calendar"]["params"]["config"]))
     fake_calendar(cal)
@@ -180,12 +181,24 @@ def main():
     phone.battery_state = "Not Charging"
     phone._leave = phone._compute_leave()
 
-    modules = {
+    return {
+        "clock": clock, "stocks": stocks,
         "weather": weather, "calendar": cal, "countdown": countdown,
         "smarthome": smarthome, "greeting": greeting, "quote": quote,
         "news": news, "fitbit": fitbit, "sysinfo": sysinfo, "phone": phone,
     }
 
+
+def main():
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    screen.fill((0, 0, 0))
+    layout = LayoutManager(WIDTH, HEIGHT)
+
+    modules = build_modules()
+    clock = modules.pop("clock")
+    stocks = modules.pop("stocks")
+    weather = modules["weather"]
+
     # Let the banner ambience settle (cloud spread, drop distribution)
     # before the single draw pass; weather.draw renders the animation
     if weather.animation:
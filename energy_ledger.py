@@ -0,0 +1,236 @@
+"""Local half-hourly consumption and tariff store for the Octopus module.
+
+OctopusEnergyModule used to ask for one page of today's consumption and
+price it as total kWh x the current unit rate - wrong on Agile and
+Intelligent Go, where the rate changes every half hour. EnergyLedger
+keeps both series locally instead:
+
+  - consumption intervals (start, kWh) and unit-rate intervals
+    (valid_from, valid_to, p/kWh) for the last window_days, persisted
+    through data_cache ("octopus_ledger");
+  - watermarks, so each refresh only asks the API for half-hours after
+    the newest one it already holds, plus a trailing refetch window
+    (default the last 24 h) that is fetched again on every pass and
+    upserted - smart meters upload half-hours late and out of order, so
+    a gap behind the newest interval can still fill in. Pages are
+    followed through the API's "next" links;
+  - cost(start, end): every consumption interval joined to the rate in
+    force at its start - np.searchsorted over sorted arrays, or a
+    bisect loop when numpy is missing - for an exact figure plus the
+    count of intervals that had no rate.
+
+Times are unix seconds (UTC). The module owns the fetching; the ledger
+only stores, prunes and prices.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger("EnergyLedger")
+
+HALF_HOUR = 1800
+OPEN_END = float('inf')   # valid_to of a rate with no end date
+
+
+def parse_time(value):
+    """Octopus ISO timestamp ('...Z' or '+01:00') -> unix seconds."""
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+
+
+class EnergyLedger:
+    """Consumption and unit-rate intervals for one meter and tariff."""
+
+    def __init__(self, window_days=31, refetch_hours=24, cache_name="octopus_ledger",
+                 clock=time.time):
+        self.window_s = window_days * 86400
+        self.refetch_s = int(refetch_hours * 3600)
+        self.cache_name = cache_name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.meter = None            # (mpan, serial)
+        self.tariff = None
+        self._consumption = {}       # interval start -> kWh
+        self._rates = {}             # valid_from -> (valid_to, p/kWh inc VAT)
+        self.rates_fetched_to = 0    # rates are known up to here
+        self._arrays = None          # cached numpy view, rebuilt on change
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self, meter, tariff):
+        """Restore stored intervals if they belong to this meter/tariff."""
+        from data_cache import data_cache
+        cached, _ = data_cache.load(self.cache_name)
+        with self._lock:
+            self.meter, self.tariff = tuple(meter), tariff
+            self._consumption, self._rates, self.rates_fetched_to = {}, {}, 0
+            self._arrays = None
+            if not cached or tuple(cached.get('meter') or ()) != self.meter:
+                return
+            self._consumption = {int(s): kwh for s, kwh in cached.get('consumption', [])}
+            if cached.get('tariff') == tariff:
+                self._rates = {int(f): (OPEN_END if t is None else int(t), p)
+                               for f, t, p in cached.get('rates', [])}
+                self.rates_fetched_to = cached.get('rates_fetched_to', 0)
+            self._prune()
+        logger.info(f"Restored {len(self._consumption)} consumption and "
+                    f"{len(self._rates)} rate intervals")
+
+    def save(self):
+        from data_cache import data_cache
+        with self._lock:
+            payload = {
+                'meter': list(self.meter or ()),
+                'tariff': self.tariff,
+                'consumption': sorted(self._consumption.items()),
+                'rates': [[f, None if t == OPEN_END else t, p]
+                          for f, (t, p) in sorted(self._rates.items())],
+                'rates_fetched_to': self.rates_fetched_to,
+            }
+        data_cache.save(self.cache_name, payload)
+
+    def _prune(self):
+        """Drop intervals older than the window. Lock held."""
+        cutoff = self._clock() - self.window_s
+        self._consumption = {s: k for s, k in self._consumption.items() if s >= cutoff}
+        self._rates = {f: (t, p) for f, (t, p) in self._rates.items() if t > cutoff}
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def window_start(self):
+        return int(self._clock() - self.window_s) // HALF_HOUR * HALF_HOUR
+
+    def consumption_from(self):
+        """Where the next consumption fetch starts: after the newest
+        interval, or at the start of the refetch window if that is
+        earlier."""
+        with self._lock:
+            newest = max(self._consumption, default=None)
+        if newest is None:
+            return self.window_start()
+        trailing = int(self._clock() - self.refetch_s) // HALF_HOUR * HALF_HOUR
+        return max(min(newest + HALF_HOUR, trailing), self.window_start())
+
+    def rates_from(self):
+        return max(self.rates_fetched_to, self.window_start())
+
+    def add_consumption(self, results):
+        """Upsert API consumption results; returns (new, revised) counts."""
+        added = revised = 0
+        with self._lock:
+            for r in results:
+                start = parse_time(r['interval_start'])
+                kwh = float(r.get('consumption', 0.0))
+                old = self._consumption.get(start)
+                if old is None:
+                    added += 1
+                elif old != kwh:
+                    revised += 1
+                self._consumption[start] = kwh
+            self._arrays = None
+            self._prune()
+        return added, revised
+
+    def add_rates(self, results, fetched_to):
+        """Store API unit-rate results covering up to fetched_to."""
+        with self._lock:
+            for r in results:
+                valid_to = r.get('valid_to')
+                self._rates[parse_time(r['valid_from'])] = (
+                    parse_time(valid_to) if valid_to else OPEN_END,
+                    float(r['value_inc_vat']))
+            self.rates_fetched_to = max(self.rates_fetched_to, int(fetched_to))
+            self._arrays = None
+            self._prune()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def counts(self):
+        with self._lock:
+            return {'consumption': len(self._consumption), 'rates': len(self._rates)}
+
+    def rate_at(self, ts):
+        """Unit rate in force at ts (p/kWh), or None."""
+        with self._lock:
+            starts = sorted(self._rates)
+            i = bisect.bisect_right(starts, ts) - 1
+            if i < 0:
+                return None
+            valid_to, price = self._rates[starts[i]]
+            return price if ts < valid_to else None
+
+    def rates_between(self, start, end):
+        """[{valid_from, valid_to, value_inc_vat}] overlapping [start, end)."""
+        with self._lock:
+            return [{'valid_from': f, 'valid_to': None if t == OPEN_END else t,
+                     'value_inc_vat': p}
+                    for f, (t, p) in sorted(self._rates.items()) if f < end and t > start]
+
+    def _snapshot(self):
+        """Sorted arrays (starts, kwh, rate_from, rate_to, price). Lock held."""
+        if self._arrays is None:
+            starts = sorted(self._consumption)
+            rate_from = sorted(self._rates)
+            self._arrays = (
+                np.array(starts, dtype=np.int64),
+                np.array([self._consumption[s] for s in starts], dtype=np.float64),
+                np.array(rate_from, dtype=np.int64),
+                np.array([self._rates[f][0] for f in rate_from], dtype=np.float64),
+                np.array([self._rates[f][1] for f in rate_from], dtype=np.float64),
+            )
+        return self._arrays
+
+    def cost(self, start, end):
+        """Exact cost of consumption in [start, end).
+
+        Returns {'kwh', 'pence', 'intervals', 'unpriced'}; unpriced
+        intervals (no rate known for them) count towards kWh only.
+        """
+        if np is None:
+            return self.cost_loop(start, end)
+        with self._lock:
+            starts, kwh, rate_from, rate_to, price = self._snapshot()
+        lo, hi = np.searchsorted(starts, [start, end])
+        starts, kwh = starts[lo:hi], kwh[lo:hi]
+        if len(rate_from):
+            # Rate in force = the latest one starting at or before the interval
+            idx = np.searchsorted(rate_from, starts, side='right') - 1
+            safe = np.clip(idx, 0, None)
+            priced = (idx >= 0) & (starts < rate_to[safe])
+            pence = float(np.dot(kwh[priced], price[safe[priced]]))
+        else:
+            priced = np.zeros(len(starts), dtype=bool)
+            pence = 0.0
+        return {'kwh': float(kwh.sum()), 'pence': pence, 'intervals': int(len(starts)),
+                'unpriced': int(len(starts) - int(priced.sum()))}
+
+    def cost_loop(self, start, end):
+        """cost() one interval at a time (no numpy)."""
+        with self._lock:
+            consumption = sorted((s, k) for s, k in self._consumption.items() if start <= s < end)
+            rate_from = sorted(self._rates)
+            rates = [self._rates[f] for f in rate_from]
+        total_kwh = pence = 0.0
+        unpriced = 0
+        for s, k in consumption:
+            total_kwh += k
+            i = bisect.bisect_right(rate_from, s) - 1
+            if i >= 0 and s < rates[i][0]:
+                pence += k * rates[i][1]
+            else:
+                unpriced += 1
+        return {'kwh': total_kwh, 'pence': pence, 'intervals': len(consumption),
+                'unpriced': unpriced}
@@ -15,9 +15,10 @@ from fitbit.api import Fitbit
 from fitbit.exceptions import HTTPUnauthorized
 from oauthlib.oauth2.rfc6749.errors import TokenExpiredError
 from background_fetcher import BackgroundFetcher
+from module_base import RetainedLayer
 import base64
 
-class FitbitModule:
+class FitbitModule(RetainedLayer):
     # NOTE: The legacy Fitbit Web API this module uses is being retired by
     # Google in September 2026 in favour of the new Google Health API
     # (Google Cloud + Google OAuth, mandatory user re-consent). This module
@@ -310,6 +311,10 @@ class FitbitModule:
                 remaining = 0
         screen.blit(surf, (x, y))
 
+    def content_version(self):
+        """Retained layer: new data lands a few times an hour at most."""
+        return (self.last_update, self._api_retired)
+
     def draw(self, screen, position):
         """Draw Fitbit data -- floating text on black, no background."""
         try:
@@ -0,0 +1,185 @@
+"""Adaptive frame-rate scheduler for the AI-Mirror main loop.
+
+A fixed 30 FPS tick costs the same CPU whether the mirror is animating
+rain or asleep showing a clock. Each frame the main loop tells the
+scheduler which things are animating (AnimationManager fades and
+notifications, plus modules whose optional is_animating() hook says so)
+and the scheduler picks the tick rate:
+
+    animating       -> the state's ceiling (full rate)
+    nothing moving  -> idle_fps (the clock only changes once a second)
+
+Rates are capped by a per-state ceiling from CONFIG['frame_scheduler'],
+so sleep can run at ~1 FPS. Low-rate frames are aligned to the wall
+clock so a 1 FPS sleep clock still lands on every second.
+
+Long waits wake up at once on pygame input or when another thread calls
+wake() (web panel commands, voice events), and then hold the full rate
+for a moment so the response animates smoothly.
+
+Modules opt in with one optional hook; without it a module is treated
+as static (it still repaints whenever its content changes, just at the
+idle rate):
+
+    def is_animating(self):   # True while it needs smooth frames
+"""
+
+import logging
+import math
+import threading
+import time
+
+import pygame
+
+logger = logging.getLogger("FrameScheduler")
+
+# Events that end a long wait (window housekeeping events do not)
+_INPUT_EVENTS = [
+    pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.FINGERDOWN,
+]
+
+
+class FrameScheduler:
+    """Chooses the per-frame tick rate and sleeps until the next frame."""
+
+    def __init__(self, frame_rate=30, max_fps=None, idle_fps=4,
+                 wake_hold_ms=1500, input_poll_ms=50, log_interval_s=300,
+                 enabled=True):
+        self.frame_rate = frame_rate
+        self.max_fps = dict(max_fps or {})
+        self.idle_fps = idle_fps
+        self.wake_hold = wake_hold_ms / 1000.0
+        self.input_poll = input_poll_ms / 1000.0
+        self.log_interval = log_interval_s
+        self.enabled = enabled
+
+        self._wake = threading.Event()
+        self._hold_until = 0.0
+        self._wake_reason = None
+
+        self.fps = frame_rate
+        self.reason = "startup"
+        self.state = None
+
+        # Measurement counters (see get_stats)
+        self.frames = 0
+        self.wakes = 0
+        self._started = time.monotonic()
+        self._frame_start = self._started
+        self._busy_s = 0.0
+        self._time_at_fps = {}
+        self._last_log = self._started
+
+    # ----- wake-up --------------------------------------------------------
+
+    def wake(self, reason="wake"):
+        """Cut the current wait short and run at full rate for a moment.
+
+        Safe to call from any thread.
+        """
+        self._wake_reason = reason
+        self._hold_until = time.monotonic() + self.wake_hold
+        self._wake.set()
+
+    # ----- rate selection -------------------------------------------------
+
+    def ceiling(self, state):
+        """Highest rate allowed in a mirror state."""
+        return max(0.1, min(self.max_fps.get(state, self.frame_rate), self.frame_rate))
+
+    def choose(self, state, animating):
+        """Pick the rate for the next frame.
+
+        animating: names of the things animating this frame (may be empty).
+        """
+        ceiling = self.ceiling(state)
+        if not self.enabled:
+            fps, reason = self.frame_rate, "fixed"
+        elif animating:
+            fps, reason = ceiling, ",".join(animating)
+        elif time.monotonic() < self._hold_until:
+            fps, reason = ceiling, self._wake_reason or "wake"
+        else:
+            fps, reason = min(self.idle_fps, ceiling), "idle"
+
+        if fps != self.fps or state != self.state:
+            logger.debug(f"Frame rate {self.fps} -> {fps} FPS ({state}: {reason})")
+        self.fps, self.reason, self.state = fps, reason, state
+        return fps
+
+    # ----- waiting --------------------------------------------------------
+
+    def tick(self, state, animating):
+        """Choose the rate, then sleep until the next frame is due.
+
+        Replaces clock.tick(frame_rate) at the end of each loop iteration.
+        Returns the rate that was used.
+        """
+        fps = self.choose(state, animating)
+        now = time.monotonic()
+        self._busy_s += now - self._frame_start
+        self._wait(fps)
+
+        end = time.monotonic()
+        self._time_at_fps[fps] = self._time_at_fps.get(fps, 0.0) + (end - self._frame_start)
+        self._frame_start = end
+        self.frames += 1
+        if self.log_interval and end - self._last_log >= self.log_interval:
+            self._last_log = end
+            self._log_summary()
+        return fps
+
+    def _wait(self, fps):
+        period = 1.0 / fps
+        # Align to the wall clock grid (a 1 FPS clock ticks on the second);
+        # capped at one period so clock jumps can't stall the loop
+        wall = time.time()
+        remaining = (math.floor(wall * fps) + 1) / fps - wall + 0.002
+        deadline = time.monotonic() + min(remaining, period)
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._wake.wait(min(remaining, self.input_poll)):
+                self._wake.clear()
+                self.wakes += 1
+                return
+            if remaining > self.input_poll and self._input_pending():
+                self.wake("input")
+                self._wake.clear()
+                self.wakes += 1
+                return
+
+    @staticmethod
+    def _input_pending():
+        try:
+            return pygame.display.get_init() and pygame.event.peek(_INPUT_EVENTS)
+        except pygame.error:
+            return False
+
+    # ----- diagnostics ----------------------------------------------------
+
+    def get_stats(self):
+        """Chosen rate plus counters for measuring CPU savings."""
+        elapsed = max(time.monotonic() - self._started, 1e-6)
+        return {
+            'enabled': self.enabled,
+            'state': self.state,
+            'fps': self.fps,
+            'reason': self.reason,
+            'frames': self.frames,
+            'wakes': self.wakes,
+            'avg_fps': round(self.frames / elapsed, 2),
+            'busy_fraction': round(self._busy_s / elapsed, 4),
+            'seconds_at_fps': {
+                str(fps): round(s, 1) for fps, s in sorted(self._time_at_fps.items())
+            },
+        }
+
+    def _log_summary(self):
+        stats = self.get_stats()
+        logger.info(
+            f"Frame rate: avg {stats['avg_fps']} FPS, busy {stats['busy_fraction']:.1%}, "
+            f"now {stats['fps']} FPS ({stats['reason']}), time at rate {stats['seconds_at_fps']}"
+        )
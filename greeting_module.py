@@ -14,7 +14,7 @@ from config import (
     COLOR_TEXT_PRIMARY, COLOR_TEXT_SECONDARY, COLOR_ACCENT_BLUE,
     TRANSPARENCY, load_font,
 )
-from module_base import ModuleDrawHelper, SurfaceCache
+from module_base import ModuleDrawHelper, SurfaceCache, RetainedLayer
 
 logger = logging.getLogger("Greeting")
 
@@ -78,13 +78,13 @@ def _get_time_period():
     return 'night'
 
 
-class GreetingModule:
+class GreetingModule(RetainedLayer):
     def __init__(self, rotation_interval=60, **kwargs):
         self.rotation_interval = timedelta(seconds=rotation_interval)
         self.last_rotation = datetime.min
         self.current_greeting = ""
         self.current_affirmation = ""
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("greeting")
         self._last_period = None
         self._affirmation_index = 0
 
@@ -115,6 +115,10 @@ class GreetingModule:
                 random.shuffle(self._shuffled)
             self.last_rotation = now
 
+    def content_version(self):
+        """Retained layer: re-render only when the text rotates."""
+        return (self.current_greeting, self.current_affirmation)
+
     def draw(self, screen, position):
         try:
             if isinstance(position, dict):
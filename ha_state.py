@@ -0,0 +1,389 @@
+"""Shared Home Assistant state store for AI-Mirror modules.
+
+SmartHomeModule and PhoneModule both read Home Assistant entity states.
+Instead of each downloading the full /api/states snapshot on its own
+timer, one HAStateStore per HA instance owns the connection on a
+background thread:
+
+  1. subscribe to the WebSocket API's state_changed events,
+  2. take one REST /api/states snapshot,
+  3. apply each state_changed event as it arrives.
+
+Subscribing before the snapshot means no change is missed in between;
+events older than the state already held are ignored. If the WebSocket
+is unavailable (websocket-client missing, HA restarting, auth refused)
+the store polls /api/states instead and keeps retrying the socket with
+backoff. The poll interval is the shortest one any subscriber asks for.
+
+Consumers subscribe by entity id and/or domain and drain diffs from
+their update() on the main loop:
+
+    sub = ha_state_store(url, token).subscribe(domains={'sensor'})
+    for entity_id, state in sub.take_changes().items():
+        ...   # HA state dict, or None when the entity was removed
+
+The first take_changes() returns every matching entity. Changes to the
+same entity coalesce until taken, so a consumer sees the latest state,
+never a backlog. Connection stats: get_stats() (web panel /api/fetch).
+"""
+
+import json
+import logging
+import threading
+import time
+
+from api_tracker import api_tracker
+from config import CONFIG
+from http_client import http_client, APICallBlocked
+
+logger = logging.getLogger("HAState")
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+    logger.warning("websocket-client not installed; Home Assistant will be polled")
+
+MODE_OFFLINE = 'offline'
+MODE_POLLING = 'polling'
+MODE_WEBSOCKET = 'websocket'
+
+
+class HAAuthError(Exception):
+    """Home Assistant refused the access token."""
+
+
+class HASubscription:
+    """One consumer's filter and its pending (coalesced) changes."""
+
+    def __init__(self, store, entity_ids, domains, poll_interval_s):
+        self.store = store
+        self.entity_ids = frozenset(entity_ids or ())
+        self.domains = frozenset(domains or ())
+        # How stale this consumer tolerates data while the store polls
+        self.poll_interval_s = poll_interval_s
+        self.delivered = 0
+        self._pending = {}
+
+    def matches(self, entity_id):
+        """True if entity_id passes the filter (no filter = everything)."""
+        if not self.entity_ids and not self.domains:
+            return True
+        return (entity_id in self.entity_ids
+                or entity_id.split('.', 1)[0] in self.domains)
+
+    def take_changes(self):
+        """Changes since the last call: {entity_id: state dict or None}."""
+        return self.store._take(self)
+
+    def set_filter(self, entity_ids=None, domains=None):
+        """Replace the filter; newly matching entities arrive as changes."""
+        self.store._refilter(self, entity_ids, domains)
+
+    def close(self):
+        self.store.unsubscribe(self)
+
+
+class HAStateStore:
+    """Entity states of one Home Assistant instance, kept current."""
+
+    def __init__(self, ha_url, ha_token, timeout=10, poll_interval_s=None,
+                 reconnect_max_s=None):
+        settings = CONFIG.get('ha_state', {})
+        self.ha_url = ha_url.rstrip('/')
+        stream_url = http_client.resolve_url(self.ha_url)    # follows replay overrides
+        self.ws_url = ('ws' + stream_url[4:] if stream_url.startswith('http')
+                       else stream_url) + '/api/websocket'
+        self.headers = {
+            "Authorization": f"Bearer {ha_token}",
+            "content-type": "application/json",
+        }
+        self._token = ha_token
+        self.timeout = timeout
+        self.poll_interval_s = (poll_interval_s if poll_interval_s is not None
+                                else settings.get('poll_interval_s', 120))
+        self.reconnect_max_s = (reconnect_max_s if reconnect_max_s is not None
+                                else settings.get('reconnect_max_s', 300))
+
+        self._states = {}
+        self._subs = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._ws = None
+
+        self.mode = MODE_OFFLINE
+        self.last_error = None
+        self.synced = False           # a snapshot has been applied
+        self._last_poll = 0.0
+        self._stats = {'snapshots': 0, 'snapshot_bytes': 0, 'snapshot_ms_max': 0.0,
+                       'events': 0, 'ws_bytes': 0, 'stale_events': 0,
+                       'ws_connects': 0, 'poll_failures': 0}
+
+    # ------------------------------------------------------------------
+    # Consumer API (main loop)
+    # ------------------------------------------------------------------
+
+    def subscribe(self, entity_ids=None, domains=None, poll_interval_s=None):
+        """Register a consumer; starts the connection on first use."""
+        sub = HASubscription(self, entity_ids, domains,
+                             poll_interval_s or self.poll_interval_s)
+        with self._lock:
+            sub._pending = {eid: s for eid, s in self._states.items() if sub.matches(eid)}
+            self._subs.append(sub)
+        self._ensure_thread()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def get(self, entity_id):
+        """Current state dict for entity_id, or None."""
+        with self._lock:
+            return self._states.get(entity_id)
+
+    @property
+    def connected(self):
+        return self.synced and self.last_error is None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'mode': self.mode,
+                'entities': len(self._states),
+                'subscribers': len(self._subs),
+                'delivered': sum(s.delivered for s in self._subs),
+                'last_error': self.last_error,
+            })
+        stats['snapshot_ms_max'] = round(stats['snapshot_ms_max'], 1)
+        return stats
+
+    def shutdown(self, timeout=1.0):
+        self._stop.set()
+        self._wake.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _take(self, sub):
+        with self._lock:
+            pending, sub._pending = sub._pending, {}
+            sub.delivered += len(pending)
+        return pending
+
+    def _refilter(self, sub, entity_ids, domains):
+        with self._lock:
+            before = {eid for eid in self._states if sub.matches(eid)}
+            sub.entity_ids = frozenset(entity_ids or ())
+            sub.domains = frozenset(domains or ())
+            for eid, state in self._states.items():
+                if sub.matches(eid) and eid not in before:
+                    sub._pending[eid] = state
+            sub._pending = {eid: s for eid, s in sub._pending.items() if sub.matches(eid)}
+
+    # ------------------------------------------------------------------
+    # State updates (connection thread)
+    # ------------------------------------------------------------------
+
+    def _publish(self, entity_id, state):
+        """Queue a change for every matching subscriber. Lock held."""
+        for sub in self._subs:
+            if sub.matches(entity_id):
+                sub._pending[entity_id] = state
+
+    def _apply_snapshot(self, states):
+        """Diff a full /api/states snapshot against the held states."""
+        with self._lock:
+            seen = set()
+            for state in states:
+                eid = state.get('entity_id')
+                if not eid:
+                    continue
+                seen.add(eid)
+                old = self._states.get(eid)
+                if (old is None or old.get('last_updated') != state.get('last_updated')
+                        or old.get('state') != state.get('state')):
+                    self._states[eid] = state
+                    self._publish(eid, state)
+            for eid in [e for e in self._states if e not in seen]:
+                del self._states[eid]
+                self._publish(eid, None)
+            self.synced = True
+
+    def _apply_event(self, data):
+        """Apply one state_changed event's data ({entity_id, new_state})."""
+        eid = data.get('entity_id')
+        if not eid:
+            return
+        new = data.get('new_state')
+        with self._lock:
+            self._stats['events'] += 1
+            old = self._states.get(eid)
+            if new is None:
+                if old is not None:
+                    del self._states[eid]
+                    self._publish(eid, None)
+                return
+            # Events queued while the snapshot downloaded can be older
+            # than what it returned (HA timestamps are ISO-8601 UTC)
+            if old is not None and (new.get('last_updated') or '') < (old.get('last_updated') or ''):
+                self._stats['stale_events'] += 1
+                return
+            self._states[eid] = new
+            self._publish(eid, new)
+
+    def _snapshot(self):
+        """Download /api/states and apply it."""
+        start = time.perf_counter()
+        try:
+            resp = http_client.get(f"{self.ha_url}/api/states", headers=self.headers,
+                                   timeout=self.timeout, api=("ha_state", "home-assistant"))
+            resp.raise_for_status()
+            states = resp.json()
+        except APICallBlocked:
+            raise RuntimeError("home-assistant call budget exhausted")
+        except Exception:
+            api_tracker.failure("ha_state", "home-assistant")
+            raise
+        self._apply_snapshot(states)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        with self._lock:
+            self._stats['snapshots'] += 1
+            self._stats['snapshot_bytes'] += len(resp.content)
+            self._stats['snapshot_ms_max'] = max(self._stats['snapshot_ms_max'], elapsed)
+
+    # ------------------------------------------------------------------
+    # Connection loop
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ha-state", daemon=True)
+            self._thread.start()
+
+    def _poll_interval(self):
+        with self._lock:
+            return min([s.poll_interval_s for s in self._subs] or [self.poll_interval_s])
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            if websocket is not None:
+                started = time.monotonic()
+                try:
+                    self._run_websocket()
+                except HAAuthError as e:
+                    self.last_error = str(e)
+                    logger.error(f"HA WebSocket auth failed: {e}")
+                except websocket.WebSocketBadStatusException as e:
+                    # Handshake refused (proxy without WebSocket support)
+                    self.last_error = f"WebSocket handshake HTTP {e.status_code}"
+                    logger.warning(f"HA WebSocket unavailable: {self.last_error}")
+                except Exception as e:
+                    if not self._stop.is_set():
+                        self.last_error = str(e)
+                        logger.warning(f"HA WebSocket unavailable: {e}")
+                finally:
+                    self._ws = None
+                if time.monotonic() - started > 60:
+                    backoff = 1.0   # it was up for a while: reconnect promptly
+            self._poll_until(time.monotonic() + backoff if websocket is not None else None)
+            backoff = min(backoff * 2, self.reconnect_max_s)
+        self.mode = MODE_OFFLINE
+
+    def _poll_until(self, retry_at):
+        """Poll /api/states until retry_at (monotonic), stop, or forever."""
+        self.mode = MODE_POLLING
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if retry_at is not None and now >= retry_at:
+                return
+            if now - self._last_poll >= self._poll_interval():
+                self._last_poll = now
+                try:
+                    self._snapshot()
+                    self.last_error = None
+                except Exception as e:
+                    self._stats['poll_failures'] += 1
+                    self.last_error = str(e)
+                    logger.warning(f"HA poll failed: {e}")
+            wait = self._poll_interval() - (time.monotonic() - self._last_poll)
+            if retry_at is not None:
+                wait = min(wait, retry_at - time.monotonic())
+            self._wake.wait(max(0.05, min(wait, 5.0)))
+            self._wake.clear()
+
+    def _recv_json(self, ws):
+        raw = ws.recv()
+        self._stats['ws_bytes'] += len(raw)
+        return json.loads(raw)
+
+    def _run_websocket(self):
+        """One WebSocket session: auth, subscribe, snapshot, then events."""
+        ws = websocket.create_connection(self.ws_url, timeout=self.timeout)
+        self._ws = ws
+        try:
+            if self._recv_json(ws).get('type') != 'auth_required':
+                raise RuntimeError("unexpected HA WebSocket greeting")
+            ws.send(json.dumps({'type': 'auth', 'access_token': self._token}))
+            reply = self._recv_json(ws)
+            if reply.get('type') != 'auth_ok':
+                raise HAAuthError(reply.get('message', reply.get('type')))
+            ws.send(json.dumps({'id': 1, 'type': 'subscribe_events',
+                                'event_type': 'state_changed'}))
+            reply = self._recv_json(ws)
+            if not reply.get('success'):
+                raise RuntimeError(f"subscribe_events failed: {reply.get('error')}")
+
+            self._snapshot()
+            self._stats['ws_connects'] += 1
+            self.mode = MODE_WEBSOCKET
+            self.last_error = None
+            logger.info(f"HA state stream connected ({len(self._states)} entities)")
+
+            ws.settimeout(1.0)
+            while not self._stop.is_set():
+                try:
+                    msg = self._recv_json(ws)
+                except websocket.WebSocketTimeoutException:
+                    continue
+                for item in msg if isinstance(msg, list) else (msg,):
+                    if item.get('type') == 'event':
+                        self._apply_event(item.get('event', {}).get('data', {}))
+        finally:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def ha_state_store(ha_url, ha_token, timeout=10):
+    """The shared HAStateStore for this HA instance (created on first use)."""
+    key = (ha_url.rstrip('/'), ha_token)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = HAStateStore(ha_url, ha_token, timeout=timeout)
+            _stores[key] = store
+        return store
+
+
+def shutdown_ha_stores(timeout=0.5):
+    """Stop every store's connection thread (app shutdown)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.shutdown(timeout)
@@ -0,0 +1,366 @@
+"""Shared HTTP client for AI-Mirror modules.
+
+Every module used to call requests.get()/post() directly, so each poll
+opened a fresh TCP (and TLS) connection and re-downloaded payloads that
+had not changed. All upstream HTTP now goes through the module-level
+http_client:
+
+  - one pooled requests.Session per host, so polls reuse a keep-alive
+    connection instead of handshaking again;
+  - conditional GET: responses carrying an ETag or Last-Modified are
+    remembered, later GETs send If-None-Match / If-Modified-Since, and
+    a 304 is answered from the remembered body (the caller still sees a
+    normal 200 response with resp.revalidated set);
+  - Cache-Control max-age is honoured: a still-fresh response is served
+    without touching the network at all;
+  - per-host metrics: requests, network calls, 304s, fresh hits, bytes,
+    new connections (handshakes) and latency - get_stats(), web panel
+    /api/http.
+
+Usage:
+    from http_client import http_client, APICallBlocked
+    try:
+        resp = http_client.get(url, params=..., timeout=10,
+                               api=("weather", "open-meteo"))
+    except APICallBlocked:
+        return None     # over budget / circuit open
+
+With api=(module, service) the client asks api_tracker.allow() before
+going to the network and records the call once it has succeeded (2xx,
+or a 304 revalidation) - fresh hits are free. A 4xx/5xx is not
+recorded, since record() closes the circuit breaker; breaker failures
+stay with the caller (it knows what counts as one).
+
+CONFIG['http_client'] can turn pooling or revalidation off to measure
+the old behaviour (benchmarks/bench_http.py). For offline load testing
+it can also record every response into a fixture directory
+(record_dir) and send all traffic to upstream_replay.py (replay_url) or
+to per-prefix base_url_overrides - see upstream_replay.py.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from api_tracker import api_tracker
+from config import CONFIG
+
+logger = logging.getLogger("HTTPClient")
+
+
+class APICallBlocked(Exception):
+    """api_tracker refused the call (rate limit or open circuit)."""
+
+
+class _CachedResponse:
+    """A remembered response body plus its validators."""
+
+    __slots__ = ('status', 'headers', 'body', 'encoding', 'url',
+                 'etag', 'last_modified', 'fresh_until')
+
+    def __init__(self, resp, fresh_until):
+        self.status = resp.status_code
+        self.headers = dict(resp.headers)
+        self.body = resp.content
+        self.encoding = resp.encoding
+        self.url = resp.url
+        self.etag = resp.headers.get('ETag')
+        self.last_modified = resp.headers.get('Last-Modified')
+        self.fresh_until = fresh_until
+
+    def to_response(self, revalidated):
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp.reason = 'OK'
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp._content = self.body
+        resp.encoding = self.encoding
+        resp.url = self.url
+        resp.revalidated = revalidated
+        return resp
+
+
+class _HostStats:
+    """Counters and latency for one host."""
+
+    def __init__(self):
+        self.requests = 0        # calls made through the client
+        self.network = 0         # calls that went over the wire
+        self.not_modified = 0    # 304s answered from the remembered body
+        self.fresh_hits = 0      # served from cache, no network
+        self.errors = 0
+        self.bytes_in = 0        # response bodies received
+        self.bytes_saved = 0     # bodies a 304 / fresh hit did not resend
+        self.handshakes = 0      # new TCP connections opened
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def as_dict(self, hours):
+        network = max(self.network, 1)
+        return {
+            'requests': self.requests,
+            'network': self.network,
+            'not_modified': self.not_modified,
+            'fresh_hits': self.fresh_hits,
+            'errors': self.errors,
+            'bytes_in': self.bytes_in,
+            'bytes_saved': self.bytes_saved,
+            'handshakes': self.handshakes,
+            'bytes_per_hour': int(self.bytes_in / hours),
+            'handshakes_per_hour': round(self.handshakes / hours, 1),
+            'latency_ms_mean': round(self.latency_total / network * 1000.0, 1),
+            'latency_ms_max': round(self.latency_max * 1000.0, 1),
+        }
+
+
+def _max_age(headers):
+    """Seconds a response may be reused without revalidating, or None."""
+    cc = headers.get('Cache-Control', '').lower()
+    if 'no-store' in cc:
+        return None
+    if 'no-cache' in cc:
+        return 0
+    for part in cc.split(','):
+        name, _, value = part.strip().partition('=')
+        if name == 'max-age':
+            try:
+                return max(0, int(value))
+            except ValueError:
+                return 0
+    return 0
+
+
+class HTTPClient:
+    def __init__(self, pooling=True, revalidate=True, pool_maxsize=4,
+                 cache_max_bytes=4 * 1024 * 1024, clock=time.monotonic,
+                 replay_url=None, record_dir=None, base_url_overrides=None):
+        self.pooling = pooling
+        self.revalidate = revalidate
+        self.pool_maxsize = pool_maxsize
+        self.cache_max_bytes = cache_max_bytes
+        self.replay_url = replay_url.rstrip('/') if replay_url else None
+        self.record_dir = record_dir
+        # Longest prefix first so a specific override beats a general one
+        self.base_url_overrides = sorted((base_url_overrides or {}).items(),
+                                         key=lambda kv: -len(kv[0]))
+        self._clock = clock
+        self._sessions = {}
+        self._cache = OrderedDict()    # request key -> _CachedResponse (LRU)
+        self._cache_bytes = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._started = clock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, url, api=None, **kwargs):
+        return self.request('GET', url, api=api, **kwargs)
+
+    def post(self, url, api=None, **kwargs):
+        return self.request('POST', url, api=api, **kwargs)
+
+    def resolve_url(self, url):
+        """Where url is actually sent: base_url_overrides, then replay_url."""
+        for prefix, target in self.base_url_overrides:
+            if url.startswith(prefix):
+                return target.rstrip('/') + url[len(prefix):]
+        if self.replay_url:
+            parts = urlsplit(url)
+            query = f"?{parts.query}" if parts.query else ''
+            return f"{self.replay_url}/{parts.netloc}{parts.path}{query}"
+        return url
+
+    def request(self, method, url, api=None, **kwargs):
+        """Like requests.request(), pooled and (for GET) revalidated.
+
+        Stats are kept under the upstream host even when the call is
+        redirected to a replay server.
+        """
+        host = urlsplit(url).netloc
+        key = None
+        cached = None
+        if method == 'GET' and self.revalidate:
+            key = requests.Request('GET', url, params=kwargs.get('params')).prepare().url
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                stats = self._host_stats(host)
+                stats.requests += 1
+                if cached is not None and cached.fresh_until > self._clock():
+                    stats.fresh_hits += 1
+                    stats.bytes_saved += len(cached.body)
+                    return cached.to_response(revalidated=True)
+        else:
+            with self._lock:
+                self._host_stats(host).requests += 1
+
+        if api is not None and not api_tracker.allow(*api):
+            raise APICallBlocked(f"{api[1]} call blocked by api_tracker")
+
+        if cached is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+            kwargs['headers'] = headers
+
+        target = self.resolve_url(url)
+        start = time.perf_counter()
+        try:
+            if self.pooling:
+                session = self._session(urlsplit(target).netloc)
+                before = self._connections(session)
+                resp = session.request(method, target, **kwargs)
+                opened = self._connections(session) - before
+            else:
+                resp = requests.request(method, target, **kwargs)
+                opened = 1
+        except Exception:
+            with self._lock:
+                stats = self._host_stats(host)
+                stats.network += 1
+                stats.errors += 1
+            raise
+        elapsed = time.perf_counter() - start
+        if api is not None and (200 <= resp.status_code < 300 or resp.status_code == 304):
+            api_tracker.record(*api)
+
+        with self._lock:
+            stats = self._host_stats(host)
+            stats.network += 1
+            stats.handshakes += opened
+            stats.bytes_in += len(resp.content)
+            stats.latency_total += elapsed
+            stats.latency_max = max(stats.latency_max, elapsed)
+
+            if cached is not None and resp.status_code == 304:
+                stats.not_modified += 1
+                stats.bytes_saved += len(cached.body)
+                age = _max_age(resp.headers)
+                if age is not None:
+                    cached.fresh_until = self._clock() + age
+                cached.etag = resp.headers.get('ETag', cached.etag)
+                cached.last_modified = resp.headers.get('Last-Modified', cached.last_modified)
+                resp = cached.to_response(revalidated=True)
+            else:
+                if key is not None:
+                    self._remember(key, resp)
+                resp.revalidated = False
+        if self.record_dir:
+            self._record(method, url, resp, kwargs)
+        return resp
+
+    def get_stats(self):
+        """Per-host counters plus totals; rates are per hour of uptime."""
+        hours = max((self._clock() - self._started) / 3600.0, 1e-6)
+        with self._lock:
+            hosts = {h: s.as_dict(hours) for h, s in self._stats.items()}
+            cache = {'entries': len(self._cache), 'bytes': self._cache_bytes,
+                     'max_bytes': self.cache_max_bytes}
+        totals = {name: sum(h[name] for h in hosts.values())
+                  for name in ('requests', 'network', 'not_modified', 'fresh_hits',
+                               'errors', 'bytes_in', 'bytes_saved', 'handshakes')}
+        totals['bytes_per_hour'] = int(totals['bytes_in'] / hours)
+        totals['handshakes_per_hour'] = round(totals['handshakes'] / hours, 1)
+        return {'pooling': self.pooling, 'revalidate': self.revalidate,
+                'uptime_s': round(hours * 3600.0), 'totals': totals,
+                'hosts': hosts, 'cache': cache}
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _host_stats(self, host):
+        """Stats for host. Lock held."""
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats[host] = _HostStats()
+        return stats
+
+    def _session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    @staticmethod
+    def _connections(session):
+        """Connections this session's pools have opened so far."""
+        total = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is not None:
+                    total += pool.num_connections
+        return total
+
+    def _record(self, method, url, resp, kwargs):
+        """Save resp as a replay fixture; never fails the caller."""
+        import upstream_replay
+        if kwargs.get('params'):
+            url = requests.Request(method, url, params=kwargs['params']).prepare().url
+        try:
+            upstream_replay.save_fixture(self.record_dir, method, url, resp,
+                                         json_body=kwargs.get('json'), data=kwargs.get('data'))
+        except Exception as e:
+            logger.warning(f"Could not record {method} {urlsplit(url).netloc}: {e}")
+
+    def _remember(self, key, resp):
+        """Keep a revalidatable 200 response (LRU by bytes). Lock held."""
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._cache_bytes -= len(old.body)
+        if resp.status_code != 200:
+            return
+        age = _max_age(resp.headers)
+        has_validator = 'ETag' in resp.headers or 'Last-Modified' in resp.headers
+        if age is None or (not has_validator and not age):
+            return
+        if len(resp.content) > self.cache_max_bytes // 2:
+            return
+        self._cache[key] = _CachedResponse(resp, self._clock() + age)
+        self._cache_bytes += len(resp.content)
+        while self._cache_bytes > self.cache_max_bytes and self._cache:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted.body)
+
+
+_settings = CONFIG.get('http_client', {})
+http_client = HTTPClient(
+    pooling=_settings.get('pooling', True),
+    revalidate=_settings.get('revalidate', True),
+    pool_maxsize=_settings.get('pool_maxsize', 4),
+    cache_max_bytes=_settings.get('cache_max_bytes', 4 * 1024 * 1024),
+    replay_url=_settings.get('replay_url'),
+    record_dir=_settings.get('record_dir'),
+    base_url_overrides=_settings.get('base_url_overrides'),
+)
+if http_client.replay_url or http_client.base_url_overrides:
+    logger.warning(f"Upstream traffic redirected: replay_url={http_client.replay_url} "
+                   f"overrides={dict(http_client.base_url_overrides)}")
+if http_client.record_dir:
+    logger.info(f"Recording upstream responses to {os.path.abspath(http_client.record_dir)}")
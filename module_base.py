@@ -6,6 +6,9 @@ rendering helpers, and surface caching. All modules use these helpers
 for a unified minimal-luxury visual style.
 """
 
+import weakref
+from collections import OrderedDict
+
 import pygame
 from config import (
     CONFIG, FONT_NAME, FONT_SIZE_TITLE, FONT_SIZE_BODY, FONT_SIZE_SMALL,
@@ -14,30 +17,291 @@ from config import (
 )
 
 
+def surface_bytes(surface):
+    """Pixel memory held by a surface (width x height x bytes per pixel)."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class SurfaceBudget:
+    """Byte budget shared by every SurfaceCache.
+
+    When the total goes over max_bytes the least recently used surface
+    across all caches is evicted, so a module that churns keys (news
+    headlines, stock values) pushes out its own stale text first rather
+    than growing without bound.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._tick = 0
+        self._caches = weakref.WeakSet()
+
+    def register(self, cache):
+        self._caches.add(cache)
+        # Give back a collected cache's bytes (finalizer must not hold the cache)
+        weakref.finalize(cache, self._release_all, cache._entries)
+
+    def _release_all(self, entries):
+        self.bytes -= sum(entry[2] for entry in entries.values())
+
+    def next_tick(self):
+        self._tick += 1
+        return self._tick
+
+    def charge(self, cache, key, nbytes):
+        """Account for a new surface, evicting LRU entries to fit."""
+        self.bytes += nbytes
+        while self.bytes > self.max_bytes:
+            victim = None
+            for other in list(self._caches):
+                head = other.lru_key()
+                if head is None or (other is cache and head == key):
+                    continue
+                tick = other._entries[head][3]
+                if victim is None or tick < victim[2]:
+                    victim = (other, head, tick)
+            if victim is None:
+                break  # only the new surface is left; keep it
+            victim[0]._evict(victim[1])
+            self.evictions += 1
+
+    def get_stats(self):
+        caches = sorted(list(self._caches), key=lambda c: c.name)
+        return {
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'caches': {c.name: c.get_stats() for c in caches},
+        }
+
+
 class SurfaceCache:
     """Cache rendered text surfaces to avoid per-frame font.render() calls.
 
-    Only re-renders when the source data actually changes.
+    Only re-renders when the source data actually changes. Entries live
+    in LRU order and count against the shared surface_budget, so keys a
+    module stops using are eventually evicted.
     """
 
-    def __init__(self):
-        self._cache = {}
+    def __init__(self, name="surfaces", budget=None):
+        self.name = name
+        self._entries = OrderedDict()  # key -> [surface, data_hash, bytes, tick]
+        self._budget = budget or surface_budget
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._budget.register(self)
 
     def get_or_render(self, key, render_func, data_hash):
         """Return cached surface if data_hash unchanged, else re-render."""
-        entry = self._cache.get(key)
-        if entry and entry[1] == data_hash:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == data_hash:
+            self.hits += 1
+            entry[3] = self._budget.next_tick()
+            self._entries.move_to_end(key)
             return entry[0]
+        self.misses += 1
+        if entry is not None:
+            self._drop(key)
         surface = render_func()
-        self._cache[key] = (surface, data_hash)
+        nbytes = surface_bytes(surface)
+        self._entries[key] = [surface, data_hash, nbytes, self._budget.next_tick()]
+        self.bytes += nbytes
+        self._budget.charge(self, key, nbytes)
         return surface
 
+    def lru_key(self):
+        """Least recently used key, or None when empty."""
+        return next(iter(self._entries), None)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry[2]
+        self._budget.bytes -= entry[2]
+
+    def _evict(self, key):
+        self._drop(key)
+        self.evictions += 1
+
     def invalidate(self, key=None):
         """Clear specific key or entire cache."""
         if key:
-            self._cache.pop(key, None)
+            if key in self._entries:
+                self._drop(key)
+        else:
+            for k in list(self._entries):
+                self._drop(k)
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Shared by all SurfaceCache instances (CONFIG['surface_cache'])
+surface_budget = SurfaceBudget(
+    CONFIG.get('surface_cache', {}).get('max_bytes', 32 * 1024 * 1024)
+)
+
+
+class RetainedLayer:
+    """Opt-in retained-mode drawing for modules whose content rarely changes.
+
+    A module mixes this in and either calls mark_dirty() from update()
+    whenever what draw() shows has changed, or overrides content_version()
+    to return any cheap, comparable value derived from its display state.
+    The main loop keeps one pre-rendered surface per module (LayerCache)
+    and only re-runs draw() when the version changes. draw() must stay
+    inside its position rect.
+    """
+
+    _layer_version = 0
+
+    def mark_dirty(self):
+        """Force a re-render of the cached layer on the next frame."""
+        self._layer_version += 1
+
+    def content_version(self):
+        """Value that changes whenever draw() would produce new pixels."""
+        return self._layer_version
+
+
+class LayerCache:
+    """One pre-rendered surface per RetainedLayer module.
+
+    Fade alpha is applied when the cached surface is blitted, so fades
+    never force a re-render.
+    """
+
+    def __init__(self):
+        self._layers = {}  # name -> (version, (w, h), surface)
+        self.renders = 0
+        self.blits = 0
+
+    @staticmethod
+    def _size(position):
+        return (max(int(position.get('width', 300)), 1),
+                max(int(position.get('height', 300)), 1))
+
+    def is_stale(self, name, module, position):
+        """True if the module must be re-rendered before its next blit."""
+        entry = self._layers.get(name)
+        return (entry is None or entry[1] != self._size(position)
+                or entry[0] != module.content_version())
+
+    def blit(self, screen, name, module, position, alpha=TRANSPARENCY):
+        """Blit the module's cached layer, re-rendering it if stale."""
+        size = self._size(position)
+        version = module.content_version()
+        entry = self._layers.get(name)
+        if entry is None or entry[1] != size or entry[0] != version:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            module.draw(surface, dict(position, x=0, y=0))
+            entry = (version, size, surface)
+            self._layers[name] = entry
+            self.renders += 1
+        surface = entry[2]
+        surface.set_alpha(alpha)
+        screen.blit(surface, (position.get('x', 0), position.get('y', 0)))
+        self.blits += 1
+
+    def invalidate(self, name=None):
+        """Drop one cached layer, or all of them."""
+        if name:
+            self._layers.pop(name, None)
         else:
-            self._cache.clear()
+            self._layers.clear()
+
+    def get_stats(self):
+        return {'layers': len(self._layers), 'renders': self.renders, 'blits': self.blits}
+
+
+class GlyphAtlas:
+    """Pre-rasterised glyphs for one (font, colour), packed on a sheet.
+
+    Each character is rendered with font.render() once, copied onto a
+    shelf-packed sheet, and its advance (rendered width) recorded.
+    Tracked strings are then assembled from area blits of the sheet
+    instead of one font.render() per character. A pygame Font already
+    fixes the face and size, so (font, colour) identifies an atlas.
+    """
+
+    SHEET_WIDTH = 1024
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self._glyphs = {}    # char -> (Rect on sheet, advance)
+        self._row_h = font.get_linesize() + 2
+        self._sheet = pygame.Surface((self.SHEET_WIDTH, self._row_h), pygame.SRCALPHA)
+        self._x = 0
+        self._y = 0
+        self.rasterised = 0
+
+    def _add(self, ch):
+        glyph = self.font.render(ch, True, self.color)
+        w, h = glyph.get_size()
+        if self._x + w > self.SHEET_WIDTH:
+            self._x, self._y = 0, self._y + self._row_h
+        if h > self._row_h or self._y + self._row_h > self._sheet.get_height():
+            self._row_h = max(self._row_h, h)
+            grown = pygame.Surface(
+                (self.SHEET_WIDTH, self._y + self._row_h * 2), pygame.SRCALPHA
+            )
+            grown.blit(self._sheet, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self._sheet = grown
+        # MAX onto transparent pixels copies RGBA verbatim (no blending)
+        self._sheet.blit(glyph, (self._x, self._y), special_flags=pygame.BLEND_RGBA_MAX)
+        entry = (pygame.Rect(self._x, self._y, w, h), w)
+        self._x += w
+        self._glyphs[ch] = entry
+        self.rasterised += 1
+        return entry
+
+    def render(self, text, tracking=0):
+        """Letter-spaced string surface built from atlas blits."""
+        glyphs = [self._glyphs.get(ch) or self._add(ch) for ch in text]
+        if not glyphs:
+            return pygame.Surface((1, 1), pygame.SRCALPHA)
+        width = sum(advance for _, advance in glyphs) + tracking * (len(glyphs) - 1)
+        height = max(rect.height for rect, _ in glyphs)
+        surf = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
+        x = 0
+        for rect, advance in glyphs:
+            if rect.width:
+                surf.blit(self._sheet, (x, 0), rect)
+            x += advance + tracking
+        return surf
+
+
+_glyph_atlases = OrderedDict()  # (font, colour) -> GlyphAtlas, LRU order
+MAX_GLYPH_ATLASES = CONFIG.get('surface_cache', {}).get('max_glyph_atlases', 32)
+
+
+def glyph_atlas(font, color):
+    """Shared atlas for a font and colour (created on first use).
+
+    At most MAX_GLYPH_ATLASES are kept; the least recently used one is
+    dropped, so font or colour churn cannot hold sheets forever.
+    """
+    key = (font, tuple(color))
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        atlas = _glyph_atlases[key] = GlyphAtlas(font, color)
+        while len(_glyph_atlases) > MAX_GLYPH_ATLASES:
+            _glyph_atlases.popitem(last=False)
+    else:
+        _glyph_atlases.move_to_end(key)
+    return atlas
 
 
 class ModuleDrawHelper:
@@ -74,20 +338,11 @@ class ModuleDrawHelper:
     def render_tracked(font, text, color, tracking=LABEL_TRACKING):
         """Render text with letterspacing (pygame has none natively).
 
-        Used for the uppercase module labels; cache the result, do not
-        call per frame for long strings.
+        Used for the uppercase module labels and the clock date. Glyphs
+        come from the shared GlyphAtlas; still cache the result rather
+        than calling per frame for long strings.
         """
-        glyphs = [font.render(ch, True, color) for ch in text]
-        if not glyphs:
-            return pygame.Surface((1, 1), pygame.SRCALPHA)
-        width = sum(g.get_width() for g in glyphs) + tracking * (len(glyphs) - 1)
-        height = max(g.get_height() for g in glyphs)
-        surf = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
-        x = 0
-        for g in glyphs:
-            surf.blit(g, (x, 0))
-            x += g.get_width() + tracking
-        return surf
+        return glyph_atlas(font, color).render(text, tracking)
 
     # Per-class cache of rendered title labels (they rarely change)
     _title_cache = {}
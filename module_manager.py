@@ -1,17 +1,371 @@
+import importlib
 import logging
+import sys
+import threading
 from config import CONFIG
 import time
 import traceback
 
+# Module class -> source file, for import by name. Nothing here is
+# imported until a module is first needed (or pre-warmed).
+MODULE_SOURCES = {
+    'ClockModule': 'clock_module',
+    'WeatherModule': 'weather_module',
+    'StocksModule': 'stocks_module',
+    'CalendarModule': 'calendar_module',
+    'FitbitModule': 'fitbit_module',
+    'RetroCharactersModule': 'retrocharacters_module',
+    'AIVoiceModule': 'ai_voice_module',
+    'AIInteractionModule': 'AI_Module',
+    'ElevenVoice': 'elevenvoice_module',
+    'CountdownModule': 'countdown_module',
+    'QuoteModule': 'quote_module',
+    'NewsModule': 'news_module',
+    'OpenClawModule': 'openclaw_module',
+    'SmartHomeModule': 'smarthome_module',
+    'SysInfoModule': 'sysinfo_module',
+    'GreetingModule': 'greeting_module',
+    'OctopusEnergyModule': 'octopus_energy_module',
+    'AvatarModule': 'avatar_module',
+    'PhoneModule': 'phone_module',
+}
+
+# Voice modules take their whole config dict rather than **params
+CONFIG_ARG_CLASSES = ('AIVoiceModule', 'AIInteractionModule')
+
+# name -> module it stands in for: only built if that one is missing/failed
+FALLBACKS = {'ai_interaction': 'ai_voice'}
+
+
+def import_module_class(class_name):
+    """Import a module class by name (see MODULE_SOURCES)."""
+    source = MODULE_SOURCES.get(class_name)
+    if source is None:
+        return None
+    return getattr(importlib.import_module(source), class_name, None)
+
+
+class ModuleRegistry:
+    """Builds mirror modules on demand instead of all at boot.
+
+    Every configured module is registered by name, but its source is
+    only imported and its class only constructed when the module first
+    becomes visible (request() + pump() on the main loop, a few per
+    frame) or a command needs it (load()). After the first frame,
+    prewarm() imports the remaining sources on a background thread so a
+    later load only pays for __init__. Each import and init is timed
+    into a startup timeline (get_timeline(), report()).
+    """
+
+    def __init__(self, config=None, frame_budget_ms=40.0, clock=time.perf_counter):
+        self.config = CONFIG if config is None else config
+        self.frame_budget_ms = frame_budget_ms
+        self.logger = logging.getLogger("ModuleRegistry")
+        self._clock = clock
+        self._boot = clock()
+        self.modules = {}          # constructed only: name -> instance
+        self._specs = {}           # name -> config entry
+        self._state = {}           # name -> registered|loaded|failed|skipped
+        self._pending = []         # names waiting for pump(), in order
+        self._standing_in = set()  # fallbacks built although their primary loaded
+        self._imports = {}         # source -> {'ms', 'thread'}
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._prewarm_thread = None
+        self._warming = None       # source the pre-warm thread is importing
+        self._first_frame = False
+        self._reported = False
+        self.timeline = []         # one dict per load attempt or mark
+
+    # ----- registration ---------------------------------------------------
+
+    def register_from_config(self, skip=()):
+        """Register every config entry with a known 'class', in config
+        order, except those hidden in module_visibility (voice modules
+        open connections and cost credits, so they stay opt-in)."""
+        visibility = self.config.get('module_visibility', {})
+        for name, entry in self.config.items():
+            if not isinstance(entry, dict) or entry.get('class') not in MODULE_SOURCES:
+                continue
+            if name in skip:
+                continue
+            if not visibility.get(name, True):
+                self.logger.info(f"Skipping {name}: disabled in module_visibility")
+                continue
+            self.register(name, entry)
+
+    def register(self, name, entry):
+        self._specs[name] = entry
+        self._state.setdefault(name, 'registered')
+
+    def adopt(self, modules):
+        """Use already-built modules (tests, benchmarks) as loaded."""
+        self.modules = modules
+        for name in modules:
+            self._state[name] = 'loaded'
+
+    def add_listener(self, callback):
+        """callback(name, module) after each successful load (main loop)."""
+        self._listeners.append(callback)
+
+    def names(self):
+        """Every registered or adopted module name."""
+        return list(self._specs) + [n for n in self.modules if n not in self._specs]
+
+    def is_loaded(self, name):
+        return name in self.modules
+
+    def state(self, name):
+        return self._state.get(name)
+
+    # ----- loading --------------------------------------------------------
+
+    def _ms(self):
+        return round((self._clock() - self._boot) * 1000.0, 1)
+
+    def _import(self, source):
+        """Import a source file, timing it once (whichever thread gets there first).
+
+        Always goes through import_module: a source still being imported
+        on the other thread is already in sys.modules, and the import
+        lock is what makes this wait for it to finish.
+        """
+        if source in sys.modules:
+            importlib.import_module(source)
+            return
+        start = self._clock()
+        importlib.import_module(source)
+        with self._lock:
+            self._imports.setdefault(source, {
+                'ms': round((self._clock() - start) * 1000.0, 1),
+                'thread': threading.current_thread().name,
+            })
+
+    def load(self, name, trigger='command'):
+        """The module instance, constructing it now if needed (main loop).
+
+        Returns None for unknown modules, failed ones, and fallbacks
+        whose primary loaded fine.
+        """
+        if name in self.modules:
+            return self.modules[name]
+        if self._state.get(name) != 'registered':
+            return None
+        primary = FALLBACKS.get(name)
+        if (primary in self._specs and name not in self._standing_in
+                and self.load(primary, trigger) is not None):
+            self._state[name] = 'skipped'
+            self.logger.info(f"{primary} loaded - skipping fallback {name}")
+            return None
+        if name in self._pending:
+            self._pending.remove(name)
+
+        entry = self._specs[name]
+        class_name = entry['class']
+        source = MODULE_SOURCES[class_name]
+        event = {'name': name, 'class': class_name, 'trigger': trigger, 'at_ms': self._ms()}
+        try:
+            self._import(source)
+            # Pre-warmed imports keep their background time; sources
+            # imported elsewhere (or by an earlier load) cost nothing here
+            imported = self._imports.get(source)
+            if imported is None or imported.get('claimed'):
+                event['import_ms'], event['import_thread'] = 0.0, None
+            else:
+                imported['claimed'] = True
+                event['import_ms'], event['import_thread'] = imported['ms'], imported['thread']
+            module_class = getattr(sys.modules[source], class_name)
+            start = self._clock()
+            if class_name in CONFIG_ARG_CLASSES:
+                instance = module_class(entry)
+            else:
+                instance = module_class(**entry.get('params', {}))
+            event['init_ms'] = round((self._clock() - start) * 1000.0, 1)
+        except Exception as e:
+            event['error'] = str(e)
+            self.timeline.append(event)
+            self._state[name] = 'failed'
+            self.logger.error(f"Error initializing {name}: {e}")
+            self.logger.error(traceback.format_exc())
+            fallback = next((f for f, p in FALLBACKS.items() if p == name), None)
+            if fallback in self._specs:
+                self.logger.warning(f"{name} failed - {fallback} will stand in")
+                self.request(fallback)
+            return None
+
+        self.timeline.append(event)
+        self.modules[name] = instance
+        self._state[name] = 'loaded'
+        self.logger.info(
+            f"Loaded {name} ({trigger}): import {event['import_ms']:.0f} ms, "
+            f"init {event['init_ms']:.0f} ms"
+        )
+        for callback in self._listeners:
+            try:
+                callback(name, instance)
+            except Exception as e:
+                self.logger.error(f"Load listener failed for {name}: {e}")
+                self.logger.error(traceback.format_exc())
+        return instance
+
+    def stand_in(self, name):
+        """Queue fallback name even though its primary loaded (the primary
+        turned out not to work). True if it is loaded or now queued."""
+        if name in self.modules:
+            return True
+        if self._state.get(name) == 'skipped':
+            self._state[name] = 'registered'
+        if self._state.get(name) != 'registered':
+            return False
+        self._standing_in.add(name)
+        self.request(name)
+        return True
+
+    def request(self, name):
+        """Queue a module for construction on a later pump()."""
+        if self._state.get(name) == 'registered' and name not in self._pending:
+            self._pending.append(name)
+
+    def pump(self, budget_ms=None):
+        """Construct queued modules for up to budget_ms (at least one).
+
+        Does nothing until first_frame(), so boot draws the eager
+        modules without waiting on the rest. Returns the names loaded.
+        """
+        if not self._first_frame:
+            return []
+        budget = self.frame_budget_ms if budget_ms is None else budget_ms
+        loaded = []
+        start = self._clock()
+        while self._pending:
+            name = next((n for n in self._pending if self._ready(n)), None)
+            if name is None:
+                break
+            if self.load(name, 'visible') is not None:
+                loaded.append(name)
+            elif name in self._pending:
+                self._pending.remove(name)
+            if (self._clock() - start) * 1000.0 >= budget:
+                break
+        if not self._reported and self.settled():
+            self._reported = True
+            self.mark('settled')
+            self.logger.info(self.report())
+        return loaded
+
+    def _ready(self, name):
+        """While pre-warm runs, only build modules it has finished importing:
+        importing on the main loop too would block on the import lock
+        (sources share heavy dependencies) and stall the frame."""
+        if self._prewarm_thread is None or not self._prewarm_thread.is_alive():
+            return True
+        source = MODULE_SOURCES[self._specs[name]['class']]
+        return source in sys.modules and source != self._warming
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def settled(self):
+        """First frame shown, nothing queued, pre-warm finished."""
+        return (self._first_frame and not self._pending
+                and (self._prewarm_thread is None or not self._prewarm_thread.is_alive()))
+
+    # ----- boot milestones and pre-warm -------------------------------------
+
+    def mark(self, label):
+        self.timeline.append({'mark': label, 'at_ms': self._ms()})
+
+    def first_frame(self, prewarm=True):
+        """Call once the first frame is on screen: starts pump() and pre-warm."""
+        if self._first_frame:
+            return
+        self._first_frame = True
+        self.mark('first_frame')
+        if prewarm:
+            self.prewarm()
+
+    def prewarm(self):
+        """Import every registered, unloaded module's source in the background.
+
+        Only imports: constructors create fonts and surfaces, which stay
+        on the main loop.
+        """
+        queued = self._pending + [n for n in self._specs if n not in self._pending]
+        sources = []
+        for name in queued:
+            if self._state.get(name) != 'registered':
+                continue
+            source = MODULE_SOURCES[self._specs[name]['class']]
+            if source not in sys.modules and source not in sources:
+                sources.append(source)
+        if not sources:
+            return
+
+        def run():
+            for source in sources:
+                self._warming = source
+                try:
+                    self._import(source)
+                except Exception as e:
+                    self.logger.warning(f"Pre-warm import of {source} failed: {e}")
+            self._warming = None
+
+        self._prewarm_thread = threading.Thread(target=run, name="module-prewarm", daemon=True)
+        self._prewarm_thread.start()
+        self.logger.info(f"Pre-warming {len(sources)} module imports")
+
+    # ----- reporting --------------------------------------------------------
+
+    def get_timeline(self):
+        """Timeline events plus per-source import times (web panel)."""
+        with self._lock:
+            imports = {s: {'ms': v['ms'], 'thread': v['thread']} for s, v in self._imports.items()}
+        return {
+            'events': [dict(e) for e in self.timeline],
+            'imports': imports,
+            'states': dict(self._state),
+            'pending': list(self._pending),
+        }
+
+    def report(self):
+        """Startup timeline as a text table (ms since the registry was built)."""
+        lines = ["Startup timeline (ms since boot):",
+                 f"  {'at':>8} {'import':>8} {'init':>8}  {'module':<18} trigger"]
+        for event in self.timeline:
+            if 'mark' in event:
+                lines.append(f"  {event['at_ms']:8.1f}  -- {event['mark']}")
+                continue
+            note = f"  FAILED: {event['error']}" if 'error' in event else ''
+            if event.get('import_thread') not in (None, 'MainThread'):
+                note += f"  (imported on {event['import_thread']})"
+            lines.append(
+                f"  {event['at_ms']:8.1f} {event.get('import_ms', 0.0):8.1f} "
+                f"{event.get('init_ms', 0.0):8.1f}  {event['name']:<18} {event['trigger']}{note}"
+            )
+        unloaded = [n for n, s in self._state.items() if s == 'registered']
+        if unloaded:
+            lines.append(f"  not loaded: {', '.join(unloaded)}")
+        return "\n".join(lines)
+
+
 class ModuleManager:
-    def __init__(self, initialized_modules=None):
+    def __init__(self, initialized_modules=None, registry=None):
         self.module_visibility = CONFIG.get('module_visibility', {})
         self.logger = logging.getLogger(__name__)
         
         self.modules = {}
         self.enabled_modules = CONFIG.get('enabled_modules', [])
+        self.registry = registry
+        self.voice_interface = None     # voice module in use, or 'ai_interaction'
         
-        if initialized_modules:
+        if registry is not None:
+            # Lazy: every registered module is visible by default; the
+            # voice check runs when a voice module actually loads
+            self.modules = registry.modules
+            self.enabled_modules = registry.names()
+            for module_name in self.enabled_modules:
+                self.module_visibility[module_name] = True
+        elif initialized_modules:
             self.modules = initialized_modules
             self.enabled_modules = list(initialized_modules.keys())
             self.logger.info("Using PRE-INITIALIZED modules from MagicMirror")
@@ -26,15 +380,25 @@ class ModuleManager:
             self.initialize_modules()
 
     def verify_voice_module(self):
-        """Verify if voice module is working; try alternatives if needed"""
+        """Verify if voice module is working; try alternatives if needed.
+
+        Called again on every voice state change, so it only acts (and
+        logs) when the voice interface in use changes.
+        """
         voice_modules = ['eleven_voice', 'ai_voice']
         
         for module_name in voice_modules:
             if module_name in self.modules:
                 try:
-                    if module_name == 'eleven_voice' or (hasattr(self.modules[module_name], 'session_ready') and 
-                        self.modules[module_name].session_ready):
+                    module = self.modules[module_name]
+                    if module_name == 'eleven_voice' or self._voice_functional(module):
+                        if self.voice_interface == module_name:
+                            return
                         self.logger.info(f"{module_name} is functional - using as primary voice interface")
+                        if self.voice_interface == 'ai_interaction':
+                            self.module_visibility['ai_interaction'] = False
+                        self.voice_interface = module_name
+                        self.module_visibility[module_name] = True
                         # Hide other voice modules
                         for other_module in voice_modules:
                             if other_module != module_name:
@@ -44,15 +408,28 @@ class ModuleManager:
                     self.logger.error(f"{module_name} verification failed: {e}")
                     continue
         
-        self.fallback_to_interaction()
+        if self.voice_interface != 'ai_interaction':
+            self.fallback_to_interaction()
+
+    @staticmethod
+    def _voice_functional(module):
+        """A Realtime module still connecting in the background counts: it
+        connects on its own thread, so it is not ready right after
+        construction. One that keeps failing to connect does not."""
+        if hasattr(module, 'is_functional'):
+            return module.is_functional()
+        return getattr(module, 'session_ready', False)
 
     def fallback_to_interaction(self):
         """Activate AIInteractionModule as fallback if AIVoiceModule fails"""
-        if 'ai_interaction' in self.modules:
+        if 'ai_interaction' in self.modules or (
+                self.registry is not None and self.registry.stand_in('ai_interaction')):
             self.logger.info("Falling back to AIInteractionModule")
+            self.voice_interface = 'ai_interaction'
             self.module_visibility['ai_voice'] = False
             self.module_visibility['ai_interaction'] = True
-        else:
+        elif self.voice_interface is not None:
+            self.voice_interface = None
             self.logger.error("No AIInteractionModule available for fallback")
 
     def handle_command(self, command):
@@ -63,6 +440,8 @@ class ModuleManager:
         if module in self.module_visibility:
             self.module_visibility[module] = (action == 'show')
             self.logger.info(f"{module} module visibility set to {self.module_visibility[module]}")
+            if action == 'show' and self.registry is not None:
+                self.registry.request(module)
             return True
         
         self.logger.warning(f"Unknown module: {module}")
@@ -131,7 +510,9 @@ class ModuleManager:
         self.logger.info("All modules initialized")
 
     def initialize_module(self, module_name):
-        """Initialize a specific module"""
+        """Initialize a specific module (through the registry when lazy)"""
+        if self.registry is not None:
+            return self.registry.load(module_name, 'command')
         if module_name not in self.enabled_modules:
             return
         
@@ -141,36 +522,18 @@ class ModuleManager:
             return
         
         try:
-            if config['class'] == 'AIVoiceModule':
-                from ai_voice_module import AIVoiceModule
-                module_class = AIVoiceModule
-            elif config['class'] == 'AIInteractionModule':
-                from AI_Module import AIInteractionModule
-                module_class = AIInteractionModule
-            elif config['class'] == 'ElevenVoice':
-                from elevenvoice_module import ElevenVoice
-                module_class = ElevenVoice
-            elif config['class'] == 'CountdownModule':
-                from countdown_module import CountdownModule
-                module_class = CountdownModule
-            elif config['class'] == 'QuoteModule':
-                from quote_module import QuoteModule
-                module_class = QuoteModule
-            elif config['class'] == 'NewsModule':
-                from news_module import NewsModule
-                module_class = NewsModule
-            elif config['class'] == 'OpenClawModule':
-                from openclaw_module import OpenClawModule
-                module_class = OpenClawModule
-            else:
-                module_class = globals().get(config['class'])
+            module_class = import_module_class(config['class'])
             
             if module_class:
                 self.logger.info(f"Initializing {module_name}")
-                instance = module_class(**config.get('params', {}))
+                if config['class'] in CONFIG_ARG_CLASSES:
+                    instance = module_class(config)
+                else:
+                    instance = module_class(**config.get('params', {}))
                 self.modules[module_name] = instance
                 self.module_visibility[module_name] = True
                 self.logger.info(f"Successfully initialized {module_name}")
+                return instance
             else:
                 self.logger.error(f"Class {config['class']} not found for {module_name}")
         except Exception as e:
@@ -0,0 +1,268 @@
+"""Per-module update/draw profiler for the AI-Mirror frame loop.
+
+When the mirror stutters, the question is which module is to blame.
+ModuleProfiler wraps each module's update() and draw() (plus the
+stocks ticker, smart home dashboard and notification draws) with a
+perf_counter pair, sums the time per frame, and feeds the per-frame
+totals into rolling latency histograms:
+
+    profiler.instrument(modules, animation_manager)
+    ...
+    profiler.end_frame(frame_seconds)     # once per loop iteration
+
+Histograms use fixed log-spaced buckets split into time slices, so the
+numbers cover the last window_s seconds and recording is a bisect plus
+an increment. A module whose time in one frame exceeds
+module_budget_ms counts as over budget for that frame; those counts
+are kept per slice too, so they cover the same window. Stats are
+served by the web panel (/api/profile) and summarised in the log.
+
+The wrapper's own cost is measured at startup (see measure_overhead)
+and reported with the stats, so it can be checked on the Pi.
+"""
+
+import logging
+import time
+from bisect import bisect_left
+
+logger = logging.getLogger("Profiler")
+
+# Bucket upper edges in ms; the last bucket catches everything above
+BUCKET_EDGES_MS = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0, 66.0, 133.0, 500.0,
+)
+
+
+class RollingHistogram:
+    """Latency histogram over the last N time slices.
+
+    With budget_ms, samples above it are also counted per slice, so the
+    over-budget count covers the same window as the percentiles.
+    """
+
+    def __init__(self, slices=6, budget_ms=None):
+        self.budget_ms = budget_ms
+        self._counts = [[0] * (len(BUCKET_EDGES_MS) + 1) for _ in range(slices)]
+        self._sums = [0.0] * slices
+        self._maxes = [0.0] * slices
+        self._over = [0] * slices
+        self._current = 0
+
+    def add(self, ms):
+        s = self._current
+        self._counts[s][bisect_left(BUCKET_EDGES_MS, ms)] += 1
+        self._sums[s] += ms
+        if ms > self._maxes[s]:
+            self._maxes[s] = ms
+        if self.budget_ms is not None and ms > self.budget_ms:
+            self._over[s] += 1
+
+    def rotate(self):
+        """Start a new slice, dropping the oldest."""
+        self._current = (self._current + 1) % len(self._counts)
+        self._counts[self._current] = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self._sums[self._current] = 0.0
+        self._maxes[self._current] = 0.0
+        self._over[self._current] = 0
+
+    def summary(self):
+        """count, mean, bucket-resolution p50/p95/p99 (ms) and, with a
+        budget, over_budget over the window."""
+        merged = [sum(col) for col in zip(*self._counts)]
+        count = sum(merged)
+        peak = max(self._maxes)
+        result = {'count': count, 'mean_ms': round(sum(self._sums) / count, 3) if count else 0.0}
+        for label, q in (('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+            result[label] = self._quantile(merged, count, q, peak)
+        result['max_ms'] = round(peak, 3)
+        if self.budget_ms is not None:
+            result['over_budget'] = sum(self._over)
+        return result
+
+    @staticmethod
+    def _quantile(merged, count, q, peak):
+        if not count:
+            return 0.0
+        target = q * count
+        seen = 0
+        for i, n in enumerate(merged):
+            seen += n
+            if seen >= target:
+                edge = BUCKET_EDGES_MS[i] if i < len(BUCKET_EDGES_MS) else peak
+                return round(min(edge, peak), 3)
+        return round(peak, 3)
+
+
+class ModuleProfiler:
+    """Times wrapped module methods and keeps per-module rolling stats."""
+
+    def __init__(self, frame_rate=30, module_budget_ms=5.0, window_s=60,
+                 slices=6, log_interval_s=300, enabled=True):
+        self.enabled = enabled
+        self.frame_budget_ms = 1000.0 / max(frame_rate, 1)
+        self.module_budget_ms = module_budget_ms
+        self.slices = slices
+        self.slice_s = window_s / float(slices)
+        self.log_interval = log_interval_s
+
+        self._frame = {}            # key -> seconds spent this frame
+        self._calls = 0             # wrapped calls this frame
+        self._hists = {}            # key -> RollingHistogram
+        self._frame_hist = RollingHistogram(slices, budget_ms=self.frame_budget_ms)
+        self.frames = 0             # since boot
+        self.frames_over_budget = 0
+        self._total_calls = 0
+
+        now = time.monotonic()
+        self._next_rotate = now + self.slice_s
+        self._last_log = now
+        self.overhead_us = None     # per wrapped call, from measure_overhead()
+
+    # ----- instrumentation ------------------------------------------------
+
+    def wrap(self, obj, method, key):
+        """Replace obj.method with a timed wrapper (on the instance only)."""
+        if not self.enabled or not hasattr(obj, method):
+            return
+        setattr(obj, method, self._timed(getattr(obj, method), key))
+
+    def _timed(self, fn, key):
+        frame = self._frame
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                frame[key] = frame.get(key, 0.0) + (clock() - start)
+                self._calls += 1
+
+        timed.__wrapped__ = fn
+        return timed
+
+    def instrument(self, modules, animation_manager=None):
+        """Wrap update/draw of every module plus the overlay draw paths."""
+        if not self.enabled:
+            return
+        for name, module in modules.items():
+            self.instrument_module(name, module)
+        if animation_manager is not None:
+            self.wrap(animation_manager, 'draw_notifications', 'notifications.draw')
+        self.measure_overhead()
+        logger.info(
+            f"Profiling {len(modules)} modules "
+            f"(wrapper overhead {self.overhead_us:.2f} us/call)"
+        )
+
+    def instrument_module(self, name, module):
+        """Wrap one module's update/draw (and its overlay paths), e.g. when
+        it is constructed after boot."""
+        if not self.enabled:
+            return
+        self.wrap(module, 'update', f"{name}.update")
+        self.wrap(module, 'draw', f"{name}.draw")
+        if name == 'stocks':
+            self.wrap(module, 'draw_scrolling_ticker', 'stocks.ticker')
+        elif name == 'smarthome':
+            self.wrap(module, 'draw_dashboard', 'smarthome.dashboard')
+
+    def measure_overhead(self, iterations=5000):
+        """Time a wrapped no-op against a bare one; returns us per call."""
+        def noop():
+            pass
+
+        timed = self._timed(noop, '__calibration__')
+        clock = time.perf_counter
+        start = clock()
+        for _ in range(iterations):
+            noop()
+        bare = clock() - start
+        start = clock()
+        for _ in range(iterations):
+            timed()
+        wrapped = clock() - start
+        self._frame.pop('__calibration__', None)
+        self._calls = 0
+        self.overhead_us = max(0.0, (wrapped - bare) / iterations * 1e6)
+        return self.overhead_us
+
+    # ----- per-frame ------------------------------------------------------
+
+    def end_frame(self, frame_seconds):
+        """Fold this frame's per-module totals into the histograms."""
+        if not self.enabled:
+            return
+        self.frames += 1
+        self._total_calls += self._calls
+        self._calls = 0
+
+        frame_ms = frame_seconds * 1000.0
+        self._frame_hist.add(frame_ms)
+        if frame_ms > self.frame_budget_ms:
+            self.frames_over_budget += 1
+
+        for key, seconds in self._frame.items():
+            ms = seconds * 1000.0
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = RollingHistogram(self.slices, self.module_budget_ms)
+            hist.add(ms)
+        self._frame.clear()
+
+        now = time.monotonic()
+        if now >= self._next_rotate:
+            self._next_rotate = now + self.slice_s
+            self._frame_hist.rotate()
+            for hist in self._hists.values():
+                hist.rotate()
+        if self.log_interval and now - self._last_log >= self.log_interval:
+            self._last_log = now
+            self._log_summary()
+
+    # ----- reporting ------------------------------------------------------
+
+    def get_stats(self):
+        """Rolling per-module latency summary plus over-budget counts.
+
+        Everything under 'frame' and 'modules' covers window_s;
+        frames and frames_over_budget are totals since boot.
+        """
+        frame = self._frame_hist.summary()
+        frames = max(self.frames, 1)
+        calls_per_frame = self._total_calls / frames
+        overhead_ms = (self.overhead_us or 0.0) * calls_per_frame / 1000.0
+        modules = {}
+        for key, hist in list(self._hists.items()):  # read from the web panel thread
+            modules[key] = hist.summary()
+        return {
+            'enabled': self.enabled,
+            'window_s': round(self.slice_s * self.slices),
+            'frame_budget_ms': round(self.frame_budget_ms, 2),
+            'module_budget_ms': self.module_budget_ms,
+            'frames': self.frames,
+            'frames_over_budget': self.frames_over_budget,
+            'frame': frame,
+            'modules': dict(sorted(modules.items(), key=lambda kv: -kv[1]['mean_ms'])),
+            'overhead': {
+                'us_per_call': round(self.overhead_us or 0.0, 3),
+                'calls_per_frame': round(calls_per_frame, 1),
+                'ms_per_frame': round(overhead_ms, 4),
+                'fraction_of_frame': (round(overhead_ms / frame['mean_ms'], 4)
+                                      if frame['mean_ms'] else 0.0),
+            },
+        }
+
+    def _log_summary(self, top=5):
+        stats = self.get_stats()
+        frame = stats['frame']
+        slowest = ", ".join(
+            f"{key} p95 {entry['p95_ms']}ms ({entry['over_budget']} over)"
+            for key, entry in list(stats['modules'].items())[:top]
+        )
+        logger.info(
+            f"Profile ({stats['window_s']}s): frame mean {frame['mean_ms']}ms "
+            f"p95 {frame['p95_ms']}ms, {frame['over_budget']}/{frame['count']} "
+            f"frames over {stats['frame_budget_ms']}ms; slowest: {slowest}; "
+            f"overhead {stats['overhead']['fraction_of_frame']:.2%}"
+        )
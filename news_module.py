@@ -2,22 +2,44 @@
 
 Displays scrolling news headlines from RSS feeds.
 Uses feedparser (no API key needed). Falls back to built-in headlines.
+
+Each feed is fetched as its own job on the shared fetch pool, so a
+refresh takes as long as the slowest feed rather than the sum of all
+of them (CONFIG['fetch_scheduler']['limits']['news'] bounds how many
+run at once). Per feed the module keeps:
+
+  - the ETag / Last-Modified validators and the feed's current
+    entries, persisted through data_cache ("news_feeds") so a restart
+    revalidates instead of downloading every feed again. An unchanged
+    feed (304) is not parsed at all;
+  - the GUIDs it has already seen, so only new entries are turned into
+    headlines (and notified) and an item carried by two feeds is shown
+    once;
+  - an exponential backoff after errors, independent of the other
+    feeds;
+  - latency, bytes and bytes saved - get_feed_stats(), web panel
+    /api/fetch.
 """
 
 import pygame
 import logging
-import requests
 import time as time_module
 from datetime import datetime, timedelta
 from config import (
     CONFIG, FONT_NAME, COLOR_FONT_DEFAULT,
     COLOR_FONT_BODY, COLOR_FONT_SMALL, TRANSPARENCY, COLOR_TEXT_DIM,
 )
-from background_fetcher import BackgroundFetcher
+from background_fetcher import BackgroundFetcher, PRIORITY_USER, PRIORITY_BACKGROUND
+from http_client import http_client
+from module_base import RetainedLayer
 
 logger = logging.getLogger("News")
 
 FEED_TIMEOUT = 10  # seconds; feedparser alone has no timeout at all
+ENTRIES_PER_FEED = 5
+SEEN_MAX = 200            # GUIDs remembered per feed
+BACKOFF_BASE_S = 60       # first retry after a failed fetch
+BACKOFF_MAX_S = 3600
 
 # Default RSS feeds (no API key needed)
 DEFAULT_FEEDS = [
@@ -26,7 +48,42 @@ DEFAULT_FEEDS = [
 ]
 
 
-class NewsModule:
+def _entry_guid(entry):
+    """Stable identity of a feed entry: its id, else link, else title."""
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+class _Feed:
+    """Fetch state, validators and current entries of one feed."""
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self.fetcher = BackgroundFetcher("news")
+        self.etag = None
+        self.last_modified = None
+        self.entries = []          # headline dicts, feed order
+        self.seen = []             # GUIDs already processed, oldest first
+        self.body_bytes = 0        # size of the last full download
+        self.failures = 0
+        self.retry_at = datetime.min
+        self.stats = {'requests': 0, 'changed': 0, 'not_modified': 0, 'errors': 0,
+                      'new_entries': 0, 'bytes': 0, 'bytes_saved': 0,
+                      'latency_ms_last': 0.0, 'latency_total_ms': 0.0}
+
+    def to_cache(self):
+        return {'etag': self.etag, 'last_modified': self.last_modified,
+                'entries': self.entries, 'seen': self.seen, 'body_bytes': self.body_bytes}
+
+    def restore(self, cached):
+        self.etag = cached.get('etag')
+        self.last_modified = cached.get('last_modified')
+        self.entries = cached.get('entries', [])
+        self.seen = cached.get('seen', [])
+        self.body_bytes = cached.get('body_bytes', 0)
+
+
+class NewsModule(RetainedLayer):
     """Displays scrolling news headlines from RSS feeds."""
 
     def __init__(self, feeds=None, rotation_interval=15, max_headlines=8, **kwargs):
@@ -40,8 +97,8 @@ class NewsModule:
         self.rotation_interval = rotation_interval
         self.max_headlines = max_headlines
         self.headlines = []
-        self._known_titles = set()
         self._notify = None
+        self._round_notified = False
         self.current_index = 0
         self.last_rotation = time_module.time()
         self.last_fetch = datetime.min
@@ -52,16 +109,20 @@ class NewsModule:
         self.title_font = None
         self.headline_font = None
         self.source_font = None
-        self._fetcher = BackgroundFetcher("news")
+        self._feeds = [_Feed(f["name"], f["url"]) for f in self.feeds]
 
         # Show last-good headlines immediately after a restart
         from data_cache import data_cache
         cached, age = data_cache.load("news", max_age_sec=86400)
         if cached:
             self.headlines = cached[:self.max_headlines]
-            self._known_titles = {h.get("title") for h in self.headlines}
             logger.info(f"Restored {len(self.headlines)} cached headlines "
                         f"({int(age / 60)} min old)")
+        # Validators and entries never expire: a 304 proves they are current
+        feed_state, _ = data_cache.load("news_feeds")
+        for feed in self._feeds:
+            if feed_state and feed.url in feed_state:
+                feed.restore(feed_state[feed.url])
 
     def _init_fonts(self):
         if self.title_font is None:
@@ -74,51 +135,133 @@ class NewsModule:
             self.headline_font = pygame.font.SysFont(FONT_NAME, body_size)
             self.source_font = pygame.font.SysFont(FONT_NAME, small_size)
 
-    def _fetch_headlines_blocking(self):
-        """Download and parse all RSS feeds. Runs on a background thread.
+    def _fetch_feed_blocking(self, feed, etag, last_modified, known):
+        """Download and parse one feed. Runs on a background thread.
 
-        Feeds are downloaded with requests (which enforces a timeout) and
-        the bytes handed to feedparser, because feedparser's own URL
-        fetching can hang forever on a stalled host.
+        The feed is downloaded with http_client (which enforces a
+        timeout, keeps each host's connection alive and revalidates
+        unchanged feeds) and the bytes handed to feedparser, because
+        feedparser's own URL fetching can hang forever on a stalled
+        host. The persisted validators are sent too, so the first
+        refresh after a restart can already be a 304. Only entries whose
+        GUID is not in known become headline dicts.
         """
         import feedparser
 
-        new_headlines = []
-        for feed_config in self.feeds:
-            try:
-                resp = requests.get(
-                    feed_config["url"], timeout=FEED_TIMEOUT,
-                    headers={"User-Agent": "AI-Mirror/1.0"},
-                )
-                resp.raise_for_status()
-                feed = feedparser.parse(resp.content)
-                for entry in feed.entries[:5]:
-                    new_headlines.append({
-                        "title": entry.get("title", "No title"),
-                        "source": feed_config["name"],
-                        "link": entry.get("link", ""),
-                        "published": entry.get("published", ""),
-                    })
-            except Exception as e:
-                logger.warning(f"Failed to fetch feed {feed_config['name']}: {e}")
-        return new_headlines
-
-    def _apply_headlines(self, new_headlines):
-        if new_headlines:
-            # Push notification for truly new headlines
-            if self._notify and self._known_titles:
-                for h in new_headlines[:2]:
-                    if h['title'] not in self._known_titles:
-                        self._notify(h['title'], duration_ms=6000)
-                        break  # One notification per fetch cycle
-
-            self._known_titles = {h['title'] for h in new_headlines}
-            self.headlines = new_headlines[:self.max_headlines]
-            from data_cache import data_cache
-            data_cache.save("news", self.headlines)
-            logger.info(f"Fetched {len(self.headlines)} headlines from {len(self.feeds)} feeds")
-        else:
+        headers = {"User-Agent": "AI-Mirror/1.0"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        start = time_module.perf_counter()
+        resp = http_client.get(feed.url, timeout=FEED_TIMEOUT, headers=headers)
+        latency_ms = (time_module.perf_counter() - start) * 1000.0
+        if resp.status_code == 304 or resp.revalidated:
+            return {'changed': False, 'latency_ms': latency_ms}
+        resp.raise_for_status()
+
+        parsed = feedparser.parse(resp.content)
+        order, new = [], []
+        for entry in parsed.entries[:ENTRIES_PER_FEED]:
+            guid = _entry_guid(entry)
+            order.append(guid)
+            if guid not in known:
+                new.append({
+                    "title": entry.get("title", "No title"),
+                    "source": feed.name,
+                    "link": entry.get("link", ""),
+                    "published": entry.get("published", ""),
+                    "guid": guid,
+                })
+        return {
+            'changed': True,
+            'latency_ms': latency_ms,
+            'bytes': len(resp.content),
+            'etag': resp.headers.get("ETag"),
+            'last_modified': resp.headers.get("Last-Modified"),
+            'order': order,
+            'new': new,
+        }
+
+    def _submit_feed(self, feed, priority=PRIORITY_BACKGROUND):
+        known = {e.get("guid") for e in feed.entries}
+        feed.fetcher.submit(lambda: self._fetch_feed_blocking(
+            feed, feed.etag, feed.last_modified, known), priority=priority)
+
+    def _apply_feed(self, feed, result):
+        """Main loop: merge one feed's fetch into its state and the headlines."""
+        feed.stats['requests'] += 1
+        feed.stats['latency_ms_last'] = round(result['latency_ms'], 1)
+        feed.stats['latency_total_ms'] += result['latency_ms']
+        feed.failures = 0
+        feed.retry_at = datetime.min
+        if not result['changed']:
+            feed.stats['not_modified'] += 1
+            feed.stats['bytes_saved'] += feed.body_bytes
+            return False
+
+        feed.stats['changed'] += 1
+        feed.stats['bytes'] += result['bytes']
+        feed.body_bytes = result['bytes']
+        feed.etag = result['etag']
+        feed.last_modified = result['last_modified']
+        seen = set(feed.seen)
+        fresh = [h for h in result['new'] if h["guid"] not in seen]
+        feed.stats['new_entries'] += len(fresh)
+        by_guid = {e.get("guid"): e for e in feed.entries}
+        by_guid.update({h["guid"]: h for h in result['new']})
+        feed.entries = [by_guid[g] for g in result['order'] if g in by_guid]
+        feed.seen = ([g for g in feed.seen if g not in set(result['order'])]
+                     + result['order'])[-SEEN_MAX:]
+
+        # Push notification for a truly new headline (not on first load)
+        if fresh and seen and self._notify and not self._round_notified:
+            self._notify(fresh[0]['title'], duration_ms=6000)
+            self._round_notified = True  # One notification per fetch cycle
+        return True
+
+    def _feed_failed(self, feed, error):
+        feed.stats['errors'] += 1
+        feed.failures += 1
+        delay = min(BACKOFF_BASE_S * 2 ** (feed.failures - 1), BACKOFF_MAX_S)
+        feed.retry_at = datetime.now() + timedelta(seconds=delay)
+        logger.warning(f"Failed to fetch feed {feed.name}: {error} "
+                       f"(retry in {delay}s)")
+
+    def _rebuild_headlines(self):
+        """Headlines from every feed in config order, each GUID once."""
+        headlines, shown = [], set()
+        for feed in self._feeds:
+            for entry in feed.entries:
+                key = entry.get("guid") or entry.get("link")
+                if key in shown:
+                    continue
+                shown.add(key)
+                headlines.append(entry)
+        if not headlines:
             logger.warning("No headlines fetched from any feed")
+            return
+        self.headlines = headlines[:self.max_headlines]
+        self.current_index %= len(self.headlines)
+        from data_cache import data_cache
+        data_cache.save("news", self.headlines)
+        data_cache.save("news_feeds", {f.url: f.to_cache() for f in self._feeds})
+        logger.info(f"{len(self.headlines)} headlines from {len(self._feeds)} feeds")
+
+    def get_feed_stats(self):
+        """Per-feed counters, latency and backoff state."""
+        now = datetime.now()
+        stats = {}
+        for feed in self._feeds:
+            s = dict(feed.stats)
+            total = s.pop('latency_total_ms')
+            s['latency_ms_mean'] = round(total / max(s['requests'], 1), 1)
+            s['entries'] = len(feed.entries)
+            s['failures'] = feed.failures
+            s['retry_in_s'] = max(0, int((feed.retry_at - now).total_seconds()))
+            s['in_flight'] = not feed.fetcher.idle
+            stats[feed.name] = s
+        return stats
 
     def set_notification_callback(self, callback):
         """Register a callback for center-screen notifications."""
@@ -142,11 +285,15 @@ class NewsModule:
         return lines
 
     def update(self):
-        result = self._fetcher.take_result()
-        if result is not None:
+        changed = landed = False
+        for feed in self._feeds:
+            result = feed.fetcher.take_result()
+            if result is None:
+                continue
+            landed = True
             ok, value = result
             if ok:
-                self._apply_headlines(value)
+                changed = self._apply_feed(feed, value) or changed
             elif isinstance(value, ImportError):
                 logger.warning("feedparser not installed, using fallback headline")
                 self.headlines = [{
@@ -154,18 +301,47 @@ class NewsModule:
                     "source": "System",
                 }]
             else:
-                logger.warning(f"Headline fetch failed: {value}")
-            self.last_fetch = datetime.now()
+                self._feed_failed(feed, value)
+        if changed or (landed and not self.headlines):
+            self._rebuild_headlines()
 
         now = datetime.now()
         if now - self.last_fetch >= self.fetch_interval:
-            self._fetcher.submit(self._fetch_headlines_blocking)
+            # New refresh round: every feed not backing off, in parallel
+            self.last_fetch = now
+            self._round_notified = False
+            for feed in self._feeds:
+                if now >= feed.retry_at:
+                    self._submit_feed(feed)
+        else:
+            # A failed feed retries on its own backoff, not the round timer
+            for feed in self._feeds:
+                if feed.failures and now >= feed.retry_at and feed.fetcher.idle:
+                    self._submit_feed(feed)
 
         # Rotate headlines
         if self.headlines and (time_module.time() - self.last_rotation) >= self.rotation_interval:
             self.current_index = (self.current_index + 1) % len(self.headlines)
             self.last_rotation = time_module.time()
 
+    def refresh(self):
+        """User-requested refresh (voice, web panel): fetch every feed now,
+        ahead of background polling and any feed's backoff."""
+        self.last_fetch = datetime.now()
+        self._round_notified = False
+        for feed in self._feeds:
+            if feed.fetcher.idle:
+                self._submit_feed(feed, PRIORITY_USER)
+            else:
+                feed.fetcher.boost()
+
+    def content_version(self):
+        """Retained layer: one headline is shown until the next rotation."""
+        if not self.headlines:
+            return None
+        current = self.headlines[self.current_index % len(self.headlines)]
+        return (self.current_index, len(self.headlines), current['title'], current['source'])
+
     def draw(self, screen, position):
         try:
             if isinstance(position, dict):
@@ -1,11 +1,17 @@
 """Octopus Energy module for AI-Mirror.
 
-Displays electricity consumption, tariff rates, cost estimates, and
+Displays electricity consumption, tariff rates, today's cost, and
 Intelligent Go EV charging dispatch slots.
 
 REST API: consumption, tariff rates, account info (requires API key).
 GraphQL API: EV dispatch slots, charging preferences (Intelligent Go).
 
+Consumption and unit rates are kept in an EnergyLedger (energy_ledger.py)
+covering the last history_days: each refresh pages through only the
+half-hours newer than what is stored, and today's cost is every
+consumption interval priced at the rate in force for it - exact on
+Agile and Intelligent Go, not kWh x the current rate.
+
 Env vars:  OCTOPUS_API_KEY, OCTOPUS_ACCOUNT_NUMBER
 """
 
@@ -14,16 +20,18 @@ import pygame
 import logging
 import time
 import traceback
-from datetime import datetime, timedelta, date, timezone
+from datetime import datetime, date, timezone
 from config import (
     CONFIG, FONT_NAME, COLOR_FONT_DEFAULT, COLOR_FONT_BODY,
     COLOR_TEXT_SECONDARY, COLOR_TEXT_DIM, COLOR_ACCENT_GREEN,
     COLOR_ACCENT_RED, COLOR_ACCENT_AMBER, COLOR_ACCENT_BLUE,
     TRANSPARENCY,
 )
-from module_base import ModuleDrawHelper, SurfaceCache
+from module_base import ModuleDrawHelper, SurfaceCache, RetainedLayer
 from api_tracker import api_tracker
 from background_fetcher import BackgroundFetcher
+from energy_ledger import EnergyLedger, parse_time
+from http_client import http_client
 
 logger = logging.getLogger("OctopusEnergy")
 
@@ -34,12 +42,19 @@ GRAPHQL_URL = f"{BASE_URL}/graphql/"
 RATE_CHEAP = 10.0
 RATE_EXPENSIVE = 28.0
 
+# Results per REST page: a month of half-hours is ~1500 intervals
+PAGE_SIZE = 1500
+
 
-class OctopusEnergyModule:
+class OctopusEnergyModule(RetainedLayer):
     def __init__(self, api_key='', account_number='', **kwargs):
         self.api_key = api_key
         self.account_number = account_number
         self.timeout = kwargs.get('timeout', 15)
+        self.page_size = kwargs.get('page_size', PAGE_SIZE)
+        self._ledger = EnergyLedger(window_days=kwargs.get('history_days', 31),
+                                    refetch_hours=kwargs.get('refetch_hours', 24))
+        self.ingest_stats = {'pages': 0, 'intervals': 0, 'revised': 0, 'rates': 0}
 
         # Auto-discovered from account endpoint
         self._mpan = None
@@ -56,7 +71,8 @@ class OctopusEnergyModule:
         self.standing_charge = None       # p/day inc VAT
         self.consumption_today_kwh = None
         self.cost_today_pence = None
-        self.rates_today = []             # [{value_inc_vat, valid_from, valid_to}, ...]
+        self.rates_today = []             # [{value_inc_vat, valid_from, valid_to}, ...] (unix s)
+        self.unpriced_today = 0           # intervals with no known rate
 
         # EV / Intelligent Go data
         self._gql_token = None
@@ -78,7 +94,7 @@ class OctopusEnergyModule:
         self.title_font = None
         self.body_font = None
         self.small_font = None
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("octopus_energy")
         self._notification_callback = None
         self._fetcher = BackgroundFetcher("octopus_energy")
 
@@ -95,15 +111,34 @@ class OctopusEnergyModule:
     # ------------------------------------------------------------------
 
     def _get(self, path, auth=True):
-        """GET request to Octopus REST API."""
-        url = f"{BASE_URL}{path}"
-        kw = {'timeout': self.timeout}
+        """GET request to Octopus REST API (counted by api_tracker).
+
+        path may also be a full URL (a page's "next" link). Raises
+        http_client.APICallBlocked when the budget is spent.
+        """
+        url = path if path.startswith('http') else f"{BASE_URL}{path}"
+        kw = {'timeout': self.timeout, 'api': ("octopus_energy", "octopus-energy")}
         if auth and self.api_key:
             kw['auth'] = (self.api_key, '')
-        resp = requests.get(url, **kw)
+        resp = http_client.get(url, **kw)
         resp.raise_for_status()
         return resp.json()
 
+    def _get_all(self, path, auth=True):
+        """Every result of a paginated endpoint, following "next" links."""
+        results = []
+        while path:
+            data = self._get(path, auth=auth)
+            self.ingest_stats['pages'] += 1
+            results.extend(data.get('results', []))
+            path = data.get('next')
+        return results
+
+    @staticmethod
+    def _iso(ts):
+        """Unix seconds -> the API's period_from/period_to format."""
+        return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
     def _gql_query(self, query, variables=None):
         """Execute a GraphQL query against the Octopus Kraken API."""
         token = self._get_gql_token()
@@ -116,7 +151,7 @@ class OctopusEnergyModule:
         payload = {'query': query}
         if variables:
             payload['variables'] = variables
-        resp = requests.post(
+        resp = http_client.post(
             GRAPHQL_URL, json=payload,
             headers=headers, timeout=self.timeout,
         )
@@ -141,7 +176,7 @@ class OctopusEnergyModule:
               }
             }
             '''
-            resp = requests.post(
+            resp = http_client.post(
                 GRAPHQL_URL,
                 json={'query': mutation, 'variables': {'key': self.api_key}},
                 timeout=self.timeout,
@@ -171,7 +206,6 @@ class OctopusEnergyModule:
             if not api_tracker.allow("octopus_energy", "octopus-energy"):
                 return
             data = self._get(f"/accounts/{self.account_number}/")
-            api_tracker.record("octopus_energy", "octopus-energy")
 
             props = data.get('properties', [])
             if not props:
@@ -217,6 +251,7 @@ class OctopusEnergyModule:
                     or 'INTELLI-GO' in tc_upper
                 )
 
+            self._ledger.load((self._mpan, self._serial), self._tariff_code)
             self._account_fetched = True
             logger.info(
                 f"Account discovered: MPAN={self._mpan}, "
@@ -240,7 +275,7 @@ class OctopusEnergyModule:
     # ------------------------------------------------------------------
 
     def _fetch_rates(self):
-        """Fetch today's unit rates and standing charge for current tariff."""
+        """Fetch new unit rates and the standing charge for current tariff."""
         if not self._product_code or not self._tariff_code:
             return
         try:
@@ -248,42 +283,33 @@ class OctopusEnergyModule:
                 return
 
             today = date.today()
-            period_from = f"{today}T00:00:00Z"
-            period_to = f"{today + timedelta(days=1)}T00:00:00Z"
-
-            # Unit rates
-            rates_path = (
-                f"/products/{self._product_code}/"
-                f"electricity-tariffs/{self._tariff_code}/"
-                f"standard-unit-rates/"
-                f"?period_from={period_from}&period_to={period_to}"
-                f"&page_size=100"
-            )
-            rates_data = self._get(rates_path, auth=False)
-            api_tracker.record("octopus_energy", "octopus-energy")
-            self.rates_today = rates_data.get('results', [])
-
-            # Determine current rate
-            now = datetime.now(timezone.utc)
-            self.current_rate = None
-            self.is_offpeak = False
-            for rate in self.rates_today:
-                vf = rate.get('valid_from', '')
-                vt = rate.get('valid_to', '')
-                try:
-                    dt_from = datetime.fromisoformat(vf.replace('Z', '+00:00'))
-                    dt_to = datetime.fromisoformat(vt.replace('Z', '+00:00'))
-                    if dt_from <= now < dt_to:
-                        self.current_rate = rate.get('value_inc_vat')
-                        if self.current_rate and self.current_rate < RATE_CHEAP:
-                            self.is_offpeak = True
-                        break
-                except Exception:
-                    continue
-
-            # If only one rate returned (fixed tariff), use it
-            if self.current_rate is None and len(self.rates_today) == 1:
-                self.current_rate = self.rates_today[0].get('value_inc_vat')
+            day_start = parse_time(f"{today}T00:00:00Z")
+            day_end = day_start + 86400
+            # Unit rates: only the part of the window not already stored
+            # (up to the end of today; Agile publishes tomorrow's later)
+            fetch_from = self._ledger.rates_from()
+            if fetch_from < day_end:
+                rates_path = (
+                    f"/products/{self._product_code}/"
+                    f"electricity-tariffs/{self._tariff_code}/"
+                    f"standard-unit-rates/"
+                    f"?period_from={self._iso(fetch_from)}&period_to={self._iso(day_end)}"
+                    f"&page_size={self.page_size}"
+                )
+                results = self._get_all(rates_path, auth=False)
+                ends = [r.get('valid_to') for r in results]
+                if not results or None in ends:
+                    covered = day_end         # open-ended (fixed) rate covers it all
+                else:
+                    covered = min(day_end, max(parse_time(e) for e in ends))
+                self._ledger.add_rates(results, covered)
+                self._ledger.save()
+                self.ingest_stats['rates'] += len(results)
+
+            self.rates_today = self._ledger.rates_between(day_start, day_end)
+            self.current_rate = self._ledger.rate_at(time.time())
+            self.is_offpeak = (self.current_rate is not None
+                               and self.current_rate < RATE_CHEAP)
 
             # Standing charge
             sc_path = (
@@ -292,7 +318,6 @@ class OctopusEnergyModule:
                 f"standing-charges/"
             )
             sc_data = self._get(sc_path, auth=False)
-            api_tracker.record("octopus_energy", "octopus-energy")
             sc_results = sc_data.get('results', [])
             if sc_results:
                 self.standing_charge = sc_results[0].get('value_inc_vat')
@@ -311,40 +336,40 @@ class OctopusEnergyModule:
     # ------------------------------------------------------------------
 
     def _fetch_consumption(self):
-        """Fetch today's electricity consumption."""
+        """Fetch new consumption intervals and price today's exactly."""
         if not self._mpan or not self._serial:
             return
         try:
             if not api_tracker.allow("octopus_energy", "octopus-energy"):
                 return
 
-            today = date.today()
-            period_from = f"{today}T00:00:00Z"
+            # Page through the half-hours newer than the ledger holds, plus
+            # the trailing refetch window (late uploads, revised readings)
             path = (
                 f"/electricity-meter-points/{self._mpan}/"
                 f"meters/{self._serial}/consumption/"
-                f"?period_from={period_from}&order_by=period&page_size=100"
+                f"?period_from={self._iso(self._ledger.consumption_from())}"
+                f"&order_by=period&page_size={self.page_size}"
             )
-            data = self._get(path)
-            api_tracker.record("octopus_energy", "octopus-energy")
-
-            results = data.get('results', [])
-            total_kwh = sum(r.get('consumption', 0) for r in results)
-            self.consumption_today_kwh = round(total_kwh, 2)
-
-            # Estimate cost using current rate (rough)
-            if self.current_rate and total_kwh > 0:
-                self.cost_today_pence = round(total_kwh * self.current_rate, 1)
-            elif self.rates_today and total_kwh > 0:
-                # Use average of today's rates
-                avg_rate = sum(
-                    r.get('value_inc_vat', 0) for r in self.rates_today
-                ) / max(len(self.rates_today), 1)
-                self.cost_today_pence = round(total_kwh * avg_rate, 1)
+            added, revised = self._ledger.add_consumption(self._get_all(path))
+            self.ingest_stats['intervals'] += added
+            self.ingest_stats['revised'] += revised
+            if added or revised:
+                self._ledger.save()
+
+            day_start = parse_time(f"{date.today()}T00:00:00Z")
+            today = self._ledger.cost(day_start, day_start + 86400)
+            self.consumption_today_kwh = round(today['kwh'], 2)
+            self.unpriced_today = today['unpriced']
+            if today['intervals'] and today['unpriced'] < today['intervals']:
+                self.cost_today_pence = round(today['pence'], 1)
+            elif today['kwh'] > 0 and self.current_rate:
+                # No rates stored yet: rough estimate at the current rate
+                self.cost_today_pence = round(today['kwh'] * self.current_rate, 1)
 
             logger.info(
-                f"Consumption: {self.consumption_today_kwh} kWh, "
-                f"est cost: {self.cost_today_pence}p"
+                f"Consumption: +{added} intervals ({revised} revised), today {self.consumption_today_kwh} kWh, "
+                f"cost {self.cost_today_pence}p ({self.unpriced_today} unpriced)"
             )
 
         except requests.HTTPError as e:
@@ -479,6 +504,19 @@ class OctopusEnergyModule:
     # Drawing
     # ------------------------------------------------------------------
 
+    def content_version(self):
+        """Retained layer: derived from every value draw() shows, since
+        the background fetches write these fields directly."""
+        next_dispatch = self.planned_dispatches[0] if self.planned_dispatches else None
+        return (
+            bool(self.api_key), self._account_fetched, self.current_rate,
+            self.is_offpeak, self.consumption_today_kwh, self.cost_today_pence,
+            self.standing_charge, self._tariff_code, self._is_intelligent,
+            self._last_error is not None, repr(next_dispatch),
+            repr(self.ev_device), repr(self.charge_prefs),
+            datetime.now().weekday(),
+        )
+
     def draw(self, screen, position):
         try:
             if isinstance(position, dict):
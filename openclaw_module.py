@@ -20,6 +20,7 @@ from config import (
     CONFIG, FONT_NAME, COLOR_FONT_DEFAULT,
     COLOR_FONT_BODY, COLOR_FONT_SMALL, TRANSPARENCY,
 )
+from module_base import RetainedLayer
 
 logger = logging.getLogger("OpenClaw")
 
@@ -47,7 +48,7 @@ CHANNEL_LABELS = {
 }
 
 
-class OpenClawModule:
+class OpenClawModule(RetainedLayer):
     """OpenClaw Gateway client for the AI-Mirror.
 
     Connects to a remote OpenClaw Gateway via WebSocket, receives
@@ -289,6 +290,22 @@ class OpenClawModule:
                 if (now - n["timestamp"]).total_seconds() < self.notification_timeout
             ]
 
+    @staticmethod
+    def _ago_text(timestamp):
+        ago = (datetime.now() - timestamp).total_seconds()
+        if ago < 60:
+            return "now"
+        if ago < 3600:
+            return f"{int(ago // 60)}m"
+        return f"{int(ago // 3600)}h"
+
+    def content_version(self):
+        """Retained layer: the inbox, connection state and message ages."""
+        with self._lock:
+            shown = [(m["timestamp"], m["sender"], self._ago_text(m["timestamp"]))
+                     for m in self.inbox[:4]]
+        return (self.connected, self.connect_error, tuple(shown))
+
     def draw(self, screen, position):
         try:
             if isinstance(position, dict):
@@ -350,13 +367,7 @@ class OpenClawModule:
                     sender_surf = self.small_font.render(msg["sender"], True, COLOR_FONT_BODY)
                     sender_surf.set_alpha(TRANSPARENCY)
 
-                    ago = (datetime.now() - msg["timestamp"]).total_seconds()
-                    if ago < 60:
-                        time_str = "now"
-                    elif ago < 3600:
-                        time_str = f"{int(ago // 60)}m"
-                    else:
-                        time_str = f"{int(ago // 3600)}h"
+                    time_str = self._ago_text(msg["timestamp"])
                     time_surf = self.small_font.render(time_str, True, COLOR_FONT_SMALL)
 
                     if align == 'right':
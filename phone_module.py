@@ -5,8 +5,10 @@ Shows what matters from the phone as you pass the mirror:
     buffer -> "Leave in 38 min" (amber "Leave now" once due). Reads the
     events already fetched by the calendar module - no extra API calls.
   - Battery: iPhone battery level/state from the Home Assistant
-    Companion app sensors, auto-discovered from /api/states (or pinned
-    via battery_entity in config).
+    Companion app sensors, auto-discovered among HA's sensors (or pinned
+    via battery_entity in config). Read from the shared ha_state store;
+    once the battery is found the subscription narrows to those two
+    entities, so only their changes reach this module.
 
 Deliberately minimal (user request): no email, no messages, no
 notification content. Extend here later.
@@ -22,16 +24,13 @@ from config import (
     COLOR_TEXT_DIM, COLOR_ACCENT_GREEN, COLOR_ACCENT_RED,
     COLOR_ACCENT_AMBER, load_font,
 )
-from module_base import ModuleDrawHelper, SurfaceCache
-from api_tracker import api_tracker
-from background_fetcher import BackgroundFetcher
+from module_base import ModuleDrawHelper, SurfaceCache, RetainedLayer
+from ha_state import ha_state_store
 
 logger = logging.getLogger("Phone")
 
-import requests
 
-
-class PhoneModule:
+class PhoneModule(RetainedLayer):
     def __init__(self, ha_url='', ha_token='', battery_entity='',
                  travel_minutes=25, lead_window_minutes=180,
                  update_interval_minutes=5, **kwargs):
@@ -42,10 +41,6 @@ class PhoneModule:
             ha_url = 'http://' + ha_url
         self.ha_url = ha_url
         self.ha_token = ha_token or ''
-        self.headers = {
-            "Authorization": f"Bearer {self.ha_token}",
-            "content-type": "application/json",
-        }
         self.battery_entity = battery_entity
         self.travel_minutes = travel_minutes
         self.lead_window = timedelta(minutes=lead_window_minutes)
@@ -54,15 +49,14 @@ class PhoneModule:
         self.battery_level = None      # int percent
         self.battery_state = None      # "Charging" / "Not Charging" / "Full"
         self._battery_state_entity = ''
-        self.last_update = datetime.min
-        self._fetcher = BackgroundFetcher("phone")
+        self._ha_sub = None            # ha_state subscription, opened on first update
 
         # Calendar module reference, wired by AI-Mirror
         self._calendar = None
         self._leave = None             # (summary, start_dt, leave_dt)
         self._leave_checked_minute = None
 
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("phone")
         self.title_font = None
         self.body_font = None
         self.small_font = None
@@ -72,19 +66,25 @@ class PhoneModule:
         self._calendar = calendar_module
 
     # ------------------------------------------------------------------
-    # Battery via Home Assistant (background fetch)
+    # Battery via Home Assistant (shared ha_state store)
     # ------------------------------------------------------------------
 
-    def _fetch_states_blocking(self):
-        url = f"{self.ha_url}/api/states"
-        try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            resp.raise_for_status()
-        except Exception:
-            api_tracker.failure("phone", "home-assistant")
-            raise
-        api_tracker.record("phone", "home-assistant")
-        return resp.json()
+    def _subscribe(self):
+        """Watch all sensors until the battery is known, then just it."""
+        store = ha_state_store(self.ha_url, self.ha_token)
+        if self.battery_entity:
+            self._ha_sub = store.subscribe(
+                entity_ids=self._battery_entities(),
+                poll_interval_s=self.update_interval.total_seconds(),
+            )
+        else:
+            self._ha_sub = store.subscribe(
+                domains={'sensor'}, poll_interval_s=self.update_interval.total_seconds(),
+            )
+
+    def _battery_entities(self):
+        guess = self.battery_entity.replace('_battery_level', '_battery_state')
+        return {self.battery_entity, self._battery_state_entity or guess}
 
     def _discover_battery(self, states):
         """Find the iPhone battery sensors from the Companion app."""
@@ -109,25 +109,28 @@ class PhoneModule:
             self.battery_entity = candidates[0][1]
             logger.info(f"Discovered phone battery entity: {self.battery_entity}")
 
-    def _apply_states(self, states):
-        self._discover_battery(states)
+    def _apply_changes(self, changes):
+        """Apply ha_state changes ({entity_id: state or None})."""
         if not self.battery_entity:
-            return
+            self._discover_battery([s for s in changes.values() if s])
+            if not self.battery_entity:
+                return
+            # Found it: stop receiving every other sensor's changes
+            self._ha_sub.set_filter(entity_ids=self._battery_entities())
+
+        store = self._ha_sub.store
         if not self._battery_state_entity:
             guess = self.battery_entity.replace('_battery_level', '_battery_state')
-            if guess != self.battery_entity and any(
-                    s.get('entity_id') == guess for s in states):
+            if guess != self.battery_entity and store.get(guess) is not None:
                 self._battery_state_entity = guess
 
-        by_id = {s.get('entity_id'): s for s in states}
-        level = by_id.get(self.battery_entity, {}).get('state')
+        level = (store.get(self.battery_entity) or {}).get('state')
         try:
             self.battery_level = int(float(level))
         except (TypeError, ValueError):
             self.battery_level = None
         if self._battery_state_entity:
-            self.battery_state = by_id.get(
-                self._battery_state_entity, {}).get('state')
+            self.battery_state = (store.get(self._battery_state_entity) or {}).get('state')
 
     # ------------------------------------------------------------------
     # Leave countdown from calendar events
@@ -177,22 +180,16 @@ class PhoneModule:
         if not self.ha_url or not self.ha_token:
             return
 
-        result = self._fetcher.take_result()
-        if result is not None:
-            ok, value = result
-            if ok:
-                self._apply_states(value)
-            else:
-                logger.warning(f"Phone HA fetch failed: {value}")
-            self.last_update = datetime.now()
+        if self._ha_sub is None:
+            self._subscribe()
+        changes = self._ha_sub.take_changes()
+        if changes:
+            self._apply_changes(changes)
 
-        if datetime.now() - self.last_update < self.update_interval:
-            return
-        if not api_tracker.allow("phone", "home-assistant"):
-            # Blocked: wait a full interval before retrying allow()
-            self.last_update = datetime.now()
-            return
-        self._fetcher.submit(self._fetch_states_blocking)
+    def content_version(self):
+        """Retained layer: the leave countdown ticks once a minute."""
+        return (datetime.now().strftime('%H:%M'), self._leave,
+                self.battery_level, self.battery_state)
 
     def _battery_color(self):
         if self.battery_level is None:
@@ -302,4 +299,5 @@ class PhoneModule:
             logger.error(f"Error drawing phone module: {e}")
 
     def cleanup(self):
-        pass
+        if self._ha_sub is not None:
+            self._ha_sub.close()
@@ -0,0 +1,220 @@
+"""Local daily price history for the stocks ticker.
+
+StocksModule used to download five days of candles for every symbol on
+every refresh and kept quotes only in memory, so each restart started
+with "Loading stock data..." and fetched the same bars again. This
+stores the bars on disk instead:
+
+  - one append-only file of fixed-width records per symbol under
+    data/prices/ (<symbol>.bin, RECORD: day, open, high, low, close,
+    volume); a bar for the day already at the end of the file (today's,
+    still moving) is rewritten in place, anything older is ignored;
+  - last_day(symbol) tells the fetch where to start, so a refresh asks
+    only for bars from the newest stored day onwards;
+  - candles()/closes()/change_percent() answer from an in-memory copy
+    of each file (bisect over the day column), fast enough to call
+    from draw code.
+
+Days are unix seconds of UTC midnight for the trading date. A crash
+mid-append leaves at most a partial trailing record, which is dropped
+the next time the file is read.
+"""
+
+import bisect
+import calendar
+import logging
+import os
+import re
+import struct
+import threading
+
+logger = logging.getLogger("PriceHistory")
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+_HISTORY_DIR = os.path.join(_PROJECT_DIR, "data", "prices")
+
+RECORD = struct.Struct('<qddddd')   # day, open, high, low, close, volume
+NAN = float('nan')
+DAY = 86400
+
+
+def day_of(value):
+    """date/datetime/Timestamp or 'YYYY-MM-DD' -> unix seconds of that UTC midnight."""
+    if isinstance(value, str):
+        y, m, d = (int(p) for p in value[:10].split('-'))
+        return calendar.timegm((y, m, d, 0, 0, 0))
+    return calendar.timegm((value.year, value.month, value.day, 0, 0, 0))
+
+
+def previous_weekday(day):
+    """The weekday before day (Friday for a Monday)."""
+    day -= DAY
+    while (day // DAY + 3) % 7 >= 5:    # 1970-01-01 was a Thursday
+        day -= DAY
+    return day
+
+
+class PriceHistory:
+    """Per-symbol daily bars on disk with an in-memory read copy."""
+
+    def __init__(self, root=None):
+        self.root = root               # None: module-level _HISTORY_DIR
+        self._series = {}              # symbol -> (days list, bars list)
+        self._lock = threading.Lock()
+        self.stats = {'appended': 0, 'rewritten': 0, 'ignored': 0, 'loads': 0}
+
+    def _path(self, symbol):
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.root or _HISTORY_DIR, f"{name}.bin")
+
+    def _load(self, symbol):
+        """(days, bars) for symbol, read from disk once. Lock held."""
+        series = self._series.get(symbol)
+        if series is not None:
+            return series
+        days, bars = [], []
+        path = self._path(symbol)
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            whole = len(raw) - len(raw) % RECORD.size
+            if whole != len(raw):
+                logger.warning(f"{symbol}: dropping partial trailing record")
+                with open(path, 'r+b') as f:
+                    f.truncate(whole)
+            for rec in RECORD.iter_unpack(raw[:whole]):
+                days.append(rec[0])
+                bars.append(rec)
+            self.stats['loads'] += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not read price history for {symbol}: {e}")
+        series = self._series[symbol] = (days, bars)
+        return series
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, symbol, bars):
+        """Store (day, open, high, low, close, volume) bars, oldest first.
+
+        Bars for the last stored day replace it; older ones are ignored.
+        Returns how many bars were written.
+        """
+        written = 0
+        with self._lock:
+            days, stored = self._load(symbol)
+            path = self._path(symbol)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'r+b' if os.path.exists(path) else 'w+b') as f:
+                    for bar in sorted(bars, key=lambda b: b[0]):
+                        rec = (int(bar[0]), *(NAN if v is None else float(v) for v in bar[1:6]))
+                        if days and rec[0] < days[-1]:
+                            self.stats['ignored'] += 1
+                            continue
+                        if days and rec[0] == days[-1]:
+                            if _same(rec, stored[-1]):
+                                continue
+                            f.seek((len(days) - 1) * RECORD.size)
+                            stored[-1] = rec
+                            self.stats['rewritten'] += 1
+                        else:
+                            f.seek(len(days) * RECORD.size)
+                            days.append(rec[0])
+                            stored.append(rec)
+                            self.stats['appended'] += 1
+                        f.write(RECORD.pack(*rec))
+                        written += 1
+            except OSError as e:
+                logger.warning(f"Could not write price history for {symbol}: {e}")
+                self._series.pop(symbol, None)     # re-read what actually landed
+        return written
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def last_day(self, symbol):
+        with self._lock:
+            days, _ = self._load(symbol)
+            return days[-1] if days else None
+
+    def bars(self, symbol, start=None, end=None):
+        """Bars with start <= day < end (either bound may be None)."""
+        with self._lock:
+            days, bars = self._load(symbol)
+            lo = 0 if start is None else bisect.bisect_left(days, start)
+            hi = len(days) if end is None else bisect.bisect_left(days, end)
+            return bars[lo:hi]
+
+    def closes(self, symbol, start=None, limit=None):
+        """Close prices from start onwards (the last limit of them)."""
+        closes = [b[4] for b in self.bars(symbol, start) if b[4] == b[4]]
+        return closes[-limit:] if limit else closes
+
+    def candles(self, symbol):
+        """(price, prev, volume, low, high) from the last two bars, or None.
+
+        The arguments StocksModule._yf_quote() takes, so a quote can be
+        built from disk without the network.
+        """
+        with self._lock:
+            _, bars = self._load(symbol)
+            recent = [b for b in bars[-5:] if b[4] == b[4]]
+        if not recent:
+            return None
+        last = recent[-1]
+        price = last[4]
+        prev = recent[-2][4] if len(recent) >= 2 else price
+        return (
+            price, prev,
+            int(last[5]) if last[5] == last[5] else 0,
+            last[3] if last[3] == last[3] else price,
+            last[2] if last[2] == last[2] else price,
+        )
+
+    def change_percent(self, symbol, start):
+        """Change from the last close before start to the latest close, or None."""
+        with self._lock:
+            days, bars = self._load(symbol)
+            i = bisect.bisect_left(days, start) - 1
+            if i < 0 or not bars:
+                return None
+            base, last = bars[i][4], bars[-1][4]
+        if not base or base != base or last != last:
+            return None
+        return (last - base) / base * 100.0
+
+    def symbols(self):
+        """Symbols with a file on disk (file-name form)."""
+        try:
+            return sorted(f[:-4] for f in os.listdir(self.root or _HISTORY_DIR)
+                          if f.endswith('.bin'))
+        except OSError:
+            return []
+
+    def forget(self, symbol=None):
+        """Drop the in-memory copy (all symbols if None); files are kept."""
+        with self._lock:
+            if symbol is None:
+                self._series.clear()
+            else:
+                self._series.pop(symbol, None)
+
+    def get_stats(self):
+        with self._lock:
+            bars = sum(len(d) for d, _ in self._series.values())
+            stats = dict(self.stats, symbols=len(self._series), bars=bars)
+        stats['bytes'] = bars * RECORD.size
+        return stats
+
+
+def _same(a, b):
+    """Records equal, treating NaN == NaN."""
+    return all(x == y or (x != x and y != y) for x, y in zip(a, b))
+
+
+price_history = PriceHistory()
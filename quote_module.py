@@ -14,6 +14,7 @@ from config import (
     CONFIG, FONT_NAME, COLOR_FONT_DEFAULT,
     COLOR_FONT_BODY, COLOR_FONT_SMALL, TRANSPARENCY,
 )
+from module_base import RetainedLayer
 
 logger = logging.getLogger("Quote")
 
@@ -32,7 +33,7 @@ _BUILTIN_QUOTES = [
 ]
 
 
-class QuoteModule:
+class QuoteModule(RetainedLayer):
     """Displays a daily inspirational quote."""
 
     def __init__(self, quotes_file=None, **kwargs):
@@ -51,7 +52,7 @@ class QuoteModule:
         self._wrapped_lines = []
         from module_base import SurfaceCache
         from background_fetcher import BackgroundFetcher
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("quote")
         self._fetcher = BackgroundFetcher("quote")
 
     def _init_fonts(self):
@@ -68,13 +69,13 @@ class QuoteModule:
     def _fetch_from_api(self):
         """Fetch quote of the day from ZenQuotes API."""
         try:
-            from api_tracker import api_tracker
-            if not api_tracker.allow("quote", "zenquotes"):
+            from http_client import http_client, APICallBlocked
+            try:
+                resp = http_client.get("https://zenquotes.io/api/today", timeout=10,
+                                       api=("quote", "zenquotes"))
+            except APICallBlocked:
                 return None, None
-            import requests
-            resp = requests.get("https://zenquotes.io/api/today", timeout=10)
             if resp.status_code == 200:
-                api_tracker.record("quote", "zenquotes")
                 data = resp.json()
                 if data and isinstance(data, list) and len(data) > 0:
                     return data[0].get("q", ""), data[0].get("a", "Unknown")
@@ -145,6 +146,10 @@ class QuoteModule:
             return
         self._fetcher.submit(self._fetch_daily_quote)
 
+    def content_version(self):
+        """Retained layer: the quote changes once a day."""
+        return (self.current_quote, self.current_author)
+
     def draw(self, screen, position):
         try:
             if isinstance(position, dict):
@@ -37,6 +37,10 @@ class RetroCharactersModule:
         except Exception as e:
             logging.error(f"Error loading retro icons from {self.icon_directory}: {e}")
 
+    def is_animating(self):
+        """Frame-scheduler hook: icons fall every frame."""
+        return bool(self.icons)
+
     def update(self):
         if not self.icons:
             logging.warning("No icons loaded, skipping update")
@@ -1,8 +1,9 @@
 """Smart Home module for AI-Mirror.
 
-Displays Home Assistant entity states via the HA REST API (long-lived
-access token), fetched as a single batched /api/states call on a
-background thread.
+Displays Home Assistant entity states (long-lived access token). States
+come from the shared ha_state store, which follows HA's WebSocket
+state_changed stream (polling /api/states as a fallback) and hands this
+module only the entities that changed.
 
 Two display modes:
   - Mini view (always on, left column): summary line plus up to
@@ -15,7 +16,6 @@ Two display modes:
 
 import math
 import os
-import requests
 import pygame
 import logging
 import time
@@ -26,9 +26,8 @@ from config import (
     COLOR_ACCENT_GREEN, COLOR_ACCENT_RED, COLOR_ACCENT_AMBER,
     COLOR_ACCENT_BLUE, TRANSPARENCY,
 )
-from module_base import ModuleDrawHelper, SurfaceCache
-from api_tracker import api_tracker
-from background_fetcher import BackgroundFetcher
+from module_base import ModuleDrawHelper, SurfaceCache, RetainedLayer
+from ha_state import ha_state_store
 
 logger = logging.getLogger("SmartHome")
 
@@ -89,7 +88,7 @@ def _state_color(entity_id, state):
     return COLOR_FONT_BODY
 
 
-class SmartHomeModule:
+class SmartHomeModule(RetainedLayer):
     def __init__(self, ha_url, ha_token, entities=None,
                  update_interval_minutes=2, timeout=10,
                  max_entities=20, mini_entities=8,
@@ -101,10 +100,6 @@ class SmartHomeModule:
             ha_url = 'http://' + ha_url
         self.ha_url = ha_url
         self.ha_token = ha_token or ''
-        self.headers = {
-            "Authorization": f"Bearer {self.ha_token}",
-            "content-type": "application/json",
-        }
         self.entities = entities or []
         # Web-panel selection file wins over HA_ENTITIES / auto-discovery
         file_ents = self._load_entity_override()
@@ -121,10 +116,11 @@ class SmartHomeModule:
         self.timeout = timeout
         self._connected = False
         self._last_error = None
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("smarthome")
         self._last_data_hash = None
         self._notification_callback = None
-        self._fetcher = BackgroundFetcher("smarthome")
+        self._ha_sub = None        # ha_state subscription, opened on first update
+        self._ha_states = {}       # entity_id -> HA state, scored domains + shown
 
         # Dashboard overlay state
         self.dashboard_active = False
@@ -218,7 +214,8 @@ class SmartHomeModule:
                 continue
             options.append({
                 'id': c['id'], 'name': c['name'],
-                'state': c['state'], 'shown': c['id'] in shown_set,
+                'state': self._ha_states.get(c['id'], {}).get('state', c['state']),
+                'shown': c['id'] in shown_set,
             })
         return options
 
@@ -242,26 +239,29 @@ class SmartHomeModule:
             self.entities = valid
             logger.info(f"HA entities set via web panel: {valid}")
         else:
-            self.entities = []   # auto-discovery resumes on next fetch
+            self.entities = []   # auto-discovery resumes on next change
             logger.info("HA entity selection cleared; auto-discovery restored")
-        self.last_update = datetime.min  # force an immediate refresh
+            self._pick_entities(self._score_states(self._ha_states.values()))
+        self._follow_entities()
+        self._refresh_entities(self.entities)
         return True
 
     # ------------------------------------------------------------------
-    # Data fetch (background thread)
+    # Entity states (shared ha_state store)
     # ------------------------------------------------------------------
 
-    def _fetch_states_blocking(self):
-        """Fetch ALL entity states in one /api/states call (background thread)."""
-        url = f"{self.ha_url}/api/states"
-        try:
-            resp = requests.get(url, headers=self.headers, timeout=self.timeout)
-            resp.raise_for_status()
-        except Exception:
-            api_tracker.failure("smarthome", "home-assistant")
-            raise
-        api_tracker.record("smarthome", "home-assistant")
-        return resp.json()
+    def _subscribe(self):
+        """Open the ha_state subscription: scored domains + shown entities."""
+        store = ha_state_store(self.ha_url, self.ha_token, timeout=self.timeout)
+        self._ha_sub = store.subscribe(
+            entity_ids=self.entities, domains=self._DOMAIN_SCORE,
+            poll_interval_s=self.update_interval.total_seconds(),
+        )
+
+    def _follow_entities(self):
+        """Widen the subscription to shown entities outside scored domains."""
+        if self._ha_sub is not None:
+            self._ha_sub.set_filter(entity_ids=self.entities, domains=self._DOMAIN_SCORE)
 
     # Domains worth showing on a mirror, with a base usefulness score
     _DOMAIN_SCORE = {
@@ -327,32 +327,50 @@ class SmartHomeModule:
         else:
             logger.warning("Auto-discovery found no suitable entities")
 
-    def _apply_states(self, all_states):
-        current_time = datetime.now()
-        by_id = {s.get('entity_id'): s for s in all_states}
-
-        # Refresh the candidate pool the web panel offers to toggle
-        scored = self._score_states(all_states)
-        self._candidates = [
-            {
-                'id': eid,
-                'name': attrs.get('friendly_name', eid),
-                'state': by_id.get(eid, {}).get('state', '?'),
-                'unit': attrs.get('unit_of_measurement', ''),
-            }
-            for _, eid, attrs in scored[:self.max_candidates]
-        ]
-
-        if not self.entities:
-            self._pick_entities(scored)
+    def _apply_changes(self, changes):
+        """Fold a batch of ha_state changes into the module's view."""
+        pool_changed = False
+        for eid, state in changes.items():
+            if state is None:
+                pool_changed |= self._ha_states.pop(eid, None) is not None
+            else:
+                pool_changed |= eid not in self._ha_states
+                self._ha_states[eid] = state
+
+        # Rescore the web-panel candidate pool only when entities come or go
+        if pool_changed or not self._candidates:
+            scored = self._score_states(self._ha_states.values())
+            self._candidates = [
+                {
+                    'id': eid,
+                    'name': attrs.get('friendly_name', eid),
+                    'state': self._ha_states.get(eid, {}).get('state', '?'),
+                    'unit': attrs.get('unit_of_measurement', ''),
+                }
+                for _, eid, attrs in scored[:self.max_candidates]
+            ]
             if not self.entities:
-                self._last_error = "No entities found"
+                self._pick_entities(scored)
+                if not self.entities:
+                    return
+                self._follow_entities()
+                self._refresh_entities(self.entities)
                 return
 
-        old_states = {eid: self.data.get(eid, {}).get('state') for eid in self.entities}
+        self._refresh_entities([eid for eid in self.entities if eid in changes])
+
+    def _refresh_entities(self, entity_ids):
+        """Update self.data for shown entities and notify notable changes."""
+        if not entity_ids:
+            return
+        current_time = datetime.now()
+        store = self._ha_sub.store if self._ha_sub is not None else None
+        old_states = {eid: self.data.get(eid, {}).get('state') for eid in entity_ids}
 
-        for entity_id in self.entities:
-            state = by_id.get(entity_id)
+        for entity_id in entity_ids:
+            state = self._ha_states.get(entity_id)
+            if state is None and store is not None:
+                state = store.get(entity_id)
             if state is not None:
                 self.data[entity_id] = {
                     'state': state.get('state', 'unknown'),
@@ -367,13 +385,11 @@ class SmartHomeModule:
                     'last_updated': current_time,
                     'status': 'error',
                 }
-
-        self._connected = True
-        self._last_error = None
+        self.last_update = current_time
 
         # Push notification if a notable state changed
         if self._notification_callback:
-            for eid in self.entities:
+            for eid in entity_ids:
                 old = old_states.get(eid)
                 new = self.data.get(eid, {}).get('state')
                 if old and new and old != new:
@@ -400,28 +416,25 @@ class SmartHomeModule:
             self._connected = False
             return
 
-        result = self._fetcher.take_result()
-        if result is not None:
-            ok, value = result
-            if ok:
-                self._apply_states(value)
-            else:
-                logger.warning(f"HA fetch failed: {value}")
-                self._connected = False
-                self._last_error = str(value)
-            self.last_update = datetime.now()
-
-        # Refresh faster while someone is looking at the dashboard
+        if self._ha_sub is None:
+            self._subscribe()
+        # While the store has to poll, poll faster for an open dashboard
         interval = (self.dashboard_update_interval if self.dashboard_active
                     else self.update_interval)
-        if datetime.now() - self.last_update < interval:
-            return
-        if not api_tracker.allow("smarthome", "home-assistant"):
-            # Blocked (rate limit or open circuit): wait a full interval
-            # before retrying instead of hammering allow() every frame
-            self.last_update = datetime.now()
-            return
-        self._fetcher.submit(self._fetch_states_blocking)
+        self._ha_sub.poll_interval_s = interval.total_seconds()
+
+        changes = self._ha_sub.take_changes()
+        if changes:
+            self._apply_changes(changes)
+
+        store = self._ha_sub.store
+        self._connected = store.connected
+        if store.last_error:
+            self._last_error = store.last_error
+        elif store.synced and not self.entities:
+            self._last_error = "No entities found"
+        else:
+            self._last_error = None
 
     # ------------------------------------------------------------------
     # Shared draw helpers
@@ -479,6 +492,17 @@ class SmartHomeModule:
     # Mini view (left column)
     # ------------------------------------------------------------------
 
+    def content_version(self):
+        """Retained layer: the mini view shows each entity's name, state
+        and unit, so those are what it changes with."""
+        shown = []
+        for eid in self.entities:
+            info = self.data.get(eid, {})
+            attrs = info.get('attributes', {})
+            shown.append((info.get('state'), attrs.get('friendly_name'),
+                           attrs.get('unit_of_measurement')))
+        return tuple(shown), bool(self.data), self._last_error is not None
+
     def draw(self, screen, position):
         """Draw the mini smart home view -- floating text, no background."""
         try:
@@ -583,6 +607,20 @@ class SmartHomeModule:
     # Dashboard overlay (center zone, on demand)
     # ------------------------------------------------------------------
 
+    def is_animating(self):
+        """Frame-scheduler hook: the dashboard overlay is fading in/out."""
+        target = 1.0 if self.dashboard_active else 0.0
+        return abs(target - self._dash_alpha) > 0.01
+
+    def get_dashboard_rect(self, screen):
+        """Screen area of the dashboard overlay, or None while hidden."""
+        if self._dash_alpha <= 0.01:
+            return None
+        sw, sh = screen.get_width(), screen.get_height()
+        return pygame.Rect(
+            int(sw * 0.24), int(sh * 0.16), int(sw * 0.52), int(sh * 0.62)
+        )
+
     def draw_dashboard(self, screen):
         """Draw the full dashboard overlay in the center clear zone.
 
@@ -590,15 +628,12 @@ class SmartHomeModule:
         _dash_alpha; draws nothing once fully faded.
         """
         try:
-            if self._dash_alpha <= 0.01:
+            zone = self.get_dashboard_rect(screen)
+            if zone is None:
                 return
             self._ensure_fonts()
 
-            sw, sh = screen.get_width(), screen.get_height()
-            zone_x = int(sw * 0.24)
-            zone_w = int(sw * 0.52)
-            zone_y = int(sh * 0.16)
-            zone_h = int(sh * 0.62)
+            zone_x, zone_y, zone_w, zone_h = zone
 
             overlay = pygame.Surface((zone_w, zone_h), pygame.SRCALPHA)
 
@@ -665,10 +700,14 @@ class SmartHomeModule:
                     col_y[col] += line_h
 
             # Footer: freshness + close hint + auto-close countdown
-            age = (datetime.now() - self.last_update).total_seconds()
+            if self._ha_sub is not None and self._ha_sub.store.mode == 'websocket':
+                freshness = "live"
+            else:
+                age = (datetime.now() - self.last_update).total_seconds()
+                freshness = f"updated {int(age)}s ago"
             remaining = max(0, int(self._dashboard_until - time.monotonic()))
             footer_text = (
-                f"updated {int(age)}s ago  -  closes in {remaining}s  -  "
+                f"{freshness}  -  closes in {remaining}s  -  "
                 f"say 'close dashboard' or press H"
             )
             footer = self.small_font.render(footer_text, True, COLOR_TEXT_DIM)
@@ -680,4 +719,5 @@ class SmartHomeModule:
             logger.error(f"Error drawing HA dashboard: {e}")
 
     def cleanup(self):
-        pass
+        if self._ha_sub is not None:
+            self._ha_sub.close()
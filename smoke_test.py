@@ -23,7 +23,15 @@ PROJECT_MODULES = [
     "module_manager",
     "api_tracker",
     "background_fetcher",
+    "compositor",
+    "frame_scheduler",
+    "module_profiler",
     "data_cache",
+    "http_client",
+    "upstream_replay",
+    "energy_ledger",
+    "price_history",
+    "ha_state",
     "visual_effects",
     "voice_commands",
     "weather_animations",
@@ -0,0 +1,399 @@
+"""Sentence-level speech pipeline for the fallback assistant.
+
+AIInteractionModule used to wait for the whole chat reply, synthesise
+it in one TTS call and only then play it; speak_chunk, the per-sentence
+path, synthesised a sentence, then busy-waited on
+pygame.mixer.music.get_busy() until it had played before sending the
+next one. Either way the listener heard synthesis and playback added in
+series.
+
+SpeechPipeline overlaps them:
+
+  - feed() takes reply text as it streams in; SentenceSplitter cuts it
+    at sentence ends, so the first sentence is sent for synthesis while
+    the model is still writing the second.
+  - The "speech-synth" thread synthesises one sentence at a time into a
+    queue of at most depth ready clips, so sentence N+1 is synthesised
+    while N plays but a long reply never runs far ahead of the speaker.
+  - The "speech-play" thread blocks on that queue, starts each clip and
+    then waits on an Event for the clip's length: no polling, and
+    cancel() wakes it at once.
+  - cancel() (barge-in, ESC, cleanup) drops every queued sentence and
+    clip and stops what is playing. Work already in flight for the old
+    reply is recognised by its generation number and discarded.
+  - stats() reports time to first word (begin() to the first clip
+    starting) and the gaps between consecutive sentences of a reply.
+
+synthesise(text) returns an audio file path (AIInteractionModule's
+speech_file, backed by tts_cache). Players have play(path) -> length in
+seconds, starting playback without blocking, and stop().
+PygameSpeechPlayer is the mirror's speaker; tests/fake_tts.py has a
+fake TTS backend and player for tests and
+benchmarks/bench_speech_pipeline.py.
+
+    speech = SpeechPipeline(module.speech_file, PygameSpeechPlayer(0.8),
+                            on_discard=tts_cache.discard)
+    speech.begin()
+    for delta in stream: speech.feed(delta)
+    speech.end(); speech.wait()
+    speech.cancel()         # barge-in
+"""
+
+import logging
+import queue
+import re
+import statistics
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("SpeechPipeline")
+
+# Sentence end: terminal punctuation (and any closing quotes/brackets)
+# followed by whitespace, or a line break
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+
+
+class SentenceSplitter:
+    """Cuts streamed text into sentences for synthesis.
+
+    Pieces shorter than min_chars are held and joined to the next one
+    ("Dr. Smith", "OK. Sure."), and a run-on longer than max_chars is
+    cut at its last comma or space so synthesis can start.
+    """
+
+    def __init__(self, min_chars=12, max_chars=240):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buf = ""
+
+    def feed(self, text):
+        """Complete sentences found so far (the tail is kept)."""
+        self._buf += text
+        out = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buf):
+            piece = self._buf[start:match.end()].strip()
+            if len(piece) >= self.min_chars:
+                out.append(piece)
+                start = match.end()
+        self._buf = self._buf[start:]
+        while len(self._buf) > self.max_chars:
+            cut = max(self._buf.rfind(', ', 0, self.max_chars), self._buf.rfind(' ', 0, self.max_chars))
+            cut = cut + 1 if cut > 0 else self.max_chars
+            out.append(self._buf[:cut].strip())
+            self._buf = self._buf[cut:]
+        return [s for s in out if s]
+
+    def flush(self):
+        """Whatever is left once the reply has ended."""
+        rest, self._buf = self._buf.strip(), ""
+        return [rest] if rest else []
+
+    def reset(self):
+        self._buf = ""
+
+
+class PygameSpeechPlayer:
+    """Plays clips on a pygame mixer channel.
+
+    The clip is decoded into memory by pygame.mixer.Sound, so its file
+    can be discarded as soon as play() returns.
+    """
+
+    def __init__(self, volume=0.8):
+        self.volume = volume
+        self._channel = None
+
+    def play(self, path):
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(self.volume)
+        self._channel = sound.play()
+        return sound.get_length()
+
+    def stop(self):
+        if self._channel is not None:
+            self._channel.stop()
+            self._channel = None
+
+
+class SpeechPipeline:
+    """Synthesises sentence N+1 while sentence N plays."""
+
+    def __init__(self, synthesise, player, depth=2, min_chars=12, max_chars=240,
+                 on_discard=None, on_start=None, on_idle=None, history=100):
+        self.synthesise = synthesise
+        self.player = player
+        self.depth = max(1, depth)
+        self.on_discard = on_discard     # path -> None, once a clip has been handed to the player
+        self.on_start = on_start         # first clip of a reply started
+        self.on_idle = on_idle           # reply fully played (not after cancel)
+        self.splitter = SentenceSplitter(min_chars, max_chars)
+        self._sentences = queue.Queue()               # (generation, text, queued_at)
+        self._clips = queue.Queue(maxsize=self.depth)  # (generation, text, path)
+        self._interrupt = threading.Event()
+        self._cond = threading.Condition()
+        self._gen = 0
+        self._pending = 0        # sentences of this reply not yet played or dropped
+        self._ended = True
+        self._begun_at = None
+        self._first_started = False
+        self._last_end = None    # when the previous clip of this reply finishes
+        self._running = False
+        self._threads = []
+        self._ttfw = deque(maxlen=history)
+        self._gaps = deque(maxlen=history)
+        self._synth_ms = deque(maxlen=history)
+        self.counters = {
+            'replies': 0, 'sentences': 0, 'played': 0, 'cancelled': 0, 'dropped': 0,
+            'synth_errors': 0, 'player_errors': 0,
+            'ttfw_ms': None, 'gap_ms_total': 0.0,
+        }
+
+    # ----- producer side -----------------------------------------------
+
+    def begin(self):
+        """Start a reply, cancelling one still queued or playing.
+
+        Time to first word is measured from here.
+        """
+        self.start()
+        with self._cond:
+            if not self._ended or self._pending:
+                self._cancel_locked()
+            self._new_reply_locked()
+            self._ended = False
+        self.splitter.reset()
+
+    def _new_reply_locked(self):
+        self._begun_at = time.monotonic()
+        self._first_started = False
+        self._last_end = None
+        self.counters['replies'] += 1
+
+    def feed(self, text):
+        """Reply text as it streams in; complete sentences are queued.
+
+        Ignored outside begin() .. end(), so text still streaming in for
+        a reply that was cancelled stays silent.
+        """
+        if self._ended:
+            return
+        for sentence in self.splitter.feed(text):
+            self._queue(sentence)
+
+    def end(self):
+        """No more text for this reply; queue the tail."""
+        if self._ended:
+            return
+        for sentence in self.splitter.flush():
+            self._queue(sentence)
+        with self._cond:
+            self._ended = True
+            finished = self._pending == 0
+            self._cond.notify_all()
+        if finished and self.on_idle is not None:
+            self.on_idle()
+
+    def say(self, sentence):
+        """Queue one ready-made sentence without waiting (speak_chunk).
+
+        It joins the reply still playing, or starts a new one that ends
+        once everything said has played.
+        """
+        self.start()
+        with self._cond:
+            if self._ended and self._pending == 0:
+                self._new_reply_locked()
+        self._queue(sentence)
+
+    def speak(self, text, timeout=None):
+        """Speak a whole text sentence by sentence; returns once played."""
+        self.begin()
+        self.feed(text)
+        self.end()
+        return self.wait(timeout)
+
+    def _queue(self, sentence):
+        with self._cond:
+            gen = self._gen
+            self._pending += 1
+            self.counters['sentences'] += 1
+        self._sentences.put((gen, sentence, time.monotonic()))
+
+    def wait(self, timeout=None):
+        """Block until the reply has played (True) or was cancelled/timed out."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            gen = self._gen
+            while self._gen == gen and not (self._ended and self._pending == 0):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return self._gen == gen
+
+    def is_speaking(self):
+        with self._cond:
+            return self._pending > 0 or not self._ended
+
+    def cancel(self):
+        """Drop everything queued for the current reply and stop playback."""
+        with self._cond:
+            self._cancel_locked()
+            self._ended = True
+        self.splitter.reset()
+
+    def _cancel_locked(self):
+        if self._pending or not self._ended:
+            self.counters['cancelled'] += 1
+        self.counters['dropped'] += self._pending
+        self._gen += 1
+        self._pending = 0
+        self._interrupt.set()
+        for q in (self._sentences, self._clips):
+            while True:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                if q is self._clips:
+                    self._discard(item[2])
+        self._cond.notify_all()
+
+    # ----- threads ---------------------------------------------------------
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._synth_loop, daemon=True, name="speech-synth"),
+            threading.Thread(target=self._play_loop, daemon=True, name="speech-play"),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=2.0):
+        self.cancel()
+        self._running = False
+        self._sentences.put(None)
+        try:
+            self._clips.put_nowait(None)
+        except queue.Full:
+            pass
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+        self._threads = []
+
+    def _stale(self, gen):
+        with self._cond:
+            return gen != self._gen
+
+    def _done_one(self, gen):
+        """A sentence of reply gen was played or given up on."""
+        with self._cond:
+            if gen != self._gen:
+                return
+            self._pending -= 1
+            finished = self._ended and self._pending == 0
+            self._cond.notify_all()
+        if finished and self.on_idle is not None:
+            self.on_idle()
+
+    def _discard(self, path):
+        if path and self.on_discard is not None:
+            try:
+                self.on_discard(path)
+            except Exception as e:
+                logger.debug(f"Could not discard {path}: {e}")
+
+    def _synth_loop(self):
+        while self._running:
+            item = self._sentences.get()
+            if item is None:
+                break
+            gen, text, _ = item
+            if self._stale(gen):
+                continue
+            start = time.monotonic()
+            try:
+                path = self.synthesise(text)
+            except Exception as e:
+                logger.warning(f"Speech synthesis failed for '{text[:40]}': {e}")
+                self.counters['synth_errors'] += 1
+                self._done_one(gen)
+                continue
+            self._synth_ms.append((time.monotonic() - start) * 1000.0)
+            # Bounded: wait for the speaker to take a clip, unless cancelled
+            while self._running and not self._stale(gen):
+                try:
+                    self._clips.put((gen, text, path), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            else:
+                self._discard(path)
+
+    def _play_loop(self):
+        while self._running:
+            item = self._clips.get()
+            if item is None:
+                break
+            gen, text, path = item
+            self._interrupt.clear()
+            if self._stale(gen):
+                self._discard(path)
+                continue
+            try:
+                length = self.player.play(path)
+            except Exception as e:
+                logger.warning(f"Could not play speech clip: {e}")
+                self.counters['player_errors'] += 1
+                self._discard(path)
+                self._done_one(gen)
+                continue
+            started = time.monotonic()
+            self._discard(path)
+            self._record_start(gen, started, length)
+            if self._interrupt.wait(length):
+                self.player.stop()
+                continue
+            self.counters['played'] += 1
+            self._done_one(gen)
+
+    def _record_start(self, gen, started, length):
+        first = False
+        with self._cond:
+            if gen != self._gen:
+                return
+            if not self._first_started:
+                self._first_started = first = True
+                ttfw = (started - self._begun_at) * 1000.0
+                self._ttfw.append(ttfw)
+                self.counters['ttfw_ms'] = round(ttfw, 1)
+            elif self._last_end is not None:
+                gap = max(0.0, (started - self._last_end) * 1000.0)
+                self._gaps.append(gap)
+                self.counters['gap_ms_total'] += gap
+            self._last_end = started + length
+        if first and self.on_start is not None:
+            self.on_start()
+
+    # ----- stats -----------------------------------------------------------
+
+    def stats(self):
+        with self._cond:
+            ttfw, gaps, synth = list(self._ttfw), list(self._gaps), list(self._synth_ms)
+            stats = dict(self.counters, pending=self._pending, ready_clips=self._clips.qsize())
+        stats['gap_ms_total'] = round(stats['gap_ms_total'], 1)
+        stats['ttfw_ms_p50'] = round(statistics.median(ttfw), 1) if ttfw else None
+        stats['ttfw_ms_max'] = round(max(ttfw), 1) if ttfw else None
+        stats['gap_ms_p50'] = round(statistics.median(gaps), 1) if gaps else None
+        stats['gap_ms_max'] = round(max(gaps), 1) if gaps else None
+        stats['synth_ms_p50'] = round(statistics.median(synth), 1) if synth else None
+        return stats
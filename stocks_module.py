@@ -5,10 +5,19 @@ Primary data source: Alpha Vantage GLOBAL_QUOTE (free tier, 25 calls/day).
 Fallback: yfinance.
 
 Fetch scheduling:
-  - Non-blocking queue: processes 1 ticker per update() call (no main-loop freeze).
+  - Background quote engine: update() only schedules batches on the shared
+    fetch pool (background_fetcher) and publishes finished batches into
+    stock_data in one assignment; the main loop never waits on the network.
+  - yfinance symbols are fetched YF_BATCH_SIZE at a time with one
+    multi-ticker download; Alpha Vantage (no free batch quote) one per call.
   - 3 daily windows: UK open+30m, US open+30m, US close-30m.
   - AV budget rotates across rounds so all tickers get AV data over time.
   - yfinance fills any tickers AV cannot cover.
+
+Price history (price_history.py): every bar fetched is kept on disk per
+symbol. yfinance downloads start at the newest stored day instead of
+re-reading five days each refresh, quotes take the previous close from
+disk, and a restart shows the last known ticker before any fetch lands.
 """
 
 import os
@@ -29,6 +38,9 @@ from config import (
 )
 from visual_effects import VisualEffects
 from api_tracker import api_tracker
+from background_fetcher import BackgroundFetcher, PRIORITY_USER, PRIORITY_BACKGROUND
+from http_client import http_client, APICallBlocked
+from price_history import price_history, day_of, previous_weekday
 
 logger = logging.getLogger("stocks")
 
@@ -41,7 +53,12 @@ _TICKER_OVERRIDE = os.path.join(_PROJECT_DIR, 'data', 'tickers.txt')
 # Alpha Vantage free tier: 25/day.  Keep 1 spare.
 AV_DAILY_BUDGET = 24
 AV_CALL_INTERVAL = 13   # seconds between AV requests (~5/min)
-YF_CALL_INTERVAL = 2    # seconds between yfinance requests
+YF_CALL_INTERVAL = 2    # seconds between yfinance batches
+YF_BATCH_SIZE = 20      # symbols per yfinance multi-ticker download
+YF_DOWNLOAD_THREADS = 4 # yfinance's own per-symbol download threads
+TICKER_ITEM_GAP = 44    # px of breathing room between ticker items
+HISTORY_BACKFILL_DAYS = 30  # first download for a symbol with no stored bars
+SPARKLINE_BARS = 20     # closes carried in each quote for the grid view
 
 # Exchange suffixes to strip (not London)
 _STRIP_SUFFIXES = ('.O', '.K', '.PK')
@@ -111,10 +128,17 @@ class StocksModule:
                     'currency': '\u00a3' if t.endswith('.L') else '$',
                 }
 
-        # Non-blocking fetch queue
+        # Last known quotes from disk: the ticker renders before any fetch
+        self.stock_data = self._quotes_from_history(self.tickers)
+
+        # Non-blocking fetch queue, drained in batches on the fetch pool
         self._fetch_queue = []          # [(ticker, 'av'|'yf'), ...]
+        self._fetcher = BackgroundFetcher("stocks")
         self._last_fetch_call = 0
         self._queue_complete_pending = False
+        self._round_started = 0.0
+        self._user_round = False        # round asked for by the user: run ahead of polling
+        self._quote_stats = {'batches': 0, 'quotes': 0, 'missing': 0, 'last_round_s': None}
 
         # Daily budget / round tracking
         self._fetch_day = None
@@ -140,6 +164,12 @@ class StocksModule:
         self.status_font = load_font('regular', FONT_SIZE - 6)
         self._ticker_hairline = None
 
+        # Pre-composited ticker strip (see _sync_ticker_strip)
+        self._ticker_strip = None
+        self._ticker_segments = []      # [(ticker, x, width, quote key), ...]
+        self._ticker_parts = {}         # ticker -> (quote key, text surfaces)
+        self._ticker_stats = {'rebuilds': 0, 'patches': 0, 'resizes': 0}
+
         # Scroll state
         self.scroll_position = 0
         self.scroll_speed = 0.8
@@ -156,7 +186,8 @@ class StocksModule:
         self._prev_changes = {}
 
         logger.info(
-            f"StocksModule: {len(self.tickers)} tickers, "
+            f"StocksModule: {len(self.tickers)} tickers "
+            f"({len(self.stock_data)} from history), "
             f"AV key={'yes' if alpha_vantage_key else 'no'}"
         )
 
@@ -284,7 +315,8 @@ class StocksModule:
         self._ticker_meta = meta
         # Drop data/state for removed tickers, keep the rest
         keep = set(tickers)
-        self.stock_data = {k: v for k, v in self.stock_data.items() if k in keep}
+        restored = self._quotes_from_history([t for t in tickers if t not in self.stock_data])
+        self.stock_data = {**{k: v for k, v in self.stock_data.items() if k in keep}, **restored}
         self.item_fade_offsets = {t: i * 0.2 for i, t in enumerate(tickers)}
         self._fetch_queue = []
         self._initial_fetch_done = False  # refetch on next update
@@ -346,6 +378,8 @@ class StocksModule:
                 queue.append((ticker, 'yf'))
 
         self._fetch_queue = queue
+        self._queue_complete_pending = True
+        self._round_started = time.time()
         self._rotation_offset += av_count
         self._rounds_today += 1
         logger.info(
@@ -379,37 +413,85 @@ class StocksModule:
         return None
 
     # ------------------------------------------------------------------
-    # Single-ticker fetch (non-blocking)
+    # Background quote engine
     # ------------------------------------------------------------------
 
-    def _process_queue_item(self):
-        """Pop one item from the queue and fetch it."""
-        if not self._fetch_queue:
-            return
+    def _next_batch(self):
+        """Take the next job off the round queue.
 
-        ticker, source = self._fetch_queue.pop(0)
+        Alpha Vantage has no multi-symbol quote on the free tier, so AV
+        items go one at a time; yfinance items are grouped into one
+        multi-ticker download of up to YF_BATCH_SIZE symbols.
+        """
+        ticker, source = self._fetch_queue[0]
+        if source == 'av':
+            self._fetch_queue = self._fetch_queue[1:]
+            return [ticker], 'av'
+        batch = [t for t, s in self._fetch_queue if s == 'yf'][:YF_BATCH_SIZE]
+        taken = set(batch)
+        self._fetch_queue = [
+            (t, s) for t, s in self._fetch_queue if not (s == 'yf' and t in taken)
+        ]
+        return batch, 'yf'
+
+    def _submit_next_batch(self, now):
+        """Hand the next batch to the shared fetch pool (never blocks)."""
+        tickers, source = self._next_batch()
+        priority = PRIORITY_USER if self._user_round else PRIORITY_BACKGROUND
+        self._fetcher.submit(lambda: self._fetch_batch_blocking(tickers, source),
+                             priority=priority)
+        self._last_fetch_call = now
+        self._quote_stats['batches'] += 1
+
+    def _fetch_batch_blocking(self, tickers, source):
+        """Runs on a fetch worker. Returns quotes; never touches stock_data."""
+        quotes, av_calls, rate_limited = {}, 0, False
         if source == 'av':
-            self._fetch_single_av(ticker)
+            ticker = tickers[0]
+            quote, status = self._fetch_single_av(ticker)
+            if status == 'skipped':
+                # No key / AV budget hit: use Yahoo rather than skipping
+                quotes.update(self._fetch_yf_batch([ticker]))
+            elif status != 'failed':
+                av_calls = 1
+                rate_limited = status == 'limited'
+                if quote is not None:
+                    quotes[ticker] = quote
         else:
-            self._fetch_single_yf(ticker)
-        self._last_fetch_call = time.time()
+            quotes.update(self._fetch_yf_batch(tickers))
+        return {
+            'quotes': quotes,
+            'requested': len(tickers),
+            'av_calls': av_calls,
+            'rate_limited': rate_limited,
+        }
 
-        if not self._fetch_queue:
-            self._queue_complete_pending = True
+    def _publish_quotes(self, batch):
+        """Main loop: swap the batch into stock_data in one assignment."""
+        keep = set(self.tickers)  # watchlist may have changed mid-fetch
+        quotes = {t: q for t, q in batch['quotes'].items() if t in keep}
+        if quotes:
+            self.stock_data = {**self.stock_data, **quotes}
+        self._av_calls_today += batch['av_calls']
+        self._quote_stats['quotes'] += len(quotes)
+        self._quote_stats['missing'] += batch['requested'] - len(quotes)
+        if batch['rate_limited']:
+            # Downgrade remaining AV items to yfinance
+            self._fetch_queue = [(t, 'yf') for t, _s in self._fetch_queue]
 
     def _fetch_single_av(self, ticker):
-        """Fetch one ticker from Alpha Vantage GLOBAL_QUOTE."""
+        """Fetch one ticker from Alpha Vantage GLOBAL_QUOTE.
+
+        Returns (quote or None, status): 'ok', 'skipped' (no key or AV
+        budget exhausted - caller falls back to Yahoo), 'limited' (AV
+        rate-limit note), 'empty' (call made, no usable quote) or
+        'failed' (request never completed).
+        """
         meta = self._ticker_meta.get(ticker, {})
         av_symbol = meta.get('av_symbol', ticker)
 
         if not self.alpha_vantage_key:
-            # No key: fall through to Yahoo rather than storing nothing
-            self._fetch_single_yf(ticker)
-            return
-        if not api_tracker.allow("stocks", "alpha-vantage"):
-            # AV budget hit: use Yahoo for this ticker instead of skipping
-            self._fetch_single_yf(ticker)
-            return
+            return None, 'skipped'
 
         url = (
             f"https://www.alphavantage.co/query"
@@ -418,31 +500,33 @@ class StocksModule:
             f"&apikey={self.alpha_vantage_key}"
         )
         try:
-            resp = requests.get(url, timeout=15)
+            resp = http_client.get(url, timeout=15, api=("stocks", "alpha-vantage"))
             resp.raise_for_status()
-            api_tracker.record("stocks", "alpha-vantage")
-            self._av_calls_today += 1
+        except APICallBlocked:
+            return None, 'skipped'
+        except requests.RequestException as e:
+            logger.warning(f"AV request failed for {ticker}: {e}")
+            return None, 'failed'
+
+        try:
             data = resp.json()
 
             # Rate-limit / info message from AV
             if 'Note' in data or 'Information' in data:
                 msg = data.get('Note', data.get('Information', ''))
                 logger.warning(f"Alpha Vantage limit: {msg}")
-                # Downgrade remaining AV items to yfinance
-                self._fetch_queue = [
-                    (t, 'yf') for t, _s in self._fetch_queue
-                ]
-                return
+                return None, 'limited'
 
             quote = data.get('Global Quote', {})
             if not quote or '05. price' not in quote:
                 logger.warning(f"No AV quote for {ticker} ({av_symbol})")
-                return
+                return None, 'empty'
 
             price = float(quote['05. price'])
             change_pct = float(quote.get('10. change percent', '0%').rstrip('%'))
-
-            self.stock_data[ticker] = {
+            logger.info(f"AV: {ticker} = {price:.2f} ({change_pct:+.2f}%)")
+            self._store_av_quote(ticker, quote)
+            return {
                 'price': price,
                 'percent_change': change_pct,
                 'volume': int(quote.get('06. volume', 0)),
@@ -452,15 +536,13 @@ class StocksModule:
                 ),
                 'source': 'alpha-vantage',
                 'currency': meta.get('currency', '$'),
-            }
-            logger.info(f"AV: {ticker} = {price:.2f} ({change_pct:+.2f}%)")
-
-        except requests.RequestException as e:
-            logger.warning(f"AV request failed for {ticker}: {e}")
+                'sparkline': price_history.closes(ticker, limit=SPARKLINE_BARS),
+            }, 'ok'
         except (ValueError, KeyError) as e:
             logger.warning(f"AV parse error for {ticker}: {e}")
         except Exception as e:
             logger.error(f"AV error for {ticker}: {e}")
+        return None, 'empty'
 
     @staticmethod
     def _fi_get(fast_info, *keys):
@@ -481,8 +563,148 @@ class StocksModule:
                 return v
         return None
 
+    def _yf_quote(self, ticker, price, prev, volume=0, day_low=None, day_high=None,
+                  source='yfinance'):
+        meta = self._ticker_meta.get(ticker, {})
+        prev = prev or price
+        pct = ((price - prev) / prev) * 100 if prev else 0.0
+        if source == 'yfinance':
+            logger.info(f"yfinance: {ticker} = {price:.2f} ({pct:+.2f}%)")
+        return {
+            'price': float(price),
+            'percent_change': pct,
+            'volume': int(volume or 0),
+            'day_range': f"{(day_low or price):.2f} - {(day_high or price):.2f}",
+            'source': source,
+            'currency': meta.get('currency', '$'),
+            'sparkline': price_history.closes(ticker, limit=SPARKLINE_BARS),
+        }
+
+    # ------------------------------------------------------------------
+    # Price history
+    # ------------------------------------------------------------------
+
+    def _quotes_from_history(self, tickers):
+        """Quotes rebuilt from stored bars (no network), for a warm start."""
+        quotes = {}
+        for ticker in tickers:
+            candles = price_history.candles(ticker)
+            if candles is not None:
+                quotes[ticker] = self._yf_quote(ticker, *candles, source='history')
+        return quotes
+
+    @staticmethod
+    def _history_start(tickers):
+        """'YYYY-MM-DD' to download from: the oldest "newest stored day"
+        in the batch (re-reading that day, which may still be moving),
+        or a backfill for symbols with nothing stored."""
+        lasts = [price_history.last_day(t) for t in tickers]
+        if None in lasts:
+            start = int(time.time()) // 86400 * 86400 - HISTORY_BACKFILL_DAYS * 86400
+        else:
+            start = min(lasts)
+        return time.strftime('%Y-%m-%d', time.gmtime(start))
+
+    @staticmethod
+    def _bars_from_history(hist):
+        """[(day, open, high, low, close, volume)] from a candle frame."""
+        if hist is None or hist.empty:
+            return []
+        columns = [hist[c] for c in ('Open', 'High', 'Low', 'Close', 'Volume')]
+        return [
+            (day_of(ts), o, h, lo, c, v)
+            for ts, o, h, lo, c, v in zip(hist.index, *columns)
+            if c == c  # NaN guard
+        ]
+
+    def _store_history(self, ticker, hist):
+        """Store a download's bars; returns quote candles from disk or None."""
+        bars = self._bars_from_history(hist)
+        if not bars:
+            return None
+        price_history.append(ticker, bars)
+        return price_history.candles(ticker)
+
+    @staticmethod
+    def _store_av_quote(ticker, quote):
+        """GLOBAL_QUOTE -> today's bar, plus the previous close when the
+        stored series does not reach it (weekends skipped, not holidays)."""
+        def num(key):
+            try:
+                return float(quote[key])
+            except (KeyError, ValueError):
+                return None
+        try:
+            day = day_of(quote['07. latest trading day'])
+        except (KeyError, ValueError):
+            return
+        bars = []
+        prev_day, prev_close = previous_weekday(day), num('08. previous close')
+        last = price_history.last_day(ticker)
+        if prev_close and (last is None or last < prev_day):
+            bars.append((prev_day, None, None, None, prev_close, None))
+        bars.append((day, num('02. open'), num('03. high'), num('04. low'),
+                     num('05. price'), num('06. volume')))
+        price_history.append(ticker, bars)
+
+    def _fetch_yf_batch(self, tickers):
+        """Quotes for several tickers from one yfinance multi-ticker download.
+
+        Uses the chart endpoint (far less rate-limited than the quote
+        endpoint fast_info uses). Symbols missing from the download fall
+        back to a per-symbol _fetch_single_yf.
+        """
+        try:
+            import yfinance as yf
+        except ImportError:
+            return {}
+
+        symbols = {
+            self._ticker_meta.get(t, {}).get('yf_symbol', t): t for t in tickers
+        }
+        frame = None
+        try:
+            frame = yf.download(
+                list(symbols), start=self._history_start(tickers), group_by='ticker',
+                auto_adjust=False, progress=False, threads=YF_DOWNLOAD_THREADS,
+            )
+        except Exception as e:
+            logger.debug(f"yfinance download failed for {len(symbols)} symbols: {e}")
+
+        quotes = {}
+        for yf_symbol, ticker in symbols.items():
+            candles = None
+            try:
+                candles = self._store_history(
+                    ticker, self._history_for(frame, yf_symbol, single=len(symbols) == 1)
+                )
+            except Exception as e:
+                logger.debug(f"yfinance batch parse failed for {ticker}: {e}")
+            if candles is not None:
+                quotes[ticker] = self._yf_quote(ticker, *candles)
+            else:
+                quote = self._fetch_single_yf(ticker)
+                if quote is not None:
+                    quotes[ticker] = quote
+        if frame is not None:
+            # yfinance makes one chart request per symbol under the hood
+            for _ in range(len(symbols)):
+                api_tracker.record("stocks", "yahoo-finance")
+        return quotes
+
+    @staticmethod
+    def _history_for(frame, yf_symbol, single=False):
+        """One symbol's candles out of a yf.download() frame."""
+        if frame is None or frame.empty:
+            return None
+        if getattr(frame.columns, 'nlevels', 1) > 1:
+            if yf_symbol not in frame.columns.get_level_values(0):
+                return None
+            return frame[yf_symbol]
+        return frame if single else None
+
     def _fetch_single_yf(self, ticker):
-        """Fetch one ticker from Yahoo via yfinance.
+        """Fetch one ticker from Yahoo via yfinance; returns a quote or None.
 
         Uses history() (the chart endpoint) as the primary source: it is
         far less rate-limited than the quote endpoint fast_info uses, and
@@ -493,70 +715,63 @@ class StocksModule:
         try:
             import yfinance as yf
         except ImportError:
-            return
+            return None
 
         meta = self._ticker_meta.get(ticker, {})
         yf_symbol = meta.get('yf_symbol', ticker)
 
         try:
             stock = yf.Ticker(yf_symbol)
-            price = prev = None
-            volume = 0
-            day_low = day_high = None
+            candles = None
 
-            # Primary: recent daily candles (chart endpoint, robust)
+            # Primary: daily candles since the newest stored day (chart
+            # endpoint, robust)
             try:
-                hist = stock.history(period='5d')
-                if hist is not None and not hist.empty:
-                    closes = hist['Close'].dropna()
-                    if len(closes):
-                        price = float(closes.iloc[-1])
-                        prev = float(closes.iloc[-2]) if len(closes) >= 2 else price
-                        vol = hist['Volume'].iloc[-1]
-                        volume = int(vol) if vol == vol else 0  # NaN guard
-                        low = hist['Low'].iloc[-1]
-                        high = hist['High'].iloc[-1]
-                        day_low = float(low) if low == low else price
-                        day_high = float(high) if high == high else price
+                candles = self._store_history(
+                    ticker, stock.history(start=self._history_start([ticker])))
             except Exception as e:
                 logger.debug(f"yfinance history failed for {ticker}: {e}")
 
             # Secondary: fast_info quote
-            if not price:
+            if candles is None:
                 try:
                     fi = stock.fast_info
                     price = self._fi_get(fi, 'last_price', 'lastPrice')
                     prev = self._fi_get(fi, 'previous_close', 'previousClose') or price
+                    if price:
+                        candles = (price, prev)
                 except Exception:
                     pass
 
-            if not price:
+            if candles is None:
                 logger.debug(f"yfinance: no price for {ticker} ({yf_symbol})")
-                return
+                return None
 
-            prev = prev or price
-            pct = ((price - prev) / prev) * 100 if prev else 0.0
-            self.stock_data[ticker] = {
-                'price': float(price),
-                'percent_change': pct,
-                'volume': int(volume or 0),
-                'day_range': f"{(day_low or price):.2f} - {(day_high or price):.2f}",
-                'source': 'yfinance',
-                'currency': meta.get('currency', '$'),
-            }
-            logger.info(f"yfinance: {ticker} = {price:.2f} ({pct:+.2f}%)")
             api_tracker.record("stocks", "yahoo-finance")
+            return self._yf_quote(ticker, *candles)
         except Exception as e:
             logger.debug(f"yfinance failed for {ticker} ({yf_symbol}): {e}")
+            return None
 
     # ------------------------------------------------------------------
     # Main update (non-blocking)
     # ------------------------------------------------------------------
 
     def update(self):
-        """Non-blocking update.  Processes at most 1 ticker per call."""
+        """Non-blocking update: schedules quote batches, publishes results."""
         now = time.time()
 
+        # Read idle before taking the result, so an idle fetcher here
+        # means its last batch has been published below
+        idle = self._fetcher.idle
+        result = self._fetcher.take_result()
+        if result is not None:
+            ok, value = result
+            if ok:
+                self._publish_quotes(value)
+            else:
+                logger.warning(f"Stock quote batch failed: {value}")
+
         # Hourly CSV check
         if now - self._last_csv_check > 3600:
             self._check_csv_update()
@@ -572,17 +787,22 @@ class StocksModule:
             self._initial_fetch_done = False
             logger.info("Daily stock tracker reset")
 
+        if not idle:
+            return  # a batch is in flight
+
         # Process queue: respect per-source rate intervals
         if self._fetch_queue:
             next_source = self._fetch_queue[0][1]
             delay = AV_CALL_INTERVAL if next_source == 'av' else YF_CALL_INTERVAL
             if now - self._last_fetch_call >= delay:
-                self._process_queue_item()
+                self._submit_next_batch(now)
             return  # don't start new rounds while queue is active
 
         # Post-round notifications
+        self._user_round = False
         if self._queue_complete_pending:
             self._queue_complete_pending = False
+            self._quote_stats['last_round_s'] = round(now - self._round_started, 1)
             self._post_round_notifications()
 
         # Initial fetch (startup or after CSV reload)
@@ -601,6 +821,29 @@ class StocksModule:
             self._last_round_hour = window
             self._populate_fetch_queue()
 
+    def refresh(self):
+        """User-requested refresh (voice, web panel): start a round now,
+        unless one is running, and run its batches ahead of background
+        polling. Per-source call intervals and the AV budget still apply."""
+        self._user_round = True
+        if not self._fetch_queue and self._fetcher.idle:
+            self._initial_fetch_done = True
+            self._populate_fetch_queue()
+        self._fetcher.boost()
+
+    def get_quote_stats(self):
+        """Quote engine counters and the last full-watchlist refresh time."""
+        stats = dict(self._quote_stats)
+        stats.update({
+            'rounds_today': self._rounds_today,
+            'av_calls_today': self._av_calls_today,
+            'av_budget': AV_DAILY_BUDGET,
+            'queued': len(self._fetch_queue),
+            'in_flight': not self._fetcher.idle,
+            'history': price_history.get_stats(),
+        })
+        return stats
+
     def _post_round_notifications(self):
         """Log round summary and push center notifications for big movers."""
         valid = sum(
@@ -608,7 +851,8 @@ class StocksModule:
             if isinstance(d.get('price'), (int, float))
         )
         logger.info(
-            f"Fetch round complete: {valid}/{len(self.tickers)} with data"
+            f"Fetch round complete: {valid}/{len(self.tickers)} with data "
+            f"in {self._quote_stats['last_round_s']}s"
         )
 
         if self._notify:
@@ -630,6 +874,10 @@ class StocksModule:
                 for t, d in self.stock_data.items()
             }
 
+    def is_animating(self):
+        """Frame-scheduler hook: the ticker scrolls once it has quotes."""
+        return bool(self.stock_data)
+
     # ------------------------------------------------------------------
     # Drawing
     # ------------------------------------------------------------------
@@ -701,10 +949,29 @@ class StocksModule:
                     p_surf.set_alpha(TRANSPARENCY)
                     screen.blit(p_surf, (item_x, item_y + 16))
 
+                self._draw_sparkline(
+                    screen, pygame.Rect(item_x + col_width - 52, item_y + 4, 40, 22),
+                    data.get('sparkline'), color,
+                )
+
         except Exception as e:
             logger.error(f"Error drawing stocks: {e}")
             logger.error(traceback.format_exc())
 
+    @staticmethod
+    def _draw_sparkline(screen, rect, closes, color):
+        """Recent closes as a polyline scaled into rect."""
+        if not closes or len(closes) < 2:
+            return
+        low, high = min(closes), max(closes)
+        span = (high - low) or 1.0
+        step = rect.width / (len(closes) - 1)
+        points = [
+            (rect.x + i * step, rect.bottom - (c - low) / span * rect.height)
+            for i, c in enumerate(closes)
+        ]
+        pygame.draw.lines(screen, color, False, points, 1)
+
     def draw_scrolling_ticker(self, screen):
         """Seamless scrolling ticker at the bottom of the screen."""
         try:
@@ -725,63 +992,23 @@ class StocksModule:
                 screen.blit(surf, ((screen_width - surf.get_width()) // 2, y + 8))
                 return
 
-            # Build per-ticker surfaces
-            ticker_items = []
-            total_width = 0
-            for ticker in self.tickers:
-                data = self.stock_data.get(ticker)
-                if not data:
-                    continue
-                price = data.get('price', 'N/A')
-                pct = data.get('percent_change', 0)
-                if not isinstance(price, (int, float)):
-                    continue
-
-                # The +/- sign carries direction; arrow glyphs are not in
-                # the bundled Lato and rendered as boxes
-                if isinstance(pct, (int, float)):
-                    change_str = f"{'+' if pct >= 0 else ''}{pct:.2f}%"
-                    color = self.determine_color(pct)
-                else:
-                    change_str = "0.00%"
-                    color = (160, 160, 160)
-
-                currency = data.get('currency', '$')
-
-                # Two-tone item: symbol quiet, price platinum, change colored
-                sym_surf = self.ticker_font.render(f"{ticker}  ", True, COLOR_TEXT_SECONDARY)
-                price_surf = self.ticker_price_font.render(
-                    f"{currency}{price:.2f}  ", True, COLOR_TEXT_PRIMARY
-                )
-                chg_surf = self.ticker_font.render(change_str, True, color)
-
-                gap = 44  # breathing room between ticker items
-                item_w = (sym_surf.get_width() + price_surf.get_width()
-                          + chg_surf.get_width() + gap)
-                item_h = max(sym_surf.get_height(), price_surf.get_height(),
-                             chg_surf.get_height())
-                surf = pygame.Surface((item_w, item_h), pygame.SRCALPHA)
-                ix = 0
-                for part in (sym_surf, price_surf, chg_surf):
-                    surf.blit(part, (ix, 0))
-                    ix += part.get_width()
-                surf.set_alpha(TRANSPARENCY)
-                ticker_items.append(surf)
-                total_width += surf.get_width()
-
-            if not ticker_items:
+            strip = self._sync_ticker_strip()
+            if strip is None:
                 return
 
-            # Seamless loop
+            # Seamless loop: slide a source rect along the strip, wrapping
+            total_width = strip.get_width()
             draw_x = self.scroll_position % total_width
             if draw_x > 0:
                 draw_x -= total_width
-
-            while draw_x < screen_width:
-                for surf in ticker_items:
-                    if draw_x + surf.get_width() > 0 and draw_x < screen_width:
-                        screen.blit(surf, (draw_x, y + 8))
-                    draw_x += surf.get_width()
+            src_x = int(-draw_x) % total_width
+            dest_x = 0
+            while dest_x < screen_width:
+                w = min(total_width - src_x, screen_width - dest_x)
+                screen.blit(strip, (dest_x, y + 8),
+                            pygame.Rect(src_x, 0, w, strip.get_height()))
+                dest_x += w
+                src_x = 0
 
             self.scroll_position -= self.scroll_speed
             if self.scroll_position < -total_width * 2:
@@ -822,6 +1049,133 @@ class StocksModule:
             y += 5
         return y
 
+    # ------------------------------------------------------------------
+    # Ticker strip
+    # ------------------------------------------------------------------
+
+    def _ticker_item_parts(self, ticker, data):
+        """(key, [symbol, price, change] surfaces), or None without a price."""
+        price = data.get('price', 'N/A')
+        pct = data.get('percent_change', 0)
+        if not isinstance(price, (int, float)):
+            return None
+        currency = data.get('currency', '$')
+        key = (price, pct, currency)
+        cached = self._ticker_parts.get(ticker)
+        if cached is not None and cached[0] == key:
+            return cached
+
+        # The +/- sign carries direction; arrow glyphs are not in
+        # the bundled Lato and rendered as boxes
+        if isinstance(pct, (int, float)):
+            change_str = f"{'+' if pct >= 0 else ''}{pct:.2f}%"
+            color = self.determine_color(pct)
+        else:
+            change_str = "0.00%"
+            color = (160, 160, 160)
+
+        # Two-tone item: symbol quiet, price platinum, change colored
+        parts = [
+            self.ticker_font.render(f"{ticker}  ", True, COLOR_TEXT_SECONDARY),
+            self.ticker_price_font.render(f"{currency}{price:.2f}  ", True, COLOR_TEXT_PRIMARY),
+            self.ticker_font.render(change_str, True, color),
+        ]
+        self._ticker_parts[ticker] = (key, parts)
+        return key, parts
+
+    @staticmethod
+    def _ticker_item_width(parts):
+        return sum(part.get_width() for part in parts) + TICKER_ITEM_GAP
+
+    @staticmethod
+    def _paint_ticker_item(strip, x, width, parts):
+        """Clear one segment of the strip and draw an item into it."""
+        strip.fill((0, 0, 0, 0), pygame.Rect(x, 0, width, strip.get_height()))
+        for part in parts:
+            strip.blit(part, (x, 0))
+            x += part.get_width()
+
+    def _sync_ticker_strip(self):
+        """Bring the pre-composited ticker strip up to date with stock_data.
+
+        The strip holds every item side by side and is only touched when
+        quotes change: a new/removed symbol rebuilds it, a changed quote
+        repaints that symbol's segment in place (or splices it in if its
+        width changed). Returns the strip, or None when nothing has a price.
+        """
+        items = []
+        for ticker in self.tickers:
+            data = self.stock_data.get(ticker)
+            if data:
+                item = self._ticker_item_parts(ticker, data)
+                if item is not None:
+                    items.append((ticker, item[0], item[1]))
+        if not items:
+            return None
+
+        order = [ticker for ticker, _, _ in items]
+        if self._ticker_strip is None or order != [seg[0] for seg in self._ticker_segments]:
+            self._build_ticker_strip(items)
+            return self._ticker_strip
+
+        for i, (ticker, key, parts) in enumerate(items):
+            _, x, width, seg_key = self._ticker_segments[i]
+            if key == seg_key:
+                continue
+            new_width = self._ticker_item_width(parts)
+            if new_width != width:
+                self._splice_ticker_strip(i, new_width)
+                _, x, width, _ = self._ticker_segments[i]
+            self._paint_ticker_item(self._ticker_strip, x, width, parts)
+            self._ticker_segments[i] = (ticker, x, width, key)
+            self._ticker_stats['patches'] += 1
+        return self._ticker_strip
+
+    def _build_ticker_strip(self, items):
+        widths = [self._ticker_item_width(parts) for _, _, parts in items]
+        height = max(part.get_height() for _, _, parts in items for part in parts)
+        strip = pygame.Surface((sum(widths), height), pygame.SRCALPHA)
+        segments = []
+        x = 0
+        for (ticker, key, parts), width in zip(items, widths):
+            self._paint_ticker_item(strip, x, width, parts)
+            segments.append((ticker, x, width, key))
+            x += width
+        strip.set_alpha(TRANSPARENCY)
+        self._ticker_strip = strip
+        self._ticker_segments = segments
+        self._ticker_parts = {ticker: self._ticker_parts[ticker] for ticker, _, _ in items}
+        self._ticker_stats['rebuilds'] += 1
+
+    def _splice_ticker_strip(self, index, new_width):
+        """Resize segment `index`, shifting everything after it (no re-render)."""
+        old = self._ticker_strip
+        _, x, width, key = self._ticker_segments[index]
+        delta = new_width - width
+        strip = pygame.Surface((old.get_width() + delta, old.get_height()), pygame.SRCALPHA)
+        height = old.get_height()
+        # MAX onto transparent pixels copies RGBA verbatim (no blending)
+        strip.blit(old, (0, 0), pygame.Rect(0, 0, x, height),
+                   special_flags=pygame.BLEND_RGBA_MAX)
+        tail = x + width
+        strip.blit(old, (tail + delta, 0), pygame.Rect(tail, 0, old.get_width() - tail, height),
+                   special_flags=pygame.BLEND_RGBA_MAX)
+        strip.set_alpha(TRANSPARENCY)
+        self._ticker_strip = strip
+        self._ticker_segments[index] = (self._ticker_segments[index][0], x, new_width, key)
+        for i in range(index + 1, len(self._ticker_segments)):
+            ticker, sx, sw, skey = self._ticker_segments[i]
+            self._ticker_segments[i] = (ticker, sx + delta, sw, skey)
+        self._ticker_stats['resizes'] += 1
+
+    def get_ticker_stats(self):
+        """Strip rebuild/patch counters for diagnostics (web panel /api/caches)."""
+        stats = dict(self._ticker_stats)
+        strip = self._ticker_strip
+        stats['symbols'] = len(self._ticker_segments)
+        stats['width'] = strip.get_width() if strip is not None else 0
+        return stats
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
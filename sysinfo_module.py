@@ -23,7 +23,7 @@ from config import (
     COLOR_ACCENT_AMBER, COLOR_ACCENT_RED, COLOR_ACCENT_BLUE,
     TRANSPARENCY,
 )
-from module_base import ModuleDrawHelper, SurfaceCache
+from module_base import ModuleDrawHelper, SurfaceCache, RetainedLayer
 
 logger = logging.getLogger("SysInfo")
 
@@ -97,12 +97,12 @@ def _usage_color(percent):
     return COLOR_ACCENT_RED
 
 
-class SysInfoModule:
+class SysInfoModule(RetainedLayer):
     def __init__(self, update_interval_seconds=10, **kwargs):
         self.update_interval = timedelta(seconds=update_interval_seconds)
         self.last_update = datetime.min
         self.stats = {}
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("sysinfo")
         self._data_hash = None
 
         self.title_font = None
@@ -160,6 +160,10 @@ class SysInfoModule:
         self.stats = stats
         self.last_update = now
 
+    def content_version(self):
+        """Retained layer: stats are re-read every update_interval."""
+        return self.last_update
+
     @staticmethod
     def _get_memory():
         """Get memory usage. Tries psutil, then /proc/meminfo."""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""Fake audio output device for playback tests and benchmarks.
+
+Models a sound card closely enough to measure what a listener hears:
+audio written is played back at sample_rate in wall-clock time; a write
+that arrives after the device has run out starts late (the hole is a
+gap); and write() blocks while more than device_buffer_ms is queued,
+as an ALSA write does. open() can sleep open_ms to stand in for
+spawning a player process and opening the device, and with
+start_threshold_ms the device stays stopped until that much audio is
+queued or the stream is closed - aplay's default, which waits for its
+whole buffer (up to 500 ms) before it starts.
+
+    sink = FakeAudioSink(24000, open_ms=60)
+    engine = PlaybackEngine(24000, sink=sink)
+    ...
+    sink.first_audible(after=t)       # when the first non-silent sample plays
+    sink.gap_ms(start, end)           # silence heard inside [start, end]
+    sink.delay_frames()               # written but not yet played
+
+Each write is recorded as (start, end, audible); audible means any
+non-zero sample. Standard library only.
+"""
+
+import threading
+import time
+
+
+class FakeAudioSink:
+    """A wall-clock sound card; see the module docstring."""
+
+    def __init__(self, sample_rate=24000, channels=1, open_ms=0.0, device_buffer_ms=100.0,
+                 start_threshold_ms=0.0):
+        self.sample_rate = sample_rate
+        self.frame_bytes = 2 * channels
+        self.open_s = open_ms / 1000.0
+        self.device_buffer_s = device_buffer_ms / 1000.0
+        self.start_threshold_s = start_threshold_ms / 1000.0
+        self._lock = threading.Lock()
+        self.segments = []       # (start, end, audible), in play order
+        self.opened = 0
+        self.closed = 0
+        self.bytes_written = 0
+        self.is_open = False
+        self._running = False
+        self._pending = []       # (duration, audible) queued before the device started
+        self._play_end = 0.0
+
+    def open(self):
+        if self.open_s:
+            time.sleep(self.open_s)
+        with self._lock:
+            self.opened += 1
+            self.is_open = True
+            self._running = not self.start_threshold_s
+            self._pending = []
+            self._play_end = time.monotonic()
+
+    def _start(self, now):
+        """The device starts: lay out everything queued so far from now."""
+        self._running = True
+        self._play_end = now
+        for duration, audible in self._pending:
+            self.segments.append((self._play_end, self._play_end + duration, audible))
+            self._play_end += duration
+        self._pending = []
+
+    def write(self, pcm):
+        if not self.is_open:
+            raise BrokenPipeError("device not open")
+        pcm = bytes(pcm)
+        duration = len(pcm) / self.frame_bytes / self.sample_rate
+        audible = pcm.count(0) != len(pcm)
+        with self._lock:
+            now = time.monotonic()
+            self.bytes_written += len(pcm)
+            if not self._running:
+                self._pending.append((duration, audible))
+                if sum(d for d, _ in self._pending) >= self.start_threshold_s:
+                    self._start(now)
+                return
+            start = max(now, self._play_end)
+            self._play_end = start + duration
+            self.segments.append((start, self._play_end, audible))
+            wait = self._play_end - now - self.device_buffer_s
+        if wait > 0:
+            time.sleep(wait)
+
+    def close(self):
+        with self._lock:
+            if self._pending:
+                self._start(time.monotonic())   # drain: plays what never started
+            self.closed += 1
+            self.is_open = False
+
+    def delay_frames(self):
+        with self._lock:
+            if not self._running:
+                return int(sum(d for d, _ in self._pending) * self.sample_rate)
+            return int(max(0.0, self._play_end - time.monotonic()) * self.sample_rate)
+
+    # ----- analysis ----------------------------------------------------
+
+    def audible(self, after=0.0, before=float("inf")):
+        """Audible segments starting in [after, before)."""
+        with self._lock:
+            return [s for s in self.segments if s[2] and after <= s[0] < before]
+
+    def first_audible(self, after=0.0):
+        """Play time of the first audible sample at or after `after`."""
+        segments = self.audible(after)
+        return segments[0][0] if segments else None
+
+    def last_audible_end(self, after=0.0, before=float("inf")):
+        segments = self.audible(after, before)
+        return segments[-1][1] if segments else None
+
+    def gap_ms(self, start, end):
+        """Milliseconds inside [start, end] with no audible sample playing."""
+        heard = 0.0
+        for s, e, _ in self.audible(0.0):
+            heard += max(0.0, min(e, end) - max(s, start))
+        return max(0.0, (end - start) - heard) * 1000.0
@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+"""Offline stand-in for a Home Assistant instance (REST + WebSocket).
+
+Serves GET /api/states and the /api/websocket API (auth handshake,
+subscribe_events for state_changed) from a generated house of any size,
+using only the standard library. Tests and benchmarks drive it directly:
+
+    server = FakeHAServer(entities=3000)
+    url = server.start()
+    server.mutate(50)          # push 50 state_changed events
+    server.drop_websockets()   # simulate an HA restart
+    server.stop()
+
+Or run it standalone and point the mirror at it
+(HA_URL=http://localhost:8123 HA_TOKEN=fake-token):
+
+    python tests/fake_ha_server.py --entities 5000 --rate 20
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# (domain, device_class, unit, states or value range) for generated entities
+KINDS = [
+    ('sensor', 'temperature', '°C', (12.0, 26.0)),
+    ('sensor', 'humidity', '%', (30.0, 70.0)),
+    ('sensor', 'power', 'W', (0.0, 3000.0)),
+    ('sensor', 'battery', '%', (5.0, 100.0)),
+    ('sensor', 'timestamp', None, None),
+    ('binary_sensor', 'motion', None, ('on', 'off')),
+    ('binary_sensor', 'door', None, ('on', 'off')),
+    ('light', None, None, ('on', 'off')),
+    ('switch', None, None, ('on', 'off')),
+    ('lock', None, None, ('locked', 'unlocked')),
+    ('climate', None, None, ('heat', 'off')),
+    ('update', None, None, ('on', 'off')),
+]
+
+
+class FakeHAServer:
+    """A threaded fake Home Assistant; see the module docstring."""
+
+    def __init__(self, entities=500, token="fake-token", websocket=True,
+                 port=0, seed=1):
+        self.token = token
+        self.websocket_enabled = websocket
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tick = 0
+        self.states = {}
+        self._clients = []           # subscribed websocket connections
+        self.rest_requests = 0
+        self.rest_bytes = 0
+        self.ws_connections = 0
+        self.events_sent = 0
+        self.sent_at = {}            # context id -> perf_counter at send
+        self._build(entities)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # ----- house generation -------------------------------------------
+
+    def _stamp(self):
+        self._tick += 1
+        return (EPOCH + timedelta(milliseconds=self._tick)).isoformat()
+
+    def _value(self, kind):
+        domain, dc, unit, spec = kind
+        if dc == 'timestamp':
+            return self._stamp()
+        if isinstance(spec, tuple) and isinstance(spec[0], float):
+            return f"{self._rng.uniform(*spec):.1f}"
+        return self._rng.choice(spec)
+
+    def _build(self, count):
+        # Always include a phone battery pair like the HA Companion app
+        for eid, value, dc in (("sensor.iphone_battery_level", "76", "battery"),
+                               ("sensor.iphone_battery_state", "Not Charging", None)):
+            self.add(eid, value, {"friendly_name": eid.split('.')[1].replace('_', ' '),
+                                  "device_class": dc, "unit_of_measurement": "%" if dc else None})
+        for i in range(count - 2):
+            kind = KINDS[i % len(KINDS)]
+            domain, dc, unit, _ = kind
+            eid = f"{domain}.{dc or domain}_{i}"
+            attrs = {"friendly_name": f"{(dc or domain).title()} {i}"}
+            if dc:
+                attrs["device_class"] = dc
+            if unit:
+                attrs["unit_of_measurement"] = unit
+            self.add(eid, self._value(kind), attrs, kind=kind)
+
+    def add(self, entity_id, value, attributes, kind=None):
+        """Create (or replace) an entity; pushes a state_changed event."""
+        with self._lock:
+            state = {
+                "entity_id": entity_id,
+                "state": value,
+                "attributes": {k: v for k, v in attributes.items() if v is not None},
+                "last_changed": self._stamp(),
+                "context": {"id": str(self._tick)},
+            }
+            state["last_updated"] = state["last_changed"]
+            old = self.states.get(entity_id)
+            self.states[entity_id] = state
+            state["_kind"] = kind
+        self._broadcast(entity_id, old, state)
+
+    def remove(self, entity_id):
+        with self._lock:
+            old = self.states.pop(entity_id, None)
+        if old is not None:
+            self._broadcast(entity_id, old, None)
+
+    def set_state(self, entity_id, value):
+        """Change one entity's state value; pushes a state_changed event."""
+        with self._lock:
+            old = self.states[entity_id]
+            new = dict(old, state=value, last_updated=self._stamp(),
+                       context={"id": str(self._tick)})
+            new["last_changed"] = new["last_updated"]
+            self.states[entity_id] = new
+        self._broadcast(entity_id, old, new)
+        return new
+
+    def mutate(self, count):
+        """Change `count` random generated entities; returns their ids."""
+        with self._lock:
+            ids = [eid for eid, s in self.states.items() if s.get("_kind")]
+        changed = self._rng.sample(ids, min(count, len(ids)))
+        for eid in changed:
+            kind = self.states[eid]["_kind"]
+            self.set_state(eid, self._value(kind))
+        return changed
+
+    def _public(self, state):
+        return {k: v for k, v in state.items() if k != "_kind"} if state else None
+
+    # ----- websocket ---------------------------------------------------
+
+    def _broadcast(self, entity_id, old, new):
+        with self._lock:
+            clients = list(self._clients)
+            if not clients:
+                return
+            if new is not None:
+                self.sent_at[new["context"]["id"]] = time.perf_counter()
+        frame = _ws_frame(json.dumps({
+            "id": 1, "type": "event",
+            "event": {"event_type": "state_changed",
+                      "data": {"entity_id": entity_id, "old_state": self._public(old),
+                               "new_state": self._public(new)}},
+        }))
+        for conn in clients:
+            try:
+                conn.sendall(frame)
+                self.events_sent += 1
+            except OSError:
+                self._drop(conn)
+
+    def _drop(self, conn):
+        with self._lock:
+            if conn in self._clients:
+                self._clients.remove(conn)
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def drop_websockets(self):
+        """Close every websocket connection (HA restart / network blip)."""
+        with self._lock:
+            clients = list(self._clients)
+        for conn in clients:
+            self._drop(conn)
+
+    def _serve_websocket(self, handler):
+        conn, rfile = handler.connection, handler.rfile
+        conn.sendall(_ws_frame(json.dumps({"type": "auth_required", "ha_version": "fake"})))
+        msg = json.loads(_ws_read(rfile, conn))
+        if msg.get("type") != "auth" or msg.get("access_token") != self.token:
+            conn.sendall(_ws_frame(json.dumps({"type": "auth_invalid",
+                                                "message": "Invalid access token"})))
+            return
+        conn.sendall(_ws_frame(json.dumps({"type": "auth_ok", "ha_version": "fake"})))
+        self.ws_connections += 1
+        while True:
+            try:
+                raw = _ws_read(rfile, conn)
+            except (OSError, ConnectionError):
+                break
+            if raw is None:
+                break
+            msg = json.loads(raw)
+            if msg.get("type") == "subscribe_events":
+                with self._lock:
+                    conn.sendall(_ws_frame(json.dumps({"id": msg.get("id"), "type": "result",
+                                                       "success": True, "result": None})))
+                    self._clients.append(conn)
+            elif msg.get("type") == "ping":
+                conn.sendall(_ws_frame(json.dumps({"id": msg.get("id"), "type": "pong"})))
+        self._drop(conn)
+
+    # ----- http --------------------------------------------------------
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True   # headers and body go out as separate writes
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/api/websocket":
+                    if not server.websocket_enabled:
+                        self.send_error(404)
+                        return
+                    key = self.headers.get("Sec-WebSocket-Key", "")
+                    accept = base64.b64encode(
+                        hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+                    self.send_response(101)
+                    self.send_header("Upgrade", "websocket")
+                    self.send_header("Connection", "Upgrade")
+                    self.send_header("Sec-WebSocket-Accept", accept)
+                    self.end_headers()
+                    self.close_connection = True
+                    server._serve_websocket(self)
+                    return
+                if self.headers.get("Authorization") != f"Bearer {server.token}":
+                    self.send_error(401)
+                    return
+                if self.path != "/api/states":
+                    self.send_error(404)
+                    return
+                with server._lock:
+                    body = json.dumps([server._public(s) for s in server.states.values()]).encode()
+                    server.rest_requests += 1
+                    server.rest_bytes += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        """Serve on a background thread; returns the base URL."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def stop(self):
+        self.drop_websockets()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _ws_frame(text):
+    """Unmasked server-to-client text frame."""
+    payload = text.encode("utf-8")
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x81, n)
+    elif n < 65536:
+        header = struct.pack("!BBH", 0x81, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x81, 127, n)
+    return header + payload
+
+
+def _recv_exact(rfile, n):
+    data = rfile.read(n)
+    if len(data) < n:
+        raise ConnectionError("websocket closed")
+    return data
+
+
+def _ws_read(rfile, conn):
+    """Read one masked client frame; returns its text, or None on close."""
+    while True:
+        b1, b2 = _recv_exact(rfile, 2)
+        opcode, n = b1 & 0x0F, b2 & 0x7F
+        if n == 126:
+            n = struct.unpack("!H", _recv_exact(rfile, 2))[0]
+        elif n == 127:
+            n = struct.unpack("!Q", _recv_exact(rfile, 8))[0]
+        mask = _recv_exact(rfile, 4) if b2 & 0x80 else b"\0\0\0\0"
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(_recv_exact(rfile, n)))
+        if opcode == 0x8:
+            return None
+        if opcode == 0x9:
+            conn.sendall(struct.pack("!BB", 0x8A, len(payload)) + payload)
+            continue
+        if opcode in (0x1, 0x0):
+            return payload.decode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=10.0, help="state changes per second")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--token", default="fake-token")
+    parser.add_argument("--no-websocket", action="store_true",
+                        help="REST only (exercises the polling fallback)")
+    args = parser.parse_args()
+
+    server = FakeHAServer(entities=args.entities, token=args.token,
+                          websocket=not args.no_websocket, port=args.port)
+    print(f"Fake Home Assistant with {len(server.states)} entities at {server.start()}")
+    try:
+        while True:
+            time.sleep(1.0)
+            server.mutate(int(args.rate))
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
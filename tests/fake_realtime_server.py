@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""Offline stand-in for the OpenAI Realtime WebSocket API.
+
+Speaks just enough of the GA protocol for AIVoiceModule: session.created
+on connect, session.updated in reply to session.update, and for each
+response.create a short spoken reply (response.output_audio.delta
+chunks of 24 kHz PCM, then response.done). Everything the client sends
+is logged per connection. Standard library only; the WebSocket framing
+comes from tests/fake_ha_server.py.
+
+Faults for connection tests:
+
+    server = FakeRealtimeServer(handshake_delay_s=0.2)
+    url = server.start()             # ws://127.0.0.1:<port>
+    server.mode = "refuse"           # HTTP 503 instead of the upgrade
+    server.mode = "stall"            # upgrade, then never session.created
+    server.drop_after_s = 0.5        # close every session this long after ready
+    server.drop_connections()        # network blip
+    server.stop()
+
+Point the mirror at it with http_client.base_url_overrides =
+[("wss://api.openai.com", url)], or run it standalone:
+
+    python tests/fake_realtime_server.py --port 8790
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import socket
+import struct
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if __package__ in (None, ""):
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.fake_ha_server import WS_GUID, _ws_frame, _ws_read  # noqa: E402
+
+SAMPLE_RATE = 24000
+
+
+def tone(ms, freq=220.0, amplitude=8000):
+    """16-bit mono PCM sine, the fake reply's 'speech'."""
+    n = int(SAMPLE_RATE * ms / 1000)
+    return struct.pack(f"<{n}h", *(int(amplitude * math.sin(2 * math.pi * freq * i / SAMPLE_RATE))
+                                   for i in range(n)))
+
+
+class FakeRealtimeServer:
+    """A threaded fake Realtime endpoint; see the module docstring."""
+
+    def __init__(self, token=None, handshake_delay_s=0.0, port=0,
+                 reply_ms=600, chunk_ms=100, paced=False):
+        self.token = token               # None: accept any bearer token
+        self.handshake_delay_s = handshake_delay_s
+        self.mode = "ok"                 # ok | refuse | stall
+        self.drop_after_s = None
+        self.reply_ms = reply_ms
+        self.chunk_ms = chunk_ms
+        self.paced = paced               # send deltas in real time, not all at once
+        self._lock = threading.Lock()
+        self._conns = []
+        self.connections = 0             # upgrades completed
+        self.refused = 0
+        self.sessions = []               # per connection: list of client events
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # ----- websocket ---------------------------------------------------
+
+    def _send(self, conn, event):
+        conn.sendall(_ws_frame(json.dumps(event)))
+
+    def _reply(self, conn):
+        """A spoken reply: audio deltas, transcript, response.done."""
+        pcm = tone(self.reply_ms)
+        step = int(SAMPLE_RATE * self.chunk_ms / 1000) * 2
+        self._send(conn, {"type": "response.created", "response": {"id": "resp_fake"}})
+        for i in range(0, len(pcm), step):
+            self._send(conn, {"type": "response.output_audio.delta",
+                              "delta": base64.b64encode(pcm[i:i + step]).decode()})
+            if self.paced:
+                time.sleep(self.chunk_ms / 1000.0)
+        self._send(conn, {"type": "response.output_audio_transcript.delta",
+                          "delta": "Mirror, mirror."})
+        self._send(conn, {"type": "response.done",
+                          "response": {"id": "resp_fake", "status": "completed"}})
+
+    def _serve_websocket(self, handler):
+        conn, rfile = handler.connection, handler.rfile
+        log = []
+        with self._lock:
+            self._conns.append(conn)
+            self.sessions.append(log)
+            self.connections += 1
+        timer = None
+        try:
+            if self.mode == "stall":
+                while _ws_read(rfile, conn) is not None:
+                    pass
+                return
+            if self.handshake_delay_s:
+                time.sleep(self.handshake_delay_s)
+            self._send(conn, {"type": "session.created",
+                              "session": {"id": f"sess_{self.connections}"}})
+            while True:
+                raw = _ws_read(rfile, conn)
+                if raw is None:
+                    break
+                event = json.loads(raw)
+                log.append(event)
+                kind = event.get("type")
+                if kind == "session.update":
+                    self._send(conn, {"type": "session.updated", "session": event.get("session")})
+                    if self.drop_after_s is not None:
+                        timer = threading.Timer(self.drop_after_s, self._drop, (conn,))
+                        timer.daemon = True
+                        timer.start()
+                elif kind == "input_audio_buffer.commit":
+                    self._send(conn, {"type": "input_audio_buffer.committed"})
+                elif kind == "response.create":
+                    self._reply(conn)
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._drop(conn)
+
+    def _drop(self, conn):
+        with self._lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def drop_connections(self):
+        """Close every open WebSocket (network blip)."""
+        with self._lock:
+            conns = list(self._conns)
+        for conn in conns:
+            self._drop(conn)
+
+    def events(self, kind=None):
+        """Every client event received, across connections, in order."""
+        with self._lock:
+            sessions = [list(s) for s in self.sessions]
+        return [e for s in sessions for e in s if kind is None or e.get("type") == kind]
+
+    # ----- http --------------------------------------------------------
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                if server.mode == "refuse":
+                    server.refused += 1
+                    self.send_error(503)
+                    return
+                if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+                    self.send_error(401)
+                    return
+                key = self.headers.get("Sec-WebSocket-Key", "")
+                accept = base64.b64encode(
+                    hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+                self.send_response(101)
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header("Sec-WebSocket-Accept", accept)
+                self.end_headers()
+                self.close_connection = True
+                server._serve_websocket(self)
+
+        return Handler
+
+    def start(self):
+        """Serve on a background thread; returns the ws:// base URL."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return f"ws://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def stop(self):
+        self.drop_connections()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--handshake-delay", type=float, default=0.2, help="seconds before session.created")
+    parser.add_argument("--drop-after", type=float, help="close each session this long after it is ready")
+    args = parser.parse_args()
+
+    server = FakeRealtimeServer(handshake_delay_s=args.handshake_delay, port=args.port)
+    server.drop_after_s = args.drop_after
+    print(f"Fake Realtime API at {server.start()}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Fake TTS backend and speaker for speech pipeline tests and benchmarks.
+
+FakeTTS stands in for OpenAI TTS / gTTS: synthesise(text) sleeps
+latency_ms plus synth_ms_per_char for each character (a round-trip
+whose cost grows with the text, like the real services), then writes a
+small file recording the text and how long it would take to say
+(speech_ms_per_char). Every call is logged with its start and end, so a
+test can see whether synthesis overlapped playback. fail_on makes calls
+for matching text raise.
+
+FakeSpeechPlayer reads those files and "plays" them on the wall clock:
+play(path) returns the clip length at once, as pygame does, and records
+(text, start, end); stop() cuts the current clip short. heard() gives
+the clips as actually played, so time to first word and gaps can be
+measured independently of the pipeline's own counters.
+
+    tts = FakeTTS(root, latency_ms=150)
+    player = FakeSpeechPlayer()
+    speech = SpeechPipeline(tts, player)
+    ...
+    player.first_start(), player.gaps_ms()
+
+Standard library only.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class FakeTTS:
+    """A slow synthesiser writing clip descriptions instead of audio."""
+
+    def __init__(self, root, latency_ms=150.0, synth_ms_per_char=0.0, speech_ms_per_char=60.0,
+                 fail_on=None):
+        self.root = root
+        self.latency_s = latency_ms / 1000.0
+        self.synth_s_per_char = synth_ms_per_char / 1000.0
+        self.speech_s_per_char = speech_ms_per_char / 1000.0
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+        self._n = 0
+        self.calls = []          # (text, start, end)
+
+    def __call__(self, text):
+        start = time.monotonic()
+        time.sleep(self.latency_s + self.synth_s_per_char * len(text))
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError(f"fake TTS refused '{text[:20]}'")
+        with self._lock:
+            self._n += 1
+            path = os.path.join(self.root, f"clip-{self._n}.json")
+            self.calls.append((text, start, time.monotonic()))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"text": text, "length_s": self.speech_s_per_char * len(text)}, f)
+        return path
+
+    def save(self, text, path):
+        """synthesise(text, path) form, for tts_cache.fetch / prewarm."""
+        os.replace(self(text), path)
+
+
+class FakeSpeechPlayer:
+    """Plays FakeTTS clips on the wall clock; records what was heard."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clips = []          # [text, start, end], end cut short by stop()
+
+    def play(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            clip = json.load(f)
+        now = time.monotonic()
+        with self._lock:
+            self.clips.append([clip["text"], now, now + clip["length_s"]])
+        return clip["length_s"]
+
+    def stop(self):
+        now = time.monotonic()
+        with self._lock:
+            if self.clips and self.clips[-1][2] > now:
+                self.clips[-1][2] = now
+
+    def heard(self, after=0.0):
+        with self._lock:
+            return [tuple(c) for c in self.clips if c[1] >= after]
+
+    def first_start(self, after=0.0):
+        clips = self.heard(after)
+        return clips[0][1] if clips else None
+
+    def last_end(self, after=0.0):
+        clips = self.heard(after)
+        return max(c[2] for c in clips) if clips else None
+
+    def gaps_ms(self, after=0.0):
+        """Silence between consecutive clips started after `after`."""
+        clips = self.heard(after)
+        return [max(0.0, (b[1] - a[2]) * 1000.0) for a, b in zip(clips, clips[1:])]
@@ -47,6 +47,29 @@ DISPLAY_TESTS = [
 
 LOGIC_TESTS = [
     "test_voice_commands.py",
+    "test_compositor.py",
+    "test_frame_scheduler.py",
+    "test_module_profiler.py",
+    "test_surface_cache.py",
+    "test_layer_cache.py",
+    "test_glyph_atlas.py",
+    "test_stocks_ticker.py",
+    "test_background_fetcher.py",
+    "test_stocks_quotes.py",
+    "test_api_tracker.py",
+    "test_ha_state.py",
+    "test_http_client.py",
+    "test_upstream_replay.py",
+    "test_news_feeds.py",
+    "test_geocode_cache.py",
+    "test_energy_ledger.py",
+    "test_price_history.py",
+    "test_module_registry.py",
+    "test_voice_connection.py",
+    "test_voice_playback.py",
+    "test_lipsync.py",
+    "test_tts_cache.py",
+    "test_speech_pipeline.py",
 ]
 
 INTEGRATION_TESTS = [
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""Logic test: APITracker minute-bucket windows, limits, breaker, journal persistence, no usage log when asked."""
+
+import sys
+import os
+import json
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+START = 1_800_000_000.0
+
+
+def main():
+    from api_tracker import APITracker, RateCounter
+
+    results = TestResult()
+    print("Testing APITracker counters...")
+    print("-" * 50)
+
+    tmp = tempfile.mkdtemp()
+    state = os.path.join(tmp, "state.json")
+    now = [START]
+    tracker = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+
+    # Hourly limit (alpha-vantage: 10/hour, 25/day)
+    for _ in range(10):
+        tracker.record("stocks", "alpha-vantage")
+        now[0] += 60
+    results.record("Hourly limit blocks at the limit", not tracker.allow("stocks", "alpha-vantage"))
+    now[0] = START + 3600    # first call now 60 min old: out of the hour window
+    results.record("Calls leave the hour window after 60 minutes",
+                   tracker.allow("stocks", "alpha-vantage"),
+                   str(tracker.get_summary()["by_service"]["alpha-vantage"]))
+
+    for _ in range(15):
+        tracker.record("stocks", "alpha-vantage")
+        now[0] += 400   # spread out: never hits the hourly limit
+    summary = tracker.get_summary()["by_service"]["alpha-vantage"]
+    results.record("Daily limit blocks at 25/day",
+                   summary["daily"] == 25 and not tracker.allow("stocks", "alpha-vantage"),
+                   str(summary))
+    now[0] = START + 86400 + 30
+    results.record("Oldest calls expire after 24h",
+                   tracker.get_summary()["by_service"]["alpha-vantage"]["daily"] == 24
+                   and tracker.allow("stocks", "alpha-vantage"))
+
+    # Costs and summary totals
+    tracker.record("ai_voice", "openai-realtime", estimated_cost=0.25)
+    tracker.record("ai_voice", "openai-realtime", estimated_cost=0.25)
+    summary = tracker.get_summary()
+    results.record("Summary totals and costs",
+                   summary["by_service"]["openai-realtime"] == {"hourly": 2, "daily": 2, "cost": 0.5}
+                   and summary["total_calls_24h"] == 26,
+                   str(summary["by_service"]["openai-realtime"]))
+
+    # Circuit breaker semantics unchanged
+    for _ in range(APITracker.BREAKER_THRESHOLD):
+        tracker.failure("weather", "open-meteo")
+    blocked = not tracker.allow("weather", "open-meteo")
+    now[0] += APITracker.BREAKER_COOLDOWN + 1
+    half_open = tracker.allow("weather", "open-meteo")
+    tracker.failure("weather", "open-meteo")
+    reopened = not tracker.allow("weather", "open-meteo")
+    results.record("Breaker opens, half-opens after cooldown, reopens on failure",
+                   blocked and half_open and reopened)
+
+    # Persistence round-trip (bucket format)
+    tracker.force_summary()
+    restored = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    results.record("Buckets survive a restart",
+                   restored.get_summary()["by_service"] == tracker.get_summary()["by_service"],
+                   str(restored.get_summary()["total_calls_24h"]))
+
+    # Legacy per-call state file still loads
+    with open(state, "w") as f:
+        json.dump({"calls": [[now[0] - 120, "stocks", "alpha-vantage", 0.0],
+                             [now[0] - 90000, "stocks", "alpha-vantage", 0.0]]}, f)
+    legacy = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    results.record("Legacy call-list state loads (24h only)",
+                   legacy.get_summary()["by_service"]["alpha-vantage"]["daily"] == 1)
+
+    # Journal: every record() is on disk without a snapshot write
+    state = os.path.join(tmp, "journal_state.json")
+    journal = os.path.splitext(state)[0] + ".journal"
+    tracker = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    for _ in range(3):
+        tracker.record("news", "newsapi")
+    tracker.record("ai_voice", "openai-realtime", estimated_cost=0.125)
+    replayed = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    results.record("Journal replays unsaved calls after a crash",
+                   not os.path.exists(state)
+                   and replayed.get_summary()["by_service"] == tracker.get_summary()["by_service"],
+                   str(replayed.get_summary()["by_service"]))
+
+    # Torn final line is dropped and trimmed; later appends stay parseable
+    with open(journal, "a") as f:
+        f.write("2999")
+    torn = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    torn.record("news", "newsapi")
+    again = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    results.record("Truncated journal tail recovered",
+                   torn.get_persistence_stats()["recovered_tail_bytes"] == 4
+                   and again.get_summary()["by_service"]["newsapi"]["daily"] == 4,
+                   str(again.get_summary()["by_service"].get("newsapi")))
+
+    # Crash between snapshot and journal reset: old-generation journal ignored
+    with open(journal) as f:
+        stale_journal = f.read()
+    again.force_summary()
+    with open(journal, "w") as f:
+        f.write(stale_journal)
+    after_crash = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    results.record("Compacted journal never double-counts",
+                   after_crash.get_summary()["by_service"]["newsapi"]["daily"] == 4,
+                   str(after_crash.get_summary()["by_service"]["newsapi"]))
+
+    # Compaction keeps the journal bounded
+    small = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    small.JOURNAL_MAX_BYTES = 512
+    for _ in range(200):
+        small.record("news", "newsapi")
+    stats = small.get_persistence_stats()
+    reloaded = APITracker(state_file=state, clock=lambda: now[0], usage_log=None)
+    results.record("Compaction bounds the journal",
+                   stats["compactions"] >= 5 and os.path.getsize(journal) < 512 + 64
+                   and reloaded.get_summary()["by_service"]["newsapi"]["daily"] == 204,
+                   f"{stats} reloaded={reloaded.get_summary()['by_service']['newsapi']}")
+
+    # Counter stays bounded and exact across long gaps
+    counter = RateCounter()
+    counter.add(0, 5)
+    counter.add(59, 1)
+    counter.advance(60)
+    hour_after = counter.hour_count
+    counter.advance(10 ** 6)
+    results.record("RateCounter windows and long-gap reset",
+                   hour_after == 1 and counter.day_count == 0 and counter.hour_count == 0,
+                   f"hour={hour_after}")
+
+    # The module's own tracker already owns the APIUsage logger; listen in
+    class Capture(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.lines = []
+
+        def emit(self, record):
+            self.lines.append(record.getMessage())
+
+    usage, capture = logging.getLogger("APIUsage"), Capture()
+    usage.addHandler(capture)
+    try:
+        quiet = APITracker(state_file=None, usage_log=None)
+        quiet.record("weather", "open-meteo")
+        quiet.force_summary()
+        silent = list(capture.lines)
+        APITracker(state_file=None, usage_log=os.path.join(tmp, "usage.log"))
+    finally:
+        usage.removeHandler(capture)
+    results.record("usage_log=None writes nothing to the shared usage log",
+                   silent == [] and capture.lines == ["=== API Tracker session started ==="],
+                   str(capture.lines))
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Logic test: shared fetch worker pool - limits, priorities, deadlines, cancellation."""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+def wait_for(fetcher, timeout=2.0):
+    """Poll take_result() like a module's update() would."""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        result = fetcher.take_result()
+        if result is not None:
+            return result
+        time.sleep(0.005)
+    return None
+
+
+def main():
+    from background_fetcher import (
+        BackgroundFetcher, FetchScheduler, FetchDeadlineExceeded,
+        PRIORITY_USER, PRIORITY_BACKGROUND,
+    )
+
+    results = TestResult()
+    print("Testing FetchScheduler...")
+    print("-" * 50)
+
+    pool = FetchScheduler(workers=2)
+    fetcher = BackgroundFetcher("weather", scheduler=pool)
+    gate = threading.Event()
+    results.record("submit() accepted when idle", fetcher.submit(lambda: gate.wait(2) and 42))
+    results.record("Busy fetcher refuses a second submit",
+                   not fetcher.submit(lambda: 0) and not fetcher.idle)
+    gate.set()
+    results.record("Result delivered once via take_result()",
+                   wait_for(fetcher) == (True, 42) and fetcher.take_result() is None
+                   and fetcher.idle)
+
+    def boom():
+        raise ValueError("offline")
+
+    fetcher.submit(boom)
+    ok, err = wait_for(fetcher)
+    results.record("Failure delivered as (False, exception)",
+                   not ok and isinstance(err, ValueError))
+
+    # Pool size bounds concurrency; threads are reused, not spawned per fetch
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def tracked(duration=0.05):
+        def fn():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(duration)
+            with lock:
+                running[0] -= 1
+            return True
+        return fn
+
+    threads_before = threading.active_count()
+    fetchers = [BackgroundFetcher(f"mod{i}", scheduler=pool) for i in range(6)]
+    for f in fetchers:
+        f.submit(tracked())
+    done = [wait_for(f) for f in fetchers]
+    results.record("At most `workers` fetches run at once",
+                   all(done) and peak[0] == 2, f"peak={peak[0]}")
+    results.record("No thread per fetch", threading.active_count() == threads_before,
+                   f"{threads_before} -> {threading.active_count()} threads")
+
+    # Per-name in-flight limit: two fetchers sharing a name never overlap
+    running[0] = peak[0] = 0
+    twins = [BackgroundFetcher("octopus_energy", scheduler=pool) for _ in range(2)]
+    for f in twins:
+        f.submit(tracked())
+    [wait_for(f) for f in twins]
+    results.record("Per-name limit serialises same-name fetches", peak[0] == 1,
+                   f"peak={peak[0]}")
+
+    # Priority: with the only worker busy, a user refresh jumps the queue
+    single = FetchScheduler(workers=1)
+    blocker = BackgroundFetcher("blocker", scheduler=single)
+    gate = threading.Event()
+    blocker.submit(lambda: gate.wait(2))
+    order = []
+    background = BackgroundFetcher("news", scheduler=single)
+    user = BackgroundFetcher("calendar", scheduler=single)
+    background.submit(lambda: order.append("background"), priority=PRIORITY_BACKGROUND)
+    user.submit(lambda: order.append("user"), priority=PRIORITY_USER)
+    time.sleep(0.05)   # both wait behind the blocker
+    gate.set()
+    wait_for(background), wait_for(user)
+    results.record("User priority runs before background polling",
+                   order == ["user", "background"], str(order))
+
+    # boost(): a queued background poll is promoted when the user asks for it
+    gate = threading.Event()
+    blocker.submit(lambda: gate.wait(2))
+    order = []
+    polling = BackgroundFetcher("weather", scheduler=single)
+    asked = BackgroundFetcher("stocks", scheduler=single)
+    polling.submit(lambda: order.append("weather"))
+    asked.submit(lambda: order.append("stocks"))
+    asked.boost()
+    gate.set()
+    wait_for(polling), wait_for(asked)
+    results.record("boost() moves a queued fetch ahead of polling",
+                   order == ["stocks", "weather"], str(order))
+
+    # Deadline: a job stuck behind a slow one is dropped, not run late
+    gate = threading.Event()
+    blocker.submit(lambda: gate.wait(2))
+    stale = BackgroundFetcher("fitbit", scheduler=single)
+    ran = []
+    stale.submit(lambda: ran.append(1), deadline_s=0.05)
+    time.sleep(0.1)
+    gate.set()
+    result = wait_for(stale)
+    results.record("Missed deadline reports FetchDeadlineExceeded",
+                   result is not None and not result[0]
+                   and isinstance(result[1], FetchDeadlineExceeded) and not ran,
+                   str(result))
+
+    # Cancellation of a queued job
+    gate = threading.Event()
+    blocker.submit(lambda: gate.wait(2))
+    cancelled = BackgroundFetcher("quote", scheduler=single)
+    cancelled.submit(lambda: ran.append(2))
+    results.record("cancel() drops a queued fetch", cancelled.cancel() and cancelled.idle)
+    gate.set()
+    wait_for(blocker)
+    time.sleep(0.05)
+    results.record("Cancelled fetch never runs or delivers",
+                   2 not in ran and cancelled.take_result() is None)
+
+    stats = single.get_stats()["jobs"]
+    results.record("Per-name stats track expiry, cancellation and timings",
+                   stats["fitbit"]["expired"] == 1 and stats["quote"]["cancelled"] == 1
+                   and stats["blocker"]["run_ms_max"] > 0
+                   and stats["news"]["wait_ms_max"] >= 40,
+                   f"expired={stats['fitbit']['expired']} cancelled={stats['quote']['cancelled']} "
+                   f"run_ms_max={stats['blocker']['run_ms_max']} "
+                   f"wait_ms_max={stats['news']['wait_ms_max']}")
+
+    pool.shutdown()
+    single.shutdown()
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
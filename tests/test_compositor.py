@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Logic test: dirty-rect compositor matches a full redraw (no display needed)."""
+
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+class FakeLayer:
+    """Translucent box whose content changes every `period` frames."""
+
+    def __init__(self, rect, period):
+        import pygame
+        self.rect = pygame.Rect(rect)
+        self.period = period
+        self.version = 0
+        self.drawn = None
+        self.draw_calls = 0
+
+    def needs_redraw(self):
+        return self.version != self.drawn
+
+    def draw(self, surface, record=True):
+        import pygame
+        if record:
+            self.drawn = self.version
+            self.draw_calls += 1
+        fill = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        fill.fill(((self.version * 37) % 255, 120, 180, 128))
+        surface.blit(fill, self.rect)
+
+
+def main():
+    import pygame
+    pygame.init()
+    from compositor import FrameCompositor
+
+    results = TestResult()
+    print("Testing FrameCompositor...")
+    print("-" * 50)
+
+    screen = pygame.Surface((400, 300))
+    reference = pygame.Surface((400, 300))
+    comp = FrameCompositor(screen)
+    layers = [
+        FakeLayer((0, 0, 400, 80), 1),        # animated band
+        FakeLayer((10, 40, 100, 200), 7),     # overlaps the band
+        FakeLayer((290, 100, 100, 100), 13),
+        FakeLayer((150, 120, 50, 50), 1000),  # static
+    ]
+
+    mismatches = 0
+    double_draws = 0
+    for frame in range(60):
+        for layer in layers:
+            if frame % layer.period == 0:
+                layer.version += 1
+        visible = [l for i, l in enumerate(layers) if not (frame > 30 and i == 2)]
+        before = [l.draw_calls for l in visible]
+
+        comp.begin_frame()
+        for i, layer in enumerate(visible):
+            comp.add_layer(str(layers.index(layer)), [layer.rect],
+                           layer.needs_redraw(), lambda l=layer: l.draw(screen))
+        comp.present()
+
+        double_draws += sum(
+            1 for l, b in zip(visible, before) if l.draw_calls - b > 1
+        )
+        reference.fill((0, 0, 0))
+        for layer in visible:
+            layer.draw(reference, record=False)
+        if pygame.image.tobytes(screen, "RGB") != pygame.image.tobytes(reference, "RGB"):
+            mismatches += 1
+
+    results.record("Pixel-identical to full redraw", mismatches == 0,
+                   f"{mismatches} mismatched frames of 60")
+    results.record("Each layer drawn at most once per frame", double_draws == 0,
+                   f"{double_draws} double draws")
+
+    stats = comp.get_stats()
+    results.record("Repaints less than the full screen",
+                   stats['avg_screen_fraction'] < 1.0,
+                   f"avg fraction {stats['avg_screen_fraction']}")
+
+    static = layers[3]
+    calls = static.draw_calls
+    comp.begin_frame()
+    comp.add_layer("3", [static.rect], static.needs_redraw(),
+                   lambda: static.draw(screen))
+    comp.present()
+    comp.begin_frame()
+    comp.add_layer("3", [static.rect], static.needs_redraw(),
+                   lambda: static.draw(screen))
+    damage = comp.present()
+    results.record("Unchanged frame is skipped", damage == [] and static.draw_calls <= calls + 1,
+                   f"damage={damage}")
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+"""Logic test: Octopus energy ledger - paginated incremental ingest, persistence, exact half-hourly cost (local server)."""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+BASE = "https://api.octopus.energy"
+MPAN, SERIAL = "1200000000001", "21L0000001"
+PRODUCT = "AGILE-24-10-01"
+TARIFF = f"E-1R-{PRODUCT}-C"
+HALF_HOUR = 1800
+
+
+def iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def agile_price(ts):
+    """Cheap overnight, expensive 16:00-19:00, otherwise mid."""
+    hour = time.gmtime(ts).tm_hour
+    return 7.5 if hour < 6 else 38.0 if 16 <= hour < 19 else 22.0 + (ts // HALF_HOUR % 3)
+
+
+class OctopusREST:
+    """Account, consumption, unit-rate and standing-charge endpoints with
+    page_size/next pagination and a request log."""
+
+    def __init__(self, first, last):
+        self.consumption = {s: round(0.1 + (s // HALF_HOUR % 7) * 0.05, 3)
+                            for s in range(first, last, HALF_HOUR)}
+        self.rates = {s: agile_price(s) for s in range(first, last, HALF_HOUR)}
+        self.log = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                kind = parts.path.rstrip("/").rsplit("/", 1)[-1]
+                api.log.append((kind, query))
+                if kind == "consumption":
+                    start = api._from(query)
+                    rows = [{"interval_start": iso(s), "interval_end": iso(s + HALF_HOUR),
+                             "consumption": k}
+                            for s, k in sorted(api.consumption.items()) if s >= start]
+                    if query.get("order_by") != "period":
+                        rows.reverse()
+                elif kind == "standard-unit-rates":
+                    start = api._from(query)
+                    end = api._to(query)
+                    rows = [{"value_exc_vat": round(p / 1.05, 4), "value_inc_vat": p,
+                             "valid_from": iso(s), "valid_to": iso(s + HALF_HOUR)}
+                            for s, p in sorted(api.rates.items(), reverse=True)
+                            if s + HALF_HOUR > start and s < end]
+                elif kind == "standing-charges":
+                    rows = [{"value_inc_vat": 45.0, "valid_from": iso(first), "valid_to": None}]
+                else:
+                    return self._reply({"properties": [{"electricity_meter_points": [{
+                        "mpan": MPAN, "meters": [{"serial_number": SERIAL}],
+                        "agreements": [{"tariff_code": TARIFF, "valid_to": None}]}]}]})
+                size = int(query.get("page_size", 100))
+                page = int(query.get("page", 1))
+                chunk = rows[(page - 1) * size:page * size]
+                nxt = None
+                if page * size < len(rows):
+                    nxt = f"{BASE}{parts.path}?" + urlencode({**query, "page": page + 1})
+                self._reply({"count": len(rows), "next": nxt, "results": chunk})
+
+            def _reply(self, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    @staticmethod
+    def _from(query):
+        from energy_ledger import parse_time
+        return parse_time(query["period_from"]) if "period_from" in query else 0
+
+    @staticmethod
+    def _to(query):
+        from energy_ledger import parse_time
+        return parse_time(query["period_to"]) if "period_to" in query else float("inf")
+
+    def take_log(self):
+        log, self.log = self.log, []
+        return log
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    import data_cache as data_cache_module
+    import http_client as http_client_module
+    import octopus_energy_module
+    from api_tracker import APITracker
+    from energy_ledger import EnergyLedger, parse_time
+    from octopus_energy_module import OctopusEnergyModule
+
+    results = TestResult()
+    print("Testing energy ledger...")
+    print("-" * 50)
+
+    now = time.time()
+    day_start = int(now) // 86400 * 86400
+    first = day_start - 30 * 86400
+    last = day_start + 86400
+
+    cache_dir = tempfile.mkdtemp(prefix="ledger-test-")
+    real_cache_dir = data_cache_module._CACHE_DIR
+    data_cache_module._CACHE_DIR = cache_dir
+    client = http_client_module.http_client
+    real_overrides = client.base_url_overrides
+    real_trackers = http_client_module.api_tracker, octopus_energy_module.api_tracker
+    api = OctopusREST(first, last)
+    late = int(now) // HALF_HOUR * HALF_HOUR - 6 * HALF_HOUR   # not uploaded yet
+    late_kwh = api.consumption.pop(late)
+    try:
+        tracker = APITracker(state_file=None, usage_log=None)
+        tracker.set_limit("octopus-energy", hourly=10 ** 6, daily=10 ** 6)
+        http_client_module.api_tracker = octopus_energy_module.api_tracker = tracker
+        client.base_url_overrides = [(BASE, api.url)]
+
+        octo = OctopusEnergyModule(api_key="sk_test", account_number="A-TEST",
+                                   page_size=500, history_days=31)
+        octo._fetch_account()
+        octo._fetch_rates()
+        octo._fetch_consumption()
+        log = api.take_log()
+        pages = [q for kind, q in log if kind == "consumption"]
+        counts = octo._ledger.counts()
+        results.record("First fetch pages through the whole window",
+                       len(pages) == 3 and counts["consumption"] == len(api.consumption)
+                       and all(q["order_by"] == "period" for q in pages),
+                       f"{len(pages)} pages, {counts}")
+        results.record("Unit rates stored for the window",
+                       counts["rates"] == len(api.rates)
+                       and len([1 for kind, _ in log if kind == "standard-unit-rates"]) == 3,
+                       str(counts))
+
+        # Two new half-hours land upstream, a late one behind the newest
+        # fills its gap and an earlier reading is revised
+        for s in (last, last + HALF_HOUR):
+            api.consumption[s] = 0.4
+        api.consumption[late] = late_kwh
+        api.consumption[late - HALF_HOUR] += 0.25
+        octo._fetch_consumption()
+        log = api.take_log()
+        trailing = (int(now) - 86400) // HALF_HOUR * HALF_HOUR
+        results.record("Next refresh asks for new half-hours and the trailing day",
+                       len(log) == 1 and trailing <= parse_time(log[0][1]["period_from"])
+                       <= trailing + HALF_HOUR
+                       and octo.ingest_stats["intervals"] == len(api.consumption),
+                       str(log))
+        ledger = octo._ledger
+        results.record("Late and revised half-hours are upserted",
+                       ledger.cost(late, late + HALF_HOUR)["kwh"] == late_kwh
+                       and ledger.cost(late - HALF_HOUR, late)["kwh"]
+                       == api.consumption[late - HALF_HOUR]
+                       and octo.ingest_stats["revised"] == 1,
+                       str(octo.ingest_stats))
+
+        octo._fetch_rates()
+        results.record("Rates already held are not re-fetched",
+                       [kind for kind, _ in api.take_log()] == ["standing-charges"])
+
+        expected = sum(k * api.rates[s] for s, k in api.consumption.items()
+                       if day_start <= s < day_start + 86400)
+        kwh = sum(k for s, k in api.consumption.items() if day_start <= s < day_start + 86400)
+        estimate = kwh * octo.current_rate
+        results.record("Today's cost is each half-hour at its own rate",
+                       octo.cost_today_pence == round(expected, 1)
+                       and octo.consumption_today_kwh == round(kwh, 2) and octo.unpriced_today == 0
+                       and abs(estimate - expected) > 1.0,
+                       f"exact {expected:.1f}p, old estimate {estimate:.1f}p")
+
+        fast, loop = ledger.cost(first, last + 86400), ledger.cost_loop(first, last + 86400)
+        results.record("Vectorised join matches the interval loop",
+                       fast["intervals"] == loop["intervals"] == len(api.consumption)
+                       and abs(fast["pence"] - loop["pence"]) < 1e-6
+                       and fast["unpriced"] == loop["unpriced"] == 2,
+                       f"{fast} vs {loop}")
+
+        # Restart: ledger comes back from data_cache
+        restarted = OctopusEnergyModule(api_key="sk_test", account_number="A-TEST", page_size=500)
+        restarted._fetch_account()
+        restarted._fetch_consumption()
+        log = api.take_log()
+        results.record("Ledger persists across a restart",
+                       restarted._ledger.counts() == ledger.counts()
+                       and [kind for kind, _ in log] == ["A-TEST", "consumption"]
+                       and restarted.cost_today_pence == octo.cost_today_pence,
+                       str(log))
+
+        other = EnergyLedger()
+        other.load((MPAN, "OTHER"), TARIFF)
+        switched = EnergyLedger()
+        switched.load((MPAN, SERIAL), "E-1R-VAR-22-11-01-C")
+        results.record("Meter change drops everything, tariff change drops rates",
+                       other.counts() == {"consumption": 0, "rates": 0}
+                       and switched.counts()["consumption"] == len(api.consumption)
+                       and switched.counts()["rates"] == 0
+                       and switched.rates_from() == switched.window_start())
+
+        clock = [float(day_start)]
+        small = EnergyLedger(window_days=1, cache_name="ledger_small", clock=lambda: clock[0])
+        small.add_consumption([{"interval_start": iso(day_start - 3600), "consumption": 1.0},
+                               {"interval_start": iso(day_start), "consumption": 2.0}])
+        small.add_rates([{"valid_from": iso(day_start - 86400), "valid_to": None,
+                          "value_inc_vat": 24.5}], day_start)
+        priced = small.cost(day_start - 86400, day_start + 86400)
+        clock[0] += 86400
+        small.add_consumption([])
+        results.record("Open-ended rate prices everything; old intervals pruned",
+                       priced == {"kwh": 3.0, "pence": 73.5, "intervals": 2, "unpriced": 0}
+                       and small.counts() == {"consumption": 1, "rates": 1}
+                       and small.consumption_from() == day_start,
+                       str(priced))
+    finally:
+        api.stop()
+        client.base_url_overrides = real_overrides
+        http_client_module.api_tracker, octopus_energy_module.api_tracker = real_trackers
+        data_cache_module._CACHE_DIR = real_cache_dir
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
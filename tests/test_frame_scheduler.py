@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Logic test: adaptive frame rate follows animation demand (no display needed)."""
+
+import sys
+import os
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+def main():
+    from frame_scheduler import FrameScheduler
+
+    results = TestResult()
+    print("Testing FrameScheduler...")
+    print("-" * 50)
+
+    fs = FrameScheduler(
+        frame_rate=30,
+        max_fps={'active': 30, 'screensaver': 20, 'sleep': 1},
+        idle_fps=4, wake_hold_ms=200, log_interval_s=0,
+    )
+
+    fps = fs.choose('active', ['weather'])
+    results.record("Animating runs at full rate", fps == 30, f"{fps} FPS")
+
+    fps = fs.choose('active', [])
+    results.record("Nothing animating drops to idle rate", fps == 4, f"{fps} FPS")
+
+    fps = fs.choose('screensaver', ['retro_characters'])
+    results.record("State ceiling caps the rate", fps == 20, f"{fps} FPS")
+
+    fps = fs.choose('sleep', [])
+    results.record("Sleep runs near zero", fps == 1, f"{fps} FPS")
+
+    fs.wake('panel')
+    fps = fs.choose('active', [])
+    results.record("Wake holds full rate", fps == 30 and fs.reason == 'panel',
+                   f"{fps} FPS ({fs.reason})")
+    time.sleep(0.25)
+    fps = fs.choose('active', [])
+    results.record("Hold expires back to idle", fps == 4, f"{fps} FPS")
+
+    # A wake that arrives mid-frame skips the next wait entirely
+    start = time.monotonic()
+    fs.tick('sleep', [])
+    elapsed = time.monotonic() - start
+    results.record("Pending wake skips the wait", elapsed < 0.05,
+                   f"{elapsed * 1000:.0f} ms")
+
+    # A 1 FPS wait must end as soon as another thread wakes the loop
+    threading.Timer(0.1, fs.wake, args=('panel',)).start()
+    start = time.monotonic()
+    fs.tick('sleep', [])
+    elapsed = time.monotonic() - start
+    results.record("wake() cuts a long wait short", 0.05 < elapsed < 0.5,
+                   f"{elapsed * 1000:.0f} ms")
+
+    start = time.monotonic()
+    for _ in range(5):
+        fs.tick('active', ['stocks'])
+    elapsed = time.monotonic() - start
+    results.record("Full rate ticks at ~30 FPS", 0.1 < elapsed < 0.3,
+                   f"5 frames in {elapsed * 1000:.0f} ms")
+
+    disabled = FrameScheduler(frame_rate=30, max_fps={'sleep': 1}, enabled=False)
+    fps = disabled.choose('sleep', [])
+    results.record("Disabled scheduler keeps the fixed rate", fps == 30, f"{fps} FPS")
+
+    stats = fs.get_stats()
+    results.record("Stats report the chosen rate",
+                   stats['fps'] == 30 and stats['frames'] == 7 and stats['wakes'] >= 1,
+                   str(stats))
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""Logic test: persistent geocode cache - keys, TTL, eviction, WeatherModule warm start (local server)."""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+PLACES = {
+    "birmingham": [{"name": "Birmingham", "latitude": 33.52, "longitude": -86.80, "country_code": "US"},
+                   {"name": "Birmingham", "latitude": 52.48, "longitude": -1.90, "country_code": "GB"}],
+    "leeds": [{"name": "Leeds", "latitude": 53.80, "longitude": -1.55, "country_code": "GB"}],
+}
+
+
+class OpenMeteo:
+    """Geocoding + forecast endpoints with per-path counters."""
+
+    def __init__(self):
+        self.calls = {"search": 0, "forecast": 0}
+        self.geocode_down = False
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                if parts.path == "/v1/search":
+                    api.calls["search"] += 1
+                    if api.geocode_down:
+                        return self._reply(500, {"error": True})
+                    return self._reply(200, {"results": PLACES.get(query["name"][0].lower(), [])})
+                api.calls["forecast"] += 1
+                self._reply(200, {"current": {"temperature_2m": float(query["latitude"][0]),
+                                              "weather_code": 3}})
+
+            def _reply(self, code, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def forget_weather(cache_dir):
+    """Drop the last-good forecast so a new module has to fetch."""
+    path = os.path.join(cache_dir, "weather.json")
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def first_forecast(module, timeout=5.0):
+    """Drive update() until weather data lands; returns seconds or None."""
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        module.update()
+        if module.weather_data:
+            return time.monotonic() - start
+        time.sleep(0.01)
+    return None
+
+
+def main():
+    import data_cache as data_cache_module
+    import http_client as http_client_module
+    import weather_module
+    from api_tracker import APITracker
+    from weather_module import GeocodeCache, WeatherModule
+
+    results = TestResult()
+    print("Testing geocode cache...")
+    print("-" * 50)
+
+    cache_dir = tempfile.mkdtemp(prefix="geocode-test-")
+    real_cache_dir = data_cache_module._CACHE_DIR
+    data_cache_module._CACHE_DIR = cache_dir
+    client = http_client_module.http_client
+    real_overrides, real_tracker = client.base_url_overrides, http_client_module.api_tracker
+    real_cache = weather_module.geocode_cache
+    api = OpenMeteo()
+    try:
+        results.record("Query keys are normalised",
+                       GeocodeCache.normalise("  Birmingham ,  UK") == "birmingham,gb"
+                       and GeocodeCache.normalise("New  York") == "new york")
+
+        now = [1_000_000.0]
+        cache = GeocodeCache(ttl_s=3600, max_entries=2, clock=lambda: now[0])
+        cache.put("Leeds, GB", {"lat": 53.8, "lon": -1.55, "name": "Leeds", "country": "GB"})
+        reloaded = GeocodeCache(ttl_s=3600, max_entries=2, clock=lambda: now[0])
+        results.record("Entries persist through data_cache",
+                       reloaded.get("leeds,gb") == {"lat": 53.8, "lon": -1.55, "name": "Leeds",
+                                                    "country": "GB"}
+                       and os.path.exists(os.path.join(cache_dir, "geocode.json")))
+
+        now[0] += 3601
+        results.record("Expired entry is a miss but usable as a fallback",
+                       reloaded.get("Leeds,GB") is None
+                       and reloaded.get("Leeds,GB", allow_stale=True)["lat"] == 53.8)
+
+        now[0] += 1
+        cache.put("York,GB", {"lat": 53.96, "lon": -1.08})
+        now[0] += 1
+        cache.put("Hull,GB", {"lat": 53.74, "lon": -0.33})
+        results.record("Oldest entry evicted past max_entries",
+                       cache.get("Leeds,GB", allow_stale=True) is None
+                       and cache.get("York,GB") is not None and cache.get("Hull,GB") is not None)
+
+        pinned = GeocodeCache(pinned={"Home, UK": {"lat": 1.0, "lon": 2.0, "name": "Home"}})
+        results.record("Pinned locations need no lookup", pinned.get("home,gb")["lat"] == 1.0)
+
+        # WeatherModule against the local Open-Meteo
+        os.remove(os.path.join(cache_dir, "geocode.json"))
+        weather_module.geocode_cache = GeocodeCache()
+        client.base_url_overrides = [("https://geocoding-api.open-meteo.com", api.url),
+                                     ("https://api.open-meteo.com", api.url)]
+        tracker = APITracker(state_file=None, usage_log=None)
+        http_client_module.api_tracker = tracker
+
+        cold = WeatherModule(api_key=None, city="Birmingham, UK")
+        cold_s = first_forecast(cold)
+        results.record("Cold start geocodes, then fetches the forecast",
+                       cold_s is not None and api.calls == {"search": 1, "forecast": 1}, str(api.calls))
+        results.record("UK alias matches the GB result",
+                       cold.weather_data["main"]["temp"] == 52.48, str(cold._geo_cache))
+
+        weather_module.geocode_cache = GeocodeCache()          # fresh process, same disk
+        forget_weather(cache_dir)
+        warm = WeatherModule(api_key=None, city="birmingham,gb")
+        ready = warm._geo_cache is not None
+        warm_s = first_forecast(warm)
+        results.record("Warm start goes straight to the forecast",
+                       ready and warm_s is not None and api.calls == {"search": 1, "forecast": 2},
+                       str(api.calls))
+
+        forget_weather(cache_dir)
+        leeds = WeatherModule(api_key=None, city="Leeds")
+        first_forecast(leeds)
+        entries = json.load(open(os.path.join(cache_dir, "geocode.json")))["payload"]
+        results.record("Several locations cached side by side",
+                       set(entries) == {"birmingham,gb", "leeds"}
+                       and leeds.weather_data["main"]["temp"] == 53.80, str(sorted(entries)))
+
+        now[0] = time.time() + 31 * 86400
+        weather_module.geocode_cache = GeocodeCache(clock=lambda: now[0])
+        api.geocode_down = True
+        forget_weather(cache_dir)
+        stale = WeatherModule(api_key=None, city="Leeds")
+        results.record("Expired entry refreshed; failure falls back to it",
+                       stale._geo_cache is None and first_forecast(stale) is not None
+                       and api.calls["search"] == 3
+                       and weather_module.geocode_cache.stats["stale_hits"] == 1,
+                       str(weather_module.geocode_cache.stats))
+    finally:
+        api.stop()
+        client.base_url_overrides = real_overrides
+        http_client_module.api_tracker = real_tracker
+        weather_module.geocode_cache = real_cache
+        data_cache_module._CACHE_DIR = real_cache_dir
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Logic test: GlyphAtlas tracked text matches per-glyph rendering, atlas count bounded (no display needed)."""
+
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+def per_glyph(font, text, color, tracking):
+    """The previous render_tracked: one font.render() per character."""
+    import pygame
+    glyphs = [font.render(ch, True, color) for ch in text]
+    width = sum(g.get_width() for g in glyphs) + tracking * (len(glyphs) - 1)
+    height = max(g.get_height() for g in glyphs)
+    surf = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
+    x = 0
+    for g in glyphs:
+        surf.blit(g, (x, 0))
+        x += g.get_width() + tracking
+    return surf
+
+
+def same_pixels(a, b):
+    import pygame
+    return (a.get_size() == b.get_size()
+            and pygame.image.tostring(a, "RGBA") == pygame.image.tostring(b, "RGBA"))
+
+
+def main():
+    import pygame
+    pygame.init()
+    from config import load_font, FONT_SIZE_SMALL, FONT_SIZE_LABEL
+    from module_base import GlyphAtlas, ModuleDrawHelper, glyph_atlas
+
+    results = TestResult()
+    print("Testing GlyphAtlas...")
+    print("-" * 50)
+
+    label = load_font('medium', FONT_SIZE_LABEL)
+    small = load_font('regular', FONT_SIZE_SMALL)
+    color = (80, 180, 255)
+
+    for font, text, tracking in ((label, "WEATHER", 4),
+                                 (small, "FRIDAY 16 OCTOBER 2026", 2),
+                                 (small, "A B  C", 0)):
+        atlas_surf = ModuleDrawHelper.render_tracked(font, text, color, tracking=tracking)
+        results.record(f"Pixel-identical: {text!r}",
+                       same_pixels(atlas_surf, per_glyph(font, text, color, tracking)),
+                       f"size {atlas_surf.get_size()}")
+
+    atlas = glyph_atlas(small, color)
+    before = atlas.rasterised
+    ModuleDrawHelper.render_tracked(small, "FRIDAY 16 OCTOBER 2026", color, tracking=2)
+    results.record("Repeat string rasterises nothing", atlas.rasterised == before,
+                   f"{atlas.rasterised} glyphs")
+    results.record("Each glyph rasterised once",
+                   atlas.rasterised == len(set("FRIDAY 16 OCTOBER 2026A B  C")),
+                   f"{atlas.rasterised} glyphs")
+
+    results.record("Atlas shared per (font, colour)",
+                   glyph_atlas(small, list(color)) is atlas
+                   and glyph_atlas(small, (255, 255, 255)) is not atlas)
+
+    import module_base
+    for shade in range(module_base.MAX_GLYPH_ATLASES + 8):
+        glyph_atlas(small, (shade, 0, 0))
+        glyph_atlas(small, color)   # in use every frame: never the LRU
+    results.record("Atlases bounded, least recently used dropped",
+                   len(module_base._glyph_atlases) == module_base.MAX_GLYPH_ATLASES
+                   and glyph_atlas(small, color) is atlas
+                   and (small, (0, 0, 0)) not in module_base._glyph_atlases,
+                   f"{len(module_base._glyph_atlases)} atlases")
+
+    class NarrowAtlas(GlyphAtlas):
+        SHEET_WIDTH = 64
+
+    wide = NarrowAtlas(label, color)
+    wide.render("".join(chr(c) for c in range(33, 127)))
+    text = "The QUICK brown ~fox~ {jumps}"
+    results.record("Sheet grows past one row and stays correct",
+                   wide._sheet.get_height() > wide._row_h
+                   and same_pixels(wide.render(text, 3), per_glyph(label, text, color, 3)),
+                   f"sheet {wide._sheet.get_size()}")
+
+    empty = ModuleDrawHelper.render_tracked(label, "", color)
+    results.record("Empty text gives a 1x1 surface", empty.get_size() == (1, 1))
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""Logic test: shared Home Assistant state store against the fake HA server (no network)."""
+
+import sys
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+from tests.fake_ha_server import FakeHAServer
+
+ENTITIES = 2000
+
+
+def wait_until(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def main():
+    import ha_state
+    import http_client
+    from api_tracker import APITracker
+    from ha_state import HAStateStore, ha_state_store
+    from smarthome_module import SmartHomeModule
+    from phone_module import PhoneModule
+
+    results = TestResult()
+    print("Testing HA state store...")
+    print("-" * 50)
+
+    # Test traffic goes to a throwaway tracker, not the persisted one
+    tracker = APITracker(state_file=None, usage_log=None)
+    tracker.set_limit("home-assistant", hourly=10 ** 6, daily=10 ** 6, daily_cost=0)
+    real_trackers = (ha_state.api_tracker, http_client.api_tracker)
+    ha_state.api_tracker = http_client.api_tracker = tracker
+    try:
+        server = FakeHAServer(entities=ENTITIES)
+        url = server.start()
+        store = HAStateStore(url, server.token)
+        lights = store.subscribe(domains={"light"})
+        locks = store.subscribe(entity_ids={"lock.lock_9"})
+        connected = wait_until(lambda: store.mode == "websocket")
+        initial = lights.take_changes()
+        expected = {e for e in server.states if e.startswith("light.")}
+        results.record("Snapshot then WebSocket stream", connected and store.get_stats()["snapshots"] == 1,
+                       str(store.get_stats()))
+        results.record("First take returns every matching entity", set(initial) == expected,
+                       f"{len(initial)}/{len(expected)} lights")
+        locks.take_changes()
+
+        changed = server.mutate(300)
+        wait_until(lambda: store.get_stats()["events"] >= 300)
+        delta = lights.take_changes()
+        results.record("Only changed, matching entities are delivered",
+                       set(delta) == {e for e in changed if e.startswith("light.")}
+                       and all(delta[e]["state"] == server.states[e]["state"] for e in delta),
+                       f"{len(delta)} light changes of {len(changed)}")
+
+        for value in ("unlocked", "locked", "unlocked"):
+            server.set_state("lock.lock_9", value)
+        wait_until(lambda: store.get("lock.lock_9")["state"] == "unlocked")
+        coalesced = locks.take_changes()
+        results.record("Repeated changes coalesce to the latest state",
+                       list(coalesced) == ["lock.lock_9"]
+                       and coalesced["lock.lock_9"]["state"] == "unlocked", str(coalesced))
+
+        light = next(iter(expected))
+        server.remove(light)
+        wait_until(lambda: store.get(light) is None)
+        results.record("Removed entity delivered as None", lights.take_changes() == {light: None})
+
+        current = store.get("lock.lock_9")
+        store._apply_event({"entity_id": "lock.lock_9",
+                            "new_state": dict(current, state="jammed", last_updated="2000-01-01T00:00:00")})
+        results.record("Stale (older) event ignored",
+                       store.get("lock.lock_9")["state"] == "unlocked" and not locks.take_changes())
+
+        locks.set_filter(entity_ids={"lock.lock_9", "switch.switch_8"})
+        results.record("Widened filter delivers newly matching entities",
+                       set(locks.take_changes()) == {"switch.switch_8"})
+
+        # HA restart: the stream reconnects and the snapshot diff catches up
+        server.drop_websockets()
+        wait_until(lambda: store.mode != "websocket", timeout=2.0)
+        server.set_state("switch.switch_8", "on" if store.get("switch.switch_8")["state"] == "off" else "off")
+        reconnected = wait_until(lambda: store.get_stats()["ws_connects"] == 2)
+        results.record("Reconnects and catches up on missed changes",
+                       reconnected and store.get("switch.switch_8")["state"]
+                       == server.states["switch.switch_8"]["state"]
+                       and list(locks.take_changes()) == ["switch.switch_8"],
+                       str(store.get_stats()))
+        store.shutdown()
+
+        # No WebSocket: fall back to polling at the shortest subscriber interval
+        rest_only = FakeHAServer(entities=200, websocket=False)
+        poller = HAStateStore(rest_only.start(), rest_only.token)
+        sub = poller.subscribe(domains={"switch"}, poll_interval_s=0.2)
+        wait_until(lambda: poller.synced)
+        sub.take_changes()
+        changed = rest_only.mutate(100)
+        polled = wait_until(lambda: bool(sub.take_changes()), timeout=3.0)
+        results.record("Falls back to polling without a WebSocket",
+                       polled and poller.mode == "polling" and rest_only.rest_requests >= 2,
+                       f"mode={poller.mode} polls={rest_only.rest_requests}")
+        poller.shutdown()
+        rest_only.stop()
+
+        denied = HAStateStore(url, "wrong-token")
+        denied.subscribe()
+        wait_until(lambda: denied.last_error is not None)
+        results.record("Bad token reported, not connected",
+                       not denied.connected and denied.last_error is not None, str(denied.last_error))
+        denied.shutdown()
+
+        # Modules share one connection and one snapshot
+        home = SmartHomeModule(ha_url=url, ha_token=server.token, max_entities=10)
+        home._load_entity_override = lambda: []
+        home.entities = []
+        phone = PhoneModule(ha_url=url, ha_token=server.token)
+        requests_before = server.rest_requests
+        home.update()
+        phone.update()
+        shared = ha_state_store(url, server.token)
+        wait_until(lambda: shared.mode == "websocket")
+        wait_until(lambda: (home.update(), phone.update(), bool(home.data and phone.battery_level))[-1])
+        results.record("SmartHome and Phone share one snapshot",
+                       home._ha_sub.store is phone._ha_sub.store
+                       and server.rest_requests - requests_before == 1,
+                       f"{server.rest_requests - requests_before} snapshots")
+        results.record("Phone discovers the battery, then narrows its filter",
+                       phone.battery_entity == "sensor.iphone_battery_level"
+                       and phone.battery_level == 76 and phone.battery_state == "Not Charging"
+                       and phone._ha_sub.entity_ids == {"sensor.iphone_battery_level",
+                                                        "sensor.iphone_battery_state"}
+                       and not phone._ha_sub.domains)
+
+        shown = home.entities[0]
+        new_value = "off" if server.states[shown]["state"] == "on" else "on"
+        if shown.startswith(("sensor.", "climate.")):
+            new_value = "19.5" if shown.startswith("sensor.") else "off"
+        server.set_state(shown, new_value)
+        server.set_state("sensor.iphone_battery_level", "15")
+        server.mutate(200)
+        updated = wait_until(lambda: (home.update(), phone.update(),
+                                      home.data[shown]["state"] == new_value
+                                      and phone.battery_level == 15)[-1])
+        results.record("Modules follow pushed changes", updated and len(home.entities) == 10,
+                       f"{shown}={home.data[shown]['state']} battery={phone.battery_level}")
+
+        version = home.content_version()
+        attrs = home.data[shown]["attributes"]
+        home.data[shown]["attributes"] = dict(attrs, friendly_name="Renamed")
+        renamed = home.content_version()
+        home.data[shown]["attributes"] = dict(attrs, unit_of_measurement="units")
+        results.record("Mini view layer re-renders on a rename or unit change",
+                       len({version, renamed, home.content_version()}) == 3)
+
+        shared.shutdown()
+        server.stop()
+    finally:
+        ha_state.api_tracker, http_client.api_tracker = real_trackers
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
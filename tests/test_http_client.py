@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""Logic test: shared HTTP client - keep-alive pooling, conditional GET, api_tracker (local server)."""
+
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+LAST_MODIFIED = "Wed, 01 Jul 2026 10:00:00 GMT"
+
+
+class Origin:
+    """Local HTTP/1.1 server with ETag, Last-Modified and max-age routes."""
+
+    def __init__(self):
+        self.version = 1
+        self.hits = {}
+        self.ports = set()          # client ports seen = TCP connections
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True   # headers and body go out as separate writes
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                origin.hits[self.path] = origin.hits.get(self.path, 0) + 1
+                origin.ports.add(self.client_address[1])
+                body = f"{self.path} v{origin.version} ".encode() * 50
+                etag = f'"v{origin.version}"'
+                headers = {}
+                if self.path == "/etag":
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._reply(304, b"", headers)
+                elif self.path == "/lastmod":
+                    headers["Last-Modified"] = LAST_MODIFIED
+                    if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                        return self._reply(304, b"", headers)
+                elif self.path == "/fresh":
+                    headers.update({"ETag": etag, "Cache-Control": "max-age=60"})
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._reply(304, b"", headers)
+                elif self.path == "/nostore":
+                    headers.update({"ETag": etag, "Cache-Control": "no-store"})
+                elif self.path == "/down":
+                    return self._reply(503, b"upstream down", headers)
+                self._reply(200, body, headers)
+
+            def _reply(self, code, body, headers):
+                self.send_response(code)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    import http_client as http_client_module
+    from api_tracker import APITracker
+    from http_client import HTTPClient, APICallBlocked
+
+    results = TestResult()
+    print("Testing HTTP client...")
+    print("-" * 50)
+
+    origin = Origin()
+    now = [1000.0]
+    client = HTTPClient(clock=lambda: now[0])
+    host = origin.url.split("//")[1]
+
+    bodies = [client.get(origin.url + "/plain", timeout=5).content for _ in range(5)]
+    stats = client.get_stats()["hosts"][host]
+    results.record("Keep-alive: five GETs, one handshake",
+                   stats["handshakes"] == 1 and len(origin.ports) == 1 and len(set(bodies)) == 1,
+                   f"handshakes={stats['handshakes']} server connections={len(origin.ports)}")
+
+    first = client.get(origin.url + "/etag", timeout=5)
+    second = client.get(origin.url + "/etag", timeout=5)
+    stats = client.get_stats()["hosts"][host]
+    results.record("ETag revalidation answers 304 from the remembered body",
+                   second.status_code == 200 and second.revalidated and not first.revalidated
+                   and second.content == first.content and stats["not_modified"] == 1
+                   and origin.hits["/etag"] == 2,
+                   f"not_modified={stats['not_modified']}")
+
+    client.get(origin.url + "/lastmod", timeout=5)
+    again = client.get(origin.url + "/lastmod", timeout=5)
+    results.record("Last-Modified revalidation", again.revalidated and again.json is not None
+                   and client.get_stats()["hosts"][host]["not_modified"] == 2)
+
+    origin.version = 2
+    changed = client.get(origin.url + "/etag", timeout=5)
+    results.record("Changed resource downloads the new body",
+                   not changed.revalidated and b"v2" in changed.content)
+
+    bytes_before = client.get_stats()["hosts"][host]["bytes_in"]
+    client.get(origin.url + "/fresh", timeout=5)
+    hits = origin.hits["/fresh"]
+    cached = client.get(origin.url + "/fresh", timeout=5)
+    results.record("max-age response served without the network",
+                   origin.hits["/fresh"] == hits and cached.revalidated
+                   and client.get_stats()["hosts"][host]["fresh_hits"] == 1)
+    now[0] += 61
+    client.get(origin.url + "/fresh", timeout=5)
+    stats = client.get_stats()["hosts"][host]
+    results.record("Expired max-age revalidates (304)",
+                   origin.hits["/fresh"] == hits + 1 and stats["not_modified"] == 3
+                   and stats["bytes_in"] - bytes_before == len(cached.content),
+                   f"bytes_in +{stats['bytes_in'] - bytes_before}")
+
+    client.get(origin.url + "/nostore", timeout=5)
+    fresh = client.get(origin.url + "/nostore", timeout=5)
+    results.record("no-store responses are not remembered", not fresh.revalidated)
+
+    # Only real upstream calls count against api_tracker limits
+    tracker = APITracker(state_file=None, clock=lambda: 1_800_000_000.0, usage_log=None)
+    tracker.set_limit("test-origin", hourly=2, daily=100, daily_cost=0)
+    real_tracker = http_client_module.api_tracker
+    http_client_module.api_tracker = tracker
+    try:
+        api = ("test", "test-origin")
+        client.get(origin.url + "/fresh", timeout=5, api=api)     # fresh hit: free
+        client.get(origin.url + "/plain", timeout=5, api=api)
+        client.get(origin.url + "/etag", timeout=5, api=api)      # 304 is still upstream
+        try:
+            client.get(origin.url + "/plain", timeout=5, api=api)
+            blocked = False
+        except APICallBlocked:
+            blocked = True
+        counted = tracker.get_summary()["by_service"]["test-origin"]["hourly"]
+        results.record("api_tracker counts upstream calls, not fresh hits",
+                       counted == 2 and blocked, f"counted={counted} blocked={blocked}")
+
+        # Consecutive 5xx responses open the breaker: the client must not
+        # record them, since record() resets the failure count
+        api = ("test", "test-down")
+        statuses = []
+        for _ in range(tracker.BREAKER_THRESHOLD):
+            resp = client.get(origin.url + "/down", timeout=5, api=api)
+            statuses.append(resp.status_code)
+            if resp.status_code >= 500:
+                tracker.failure(*api)   # as callers do after raise_for_status()
+        try:
+            client.get(origin.url + "/down", timeout=5, api=api)
+            opened = False
+        except APICallBlocked:
+            opened = True
+        down = tracker.get_summary()["by_service"].get("test-down", {}).get("hourly", 0)
+        results.record("Consecutive 5xx responses open the breaker",
+                       opened and statuses == [503] * tracker.BREAKER_THRESHOLD and down == 0
+                       and origin.hits["/down"] == tracker.BREAKER_THRESHOLD,
+                       f"statuses={statuses} opened={opened} recorded={down}")
+    finally:
+        http_client_module.api_tracker = real_tracker
+
+    baseline = HTTPClient(pooling=False, revalidate=False)
+    for _ in range(3):
+        baseline.get(origin.url + "/etag", timeout=5)
+    stats = baseline.get_stats()["totals"]
+    results.record("Unpooled baseline handshakes every call",
+                   stats["handshakes"] == 3 and stats["not_modified"] == 0)
+
+    small = HTTPClient(cache_max_bytes=1200)
+    for path in ("/etag", "/lastmod", "/fresh"):
+        small.get(origin.url + path, timeout=5)
+    cache = small.get_stats()["cache"]
+    results.record("Remembered bodies stay within the byte budget",
+                   cache["bytes"] <= 1200 and cache["entries"] == 2, str(cache))
+
+    for c in (client, baseline, small):
+        c.close()
+    origin.stop()
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Logic test: retained module layers match a direct draw and re-render only on version or size change (no display needed)."""
+
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+def main():
+    import pygame
+    pygame.init()
+    from config import TRANSPARENCY
+    from module_base import LayerCache, ModuleDrawHelper, RetainedLayer
+
+    class FakeModule(RetainedLayer):
+        """Title, translucent text and shapes, like the column modules."""
+
+        def __init__(self):
+            self.text = "Hello"
+            self.draws = 0
+
+        def draw(self, screen, position):
+            self.draws += 1
+            x, y, width = position['x'], position['y'], position['width']
+            draw_y = ModuleDrawHelper.draw_module_title(screen, "Fake", x, y, width)
+            font = pygame.font.Font(None, 28)
+            text = font.render(self.text, True, (230, 230, 230))
+            text.set_alpha(TRANSPARENCY)
+            screen.blit(text, (x, draw_y))
+            pygame.draw.circle(screen, (80, 200, 120), (x + 20, draw_y + 40), 6)
+            box = pygame.Surface((60, 12), pygame.SRCALPHA)
+            box.fill((200, 120, 40, 128))
+            screen.blit(box, (x + 40, draw_y + 34))
+
+    results = TestResult()
+    print("Testing LayerCache...")
+    print("-" * 50)
+
+    position = {'x': 30, 'y': 20, 'width': 200, 'height': 120}
+
+    def screen():
+        return pygame.Surface((320, 200))
+
+    module = FakeModule()
+    direct = screen()
+    module.draw(direct, position)
+    cache = LayerCache()
+    cached = screen()
+    cache.blit(cached, "fake", module, position, 255)
+    pixels = pygame.image.tobytes(direct, "RGB")
+    results.record("Cached layer is pixel-identical to a direct draw",
+                   any(pixels) and pixels == pygame.image.tobytes(cached, "RGB"))
+
+    # The fade path of _draw_module: draw to a temp surface, then set_alpha
+    temp = pygame.Surface((position['width'], position['height']), pygame.SRCALPHA)
+    module.draw(temp, dict(position, x=0, y=0))
+    temp.set_alpha(100)
+    faded_direct = screen()
+    faded_direct.blit(temp, (position['x'], position['y']))
+    module.draws = 0
+    faded = screen()
+    cache.blit(faded, "fake", module, position, 100)
+    results.record("A fade alpha change does not re-render",
+                   module.draws == 0 and cache.get_stats()["renders"] == 1
+                   and pygame.image.tobytes(faded, "RGB") == pygame.image.tobytes(faded_direct, "RGB"),
+                   f"{module.draws} draws, {cache.get_stats()}")
+
+    for _ in range(5):
+        cache.blit(screen(), "fake", module, position)
+    unchanged = module.draws
+    module.text = "World"
+    stale_before = cache.is_stale("fake", module, position)
+    module.mark_dirty()
+    stale_after = cache.is_stale("fake", module, position)
+    out = screen()
+    cache.blit(out, "fake", module, position)
+    cache.blit(out, "fake", module, position)
+    results.record("draw() re-runs only when the version changes",
+                   unchanged == 0 and not stale_before and stale_after and module.draws == 1,
+                   f"{unchanged} draws unchanged, {module.draws} after mark_dirty()")
+
+    bigger = dict(position, width=240)
+    stale = cache.is_stale("fake", module, bigger)
+    cache.blit(screen(), "fake", module, bigger)
+    cache.blit(screen(), "fake", module, bigger)
+    results.record("A size change re-renders once", stale and module.draws == 2,
+                   f"{module.draws} draws")
+
+    cache.invalidate("fake")
+    cache.blit(screen(), "fake", module, bigger)
+    stats = cache.get_stats()
+    results.record("invalidate() forces the next blit to re-render",
+                   module.draws == 3 and stats["renders"] == 4 and stats["blits"] == 12,
+                   str(stats))
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
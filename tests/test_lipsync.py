@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Logic test: avatar lip-sync analysis - vectorised RMS/ZCR match the per-window loop, partial windows carried over, band energies, round/narrow visemes (no display)."""
+
+import sys
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+RATE = 24000
+
+
+def tone(freq, seconds, amplitude=8000):
+    import numpy as np
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16).tobytes()
+
+
+def loop_envelope(pcm):
+    """The per-window loop feed_audio used before LipSyncAnalyzer."""
+    import numpy as np
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    window = int(RATE * 0.025)
+    rows = []
+    for i in range(0, len(samples) - window + 1, window):
+        seg = samples[i:i + window]
+        rows.append((float(np.sqrt(np.mean(seg * seg))),
+                     float(np.mean(np.abs(np.diff(np.sign(seg))) > 0))))
+    return rows
+
+
+def main():
+    try:
+        import numpy as np
+    except ImportError:
+        print("numpy not installed - lip-sync analysis disabled, nothing to test")
+        return 0
+    import pygame
+    pygame.init()
+    from avatar_module import AvatarModule, LipSyncAnalyzer
+
+    results = TestResult()
+    print("Testing lip-sync analysis...")
+    print("-" * 50)
+
+    rng = np.random.default_rng(3)
+    noise = (rng.standard_normal(RATE) * 3000).astype(np.int16)
+    noise[1000:1600] = 0   # a silent window: sign 0 handled like the loop
+    pcm = noise.tobytes()
+    rows = LipSyncAnalyzer(bands=False).analyse(pcm)
+    reference = np.array(loop_envelope(pcm))
+    results.record("RMS and ZCR match the per-window loop",
+                   rows.shape == reference.shape
+                   and np.allclose(rows[:, 0], reference[:, 0], rtol=1e-5)
+                   and np.array_equal(rows[:, 1], reference[:, 1]),
+                   f"{rows.shape} vs {reference.shape}")
+
+    analyzer = LipSyncAnalyzer(bands=True)
+    parts = [analyzer.analyse(pcm[i:i + 1000]) for i in range(0, len(pcm), 1000)]
+    whole = LipSyncAnalyzer(bands=True).analyse(pcm)
+    results.record("Partial windows carry over between chunks",
+                   np.allclose(np.vstack(parts), whole) and len(whole) == RATE // 600
+                   and sum(len(p) == 0 for p in parts) > 0,
+                   f"{sum(len(p) for p in parts)} windows from {len(parts)} chunks")
+
+    low = LipSyncAnalyzer(bands=True).analyse(tone(300, 0.1))
+    high = LipSyncAnalyzer(bands=True).analyse(tone(5000, 0.1))
+    results.record("Band energies: 300 Hz is low, 5 kHz is high",
+                   low[:, 2].min() > 0.95 and low[:, 3].max() < 0.01
+                   and high[:, 3].min() > 0.95 and high[:, 2].max() < 0.01,
+                   f"low band {low[0, 2]:.2f}/{high[0, 2]:.2f}, high band {low[0, 3]:.2f}/{high[0, 3]:.2f}")
+
+    avatar = AvatarModule(assets_path=os.devnull, lipsync_bands=True)
+    block = tone(220, 0.02)   # 20 ms blocks: smaller than a window
+    for _ in range(5):
+        avatar.feed_audio(block)
+    results.record("feed_audio keeps every window of small blocks",
+                   len(avatar._envelope) == 4 and len(avatar._envelope[0]) == 4,
+                   f"{len(avatar._envelope)} envelope samples")
+
+    face = pygame.Surface((10, 10))
+    avatar._frames = {k: face for k in ("neutral", "small", "open", "round")}
+    avatar.set_voice_state("Speaking")
+
+    def speak(pcm, seconds=0.4):
+        avatar._envelope.clear()
+        avatar.feed_audio(pcm)
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            avatar.update()
+            time.sleep(0.02)
+        return avatar._pick_frame(time.monotonic())
+
+    speak(tone(700, 0.3, amplitude=12000))   # sets the loudness ceiling
+    oo = speak(tone(250, 1.0, amplitude=5000))
+    hiss = speak(tone(6000, 1.0, amplitude=6000))
+    results.record("Low-band sound rounds the mouth, high-band narrows it",
+                   oo == "round" and hiss == "small",
+                   f"oo -> {oo}, hiss -> {hiss} (round {avatar._round:.2f}, narrow {avatar._narrow:.2f})")
+
+    plain = AvatarModule(assets_path=os.devnull)
+    plain.feed_audio(tone(220, 0.05))
+    results.record("Bands are off by default: (rms, zcr) samples",
+                   len(plain._envelope) == 2 and len(plain._envelope[0]) == 2)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Logic test: per-module profiler histograms, budgets and overhead."""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+class FakeModule:
+    """update() is free; draw() is slow every 10th call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def update(self):
+        pass
+
+    def draw(self, screen, position):
+        self.calls += 1
+        if self.calls % 10 == 0:
+            time.sleep(0.008)
+        return "drawn"
+
+
+class FakeAnimations:
+    def draw_notifications(self, screen):
+        pass
+
+
+def main():
+    from module_profiler import ModuleProfiler, RollingHistogram
+
+    results = TestResult()
+    print("Testing ModuleProfiler...")
+    print("-" * 50)
+
+    prof = ModuleProfiler(frame_rate=30, module_budget_ms=5.0, log_interval_s=0)
+    fake = FakeModule()
+    anims = FakeAnimations()
+    prof.instrument({"fake": fake}, anims)
+
+    value = None
+    for _ in range(50):
+        start = time.perf_counter()
+        fake.update()
+        value = fake.draw(None, {})
+        anims.draw_notifications(None)
+        prof.end_frame(time.perf_counter() - start)
+
+    results.record("Wrapped method still returns its value", value == "drawn")
+
+    stats = prof.get_stats()
+    draw = stats["modules"].get("fake.draw", {})
+    results.record("Per-module histograms recorded",
+                   {"fake.update", "fake.draw", "notifications.draw"} <= set(stats["modules"]),
+                   str(sorted(stats["modules"])))
+    results.record("Over-budget frames counted", draw.get("over_budget") == 5,
+                   f"over_budget={draw.get('over_budget')}")
+    results.record("p99 lands in the slow bucket", draw.get("p99_ms", 0) >= 4.0,
+                   f"p50={draw.get('p50_ms')} p99={draw.get('p99_ms')}")
+    results.record("Frames counted", stats["frames"] == 50, f"frames={stats['frames']}")
+
+    overhead = stats["overhead"]
+    results.record("Wrapper overhead under 20 us/call", overhead["us_per_call"] < 20,
+                   f"{overhead['us_per_call']} us/call, {overhead['calls_per_frame']} calls/frame")
+
+    hist = RollingHistogram(slices=3, budget_ms=50.0)
+    hist.add(100.0)
+    over_before = hist.summary()["over_budget"]
+    for _ in range(3):
+        hist.rotate()
+    hist.add(1.0)
+    summary = hist.summary()
+    results.record("Rolling window drops old slices, over-budget counts too",
+                   summary["count"] == 1 and summary["max_ms"] == 1.0
+                   and over_before == 1 and summary["over_budget"] == 0, str(summary))
+
+    off = ModuleProfiler(enabled=False)
+    plain = FakeModule()
+    original = plain.draw
+    off.instrument({"plain": plain})
+    results.record("Disabled profiler leaves modules untouched",
+                   plain.draw == original and off.get_stats()["frames"] == 0)
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""Logic test: lazy module registry - construct on visibility or command, per-frame budget, background import pre-warm, voice fallback, startup timeline (no display)."""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+# Fake module sources written to a temp dir: name -> (class, body)
+SOURCES = {
+    "lazy_fast_module": ("FastModule", "pass"),
+    "lazy_slow_module": ("SlowModule", "time.sleep(0.03)"),
+    "lazy_heavy_module": ("HeavyModule", "pass"),
+    "lazy_voice_module": ("VoiceModule", "raise RuntimeError('no microphone')"),
+    "lazy_text_module": ("TextModule", "pass"),
+}
+HEAVY_IMPORT_S = 0.05
+
+
+def write_sources(root):
+    for source, (cls, body) in SOURCES.items():
+        prelude = f"time.sleep({HEAVY_IMPORT_S})\n" if source == "lazy_heavy_module" else ""
+        with open(os.path.join(root, f"{source}.py"), "w") as f:
+            f.write(
+                "import time\n" + prelude +
+                f"class {cls}:\n"
+                f"    def __init__(self, **params):\n"
+                f"        self.params = params\n"
+                f"        {body}\n"
+            )
+
+
+def config():
+    return {
+        "module_visibility": {"hidden": False},
+        "clock": {"class": "FastModule", "params": {"size": 3}},
+        "news": {"class": "SlowModule", "params": {}},
+        "quote": {"class": "SlowModule", "params": {}},
+        "weather": {"class": "HeavyModule", "params": {}},
+        "hidden": {"class": "FastModule", "params": {}},
+        "ai_voice": {"class": "VoiceModule", "params": {}},
+        "ai_interaction": {"class": "TextModule", "params": {}},
+        "not_a_module": {"class": "Nope"},
+        "frame_rate": 30,
+    }
+
+
+def last_load(registry):
+    return [e for e in registry.timeline if "name" in e][-1]
+
+
+def main():
+    import module_manager
+    from module_manager import ModuleManager, ModuleRegistry, import_module_class
+
+    results = TestResult()
+    print("Testing module registry...")
+    print("-" * 50)
+
+    work = tempfile.mkdtemp(prefix="registry-test-")
+    write_sources(work)
+    sys.path.insert(0, work)
+    real_sources = dict(module_manager.MODULE_SOURCES)
+    for source, (cls, _) in SOURCES.items():
+        module_manager.MODULE_SOURCES[cls] = source
+    try:
+        registry = ModuleRegistry(config=config(), frame_budget_ms=10)
+        registry.register_from_config()
+        loaded = []
+        registry.add_listener(lambda name, module: loaded.append(name))
+        results.record("Configured modules registered, nothing imported",
+                       registry.names() == ["clock", "news", "quote", "weather",
+                                            "ai_voice", "ai_interaction"]
+                       and not any(s in sys.modules for s in SOURCES)
+                       and registry.modules == {},
+                       str(registry.names()))
+
+        clock = registry.load("clock", "boot")
+        results.record("load() constructs with params and notifies listeners",
+                       clock.params == {"size": 3} and loaded == ["clock"]
+                       and registry.load("clock") is clock
+                       and registry.timeline[-1]["trigger"] == "boot")
+
+        for name in ("news", "quote"):
+            registry.request(name)
+        before = registry.pump()
+        registry.first_frame(prewarm=False)
+        first = registry.pump()
+        second = registry.pump()
+        results.record("pump() waits for the first frame, then keeps to the budget",
+                       before == [] and first == ["news"] and second == ["quote"]
+                       and last_load(registry)["init_ms"] >= 25,
+                       f"{first} then {second}")
+
+        # Pre-warm: the heavy import happens off the main loop
+        warm = ModuleRegistry(config=config())
+        warm.register_from_config()
+        warm.first_frame()
+        warm._prewarm_thread.join(5)
+        start = time.perf_counter()
+        weather = warm.load("weather", "visible")
+        took = time.perf_counter() - start
+        event = last_load(warm)
+        results.record("Pre-warm imports sources in the background",
+                       weather is not None and took < HEAVY_IMPORT_S
+                       and event["import_thread"] == "module-prewarm"
+                       and event["import_ms"] >= HEAVY_IMPORT_S * 1000 * 0.8,
+                       f"load {took * 1000:.1f} ms, {event}")
+
+        # ai_voice fails -> recorded, ai_interaction stands in
+        results.record("Failed construction recorded, not retried",
+                       registry.load("ai_voice", "command") is None
+                       and registry.state("ai_voice") == "failed"
+                       and "no microphone" in last_load(registry)["error"]
+                       and registry.load("ai_voice") is None
+                       and registry.has_pending())
+        registry.pump()
+        results.record("Fallback loads when the primary voice module fails",
+                       registry.state("ai_interaction") == "loaded"
+                       and registry.modules["ai_interaction"].params == {})
+
+        ok_config = config()
+        ok_config["ai_voice"] = {"class": "FastModule", "params": {}}
+        ok = ModuleRegistry(config=ok_config)
+        ok.register_from_config()
+        results.record("Fallback skipped while the primary works",
+                       ok.load("ai_interaction", "visible") is None
+                       and ok.state("ai_voice") == "loaded"
+                       and ok.state("ai_interaction") == "skipped")
+
+        # Timeline report once everything has settled
+        registry.request("weather")
+        while registry.has_pending():
+            registry.pump()
+        report = registry.report()
+        timeline = registry.get_timeline()
+        marks = [e["mark"] for e in timeline["events"] if "mark" in e]
+        results.record("Startup timeline lists import and init per module",
+                       marks == ["first_frame", "settled"]
+                       and all(n in report for n in ("clock", "news", "weather", "ai_voice"))
+                       and "FAILED: no microphone" in report
+                       and timeline["states"]["weather"] == "loaded"
+                       and timeline["imports"]["lazy_slow_module"]["thread"] == "MainThread",
+                       "\n" + report)
+
+        manager = ModuleManager(registry=ok)
+        manager.handle_command({"action": "show", "module": "news"})
+        results.record("ModuleManager: visible by default, commands load",
+                       manager.is_module_visible("quote") and ok.has_pending()
+                       and manager.initialize_module("quote") is ok.modules["quote"]
+                       and last_load(ok)["trigger"] == "command")
+
+        # ai_voice loaded but stops working (backoff, bad key) -> fallback
+        # is built after all, and dropped again once the voice recovers
+        working = [False]
+        ok.modules["ai_voice"].is_functional = lambda: working[0]
+        manager.verify_voice_module()
+        ok.first_frame(prewarm=False)
+        ok.pump()
+        fell_back = (manager.voice_interface == "ai_interaction"
+                     and ok.state("ai_interaction") == "loaded"
+                     and manager.is_module_visible("ai_interaction")
+                     and not manager.is_module_visible("ai_voice"))
+        working[0] = True
+        manager.verify_voice_module()
+        results.record("Voice that stops working falls back, and back again",
+                       fell_back and manager.voice_interface == "ai_voice"
+                       and manager.is_module_visible("ai_voice")
+                       and not manager.is_module_visible("ai_interaction"),
+                       f"{manager.voice_interface}, {ok.state('ai_interaction')}")
+
+        clock_class = import_module_class("ClockModule")
+        results.record("Import by class name",
+                       clock_class is not None and clock_class.__name__ == "ClockModule"
+                       and import_module_class("Nope") is None)
+    finally:
+        module_manager.MODULE_SOURCES.clear()
+        module_manager.MODULE_SOURCES.update(real_sources)
+        sys.path.remove(work)
+        for source in SOURCES:
+            sys.modules.pop(source, None)
+        shutil.rmtree(work, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
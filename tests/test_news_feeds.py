@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""Logic test: concurrent RSS pipeline - conditional GETs, persisted validators, GUID dedup, backoff."""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+DELAY = 0.3   # per-feed server latency
+
+
+class FeedOrigin:
+    """RSS feeds with ETags, a per-request delay and switchable failures."""
+
+    def __init__(self):
+        self.items = {"/a.xml": [("a1", "Alpha one"), ("a2", "Alpha two"), ("shared", "Shared")],
+                      "/b.xml": [("b1", "Bravo one"), ("shared", "Shared")]}
+        self.version = {path: 1 for path in self.items}
+        self.failing = set()
+        self.full = {path: 0 for path in self.items}        # 200 responses
+        self.not_modified = {path: 0 for path in self.items}
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(DELAY)
+                if self.path in origin.failing:
+                    return self._reply(500, b"down", {})
+                etag = f'"{origin.version[self.path]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    origin.not_modified[self.path] += 1
+                    return self._reply(304, b"", {"ETag": etag})
+                origin.full[self.path] += 1
+                body = ("<?xml version='1.0'?><rss><channel><title>t</title>"
+                        + "".join(f"<item><title>{title}</title><link>http://n.test/{guid}</link>"
+                                  f"<guid>{guid}</guid></item>"
+                                  for guid, title in origin.items[self.path])
+                        + "</channel></rss>").encode()
+                self._reply(200, body, {"ETag": etag, "Content-Type": "application/rss+xml"})
+
+            def _reply(self, code, body, headers):
+                self.send_response(code)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def change(self, path, items):
+        self.items[path] = items
+        self.version[path] += 1
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def refresh(news, timeout=5.0):
+    """Start a refresh round and pump update() until every feed lands."""
+    news.last_fetch = datetime.min
+    news.update()
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        time.sleep(0.01)
+        if all(f.fetcher.idle for f in news._feeds):
+            news.update()
+            return time.monotonic() - start
+    return None
+
+
+def main():
+    import data_cache as data_cache_module
+    from http_client import http_client
+    from news_module import NewsModule
+
+    results = TestResult()
+    print("Testing news feed pipeline...")
+    print("-" * 50)
+
+    cache_dir = tempfile.mkdtemp(prefix="news-test-")
+    real_cache_dir = data_cache_module._CACHE_DIR
+    data_cache_module._CACHE_DIR = cache_dir
+    origin = FeedOrigin()
+    feeds = [{"name": "A", "url": origin.url + "/a.xml"},
+             {"name": "B", "url": origin.url + "/b.xml"}]
+    try:
+        news = NewsModule(feeds=feeds)
+        notes = []
+        news.set_notification_callback(lambda text, duration_ms=0: notes.append(text))
+        took = refresh(news)
+        titles = [h["title"] for h in news.headlines]
+        results.record("Feeds fetched in parallel",
+                       took is not None and took < DELAY * 1.8, f"{took:.2f}s for 2 x {DELAY}s feeds")
+        results.record("Entry carried by both feeds shown once",
+                       titles == ["Alpha one", "Alpha two", "Shared", "Bravo one"], str(titles))
+        results.record("No notification on first load", notes == [])
+
+        refresh(news)
+        stats = news.get_feed_stats()
+        results.record("Unchanged feeds answer 304 and are not parsed",
+                       all(stats[n]["not_modified"] == 1 and stats[n]["bytes_saved"] > 0 for n in "AB")
+                       and origin.full == {"/a.xml": 1, "/b.xml": 1}, str(stats["A"]))
+
+        origin.change("/a.xml", [("a3", "Alpha three"), ("a1", "Alpha one"), ("a2", "Alpha two"),
+                                 ("shared", "Shared")])
+        refresh(news)
+        stats = news.get_feed_stats()
+        results.record("Only the new entry is processed and notified",
+                       stats["A"]["new_entries"] == 4 and notes == ["Alpha three"]
+                       and news.headlines[0]["title"] == "Alpha three",
+                       f"new_entries={stats['A']['new_entries']} notes={notes}")
+
+        # Restart: validators come back from data_cache, not from http_client memory
+        http_client._cache.clear()
+        full_before = dict(origin.full)
+        restarted = NewsModule(feeds=feeds)
+        refresh(restarted)
+        results.record("Validators persist across a restart",
+                       origin.full == full_before
+                       and [h["title"] for h in restarted.headlines]
+                       == [h["title"] for h in news.headlines]
+                       and restarted.get_feed_stats()["A"]["not_modified"] == 1,
+                       f"full downloads {full_before} -> {origin.full}")
+
+        origin.failing.add("/b.xml")
+        refresh(restarted)
+        stats = restarted.get_feed_stats()
+        results.record("Failing feed backs off, keeps its entries, others unaffected",
+                       stats["B"]["failures"] == 1 and 50 <= stats["B"]["retry_in_s"] <= 60
+                       and stats["A"]["errors"] == 0
+                       and any(h["source"] == "B" for h in restarted.headlines), str(stats["B"]))
+
+        feed_b = restarted._feeds[1]
+        feed_b.retry_at = datetime.now() - timedelta(seconds=1)
+        restarted.update()          # retries on its own backoff, outside a round
+        start = time.monotonic()
+        while not feed_b.fetcher.idle and time.monotonic() - start < 5:
+            time.sleep(0.01)
+        restarted.update()
+        stats = restarted.get_feed_stats()
+        results.record("Backoff doubles on repeated failure",
+                       stats["B"]["failures"] == 2 and 110 <= stats["B"]["retry_in_s"] <= 120
+                       and stats["A"]["requests"] == 2, str(stats["B"]))
+        results.record("Per-feed latency reported",
+                       stats["A"]["latency_ms_last"] >= DELAY * 1000 * 0.9
+                       and stats["A"]["latency_ms_mean"] > 0)
+    finally:
+        origin.stop()
+        data_cache_module._CACHE_DIR = real_cache_dir
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""Logic test: stock price history store - append/rewrite, range queries, incremental yfinance top-up, warm restart (no network)."""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+TICKERS = ["AAPL", "MSFT", "VOD.L"]
+DAY = 86400
+
+
+class FakeExchange:
+    """Stands in for yfinance.download: weekday bars from a start date."""
+
+    def __init__(self):
+        self.today = int(time.time()) // DAY * DAY
+        while (self.today // DAY + 3) % 7 >= 5:   # latest trading day
+            self.today -= DAY
+        self.calls = []          # (symbols, start)
+        self.moves = {}          # symbol -> extra on today's close
+
+    def close(self, symbol, day):
+        base = 100.0 + 50 * TICKERS.index(symbol) if symbol in TICKERS else 10.0
+        return base + (day // DAY) % 17 + (self.moves.get(symbol, 0.0) if day == self.today else 0.0)
+
+    def download(self, symbols, start=None, **kwargs):
+        import pandas as pd
+        from price_history import day_of
+        self.calls.append((list(symbols), start))
+        first = day_of(start)
+        days = [d for d in range(first, self.today + DAY, DAY) if (d // DAY + 3) % 7 < 5]
+        index = pd.DatetimeIndex([pd.Timestamp(d, unit="s") for d in days])
+        columns, data = [], []
+        for symbol in symbols:
+            for field in ("Open", "High", "Low", "Close", "Adj Close", "Volume"):
+                columns.append((symbol, field))
+                if field == "Volume":
+                    data.append([1000.0 + i for i in range(len(days))])
+                else:
+                    bump = {"High": 1.0, "Low": -1.0}.get(field, 0.0)
+                    data.append([self.close(symbol, d) + bump for d in days])
+        return pd.DataFrame(dict(zip(columns, data)), index=index,
+                            columns=pd.MultiIndex.from_tuples(columns))
+
+
+def main():
+    import pygame
+    pygame.init()
+    import yfinance
+    import price_history as price_history_module
+    import stocks_module
+    from api_tracker import APITracker
+    from price_history import RECORD, PriceHistory, day_of, price_history
+
+    results = TestResult()
+    print("Testing price history...")
+    print("-" * 50)
+
+    work = tempfile.mkdtemp(prefix="prices-test-")
+    real_dir = price_history_module._HISTORY_DIR
+    real_paths = stocks_module._CSV_DIR, stocks_module._TICKER_OVERRIDE
+    real_download = yfinance.download
+    real_tracker = stocks_module.api_tracker
+    price_history_module._HISTORY_DIR = os.path.join(work, "prices")
+    stocks_module._CSV_DIR = work                                   # no watchlist CSV
+    stocks_module._TICKER_OVERRIDE = os.path.join(work, "tickers.txt")
+    exchange = FakeExchange()
+    yfinance.download = exchange.download
+    # yahoo-finance calls go to a throwaway tracker, not the persisted one
+    tracker = APITracker(state_file=None, usage_log=None)
+    stocks_module.api_tracker = tracker
+    try:
+        # Store on its own
+        store = PriceHistory(os.path.join(work, "unit"))
+        d0 = day_of("2026-03-02")
+        store.append("BTC/USD", [(d0 + i * DAY, 1, 2, 0.5, 10.0 + i, 5) for i in range(10)])
+        store.append("BTC/USD", [(d0 + 9 * DAY, 1, 2, 0.5, 30.0, 6), (d0, 9, 9, 9, 9, 9)])
+        path = store._path("BTC/USD")
+        reopened = PriceHistory(os.path.join(work, "unit"))
+        results.record("Bars persist; today's bar rewritten in place, older ignored",
+                       os.path.getsize(path) == 10 * RECORD.size
+                       and reopened.bars("BTC/USD") == store.bars("BTC/USD")
+                       and reopened.bars("BTC/USD")[-1][4] == 30.0
+                       and store.stats["rewritten"] == 1 and store.stats["ignored"] == 1,
+                       str(store.stats))
+
+        results.record("Range queries by day",
+                       [b[4] for b in reopened.bars("BTC/USD", d0 + 2 * DAY, d0 + 5 * DAY)]
+                       == [12.0, 13.0, 14.0]
+                       and reopened.closes("BTC/USD", limit=3) == [17.0, 18.0, 30.0]
+                       and abs(reopened.change_percent("BTC/USD", d0 + 9 * DAY) - (30 / 18 - 1) * 100)
+                       < 1e-9)
+
+        with open(path, "ab") as f:
+            f.write(b"\x01\x02\x03")                               # crash mid-append
+        torn = PriceHistory(os.path.join(work, "unit"))
+        results.record("Partial trailing record dropped",
+                       len(torn.bars("BTC/USD")) == 10 and os.path.getsize(path) == 10 * RECORD.size)
+
+        # Cold start: nothing stored, first round backfills
+        cold = stocks_module.StocksModule(tickers=TICKERS)
+        empty_at_start = cold.stock_data == {}
+        cold._publish_quotes(cold._fetch_batch_blocking(TICKERS, "yf"))
+        symbols, start = exchange.calls[-1]
+        results.record("First fetch backfills history",
+                       empty_at_start and sorted(symbols) == sorted(TICKERS)
+                       and tracker.get_summary()["by_service"]["yahoo-finance"]["hourly"] == len(TICKERS)
+                       and day_of(start) == int(time.time()) // DAY * DAY
+                       - stocks_module.HISTORY_BACKFILL_DAYS * DAY
+                       and len(price_history.bars("AAPL")) >= 20,
+                       f"start={start} bars={len(price_history.bars('AAPL'))}")
+
+        # Next round: only from the newest stored day, prev close from disk
+        exchange.moves["AAPL"] = 7.0
+        cold._publish_quotes(cold._fetch_batch_blocking(TICKERS, "yf"))
+        symbols, start = exchange.calls[-1]
+        closes = price_history.closes("AAPL")
+        expected = (closes[-1] - closes[-2]) / closes[-2] * 100
+        results.record("Top-up requests only bars from the newest stored day",
+                       day_of(start) == price_history.last_day("AAPL")
+                       and abs(cold.stock_data["AAPL"]["percent_change"] - expected) < 1e-9
+                       and closes[-1] == exchange.close("AAPL", exchange.today),
+                       f"start={start} pct={cold.stock_data['AAPL']['percent_change']:.3f}")
+
+        # Alpha Vantage quote: today's bar plus the previous close
+        stocks_module.StocksModule._store_av_quote("IBM", {
+            "02. open": "240.0", "03. high": "246.0", "04. low": "239.0", "05. price": "245.0",
+            "06. volume": "1200", "07. latest trading day": "2026-03-16",
+            "08. previous close": "240.0", "10. change percent": "2.0833%"})
+        ibm = price_history.bars("IBM")
+        results.record("AV quote stored with its previous close (Friday for a Monday)",
+                       [b[4] for b in ibm] == [240.0, 245.0]
+                       and ibm[0][0] == day_of("2026-03-13"))
+
+        # Warm restart: quotes and sparklines from disk before any fetch
+        calls = len(exchange.calls)
+        price_history.forget()
+        start_t = time.perf_counter()
+        warm = stocks_module.StocksModule(tickers=TICKERS + ["IBM"])
+        took = time.perf_counter() - start_t
+        strip = warm._sync_ticker_strip()
+        results.record("Warm restart has the full ticker before any network call",
+                       set(warm.stock_data) == set(TICKERS + ["IBM"]) and strip is not None
+                       and len(exchange.calls) == calls
+                       and warm.stock_data["AAPL"]["price"] == cold.stock_data["AAPL"]["price"]
+                       and warm.stock_data["AAPL"]["source"] == "history",
+                       f"{took * 1000:.1f} ms")
+        results.record("Restored change matches the AV quote",
+                       abs(warm.stock_data["IBM"]["percent_change"] - 2.0833) < 1e-3)
+
+        spark = warm.stock_data["MSFT"]["sparkline"]
+        screen = pygame.Surface((400, 200))
+        warm.draw(screen, {"x": 0, "y": 0, "width": 400, "height": 200})
+        results.record("Quotes carry sparkline closes for the grid view",
+                       len(spark) == stocks_module.SPARKLINE_BARS
+                       and spark == price_history.closes("MSFT", limit=stocks_module.SPARKLINE_BARS))
+    finally:
+        yfinance.download = real_download
+        stocks_module.api_tracker = real_tracker
+        price_history_module._HISTORY_DIR = real_dir
+        stocks_module._CSV_DIR, stocks_module._TICKER_OVERRIDE = real_paths
+        price_history.forget()
+        shutil.rmtree(work, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""Logic test: speech pipeline - sentence splitting, synthesis overlapping playback, bounded queue, cancel on interrupt, time to first word and gap metrics, TTS cache hits (fake TTS backend)."""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+from tests.fake_tts import FakeTTS, FakeSpeechPlayer
+
+REPLY = ("The weather today is sunny and warm. Expect highs of twenty degrees by the afternoon. "
+         "Tomorrow looks wetter, with rain from noon. Take an umbrella if you go out.")
+
+
+def files(root):
+    return [f for f in os.listdir(root) if f.startswith("clip-")]
+
+
+def main():
+    from speech_pipeline import SentenceSplitter, SpeechPipeline
+
+    results = TestResult()
+    print("Testing speech pipeline...")
+    print("-" * 50)
+
+    splitter = SentenceSplitter(min_chars=12, max_chars=60)
+    whole = splitter.feed("Hi. Dr. Smith is in today! \"Really?\" she asked.\nYes. ") + splitter.flush()
+    streamed = []
+    for ch in "Hi. Dr. Smith is in today! \"Really?\" she asked.\nYes. ":
+        streamed += splitter.feed(ch)
+    streamed += splitter.flush()
+    long = splitter.feed("one two three, four five six seven eight nine ten eleven twelve thirteen fourteen")
+    results.record("Sentences split at ends, short pieces joined, run-ons cut",
+                   whole == streamed == ["Hi. Dr. Smith is in today!", "\"Really?\" she asked.", "Yes."]
+                   and long == ["one two three, four five six seven eight nine ten eleven"]
+                   and splitter.flush() == ["twelve thirteen fourteen"], f"{whole} / {long}")
+
+    root = tempfile.mkdtemp()
+    try:
+        tts = FakeTTS(root, latency_ms=150, speech_ms_per_char=6)
+        player = FakeSpeechPlayer()
+        speech = SpeechPipeline(tts, player, on_discard=os.remove)
+        begun = time.monotonic()
+        cpu = time.process_time()
+        spoken = speech.speak(REPLY, timeout=10)
+        cpu_ms = (time.process_time() - cpu) * 1000.0
+        elapsed = time.monotonic() - begun
+        heard = player.heard(begun)
+        serial = sum(end - start for _, start, end in tts.calls) + sum(e - s for _, s, e in heard)
+        results.record("Sentence N+1 is synthesised while N plays",
+                       spoken and len(heard) == 4 and tts.calls[1][1] < heard[0][2]
+                       and elapsed < serial - 0.3 and not files(root),
+                       f"{elapsed:.2f} s vs {serial:.2f} s in series")
+        gaps = player.gaps_ms(begun)
+        stats = speech.stats()
+        ttfw = (player.first_start(begun) - begun) * 1000.0
+        results.record("Time to first word and gaps reported as heard",
+                       abs(stats["ttfw_ms"] - ttfw) < 10 and 140 < ttfw < 250
+                       and max(gaps) < 20 and abs(stats["gap_ms_max"] - max(gaps)) < 5,
+                       f"ttfw {ttfw:.0f} ms (reported {stats['ttfw_ms']}), gaps {[round(g, 1) for g in gaps]}")
+        results.record("Playback waits on events, not a busy loop",
+                       cpu_ms < 0.1 * elapsed * 1000.0, f"{cpu_ms:.0f} ms CPU over {elapsed * 1000:.0f} ms")
+
+        # Streaming: deltas trickle in like a chat completion
+        begun = time.monotonic()
+        speech.begin()
+        for i in range(0, len(REPLY), 6):
+            speech.feed(REPLY[i:i + 6])
+            time.sleep(0.01)
+        stream_end = time.monotonic()
+        speech.end()
+        speech.wait(10)
+        results.record("The first sentence plays while the reply is still streaming",
+                       player.first_start(begun) < stream_end and len(player.heard(begun)) == 4,
+                       f"first word {(player.first_start(begun) - begun) * 1000:.0f} ms, "
+                       f"stream ended {(stream_end - begun) * 1000:.0f} ms")
+
+        # Bounded: a fast synthesiser stays at most depth clips ahead
+        fast = FakeTTS(root, latency_ms=5, speech_ms_per_char=4)
+        player2 = FakeSpeechPlayer()
+        bounded = SpeechPipeline(fast, player2, depth=2, on_discard=os.remove)
+        bounded.begin()
+        for n in range(10):
+            bounded.feed(f"This is sentence number {n} of a long reply. ")
+        time.sleep(0.15)
+        ahead = len(fast.calls) - len(player2.heard())
+        ready = bounded.stats()["ready_clips"]
+        results.record("Queue depth bounds how far synthesis runs ahead",
+                       ready <= 2 and ahead <= 3 and len(player2.heard()) == 1,
+                       f"{len(fast.calls)} synthesised, {len(player2.heard())} started, {ready} ready")
+
+        waited = []
+        waiter = threading.Thread(target=lambda: waited.append(bounded.wait(5)))
+        waiter.start()
+        cancelled_at = time.monotonic()
+        bounded.cancel()
+        waiter.join(1)
+        done = waited == [True]
+        bounded.feed("Text still streaming after the cancel. ")
+        time.sleep(0.3)
+        stats = bounded.stats()
+        cut = player2.heard()[-1][2] - cancelled_at
+        results.record("Cancel stops playback at once and drops the queue",
+                       not done and cut < 0.01 and len(player2.heard()) == 1 and not bounded.is_speaking()
+                       and stats["cancelled"] == 1 and stats["dropped"] == 10 and not files(root),
+                       f"clip cut {cut * 1000:.1f} ms after cancel, {stats}")
+        bounded.stop()
+
+        flaky = SpeechPipeline(FakeTTS(root, latency_ms=20, speech_ms_per_char=2, fail_on="twenty"),
+                               player, on_discard=os.remove)
+        begun = time.monotonic()
+        spoken = flaky.speak(REPLY, timeout=5)
+        results.record("A sentence that fails to synthesise is skipped",
+                       spoken and len(player.heard(begun)) == 3 and flaky.stats()["synth_errors"] == 1)
+        flaky.stop()
+
+        idle = []
+        chunks = SpeechPipeline(FakeTTS(root, latency_ms=30, speech_ms_per_char=2), player,
+                                on_discard=os.remove, on_idle=lambda: idle.append(time.monotonic()))
+        begun = time.monotonic()
+        for sentence in ("First chunk of speech.", "Second chunk of speech.", "Third one."):
+            chunks.say(sentence)
+        queued = time.monotonic() - begun
+        time.sleep(0.5)
+        results.record("say() returns at once; chunks play in order, then idle",
+                       queued < 0.01 and [c[0] for c in player.heard(begun)]
+                       == ["First chunk of speech.", "Second chunk of speech.", "Third one."]
+                       and len(idle) == 1 and idle[0] >= player.last_end(begun) - 0.01
+                       and chunks.stats()["replies"] == 1)
+        chunks.stop()
+        speech.stop()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    # Through the TTS cache: a repeated reply starts without synthesis
+    from tts_cache import TTSCache
+    root = tempfile.mkdtemp()
+    try:
+        cache = TTSCache(root=os.path.join(root, "cache"))
+        tts = FakeTTS(root, latency_ms=150, speech_ms_per_char=1)
+        cached = SpeechPipeline(lambda text: cache.fetch("fake", "v", text, lambda p: tts.save(text, p))[0],
+                                FakeSpeechPlayer(), on_discard=cache.discard)
+        cached.speak(REPLY, timeout=5)
+        cold = cached.stats()["ttfw_ms"]
+        cached.speak(REPLY, timeout=5)
+        warm = cached.stats()["ttfw_ms"]
+        results.record("Cached sentences start without synthesis",
+                       cold > 140 and warm < 20 and len(tts.calls) == 4
+                       and cache.get_stats()["hits"] == 4,
+                       f"first word {cold} ms cold, {warm} ms cached")
+        cached.stop()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Logic test: background stock quote engine - batching, budget, atomic publish (no network)."""
+
+import sys
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+TICKERS = [f"SYM{i:02d}" for i in range(25)]
+
+
+def make_module(av_key=""):
+    import stocks_module
+    from background_fetcher import BackgroundFetcher, FetchScheduler
+
+    module = stocks_module.StocksModule(tickers=TICKERS, alpha_vantage_key=av_key)
+    module.tickers = list(TICKERS)
+    module._ticker_meta = {t: {'av_symbol': t, 'yf_symbol': t, 'currency': '$'} for t in TICKERS}
+    module._last_csv_check = time.time()
+    module._fetcher = BackgroundFetcher("stocks-test", scheduler=FetchScheduler(workers=1))
+    module._is_fetch_window = lambda: None        # tests pick the window
+    module._save_ticker_override = lambda tickers: None
+    module.yf_batches = []
+    module.av_calls = []
+
+    def fake_yf(tickers):
+        module.yf_batches.append(list(tickers))
+        time.sleep(0.15)   # slow provider: must never stall update()
+        return {t: {'price': 10.0, 'percent_change': 1.0, 'currency': '$'} for t in tickers}
+
+    def fake_av(ticker):
+        module.av_calls.append(ticker)
+        if len(module.av_calls) == 3:
+            return None, 'limited'
+        return {'price': 20.0, 'percent_change': -1.0, 'currency': '$'}, 'ok'
+
+    module._fetch_yf_batch = fake_yf
+    module._fetch_single_av = fake_av
+    return module
+
+
+def run_round(module, timeout=5.0):
+    """Drive update() like the main loop until the round completes."""
+    worst, sizes = 0.0, []
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        start = time.perf_counter()
+        module.update()
+        worst = max(worst, time.perf_counter() - start)
+        if not sizes or sizes[-1] != len(module.stock_data):
+            sizes.append(len(module.stock_data))
+        if module.get_quote_stats()['last_round_s'] is not None and not module._queue_complete_pending:
+            break
+        time.sleep(0.005)
+    return worst, sizes
+
+
+def main():
+    import pygame
+    pygame.init()
+    import stocks_module
+
+    stocks_module.AV_CALL_INTERVAL = 0
+    stocks_module.YF_CALL_INTERVAL = 0
+
+    results = TestResult()
+    print("Testing stocks quote engine...")
+    print("-" * 50)
+
+    module = make_module()
+    worst, sizes = run_round(module)
+    results.record("update() never waits on the network", worst < 0.05,
+                   f"worst update {worst * 1000:.1f} ms")
+    results.record("yfinance symbols fetched in batches",
+                   [len(b) for b in module.yf_batches] == [stocks_module.YF_BATCH_SIZE, 5],
+                   str([len(b) for b in module.yf_batches]))
+    results.record("Batches publish atomically", sizes == [0, 20, 25], str(sizes))
+    stats = module.get_quote_stats()
+    results.record("Full-watchlist refresh time recorded",
+                   stats['last_round_s'] is not None and stats['quotes'] == 25, str(stats))
+
+    # AV budget: only the remaining daily budget goes to Alpha Vantage
+    module = make_module(av_key="demo")
+    module._fetch_day = datetime.now(stocks_module.pytz_tz('UTC')).date()
+    module._av_calls_today = stocks_module.AV_DAILY_BUDGET - 2
+    run_round(module)
+    results.record("AV calls capped at the remaining budget",
+                   len(module.av_calls) == 2 and module._av_calls_today == stocks_module.AV_DAILY_BUDGET,
+                   f"{len(module.av_calls)} AV calls")
+
+    # AV rate-limit note downgrades the rest of the round to yfinance
+    module = make_module(av_key="demo")
+    run_round(module)
+    results.record("AV rate limit downgrades remaining items to yfinance",
+                   len(module.av_calls) == 3 and len(module.stock_data) == 24
+                   and sum(len(b) for b in module.yf_batches) == 22,
+                   f"av={len(module.av_calls)} yf={sum(len(b) for b in module.yf_batches)}")
+
+    # Outside a fetch window no new round starts; inside one it does
+    module = make_module()
+    run_round(module)
+    batches = len(module.yf_batches)
+    weekday = module._fetch_day.weekday() < 5
+    for _ in range(5):
+        module.update()
+    results.record("No round outside a fetch window",
+                   not module._fetch_queue and len(module.yf_batches) == batches)
+    module._is_fetch_window = lambda: 10
+    module.update()
+    results.record("Fetch window starts a round (weekdays)",
+                   bool(module._fetch_queue) == weekday,
+                   f"queued={len(module._fetch_queue)} weekday={weekday}")
+
+    # Watchlist changed mid-fetch: stale symbols are not published
+    module = make_module()
+    module.update()                       # round queued
+    module.update()                       # first batch in flight
+    module.set_tickers(["SYM00"])
+    run_round(module)
+    results.record("Removed symbols are not published", set(module.stock_data) <= {"SYM00"},
+                   str(sorted(module.stock_data)))
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Logic test: pre-composited stocks ticker strip, patching and wrap-around (no network)."""
+
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+def quote(price, pct):
+    return {"price": price, "percent_change": pct, "currency": "$"}
+
+
+def same_pixels(a, b):
+    import pygame
+    return (a.get_size() == b.get_size()
+            and pygame.image.tostring(a, "RGBA") == pygame.image.tostring(b, "RGBA"))
+
+
+def strip_pixels(strip):
+    """Strip content with its surface alpha applied, as it lands on screen."""
+    import pygame
+    out = pygame.Surface(strip.get_size(), pygame.SRCALPHA)
+    out.blit(strip, (0, 0))
+    return out
+
+
+def main():
+    import pygame
+    pygame.init()
+    from stocks_module import StocksModule
+
+    results = TestResult()
+    print("Testing stocks ticker strip...")
+    print("-" * 50)
+
+    module = StocksModule(tickers=["AAPL", "MSFT", "NVDA"])
+    module.tickers = ["AAPL", "MSFT", "NVDA"]
+    module.stock_data = {
+        "AAPL": quote(190.12, 1.25),
+        "MSFT": quote(410.50, -0.40),
+        "NVDA": quote(120.00, 3.10),
+    }
+    screen = pygame.Surface((1440, 120), pygame.SRCALPHA)
+
+    def fresh_strip():
+        """Strip built from scratch for the current stock_data."""
+        other = StocksModule(tickers=list(module.tickers))
+        other.tickers = list(module.tickers)
+        other.stock_data = {t: dict(d) for t, d in module.stock_data.items()}
+        return strip_pixels(other._sync_ticker_strip())
+
+    module.draw_scrolling_ticker(screen)
+    module.draw_scrolling_ticker(screen)
+    stats = module.get_ticker_stats()
+    results.record("Strip built once for unchanged data",
+                   stats["rebuilds"] == 1 and stats["patches"] == 0, str(stats))
+
+    module.stock_data["MSFT"] = quote(410.60, -0.30)   # same width digits
+    module.draw_scrolling_ticker(screen)
+    stats = module.get_ticker_stats()
+    results.record("Changed quote patches its segment in place",
+                   stats["rebuilds"] == 1 and stats["patches"] == 1, str(stats))
+    results.record("Patched strip matches a fresh build",
+                   same_pixels(strip_pixels(module._ticker_strip), fresh_strip()))
+
+    before = module.get_ticker_stats()["width"]
+    module.stock_data["AAPL"] = quote(1190.12, -11.25)  # wider item
+    module.draw_scrolling_ticker(screen)
+    stats = module.get_ticker_stats()
+    results.record("Wider quote splices without a rebuild",
+                   stats["rebuilds"] == 1 and stats["resizes"] == 1 and stats["width"] > before,
+                   str(stats))
+    results.record("Spliced strip matches a fresh build",
+                   same_pixels(strip_pixels(module._ticker_strip), fresh_strip()))
+
+    module.stock_data["TSLA"] = quote(250.00, 0.0)
+    module.tickers.append("TSLA")
+    module.draw_scrolling_ticker(screen)
+    results.record("New symbol rebuilds the strip",
+                   module.get_ticker_stats()["rebuilds"] == 2
+                   and module.get_ticker_stats()["symbols"] == 4)
+
+    # Wrap-around: a strip narrower than the screen tiles seamlessly
+    strip = module._ticker_strip
+    module.scroll_position = -37.0
+    screen.fill((0, 0, 0, 0))
+    module.draw_scrolling_ticker(screen)
+    expected = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+    expected.blit(module._ticker_hairline, (0, 120 - 40))
+    x = -37
+    while x < screen.get_width():
+        expected.blit(strip, (x, 120 - 40 + 8))
+        x += strip.get_width()
+    results.record("Wrap-around blit tiles the strip across the screen",
+                   strip.get_width() < screen.get_width() and same_pixels(screen, expected),
+                   f"strip {strip.get_width()}px")
+
+    module.stock_data = {}
+    results.record("No prices, no strip", module._sync_ticker_strip() is None)
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
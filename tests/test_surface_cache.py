@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Logic test: SurfaceCache LRU eviction and byte accounting (no display needed)."""
+
+import sys
+import os
+import gc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+def main():
+    import pygame
+    pygame.init()
+    from module_base import SurfaceBudget, SurfaceCache, surface_bytes
+
+    results = TestResult()
+    print("Testing SurfaceCache...")
+    print("-" * 50)
+
+    def render(w=10, h=10):
+        return lambda: pygame.Surface((w, h), pygame.SRCALPHA)
+
+    one = surface_bytes(pygame.Surface((10, 10), pygame.SRCALPHA))
+    results.record("Surface size is w x h x bytesize", one == 10 * 10 * 4, f"{one} bytes")
+
+    budget = SurfaceBudget(max_bytes=one * 4)
+    news = SurfaceCache("news", budget=budget)
+    stocks = SurfaceCache("stocks", budget=budget)
+
+    news.get_or_render("a", render(), 1)
+    stocks.get_or_render("x", render(), 1)
+    news.get_or_render("b", render(), 1)
+    news.get_or_render("a", render(), 1)      # hit: 'a' becomes most recent
+    stocks.get_or_render("y", render(), 1)
+    results.record("Budget tracks bytes across caches", budget.bytes == one * 4,
+                   f"{budget.bytes} bytes")
+
+    news.get_or_render("c", render(), 1)      # over budget: evict global LRU ('x')
+    results.record("Global LRU evicts oldest entry across caches",
+                   stocks.lru_key() == "y" and budget.evictions == 1,
+                   f"stocks head={stocks.lru_key()} evictions={budget.evictions}")
+    results.record("Budget never exceeded", budget.bytes <= budget.max_bytes,
+                   f"{budget.bytes}/{budget.max_bytes}")
+
+    calls = []
+    news.get_or_render("a", lambda: calls.append(1) or pygame.Surface((10, 10)), 1)
+    results.record("Hit does not re-render", not calls)
+    news.get_or_render("a", render(20, 10), 2)  # data changed: re-render, bigger
+    stats = news.get_stats()
+    results.record("Changed data re-renders and re-accounts",
+                   stats["misses"] == 4 and stats["hits"] == 2,
+                   str(stats))
+    results.record("Cache bytes match its entries",
+                   news.bytes + stocks.bytes == budget.bytes,
+                   f"{news.bytes} + {stocks.bytes} vs {budget.bytes}")
+
+    news.invalidate()
+    results.record("invalidate() releases bytes",
+                   news.bytes == 0 and budget.bytes == stocks.bytes,
+                   f"budget {budget.bytes}")
+
+    big = SurfaceCache("big", budget=budget)
+    big.get_or_render("huge", render(100, 100), 1)
+    results.record("Oversize surface is kept, others evicted",
+                   big.get_stats()["entries"] == 1 and stocks.get_stats()["entries"] == 0,
+                   str(budget.get_stats()["caches"]))
+
+    before = budget.bytes
+    del big
+    gc.collect()
+    results.record("Collected cache gives its bytes back",
+                   budget.bytes == before - one * 100 and "big" not in budget.get_stats()["caches"],
+                   f"{before} -> {budget.bytes}")
+
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""Logic test: TTS audio cache - content keys, hits without synthesis, LRU byte budget, restart from the index, idle prewarm (fake synthesiser, no network)."""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+
+class FakeSynth:
+    """Writes size bytes per sentence after delay_s; counts calls."""
+
+    def __init__(self, size=1000, delay_s=0.03):
+        self.size = size
+        self.delay_s = delay_s
+        self.calls = []
+
+    def __call__(self, text, path):
+        self.calls.append(text)
+        time.sleep(self.delay_s)
+        with open(path, "wb") as f:
+            f.write(text.encode("utf-8")[:16].ljust(self.size, b"\0"))
+
+
+def main():
+    from tts_cache import TTSCache
+
+    results = TestResult()
+    print("Testing TTS cache...")
+    print("-" * 50)
+
+    root = tempfile.mkdtemp()
+    try:
+        cache = TTSCache(root=root, max_bytes=5000)
+        synth = FakeSynth()
+
+        def say(text, engine="gtts", voice="en"):
+            return cache.fetch(engine, voice, text, lambda p: synth(text, p))
+
+        path, hit = say("Hello! How can I help you today?")
+        again, hit2 = say("  Hello !  How can I help   you today? ")
+        curly, hit3 = say("It’s “sunny”.")
+        straight, hit4 = say("It's \"sunny\".")
+        results.record("Whitespace and typographic quotes share one entry",
+                       not hit and hit2 and again == path and hit4 and curly == straight
+                       and len(synth.calls) == 2 and os.path.exists(path), str(synth.calls))
+
+        other_voice, hit5 = say("Hello! How can I help you today?", voice="en-gb")
+        other_engine, hit6 = say("Hello! How can I help you today?", engine="openai:tts")
+        shouted, hit7 = say("HELLO! How can I help you today?")
+        results.record("Engine, voice and case are part of the key",
+                       not (hit5 or hit6 or hit7) and len({path, other_voice, other_engine, shouted}) == 4)
+
+        synth.calls.clear()
+        start = time.perf_counter()
+        hit_path, hit = say("Hello! How can I help you today?")
+        hit_ms = (time.perf_counter() - start) * 1000.0
+        stats = cache.get_stats()
+        results.record("A hit returns the file without synthesising and counts time saved",
+                       hit and not synth.calls and hit_ms < 10
+                       and stats["latency_saved_ms"] >= 2 * 30 and stats["hits"] == 3
+                       and stats["misses"] == 5 and stats["hit_rate"] == 0.375,
+                       f"hit in {hit_ms:.2f} ms, {stats}")
+
+        # Five 1000-byte entries fill the 5000-byte budget; the sixth evicts
+        # the least recently played, not the oldest stored
+        say("It's \"sunny\".")
+        say("A brand new sentence.")
+        stats = cache.get_stats()
+        gone = not os.path.exists(other_voice)
+        results.record("LRU eviction keeps the cache under its byte budget",
+                       stats["bytes"] <= 5000 and stats["evictions"] == 1 and gone
+                       and os.path.exists(path) and os.path.exists(straight)
+                       and len([f for f in os.listdir(root) if f.endswith(".mp3")]) == stats["entries"],
+                       str(stats))
+
+        cache.flush()
+        reloaded = TTSCache(root=root, max_bytes=5000)
+        synth.calls.clear()
+        path2, hit = reloaded.fetch("gtts", "en", "Hello! How can I help you today?",
+                                    lambda p: synth("x", p))
+        os.remove(straight)
+        _, lost_hit = reloaded.fetch("gtts", "en", "It's \"sunny\".", lambda p: synth("y", p))
+        results.record("Index survives a restart; a missing file is a miss",
+                       hit and path2 == path and not lost_hit and synth.calls == ["y"]
+                       and reloaded.get_stats()["latency_saved_ms"] > 0, str(reloaded.get_stats()))
+
+        def broken(p):
+            with open(p, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("TTS down")
+        try:
+            reloaded.fetch("gtts", "en", "Never stored.", broken)
+            raised = False
+        except RuntimeError:
+            raised = True
+        results.record("Failed synthesis propagates and leaves nothing behind",
+                       raised and not reloaded.contains("gtts", "en", "Never stored.")
+                       and not [f for f in os.listdir(root) if f.startswith(".tmp-")])
+
+        big = TTSCache(root=root, max_bytes=500)
+        path3, hit = big.fetch("gtts", "en", "Too big to keep.", lambda p: FakeSynth(size=800)("z", p))
+        played = os.path.exists(path3)
+        big.discard(path3)
+        results.record("Audio bigger than the budget is played uncached and discarded",
+                       not hit and played and not os.path.exists(path3)
+                       and not big.contains("gtts", "en", "Too big to keep."))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    root = tempfile.mkdtemp()
+    try:
+        cache = TTSCache(root=root)
+        phrases = [f"Phrase number {i}." for i in range(8)]
+        synth = FakeSynth(delay_s=0.02)
+        talking = threading.Event()
+        worker = threading.Thread(target=lambda: cache.prewarm("gtts", "en", phrases, synth,
+                                                               should_stop=talking.is_set))
+        worker.start()
+        time.sleep(0.07)
+        talking.set()
+        worker.join()
+        first = len(synth.calls)
+        talking.clear()
+        added = cache.prewarm("gtts", "en", phrases, synth, should_stop=talking.is_set)
+        stats = cache.get_stats()
+        hits = [cache.fetch("gtts", "en", p, lambda path: synth("late", path))[1] for p in phrases]
+        results.record("Prewarm stops when the user speaks and resumes where it left off",
+                       0 < first < 8 and added == 8 - first and len(synth.calls) == 8
+                       and stats["prewarmed"] == 8 and stats["misses"] == 0 and all(hits),
+                       f"{first} before stop, {added} after, {stats}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    off = TTSCache(root=tempfile.mkdtemp(), enabled=False)
+    path, hit = off.fetch("gtts", "en", "Not cached.", lambda p: FakeSynth(delay_s=0)("n", p))
+    kept = os.path.exists(path)
+    off.discard(path)
+    results.record("Disabled cache synthesises every time and cleans up",
+                   not hit and kept and not os.path.exists(path)
+                   and off.prewarm("gtts", "en", ["x"], FakeSynth()) == 0)
+    shutil.rmtree(off.root, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
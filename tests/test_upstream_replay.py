@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""Logic test: record upstream responses through http_client and replay them (local servers)."""
+
+import sys
+import os
+import json
+import re
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+
+SECRET = "sk-live-0123456789"
+FEED = ("<?xml version='1.0'?><rss><channel><title>Test</title>"
+        + "".join(f"<item><title>Story {i}</title><link>http://news.test/{i}</link>"
+                  f"<guid>g{i}</guid></item>" for i in range(3))
+        + "</channel></rss>")
+STATES = [{"entity_id": f"light.lamp_{i}", "state": "on",
+           "last_updated": "2026-01-01T00:00:00+00:00"} for i in range(20)]
+
+
+class Origin:
+    """The 'real' upstream: JSON, RSS, a keyed query and a GraphQL endpoint."""
+
+    def __init__(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/api/states":
+                    self._reply(json.dumps(STATES).encode(), "application/json", {"ETag": '"s1"'})
+                elif self.path == "/feed.xml":
+                    self._reply(FEED.encode(), "application/rss+xml")
+                elif self.path.startswith("/data"):
+                    self._reply(json.dumps({"path": self.path.split("city=")[1]}).encode(),
+                                "application/json")
+                else:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+
+            def do_POST(self):
+                query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["query"]
+                self._reply(json.dumps({"data": {"echo": query}}).encode(), "application/json")
+
+            def _reply(self, body, content_type, extra=None):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                for k, v in (extra or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    from http_client import HTTPClient
+    from upstream_replay import ReplayServer
+
+    results = TestResult()
+    print("Testing upstream record/replay...")
+    print("-" * 50)
+
+    fixtures = tempfile.mkdtemp(prefix="replay-test-")
+    origin = Origin()
+    host = origin.url.split("//")[1]
+    recorder = HTTPClient(record_dir=fixtures)
+    recorded = {
+        "states": recorder.get(origin.url + "/api/states", timeout=5).content,
+        "feed": recorder.get(origin.url + "/feed.xml", timeout=5).content,
+        "data": recorder.get(origin.url + "/data", params={"apikey": SECRET, "city": "leeds"},
+                             timeout=5).content,
+        "q1": recorder.post(origin.url + "/graphql", json={"query": "one"}, timeout=5).content,
+        "q2": recorder.post(origin.url + "/graphql", json={"query": "two"}, timeout=5).content,
+    }
+    recorder.get(origin.url + "/api/states", timeout=5)      # 304 path records the full body
+    recorder.close()
+    origin.stop()
+
+    files = [os.path.join(d, f) for d, _, names in os.walk(fixtures) for f in names]
+    on_disk = "".join(open(f).read() for f in files)
+    results.record("One fixture per distinct request", len(files) == 5, f"{len(files)} files")
+    results.record("Credentials in the query are not written to disk",
+                   SECRET not in on_disk and "REDACTED" not in on_disk
+                   and '"redacted": [\n  "apikey"' in on_disk)
+
+    server = ReplayServer(fixtures)
+    url = server.start()
+    client = HTTPClient(replay_url=url, revalidate=False)
+    replayed = {
+        "states": client.get(origin.url + "/api/states", timeout=5).content,
+        "feed": client.get(origin.url + "/feed.xml", timeout=5).content,
+        "data": client.get(origin.url + "/data", params={"apikey": "other-key", "city": "leeds"},
+                           timeout=5).content,
+        "q1": client.post(origin.url + "/graphql", json={"query": "one"}, timeout=5).content,
+        "q2": client.post(origin.url + "/graphql", json={"query": "two"}, timeout=5).content,
+    }
+    stats = server.get_stats()
+    results.record("Replay serves recorded bodies with the origin offline",
+                   replayed == recorded and stats["hits"] == 5, str(stats))
+    results.record("Client stats stay under the upstream host",
+                   list(client.get_stats()["hosts"]) == [host])
+
+    fallback = client.get(origin.url + "/data", params={"city": "york"}, timeout=5)
+    missing = client.get(origin.url + "/nothing", timeout=5)
+    stats = server.get_stats()
+    results.record("Unknown query falls back to the path; unknown path is a 404",
+                   fallback.content == recorded["data"] and missing.status_code == 404
+                   and stats["fallbacks"] == 1 and stats["misses"] == 1, str(stats))
+
+    revalidating = HTTPClient(replay_url=url)
+    revalidating.get(origin.url + "/api/states", timeout=5)
+    again = revalidating.get(origin.url + "/api/states", timeout=5)
+    results.record("Recorded ETag answers conditional GETs with 304",
+                   again.revalidated and server.get_stats()["not_modified"] == 1)
+    for c in (client, revalidating):
+        c.close()
+    server.stop()
+
+    overrides = ReplayServer(fixtures)
+    override_url = overrides.start()
+    routed = HTTPClient(base_url_overrides={origin.url: f"{override_url}/{host}"})
+    results.record("base_url_overrides route a single upstream",
+                   routed.get(origin.url + "/feed.xml", timeout=5).content == recorded["feed"])
+    routed.close()
+    overrides.stop()
+
+    slow = ReplayServer(fixtures, latency_ms=80, jitter_ms=20, seed=3)
+    slow_client = HTTPClient(replay_url=slow.start(), revalidate=False)
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        slow_client.get(origin.url + "/feed.xml", timeout=5)
+        times.append((time.perf_counter() - start) * 1000.0)
+    results.record("Latency and jitter are injected", min(times) >= 58 and max(times) < 250,
+                   " ".join(f"{t:.0f}" for t in times))
+    slow_client.close()
+    slow.stop()
+
+    def error_pattern(seed):
+        flaky = ReplayServer(fixtures, error_rate=0.4, seed=seed)
+        flaky_client = HTTPClient(replay_url=flaky.start(), revalidate=False)
+        codes = [flaky_client.get(origin.url + "/feed.xml", timeout=5).status_code
+                 for _ in range(30)]
+        flaky_client.close()
+        flaky.stop()
+        return codes
+
+    first, second = error_pattern(7), error_pattern(7)
+    results.record("Injected errors are 503s, reproducible per seed",
+                   first == second and set(first) == {200, 503} and 5 <= first.count(503) <= 20,
+                   f"{first.count(503)}/30 errors")
+
+    scaled = ReplayServer(fixtures, json_scale=10, rss_items=500)
+    scaled_client = HTTPClient(replay_url=scaled.start(), revalidate=False)
+    states = scaled_client.get(origin.url + "/api/states", timeout=5).json()
+    feed = scaled_client.get(origin.url + "/feed.xml", timeout=5).content
+    links = re.findall(rb"<link>(.*?)</link>", feed)
+    results.record("JSON arrays scale with unique entity_ids",
+                   len(states) == 200 and len({s["entity_id"] for s in states}) == 200)
+    results.record("Feeds grow to the requested item count with unique links",
+                   feed.count(b"<item>") == 500 and len(set(links)) == 500
+                   and feed.startswith(b"<?xml") and feed.endswith(b"</channel></rss>"),
+                   f"{feed.count(b'<item>')} items, {len(set(links))} links")
+    scaled_client.close()
+    scaled.stop()
+
+    shutil.rmtree(fixtures, ignore_errors=True)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,8 @@ TEST_CASES = [
     ("show me the temperature", "show", "weather"),
     ("turn on the schedule", "show", "calendar"),
     ("remove health data", "hide", "fitbit"),
+    ("refresh the news", "refresh", "news"),
+    ("update my stocks", "refresh", "stocks"),
     # These should return None (no valid command)
     ("hello mirror", None, None),
     ("what time is it", None, None),
@@ -35,6 +37,10 @@ def main():
     print("-" * 50)
 
     for text, expected_action, expected_module in TEST_CASES:
+        if expected_action == "refresh":
+            module = parser.parse_refresh(text)
+            results.record(f'"{text}"', module == expected_module, f"got {module}")
+            continue
         result = parser.parse_command(text)
 
         if expected_action is None:
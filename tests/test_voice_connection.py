@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""Logic test: Realtime voice connection state machine - non-blocking start, buffering while connecting, jittered backoff, reconnect, when to fall back (fake Realtime server)."""
+
+import sys
+import os
+import logging
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+from tests.fake_realtime_server import FakeRealtimeServer
+
+OPENAI = "wss://api.openai.com"
+
+
+def wait_until(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def voice_config(**connection):
+    return {"class": "AIVoiceModule", "params": {
+        "openai": {"api_key": "sk-test", "model": "gpt-realtime-mini"},
+        "audio": {},
+        "connection": dict({"connect_timeout_s": 2, "backoff_base_s": 0.1,
+                            "backoff_max_s": 0.4}, **connection),
+    }}
+
+
+def main():
+    import pygame
+    pygame.init()
+    import ai_voice_module
+    import http_client as http_client_module
+    from api_tracker import APITracker
+    from ai_voice_module import AIVoiceModule
+
+    results = TestResult()
+    print("Testing voice connection...")
+    print("-" * 50)
+
+    client = http_client_module.http_client
+    real_overrides = client.base_url_overrides
+    real_tracker = ai_voice_module.api_tracker
+    tracker = APITracker(state_file=None, usage_log=None)
+    tracker.set_limit("openai-realtime", hourly=10 ** 6, daily=10 ** 6, daily_cost=0)
+    tracker.BREAKER_THRESHOLD = 10 ** 6
+    ai_voice_module.api_tracker = tracker
+    # AIVoiceModule only adds its voice_history.log handler to a bare logger
+    history, quiet = logging.getLogger("VoiceHistory"), logging.NullHandler()
+    history.addHandler(quiet)
+    server = FakeRealtimeServer(handshake_delay_s=0.3)
+    modules = []
+    try:
+        client.base_url_overrides = [(OPENAI, server.start())]
+
+        statuses = []
+        start = time.perf_counter()
+        voice = AIVoiceModule(voice_config())
+        took = time.perf_counter() - start
+        modules.append(voice)
+        voice.set_state_listener(statuses.append)
+        results.record("Constructor returns without waiting for the socket",
+                       took < 0.25 and voice.connection_state in ("connecting", "session-configured"),
+                       f"{took * 1000:.0f} ms, {voice.connection_state}")
+
+        # Sent while connecting: buffered, then flushed in order once ready
+        voice.send_ws_message({"type": "input_audio_buffer.clear"})
+        voice.send_ws_message({"type": "conversation.item.create", "item": {"id": "a"}})
+        buffered = voice.get_connection_stats()["buffered_now"]
+        ready = wait_until(lambda: voice.connection_state == "ready")
+        wait_until(lambda: len(server.events()) >= 3)
+        kinds = [e["type"] for e in server.events()]
+        results.record("Events sent while connecting are flushed after session.update",
+                       ready and buffered == 2
+                       and kinds == ["session.update", "input_audio_buffer.clear",
+                                     "conversation.item.create"],
+                       str(kinds))
+        results.record("State changes reach the state listener",
+                       statuses[-1] == "Ready" and voice.session_ready
+                       and voice.status == "Ready", str(statuses))
+
+        # Server goes away: backoff with growing, jittered delays
+        server.mode = "refuse"
+        server.drop_connections()
+        delays = set()
+        wait_until(lambda: voice.connection_state == "backoff")
+        functional_early = voice.is_functional()
+        for _ in range(4):
+            attempts = server.refused
+            wait_until(lambda: server.refused > attempts, timeout=2.0)
+            delays.add(voice.get_connection_stats()["last_backoff_s"])
+        stats = voice.get_connection_stats()
+        results.record("Refused reconnects back off, capped and jittered",
+                       stats["failures"] >= 3 and not voice.session_ready
+                       and all(0.05 <= d <= 0.4 for d in delays) and len(delays) >= 2
+                       and "Reconnecting" in statuses,
+                       f"delays {sorted(delays)}, {stats}")
+        results.record("Functional while retrying, not after fail_after_attempts failures",
+                       functional_early and not voice.is_functional(),
+                       f"{voice._failed_attempts} failed attempts")
+
+        # A press during backoff retries at once instead of waiting
+        server.mode = "ok"
+        start = time.perf_counter()
+        voice.on_button_press()
+        press = time.perf_counter() - start
+        recovered = wait_until(lambda: voice.connection_state == "ready")
+        results.record("Recovers once the server is back; button press never blocks",
+                       recovered and press < 0.05 and voice.conn_stats["sessions"] == 2
+                       and voice.is_functional(),
+                       f"press {press * 1000:.1f} ms, {voice.get_connection_stats()}")
+
+        # Wrong key: the 401 handshake is not working on the first attempt
+        server.token = "sk-right"
+        bad_key = AIVoiceModule(voice_config())
+        modules.append(bad_key)
+        refused = wait_until(lambda: bad_key.conn_stats["failures"] >= 1, timeout=3.0)
+        results.record("Handshake 401 counts as not working at once",
+                       refused and bad_key.auth_failed and not bad_key.is_functional()
+                       and "401" in bad_key.conn_stats["last_error"],
+                       str(bad_key.conn_stats))
+        bad_key.cleanup()
+        modules.remove(bad_key)
+        server.token = None
+
+        # Stalled handshake times out into backoff
+        server.mode = "stall"
+        stalled = AIVoiceModule(voice_config(connect_timeout_s=0.3))
+        modules.append(stalled)
+        timed_out = wait_until(lambda: stalled.conn_stats["failures"] >= 1, timeout=3.0)
+        results.record("Handshake with no session.created times out",
+                       timed_out and "not ready" in stalled.conn_stats["last_error"],
+                       str(stalled.conn_stats))
+
+        capped = AIVoiceModule(voice_config(max_buffered_events=3))
+        modules.append(capped)
+        for i in range(5):
+            capped.send_ws_message({"type": "input_audio_buffer.append", "audio": str(i)})
+        results.record("Buffer is bounded (oldest dropped)",
+                       [e["audio"] for e in capped._outbox] == ["2", "3", "4"]
+                       and capped.conn_stats["dropped"] == 2)
+
+        start = time.perf_counter()
+        voice.cleanup()
+        modules.remove(voice)
+        results.record("cleanup() stops the connection thread",
+                       not voice.ws_thread.is_alive() and voice.connection_state == "disconnected",
+                       f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        for module in modules:
+            module.cleanup()
+        server.stop()
+        client.base_url_overrides = real_overrides
+        ai_voice_module.api_tracker = real_tracker
+        history.removeHandler(quiet)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
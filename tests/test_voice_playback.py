@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+"""Logic test: voice playback engine - ring buffer, one persistent stream, jitter buffer, underrun/overrun counters, barge-in flush, echo gate timing (fake audio sink)."""
+
+import sys
+import os
+import json
+import logging
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.test_helpers import TestResult
+from tests.fake_audio_sink import FakeAudioSink
+from tests.fake_realtime_server import FakeRealtimeServer, tone
+
+RATE = 24000
+CHUNK = tone(100)   # one 100 ms delta
+
+
+def wait_until(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def feed(engine, chunks=8, late=None):
+    """Deltas at real-time pace; late = (index, seconds) delays one of them."""
+    start = time.monotonic()
+    for i in range(chunks):
+        due = start + i * 0.1 + (late[1] if late and i >= late[0] else 0.0)
+        time.sleep(max(0.0, due - time.monotonic()))
+        engine.write(CHUNK)
+    engine.end_response()
+    return start
+
+
+def main():
+    import pygame
+    pygame.init()
+    from voice_playback import PCMRing, PlaybackEngine
+
+    results = TestResult()
+    print("Testing voice playback...")
+    print("-" * 50)
+
+    ring = PCMRing(10)
+    buf = ring._buf
+    out = bytearray(4)
+    ring.write(b"abcdef")
+    ring.read_into(memoryview(out))
+    accepted = ring.write(b"ghijklmnop")
+    rest = bytearray(10)
+    n = ring.read_into(memoryview(rest))
+    results.record("Ring buffer wraps in order, bounded, whole frames",
+                   bytes(out) == b"abcd" and accepted == 8 and bytes(rest[:n]) == b"efghijklmn"
+                   and len(ring) == 0 and ring._buf is buf,
+                   f"{bytes(out)} {accepted} {bytes(rest[:n])}")
+
+    events = []
+    tapped = []
+    sink = FakeAudioSink(RATE)
+    engine = PlaybackEngine(RATE, sink=sink, jitter_ms=80,
+                            on_start=lambda: events.append(("start", time.monotonic())),
+                            on_drained=lambda flushed: events.append(("drained", time.monotonic(), flushed)),
+                            tap=tapped.append)
+    engine.start()
+    try:
+        wait_until(lambda: sink.opened)
+        starts = []
+        for i in range(3):
+            starts.append(feed(engine, late=(4, 0.06) if i == 1 else None))
+            wait_until(lambda: not engine.is_playing())
+        stats = engine.stats()
+        first = sink.first_audible(starts[0])
+        heard = [sink.gap_ms(sink.first_audible(s), sink.last_audible_end(s, e))
+                 for s, e in zip(starts, starts[1:] + [time.monotonic()])]
+        results.record("One stream for every reply, no gaps with late deltas under jitter_ms",
+                       sink.opened == 1 and stats["responses"] == 3 and stats["underruns"] == 0
+                       and max(heard) < 1.0,
+                       f"opened {sink.opened}, gaps {heard}, {stats}")
+        results.record("Time to first audio measured and matches the device",
+                       first is not None and abs((first - starts[0]) * 1000 - stats["first_audio_ms_max"]) < 60
+                       and stats["first_audio_ms"] < 200,
+                       f"device {(first - starts[0]) * 1000:.0f} ms, reported {stats['first_audio_ms']} ms")
+        results.record("Tap gets every audio byte in order",
+                       b"".join(tapped) == CHUNK * 24, f"{sum(map(len, tapped))} bytes")
+
+        drained = [e for e in events if e[0] == "drained"]
+        last_end = sink.last_audible_end(starts[2])
+        results.record("on_drained fires when the last sample has played, not when written",
+                       len(drained) == 3 and -0.005 <= drained[-1][1] - last_end < 0.06,
+                       f"drained {(drained[-1][1] - last_end) * 1000:+.1f} ms after the last sample")
+
+        # A delta later than the jitter buffer: counted as an underrun gap
+        start = feed(engine, late=(4, 0.2))
+        wait_until(lambda: not engine.is_playing())
+        stats = engine.stats()
+        heard = sink.gap_ms(sink.first_audible(start), sink.last_audible_end(start))
+        results.record("Late delta beyond the jitter buffer counted as an underrun",
+                       stats["underruns"] == 1 and 150 <= stats["gap_ms"] <= 350
+                       and abs(heard - stats["gap_ms"]) < 30,
+                       f"engine gap {stats['gap_ms']} ms, heard {heard:.0f} ms")
+
+        # Barge-in: flush mid-reply
+        for _ in range(20):
+            engine.write(CHUNK)
+        wait_until(lambda: sink.first_audible(time.monotonic() - 0.05) is not None)
+        time.sleep(0.2)
+        flushed_at = time.monotonic()
+        engine.flush()
+        wait_until(lambda: not engine.is_playing())
+        tail = sink.last_audible_end(flushed_at - 1.0) - flushed_at
+        stats = engine.stats()
+        results.record("flush() silences the reply within a few periods",
+                       stats["flushes"] == 1 and stats["buffered_ms"] == 0 and tail < 0.1
+                       and events[-1][0] == "drained" and events[-1][2] is True,
+                       f"audio ran {tail * 1000:.0f} ms past flush()")
+    finally:
+        engine.stop()
+
+    small = PlaybackEngine(RATE, sink=FakeAudioSink(RATE), buffer_s=0.25)
+    for _ in range(4):
+        small.write(CHUNK)
+    stats = small.stats()
+    results.record("Overrun drops the excess and counts it",
+                   stats["overruns"] == 2 and stats["dropped_ms"] == 150.0
+                   and stats["buffered_ms"] == 250.0, str(stats))
+
+    # AIVoiceModule end to end: reply from the fake server to the fake speaker
+    import ai_voice_module
+    import http_client as http_client_module
+    from api_tracker import APITracker
+    from ai_voice_module import AIVoiceModule
+
+    client = http_client_module.http_client
+    real_overrides = client.base_url_overrides
+    real_tracker = ai_voice_module.api_tracker
+    tracker = APITracker(state_file=None, usage_log=None)
+    tracker.set_limit("openai-realtime", hourly=10 ** 6, daily=10 ** 6, daily_cost=0)
+    ai_voice_module.api_tracker = tracker
+    # AIVoiceModule only adds its voice_history.log handler to a bare logger
+    history, quiet = logging.getLogger("VoiceHistory"), logging.NullHandler()
+    history.addHandler(quiet)
+    server = FakeRealtimeServer(reply_ms=1500, paced=True)
+    voice = None
+    try:
+        client.base_url_overrides = [("wss://api.openai.com", server.start())]
+        voice = AIVoiceModule({"class": "AIVoiceModule", "params": {
+            "openai": {"api_key": "sk-test"}, "audio": {}}})
+        speaker = FakeAudioSink(RATE)
+        voice.player.set_sink(speaker)
+        statuses = []
+        lipsync = []
+        voice.set_state_listener(statuses.append)
+        voice.set_audio_sink(lipsync.append)
+        wait_until(lambda: voice.connection_state == "ready")
+
+        asked = time.monotonic()
+        voice.send_ws_message({"type": "response.create"})
+        wait_until(lambda: voice._playback_active)
+        gated = voice._playback_active
+        wait_until(lambda: not voice.player.is_playing())
+        end = speaker.last_audible_end(asked)
+        results.record("Reply plays through the persistent stream; gate opens after it",
+                       speaker.opened == 1 and gated and not voice._playback_active
+                       and end is not None and voice._mute_until - time.time() > 0.2
+                       and statuses[-2:] == ["Speaking", "Ready"] and lipsync
+                       and voice.get_playback_stats()["first_audio_ms"] is not None,
+                       f"{statuses}, {voice.get_playback_stats()}")
+
+        voice.send_ws_message({"type": "response.create"})
+        wait_until(lambda: voice._playback_active)
+        time.sleep(0.2)
+        barged = time.monotonic()
+        voice.on_ws_message(voice.ws, json.dumps({"type": "input_audio_buffer.speech_started"}))
+        wait_until(lambda: not voice.player.is_playing())
+        wait_until(lambda: server.events("response.cancel"))
+        tail = speaker.last_audible_end(barged - 1.0) - barged
+        results.record("Barge-in flushes the reply and cancels the response",
+                       tail < 0.15 and voice.get_playback_stats()["flushes"] == 1
+                       and len(server.events("response.cancel")) == 1,
+                       f"audio ran {tail * 1000:.0f} ms past speech_started")
+    finally:
+        if voice is not None:
+            voice.cleanup()
+        server.stop()
+        client.base_url_overrides = real_overrides
+        ai_voice_module.api_tracker = real_tracker
+        history.removeHandler(quiet)
+    return results.summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
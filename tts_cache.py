@@ -0,0 +1,308 @@
+"""On-disk cache of synthesised speech for the fallback assistant.
+
+AIInteractionModule used to send every sentence it spoke to OpenAI TTS
+(or gTTS) and delete the mp3 after playing it, so "Hello! How can I
+help you today?" cost a network round-trip and API spend every time.
+This keeps the audio instead:
+
+  - content-addressed: a file's name is the sha256 of (engine, voice,
+    normalised text), so the same sentence from the same voice is
+    synthesised once however it was spaced or quoted;
+  - files live under data/tts_cache/ with an index.json of size,
+    synthesis time and last use; the least recently used entries are
+    evicted once the total passes max_bytes;
+  - prewarm() synthesises a phrase list ahead of time (the module runs
+    it from update() once it has been idle for a while);
+  - stats count hits, misses and the synthesis time hits saved.
+
+A hit is only a file path: playing it never touches the network.
+
+Usage:
+    from tts_cache import tts_cache
+    path, hit = tts_cache.fetch("gtts", "en", text, lambda p: gTTS(text).save(p))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from config import CONFIG
+
+logger = logging.getLogger("TTSCache")
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+_CACHE_DIR = os.path.join(_PROJECT_DIR, "data", "tts_cache")
+
+# Typographic punctuation the chat model emits interchangeably with ASCII
+_PUNCTUATION = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"',
+                              '–': '-', '—': '-', '…': '...'})
+
+
+class TTSCache:
+    """Synthesised audio files keyed by (engine, voice, normalised text)."""
+
+    def __init__(self, root=None, max_bytes=64 * 1024 * 1024, enabled=True,
+                 save_interval_s=30.0, clock=time.time):
+        self.root = root               # None: module-level _CACHE_DIR
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.save_interval_s = save_interval_s
+        self._clock = clock
+        self._entries = None           # key -> {bytes, synth_ms, used, ...}, LRU order
+        self._bytes = 0
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0,
+                      'errors': 0, 'prewarmed': 0, 'latency_saved_ms': 0.0}
+
+    # ------------------------------------------------------------------
+    # Keys and files
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalise(text):
+        """'  Hello ,“world” ' -> 'Hello, "world"'.
+
+        Case is kept: it changes how engines read acronyms ("US" / "us").
+        """
+        text = unicodedata.normalize('NFKC', text).translate(_PUNCTUATION)
+        text = re.sub(r'\s+', ' ', text).strip()
+        return re.sub(r' ([,.;:!?])', r'\1', text)
+
+    @classmethod
+    def key(cls, engine, voice, text):
+        raw = '\x1f'.join((engine, voice or '', cls.normalise(text)))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _dir(self):
+        return self.root or _CACHE_DIR
+
+    def _path(self, key):
+        return os.path.join(self._dir(), f"{key}.mp3")
+
+    def _load(self):
+        """Index from disk, dropping entries whose file is gone. Lock held."""
+        if self._entries is not None:
+            return self._entries
+        entries = {}
+        try:
+            with open(os.path.join(self._dir(), "index.json"), "r", encoding="utf-8") as f:
+                blob = json.load(f)
+            if isinstance(blob, dict):
+                entries = blob.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read TTS cache index: {e}")
+        self._entries = OrderedDict()
+        for key, entry in sorted(entries.items(), key=lambda kv: kv[1].get('used', 0)):
+            if os.path.exists(self._path(key)):
+                self._entries[key] = entry
+                self._bytes += entry.get('bytes', 0)
+        if len(self._entries) != len(entries):
+            self._dirty = True
+        self._evict()
+        return self._entries
+
+    def _save(self, force=False):
+        """Write the index atomically if it changed. Lock held."""
+        if not self._dirty or (not force and self._clock() - self._saved_at < self.save_interval_s):
+            return
+        try:
+            os.makedirs(self._dir(), exist_ok=True)
+            path = os.path.join(self._dir(), "index.json")
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": self._clock(), "entries": self._entries}, f)
+            os.replace(tmp, path)
+            self._dirty = False
+            self._saved_at = self._clock()
+        except OSError as e:
+            logger.warning(f"Could not save TTS cache index: {e}")
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes. Lock held."""
+        while self._bytes > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.get('bytes', 0)
+            self.stats['evictions'] += 1
+            self._dirty = True
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, engine, voice, text):
+        """Path of the cached audio for this sentence, or None (counted as a miss)."""
+        if not self.enabled:
+            return None
+        key = self.key(engine, voice, text)
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is not None and not os.path.exists(self._path(key)):
+                entries.pop(key)
+                self._bytes -= entry.get('bytes', 0)
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            entries.move_to_end(key)
+            entry['used'] = self._clock()
+            entry['hits'] = entry.get('hits', 0) + 1
+            self._dirty = True
+            self.stats['hits'] += 1
+            self.stats['latency_saved_ms'] += entry.get('synth_ms', 0.0)
+            self._save()
+            return self._path(key)
+
+    def contains(self, engine, voice, text):
+        """True if cached; unlike get() this is not counted or made recent."""
+        if not self.enabled:
+            return False
+        key = self.key(engine, voice, text)
+        with self._lock:
+            return key in self._load() and os.path.exists(self._path(key))
+
+    def put(self, engine, voice, text, src_path, synth_ms=0.0):
+        """Move a freshly synthesised file into the cache; returns its cached path.
+
+        Returns src_path unchanged if the cache is disabled, the file is
+        bigger than the whole budget, or the move fails.
+        """
+        if not self.enabled:
+            return src_path
+        key = self.key(engine, voice, text)
+        try:
+            size = os.path.getsize(src_path)
+        except OSError as e:
+            logger.warning(f"TTS output missing for cache: {e}")
+            return src_path
+        if size == 0 or size > self.max_bytes:
+            return src_path
+        with self._lock:
+            entries = self._load()
+            path = self._path(key)
+            try:
+                os.makedirs(self._dir(), exist_ok=True)
+                os.replace(src_path, path)
+            except OSError as e:
+                self.stats['errors'] += 1
+                logger.warning(f"Could not store TTS audio: {e}")
+                return src_path
+            old = entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.get('bytes', 0)
+            entries[key] = {'bytes': size, 'synth_ms': round(synth_ms, 1),
+                            'used': self._clock(), 'hits': 0,
+                            'engine': engine, 'voice': voice, 'text': self.normalise(text)[:200]}
+            self._bytes += size
+            self.stats['stores'] += 1
+            self._dirty = True
+            self._evict()
+            self._save(force=True)
+            return path
+
+    def fetch(self, engine, voice, text, synthesise):
+        """(path, hit): cached audio, or synthesise(tmp_path) and cache it.
+
+        synthesise writes the audio file it is given; exceptions it
+        raises propagate (the caller falls back to another engine).
+        """
+        path = self.get(engine, voice, text)
+        if path is not None:
+            return path, True
+        return self._synthesise(engine, voice, text, synthesise), False
+
+    def _synthesise(self, engine, voice, text, synthesise):
+        """Run synthesise(tmp_path), timed, and put() the result."""
+        os.makedirs(self._dir(), exist_ok=True)
+        tmp = os.path.join(self._dir(), f".tmp-{threading.get_ident()}-{time.monotonic_ns()}.mp3")
+        start = time.perf_counter()
+        try:
+            synthesise(tmp)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return self.put(engine, voice, text, tmp, (time.perf_counter() - start) * 1000.0)
+
+    def discard(self, path):
+        """Remove a file fetch() returned if it is not a cache entry."""
+        if path and os.path.dirname(os.path.abspath(path)) == os.path.abspath(self._dir()) \
+                and os.path.basename(path).startswith(".tmp-") and os.path.exists(path):
+            os.remove(path)
+
+    def prewarm(self, engine, voice, phrases, synthesise, should_stop=None):
+        """Synthesise the phrases not cached yet; returns how many were added.
+
+        synthesise(text, path) writes one phrase. should_stop() is checked
+        between phrases so live speech never waits behind a prewarm.
+        """
+        if not self.enabled:
+            return 0
+        added = 0
+        for text in phrases:
+            if should_stop is not None and should_stop():
+                break
+            if not text or not text.strip() or self.contains(engine, voice, text):
+                continue
+            try:
+                path = self._synthesise(engine, voice, text, lambda p, t=text: synthesise(t, p))
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"TTS prewarm failed for '{text[:40]}': {e}")
+                continue
+            self.discard(path)
+            added += 1
+            self.stats['prewarmed'] += 1
+        return added
+
+    def flush(self):
+        """Write pending last-used times to the index."""
+        with self._lock:
+            if self._entries is not None:
+                self._save(force=True)
+
+    def clear(self):
+        """Remove every cached file and the index."""
+        with self._lock:
+            for key in list(self._load()):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._bytes = 0
+            self._dirty = True
+            self._save(force=True)
+
+    def get_stats(self):
+        with self._lock:
+            entries = self._load() if self.enabled else {}
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(self.stats,
+                        latency_saved_ms=round(self.stats['latency_saved_ms'], 1),
+                        hit_rate=round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+                        entries=len(entries), bytes=self._bytes, max_bytes=self.max_bytes,
+                        enabled=self.enabled)
+
+
+# Shared by the fallback assistant (CONFIG['tts_cache'])
+_settings = CONFIG.get('tts_cache', {})
+tts_cache = TTSCache(
+    max_bytes=_settings.get('max_bytes', 64 * 1024 * 1024),
+    enabled=_settings.get('enabled', True),
+)
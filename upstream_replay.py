@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""Record real upstream responses and replay them from a local server.
+
+Recording: set CONFIG['http_client']['record_dir'] (or MIRROR_RECORD_DIR)
+and run the mirror. Every response that comes back through http_client
+(Open-Meteo, OpenWeatherMap, Alpha Vantage, Octopus REST and GraphQL,
+Home Assistant, zenquotes, RSS) is written to one JSON fixture per
+request under <record_dir>/<host>/. Query parameters that look like
+credentials (key, token, appid, ...) are left out - only their names
+are kept - and request bodies are stored only as a digest. Responses
+themselves are kept as-is: treat a fixture directory as private.
+
+Replay: serve the fixtures with injected latency, jitter, errors and
+payload scaling, and point the mirror at it with MIRROR_REPLAY_URL (or
+CONFIG['http_client']['replay_url']). http_client then rewrites
+https://host/path?q to <replay_url>/host/path?q, so no module changes
+its URLs:
+
+    python upstream_replay.py --fixtures data/fixtures --port 8799 \\
+        --latency-ms 400 --jitter-ms 150 --error-rate 0.05 \\
+        --json-scale 10 --rss-items 500
+    MIRROR_REPLAY_URL=http://127.0.0.1:8799 python AI-Mirror.py
+
+--json-scale multiplies top-level JSON arrays (HA /api/states, with
+unique entity_ids) and paginated "results" arrays; --rss-items grows or
+trims every RSS/Atom feed to that many items with unique links. The HA
+WebSocket is not replayed (the state store falls back to polling);
+use tests/fake_ha_server.py for the event stream. yfinance, Google
+Calendar and Fitbit use their own client libraries and bypass
+http_client, so they are neither recorded nor replayed.
+
+Tests and benchmarks drive ReplayServer directly:
+
+    server = ReplayServer("data/fixtures", latency_ms=300, seed=1)
+    url = server.start()
+    ...
+    server.stop()
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+logger = logging.getLogger("UpstreamReplay")
+
+SECRET_PARAM = re.compile(r'key|token|secret|password|appid|sig', re.IGNORECASE)
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+_ITEM_RE = {
+    'rss': re.compile(rb'<item\b.*?</item>', re.DOTALL),
+    'atom': re.compile(rb'<entry\b.*?</entry>', re.DOTALL),
+}
+_UNIQUE_TAGS = re.compile(rb'(<(guid|link|id)\b[^>]*>)(.*?)(</\2>)', re.DOTALL)
+_TITLE_TAG = re.compile(rb'(<title\b[^>]*>)(.*?)(</title>)', re.DOTALL)
+
+
+# ----------------------------------------------------------------------
+# Fixture files
+# ----------------------------------------------------------------------
+
+def _public_query(pairs):
+    """Query pairs with credential-looking parameters dropped, sorted."""
+    return sorted((k, v) for k, v in pairs if not SECRET_PARAM.search(k))
+
+
+def _body_digest(raw):
+    """Short digest of a request body; JSON is canonicalised first."""
+    if not raw:
+        return ''
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    try:
+        raw = json.dumps(json.loads(raw), sort_keys=True).encode('utf-8')
+    except ValueError:
+        pass
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def _fixture_key(method, path, query, body_sha):
+    return f"{method} {path}?{urlencode(query)} {body_sha}"
+
+
+def save_fixture(root, method, url, resp, json_body=None, data=None):
+    """Write one response as <root>/<host>/<name>.json (latest wins)."""
+    parts = urlsplit(url)
+    pairs = parse_qsl(parts.query, keep_blank_values=True)
+    query = _public_query(pairs)
+    if json_body is not None:
+        raw = json.dumps(json_body)
+    else:
+        raw = data if isinstance(data, (str, bytes)) else ''
+    body_sha = _body_digest(raw)
+    path = parts.path or '/'
+    key = _fixture_key(method, path, query, body_sha)
+
+    record = {
+        'method': method,
+        'host': parts.netloc,
+        'path': path,
+        'query': query,
+        'redacted': sorted({k for k, _ in pairs if SECRET_PARAM.search(k)}),
+        'body_sha': body_sha,
+        'status': resp.status_code,
+        'headers': {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+        'recorded_at': time.time(),
+    }
+    try:
+        record['body'] = resp.content.decode('utf-8')
+    except UnicodeDecodeError:
+        record['body_b64'] = base64.b64encode(resp.content).decode('ascii')
+
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_')[:60] or 'root'
+    name = f"{method}_{slug}_{hashlib.sha1(key.encode()).hexdigest()[:10]}.json"
+    folder = os.path.join(root, re.sub(r'[^A-Za-z0-9.-]+', '_', parts.netloc))
+    os.makedirs(folder, exist_ok=True)
+    final = os.path.join(folder, name)
+    tmp = final + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(record, f, indent=1)
+    os.replace(tmp, final)
+    return final
+
+
+class FixtureStore:
+    """Fixtures from a record directory, indexed for lookup."""
+
+    def __init__(self, root):
+        self.root = root
+        self._exact = {}      # (host, key) -> record
+        self._by_path = {}    # (host, method, path) -> newest record
+        self.load()
+
+    def load(self):
+        self._exact.clear()
+        self._by_path.clear()
+        if not os.path.isdir(self.root):
+            return
+        for folder in sorted(os.listdir(self.root)):
+            folder_path = os.path.join(self.root, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            for name in sorted(os.listdir(folder_path)):
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(folder_path, name)) as f:
+                        record = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping fixture {folder}/{name}: {e}")
+                    continue
+                self.add(record)
+
+    def add(self, record):
+        query = [tuple(p) for p in record.get('query', [])]
+        key = _fixture_key(record['method'], record['path'], query, record.get('body_sha', ''))
+        self._exact[(record['host'], key)] = record
+        slot = (record['host'], record['method'], record['path'])
+        newest = self._by_path.get(slot)
+        if newest is None or record.get('recorded_at', 0) >= newest.get('recorded_at', 0):
+            self._by_path[slot] = record
+
+    def __len__(self):
+        return len(self._exact)
+
+    def lookup(self, method, host, path, pairs, body=b''):
+        """(record, exact) for a request, falling back to the path; (None, False)."""
+        key = _fixture_key(method, path, _public_query(pairs), _body_digest(body))
+        record = self._exact.get((host, key))
+        if record is not None:
+            return record, True
+        return self._by_path.get((host, method, path)), False
+
+
+# ----------------------------------------------------------------------
+# Payload scaling
+# ----------------------------------------------------------------------
+
+def scale_json(body, factor):
+    """Repeat top-level arrays (and "results" pages) factor times."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+
+    def grow(items):
+        out = list(items)
+        for n in range(1, factor):
+            for item in items:
+                if isinstance(item, dict) and 'entity_id' in item:
+                    item = dict(item, entity_id=f"{item['entity_id']}_{n}")
+                out.append(item)
+        return out
+
+    if isinstance(data, list) and data:
+        data = grow(data)
+    elif isinstance(data, dict) and isinstance(data.get('results'), list) and data['results']:
+        data = dict(data, results=grow(data['results']))
+        if isinstance(data.get('count'), int):
+            data['count'] = len(data['results'])
+    else:
+        return body
+    return json.dumps(data).encode('utf-8')
+
+
+def scale_feed(body, count):
+    """Grow or trim an RSS/Atom feed to count items with unique links."""
+    for pattern in _ITEM_RE.values():
+        items = list(pattern.finditer(body))
+        if items:
+            break
+    else:
+        return body
+    originals = [m.group(0) for m in items]
+    out = []
+    for i in range(count):
+        item = originals[i % len(originals)]
+        n = i // len(originals)
+        if n:
+            suffix = f"#r{n}".encode()
+            item = _UNIQUE_TAGS.sub(lambda m: m.group(1) + m.group(3) + suffix + m.group(4), item)
+            item = _TITLE_TAG.sub(lambda m: m.group(1) + m.group(2) + f" ({n})".encode()
+                                  + m.group(3), item, count=1)
+        out.append(item)
+    return body[:items[0].start()] + b''.join(out) + body[items[-1].end():]
+
+
+# ----------------------------------------------------------------------
+# Replay server
+# ----------------------------------------------------------------------
+
+class ReplayServer:
+    """Serves recorded fixtures as <url>/<host>/<path> with injected faults."""
+
+    def __init__(self, fixtures, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 json_scale=1, rss_items=None, seed=0, port=0):
+        self.store = fixtures if isinstance(fixtures, FixtureStore) else FixtureStore(fixtures)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.json_scale = max(1, int(json_scale))
+        self.rss_items = rss_items
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bodies = {}   # id(record) -> scaled body
+        self._stats = {'requests': 0, 'hits': 0, 'fallbacks': 0, 'misses': 0,
+                       'errors': 0, 'not_modified': 0, 'bytes_out': 0}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self, 'GET')
+
+            def do_POST(self):
+                server._handle(self, 'POST')
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    def start(self):
+        """Serve on a background thread; returns the base URL."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats, fixtures=len(self.store))
+
+    def body_for(self, record):
+        """Fixture body after payload scaling (computed once per fixture)."""
+        with self._lock:
+            body = self._bodies.get(id(record))
+        if body is not None:
+            return body
+        if 'body_b64' in record:
+            body = base64.b64decode(record['body_b64'])
+        else:
+            body = record.get('body', '').encode('utf-8')
+        content_type = record.get('headers', {}).get('Content-Type', '')
+        if self.json_scale > 1 and 'json' in content_type:
+            body = scale_json(body, self.json_scale)
+        if self.rss_items and ('xml' in content_type or 'rss' in content_type
+                               or body.lstrip()[:5] == b'<?xml'):
+            body = scale_feed(body, self.rss_items)
+        with self._lock:
+            self._bodies[id(record)] = body
+        return body
+
+    def _delay(self):
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return max(0.0, self.latency_ms + jitter) / 1000.0, fail
+
+    def _handle(self, req, method):
+        length = int(req.headers.get('Content-Length') or 0)
+        body = req.rfile.read(length) if length else b''
+        host, _, rest = req.path.lstrip('/').partition('/')
+        parts = urlsplit('/' + rest)
+        pairs = parse_qsl(parts.query, keep_blank_values=True)
+        record, exact = self.store.lookup(method, host, parts.path, pairs, body)
+
+        delay, fail = self._delay()
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self._stats['requests'] += 1
+            if fail:
+                self._stats['errors'] += 1
+            elif record is None:
+                self._stats['misses'] += 1
+            else:
+                self._stats['hits' if exact else 'fallbacks'] += 1
+
+        if fail:
+            return self._reply(req, 503, b'replay: injected error', {'Content-Type': 'text/plain'})
+        if record is None:
+            return self._reply(req, 404, f'replay: no fixture for {method} {req.path}'.encode(),
+                               {'Content-Type': 'text/plain'})
+        headers = dict(record.get('headers', {}))
+        etag = headers.get('ETag')
+        if (etag and req.headers.get('If-None-Match') == etag) or (
+                headers.get('Last-Modified')
+                and req.headers.get('If-Modified-Since') == headers['Last-Modified']):
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return self._reply(req, 304, b'', headers)
+        self._reply(req, record.get('status', 200), self.body_for(record), headers)
+
+    def _reply(self, req, code, body, headers):
+        req.send_response(code)
+        for k, v in headers.items():
+            req.send_header(k, v)
+        req.send_header('Content-Length', str(len(body)))
+        req.end_headers()
+        req.wfile.write(body)
+        with self._lock:
+            self._stats['bytes_out'] += len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded upstream responses")
+    parser.add_argument('--fixtures', default='data/fixtures', help='record directory')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction answered 503')
+    parser.add_argument('--json-scale', type=int, default=1, help='multiply JSON arrays')
+    parser.add_argument('--rss-items', type=int, default=None, help='items per feed')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = ReplayServer(args.fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, json_scale=args.json_scale,
+                          rss_items=args.rss_items, seed=args.seed, port=args.port)
+    if not len(server.store):
+        print(f"No fixtures in {args.fixtures} - record some with MIRROR_RECORD_DIR first")
+        return 1
+    url = server.start()
+    print(f"Replaying {len(server.store)} fixtures from {args.fixtures}")
+    print(f"  MIRROR_REPLAY_URL={url}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"  {server.get_stats()}")
+    except KeyboardInterrupt:
+        pass
+    server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -34,6 +34,17 @@ class ModuleCommand:
         # Action keywords
         self.show_keywords = ['show', 'display', 'enable', 'turn on']
         self.hide_keywords = ['hide', 'remove', 'disable', 'turn off']
+        self.refresh_keywords = ['refresh', 'reload', 'update']
+
+    def parse_refresh(self, text):
+        """Module named in a refresh request ("refresh the news"), or None"""
+        text = text.lower()
+        if not any(keyword in text for keyword in self.refresh_keywords):
+            return None
+        for module, keywords in self.module_keywords.items():
+            if any(keyword in text for keyword in keywords):
+                return module
+        return None
 
     def parse_command(self, text):
         """Parse text to determine command type and target module"""
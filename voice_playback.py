@@ -0,0 +1,440 @@
+"""Persistent playback engine for Realtime voice replies.
+
+AIVoiceModule used to start an aplay process for every reply and pipe
+the audio deltas into it as they arrived, so each reply paid for a
+process spawn and an ALSA open before its first syllable, and any delta
+that arrived late left the device to run dry mid-word.
+
+PlaybackEngine keeps one output stream open for the life of the module:
+
+  - Audio deltas go into a PCMRing, a byte ring allocated once
+    (buffer_s of audio). write() never blocks the WebSocket thread; if
+    the ring is full the excess is dropped and counted as an overrun.
+  - The "voice-playback" thread writes one period (period_ms) at a time
+    to the sink, paced by the clock so only about two periods sit ahead
+    of the speaker. With no reply playing it writes silence, so the
+    stream never closes or underruns.
+  - Jitter buffer: a reply starts jitter_ms after its first delta, so
+    every later delta has that much slack; sooner if twice that is
+    already buffered (the server is running ahead of real time) or the
+    reply has ended. If the ring runs dry mid-reply the gap is filled
+    with silence, counted as an underrun, and the reply primes again.
+  - flush() drops everything not yet written (barge-in); what the device
+    already holds is at most a couple of periods.
+  - Playback position comes from the sink's delay_frames() when it has
+    one, otherwise from the pacing clock less the sink's latency_s.
+    on_drained fires when the position passes the reply's last frame,
+    which is what releases the microphone echo gate.
+
+Sinks have open(), write(pcm), close() and optionally delay_frames() and
+latency_s. AplaySink is the Pi's speaker; NullSink discards audio at the
+same pace (dev hosts without aplay). tests/fake_audio_sink.py models a
+device for tests and benchmarks/bench_voice_playback.py.
+
+    engine = PlaybackEngine(24000, sink=AplaySink(24000),
+                            on_start=..., on_drained=..., tap=...)
+    engine.start()
+    engine.write(pcm); ...; engine.end_response()
+    engine.flush()          # barge-in
+    engine.stats()          # underruns, gaps, first-audio latency, ...
+"""
+
+import logging
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger("VoicePlayback")
+
+IDLE = "idle"            # no reply; the stream plays silence
+PRIMING = "priming"      # reply arriving, filling the jitter buffer
+PLAYING = "playing"
+DRAINING = "draining"    # reply fully written, waiting for the speaker
+
+LEAD_PERIODS = 2         # periods written ahead of the pacing clock
+REOPEN_DELAY_S = 1.0     # wait after a sink error before reopening
+
+
+class PCMRing:
+    """Fixed-size byte ring, allocated once; write() and read_into() copy
+    through a memoryview, so steady-state playback allocates nothing.
+
+    Not thread-safe on its own: PlaybackEngine holds its lock around it.
+    """
+
+    def __init__(self, capacity, frame_bytes=2):
+        capacity -= capacity % frame_bytes
+        self.capacity = capacity
+        self.frame_bytes = frame_bytes
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self.written = 0     # total bytes ever accepted
+        self.read = 0        # total bytes ever read
+
+    def __len__(self):
+        return self.written - self.read
+
+    def free(self):
+        return self.capacity - len(self)
+
+    def write(self, data):
+        """Append whole frames of data; returns the bytes accepted."""
+        data = memoryview(data).cast("B")
+        n = min(len(data), self.free())
+        n -= n % self.frame_bytes
+        pos = self.written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._view[pos:pos + first] = data[:first]
+        if n > first:
+            self._view[:n - first] = data[first:n]
+        self.written += n
+        return n
+
+    def read_into(self, out):
+        """Fill the memoryview out from the ring; returns the bytes copied."""
+        n = min(len(out), len(self))
+        pos = self.read % self.capacity
+        first = min(n, self.capacity - pos)
+        out[:first] = self._view[pos:pos + first]
+        if n > first:
+            out[first:n] = self._view[:n - first]
+        self.read += n
+        return n
+
+    def clear(self):
+        self.read = self.written
+
+
+class NullSink:
+    """Discards audio; the engine's clock still paces it like a device."""
+
+    latency_s = 0.0
+
+    def open(self):
+        pass
+
+    def write(self, pcm):
+        pass
+
+    def close(self):
+        pass
+
+
+class AplaySink:
+    """One long-lived aplay process reading raw S16_LE from stdin.
+
+    The ALSA buffer is kept small (buffer_ms) so the speaker is never
+    more than that behind what the engine has written.
+    """
+
+    def __init__(self, sample_rate, channels=1, device=None, buffer_ms=100, period_ms=25):
+        self.cmd = [
+            "aplay", "-q", "-t", "raw", "-f", "S16_LE",
+            "-r", str(sample_rate), "-c", str(channels),
+            f"--buffer-time={int(buffer_ms * 1000)}",
+            f"--period-time={int(period_ms * 1000)}",
+        ]
+        if device:
+            self.cmd += ["-D", device]
+        self.latency_s = buffer_ms / 1000.0
+        self._proc = None
+
+    def open(self):
+        self._proc = subprocess.Popen(
+            self.cmd, stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def write(self, pcm):
+        proc = self._proc
+        if proc is None or proc.poll() is not None:
+            raise BrokenPipeError("aplay exited")
+        proc.stdin.write(pcm)
+        proc.stdin.flush()
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.terminate()
+            proc.wait(timeout=2)
+        except Exception:
+            pass
+
+
+class PlaybackEngine:
+    """Ring buffer -> jitter buffer -> one persistent sink; see module docstring."""
+
+    def __init__(self, sample_rate, channels=1, sink=None, period_ms=25,
+                 jitter_ms=80, buffer_s=60, on_start=None, on_drained=None,
+                 tap=None, clock=time.monotonic):
+        self.sample_rate = sample_rate
+        self.frame_bytes = 2 * channels
+        self.period_frames = max(1, int(sample_rate * period_ms / 1000))
+        self.period_bytes = self.period_frames * self.frame_bytes
+        self.jitter_bytes = int(sample_rate * jitter_ms / 1000) * self.frame_bytes
+        self.jitter_s = jitter_ms / 1000.0
+        self.lead_frames = LEAD_PERIODS * self.period_frames
+        self.sink = sink or NullSink()
+        self.on_start = on_start        # fn() first frame of a reply written
+        self.on_drained = on_drained    # fn(flushed) reply finished playing
+        self.tap = tap                  # fn(pcm) each audio block as it is written
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._ring = PCMRing(int(sample_rate * buffer_s) * self.frame_bytes, self.frame_bytes)
+        self._block = bytearray(self.period_bytes)
+        self._block_view = memoryview(self._block)
+        self._silence = bytes(self.period_bytes)
+        self.state = IDLE
+        self._ending = False
+        self._flushed = False
+        self._first_in = None
+        self._prime_start = 0.0
+        self._start_frame = None
+        self._end_frame = 0
+        self._frames_written = 0
+        self._t0 = None
+        self._sink_open = False
+        self._new_sink = None
+        self._retry_at = 0.0
+        self._running = False
+        self._thread = None
+        self.counters = {"responses": 0, "underruns": 0, "gap_ms": 0.0,
+                         "overruns": 0, "dropped_ms": 0.0, "flushes": 0,
+                         "sink_errors": 0, "late_writes": 0,
+                         "first_audio_ms": None, "first_audio_ms_max": None}
+
+    # ----- producer side (WebSocket thread) ----------------------------
+
+    def write(self, pcm):
+        """Queue reply audio; never blocks. Returns the bytes accepted."""
+        with self._lock:
+            if self.state in (IDLE, DRAINING):
+                self._begin_response()
+            elif self._ending:
+                # Next reply queued behind the one still playing: they
+                # play back to back and drain as one
+                self._ending = False
+                self.counters["responses"] += 1
+            elif self.state == PRIMING and not len(self._ring):
+                self._prime_start = self._clock()
+            accepted = self._ring.write(pcm)
+            if accepted < len(pcm):
+                self.counters["overruns"] += 1
+                self.counters["dropped_ms"] += self._ms(len(pcm) - accepted)
+            return accepted
+
+    def end_response(self):
+        """No more audio for this reply; play out what is buffered."""
+        with self._lock:
+            if self.state != IDLE:
+                self._ending = True
+
+    def flush(self):
+        """Barge-in: drop the unplayed rest of the reply at once."""
+        with self._lock:
+            if self.state == IDLE:
+                return
+            self._ring.clear()
+            self.counters["flushes"] += 1
+            self._flushed = True
+            self._finish_audio(self._frames_written)
+
+    def _begin_response(self):
+        self.state = PRIMING
+        self._ending = False
+        self._flushed = False
+        self._first_in = self._clock()
+        self._prime_start = self._first_in
+        self._start_frame = None
+        self.counters["responses"] += 1
+
+    def _finish_audio(self, end_frame):
+        self.state = DRAINING
+        self._end_frame = end_frame
+
+    def _ms(self, nbytes):
+        return nbytes / self.frame_bytes / self.sample_rate * 1000.0
+
+    # ----- queries -----------------------------------------------------
+
+    def is_playing(self):
+        """True from a reply's first delta until its last frame has played."""
+        return self.state != IDLE
+
+    def played_frames(self):
+        """Frames the speaker has played since the stream opened."""
+        if self._t0 is None:
+            return 0
+        delay = getattr(self.sink, "delay_frames", None)
+        if delay is not None:
+            return max(0, self._frames_written - delay())
+        latency = max(0, int(getattr(self.sink, "latency_s", 0.0) * self.sample_rate) - self.lead_frames)
+        clock = int((self._clock() - self._t0) * self.sample_rate) - latency
+        return max(0, min(self._frames_written, clock))
+
+    def remaining_s(self):
+        """Seconds until the current reply's audio has all been heard."""
+        with self._lock:
+            if self.state == IDLE:
+                return 0.0
+            end = self._end_frame if self.state == DRAINING else (
+                self._frames_written + len(self._ring) // self.frame_bytes)
+        return max(0, end - self.played_frames()) / self.sample_rate
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters, state=self.state,
+                         buffered_ms=round(self._ms(len(self._ring)), 1))
+        stats["gap_ms"] = round(stats["gap_ms"], 1)
+        stats["dropped_ms"] = round(stats["dropped_ms"], 1)
+        stats["position_s"] = round(self.played_frames() / self.sample_rate, 3)
+        return stats
+
+    # ----- playback thread ---------------------------------------------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="voice-playback")
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._running = False
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+        self._close_sink()
+
+    def set_sink(self, sink):
+        """Swap the output stream (tests, device change) at the next period."""
+        if self._thread is None:
+            self._close_sink()
+            self.sink = sink
+        else:
+            self._new_sink = sink
+
+    def _open_sink(self):
+        try:
+            self.sink.open()
+        except Exception as e:
+            logger.warning(f"Audio output unavailable ({e}); replies will be silent")
+            self.sink = NullSink()
+        self._sink_open = True
+        # Frame positions carry on across reopens; only the clock restarts
+        self._t0 = self._clock() - self._frames_written / self.sample_rate
+
+    def _close_sink(self):
+        if self._sink_open:
+            self._sink_open = False
+            try:
+                self.sink.close()
+            except Exception:
+                pass
+
+    def _next_block(self):
+        """Fill self._block for the next period; returns audio bytes in it."""
+        now = self._clock()
+        if self.state == PRIMING and (
+                len(self._ring) >= 2 * self.jitter_bytes or self._ending
+                or (len(self._ring) and now - self._prime_start >= self.jitter_s)):
+            self.state = PLAYING
+        if self.state != PLAYING:
+            if self.state == PRIMING and self._start_frame is not None:
+                self.counters["gap_ms"] += self._ms(self.period_bytes)
+            return 0
+        n = self._ring.read_into(self._block_view)
+        if n < self.period_bytes:
+            self._block_view[n:] = self._silence[n:]
+            if self._ending and not len(self._ring):
+                self._finish_audio(self._frames_written + n // self.frame_bytes)
+            else:
+                # Ran dry mid-reply: pad with silence and prime again
+                self.counters["underruns"] += 1
+                self.counters["gap_ms"] += self._ms(self.period_bytes - n)
+                self.state = PRIMING
+                self._prime_start = now
+        return n
+
+    def _run(self):
+        period_s = self.period_frames / self.sample_rate
+        while self._running:
+            if self._new_sink is not None:
+                self._close_sink()
+                self.sink, self._new_sink = self._new_sink, None
+                self._retry_at = 0.0
+            if not self._sink_open:
+                if self._clock() < self._retry_at:
+                    time.sleep(period_s)
+                    continue
+                self._open_sink()
+
+            due = (self._clock() - self._t0) * self.sample_rate + self.lead_frames
+            if self._frames_written >= due:
+                self._check_drained()
+                time.sleep(min(period_s, (self._frames_written - due) / self.sample_rate + 0.001))
+                continue
+
+            started = None
+            with self._lock:
+                n = self._next_block()
+                if n and self._start_frame is None:
+                    self._start_frame = self._frames_written
+                    started = self._first_in
+                block = self._block_view if n else self._silence
+                if n and self.tap is not None:
+                    audio = bytes(self._block_view[:n])
+            if n and self.tap is not None:
+                try:
+                    self.tap(audio)
+                except Exception as e:
+                    logger.debug(f"Playback tap error: {e}")
+            try:
+                self.sink.write(block)
+            except Exception as e:
+                self.counters["sink_errors"] += 1
+                logger.warning(f"Audio output failed ({e}); reopening")
+                self._close_sink()
+                self._retry_at = self._clock() + REOPEN_DELAY_S
+                continue
+            self._frames_written += self.period_frames
+
+            now = self._clock()
+            behind = (now - self._t0) * self.sample_rate - self._frames_written
+            if behind > self.lead_frames:
+                # Stalled (slow sink or starved thread): resync the clock
+                self.counters["late_writes"] += 1
+                self._t0 = now - self._frames_written / self.sample_rate
+            if started is not None:
+                wait = max(0, self._start_frame - self.played_frames()) / self.sample_rate
+                first_ms = round((now - started + wait) * 1000.0, 1)
+                self.counters["first_audio_ms"] = first_ms
+                worst = self.counters["first_audio_ms_max"]
+                self.counters["first_audio_ms_max"] = first_ms if worst is None else max(worst, first_ms)
+                if self.on_start is not None:
+                    self._call(self.on_start)
+            self._check_drained()
+        self._close_sink()
+
+    def _check_drained(self):
+        with self._lock:
+            if self.state != DRAINING or self.played_frames() < self._end_frame:
+                return
+            self.state = IDLE
+            flushed = self._flushed
+            had_audio = self._start_frame is not None
+        if had_audio and self.on_drained is not None:
+            self._call(self.on_drained, flushed)
+
+    def _call(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.debug(f"Playback callback error: {e}")
@@ -137,6 +137,10 @@ class WeatherAnimation:
     def _draw_scene(self, surf):
         pass
 
+    def get_rect(self):
+        """Screen area the band paints into (for dirty-rect tracking)."""
+        return pygame.Rect(0, 0, self.screen_width, self.h)
+
     def draw(self, screen):
         self._surf.fill((0, 0, 0, 0))
         self._draw_scene(self._surf)
@@ -1,6 +1,8 @@
-import requests
 import pygame
 import logging
+import re
+import threading
+import time
 from datetime import datetime, timedelta
 from config import (
     CONFIG, FONT_NAME, FONT_SIZE, FONT_SIZE_HERO, COLOR_FONT_DEFAULT,
@@ -14,6 +16,7 @@ from visual_effects import VisualEffects
 from config import draw_module_background_fallback
 from api_tracker import api_tracker
 from background_fetcher import BackgroundFetcher
+from http_client import http_client, APICallBlocked
 
 logger = logging.getLogger("WeatherModule")
 
@@ -31,6 +34,86 @@ WMO_CODES = {
     95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail",
 }
 
+# Country names people write that geocoders know by another ISO code
+COUNTRY_ALIASES = {'uk': 'gb', 'england': 'gb', 'scotland': 'gb', 'wales': 'gb'}
+
+
+class GeocodeCache:
+    """City -> coordinates lookups that survive restarts.
+
+    Entries live in data_cache ("geocode", i.e. data/cache/geocode.json)
+    keyed by the normalised query, so "Birmingham, UK" and
+    "birmingham,gb" share one entry and several locations can be cached
+    side by side. Entries older than ttl_s are refreshed but still used
+    if the refresh fails. CONFIG['geocode']['locations'] pins
+    coordinates for a query so it never needs the network.
+    """
+
+    def __init__(self, ttl_s=30 * 86400, max_entries=32, pinned=None, clock=time.time):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.pinned = {self.normalise(q): dict(geo) for q, geo in (pinned or {}).items()}
+        self._clock = clock
+        self._entries = None       # loaded on first use
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'stores': 0}
+
+    @staticmethod
+    def normalise(query):
+        """'  Birmingham ,  UK' -> 'birmingham,gb'."""
+        parts = [re.sub(r'\s+', ' ', p).strip().lower() for p in query.split(',')]
+        parts = [p for p in parts if p]
+        if len(parts) > 1:
+            parts[-1] = COUNTRY_ALIASES.get(parts[-1], parts[-1])
+        return ','.join(parts)
+
+    def _load(self):
+        """Entries from disk. Lock held."""
+        if self._entries is None:
+            from data_cache import data_cache
+            cached, _ = data_cache.load("geocode")
+            self._entries = cached if isinstance(cached, dict) else {}
+        return self._entries
+
+    def get(self, query, allow_stale=False):
+        """Cached {lat, lon, name, country} for query, or None."""
+        key = self.normalise(query)
+        if key in self.pinned:
+            return dict(self.pinned[key])
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            if self._clock() - entry.get('saved_at', 0) > self.ttl_s:
+                if not allow_stale:
+                    self.stats['misses'] += 1
+                    return None
+                self.stats['stale_hits'] += 1
+            else:
+                self.stats['hits'] += 1
+            return {k: entry[k] for k in ('lat', 'lon', 'name', 'country') if k in entry}
+
+    def put(self, query, geo):
+        from data_cache import data_cache
+        key = self.normalise(query)
+        with self._lock:
+            entries = self._load()
+            entries[key] = dict(geo, saved_at=self._clock())
+            while len(entries) > self.max_entries:
+                oldest = min(entries, key=lambda k: entries[k].get('saved_at', 0))
+                del entries[oldest]
+            self.stats['stores'] += 1
+            data_cache.save("geocode", entries)
+
+
+_geocode_cfg = CONFIG.get('geocode', {})
+geocode_cache = GeocodeCache(
+    ttl_s=_geocode_cfg.get('ttl_days', 30) * 86400,
+    max_entries=_geocode_cfg.get('max_entries', 32),
+    pinned=_geocode_cfg.get('locations'),
+)
+
 
 class WeatherModule:
     def __init__(self, api_key, city, screen_width=800, screen_height=600, icons_path=None):
@@ -45,11 +128,13 @@ class WeatherModule:
         self.animation = None
         self.icons_path = icons_path
         self.effects = VisualEffects()
-        self._geo_cache = None  # Cache lat/lon for Open-Meteo
+        # lat/lon for Open-Meteo; from disk so the first forecast skips geocoding
+        self._geo_cache = geocode_cache.get(city)
         self.weather_source = None  # Track which API provided data
         from module_base import SurfaceCache
-        self._surface_cache = SurfaceCache()
+        self._surface_cache = SurfaceCache("weather")
         self._last_data_hash = None
+        self._drawn_data = None  # weather_data as of the last draw (compositor)
         self._fetcher = BackgroundFetcher("weather")
         self._retry_after = datetime.min  # backoff after a failed fetch
 
@@ -64,17 +149,26 @@ class WeatherModule:
                 logger.info(f"Restored cached weather ({int(age / 60)} min old)")
 
     def _geocode_city(self):
-        """Convert city name to lat/lon using Open-Meteo geocoding API."""
+        """Convert city name to lat/lon using Open-Meteo geocoding API.
+
+        Checks the persistent geocode_cache first; a successful lookup
+        is stored there, and a failed one falls back to an expired entry.
+        """
         if self._geo_cache:
             return self._geo_cache
+        cached = geocode_cache.get(self.city)
+        if cached:
+            self._geo_cache = cached
+            return cached
 
+        key = geocode_cache.normalise(self.city).split(",")
         city_name = self.city.split(",")[0].strip()
-        country = self.city.split(",")[1].strip() if "," in self.city else None
+        country = key[-1] if len(key) > 1 else None
 
         try:
             url = "https://geocoding-api.open-meteo.com/v1/search"
             params = {"name": city_name, "count": 5, "format": "json"}
-            resp = requests.get(url, params=params, timeout=10)
+            resp = http_client.get(url, params=params, timeout=10)
             resp.raise_for_status()
             data = resp.json()
 
@@ -83,29 +177,27 @@ class WeatherModule:
                 logger.warning(f"Geocoding returned no results for '{self.city}'")
                 return None
 
-            # Try to match country code if provided
-            if country:
-                for r in results:
-                    if r.get("country_code", "").upper() == country.upper():
-                        self._geo_cache = {
-                            "lat": r["latitude"],
-                            "lon": r["longitude"],
-                            "name": r.get("name", city_name),
-                            "country": r.get("country_code", country),
-                        }
-                        return self._geo_cache
-
-            # Fall back to first result
+            # Try to match country code if provided, else the first result
             r = results[0]
+            if country:
+                r = next((c for c in results
+                          if c.get("country_code", "").lower() == country), r)
             self._geo_cache = {
                 "lat": r["latitude"],
                 "lon": r["longitude"],
                 "name": r.get("name", city_name),
                 "country": r.get("country_code", ""),
             }
+            geocode_cache.put(self.city, self._geo_cache)
             return self._geo_cache
 
         except Exception as e:
+            stale = geocode_cache.get(self.city, allow_stale=True)
+            if stale:
+                logger.warning(f"Geocoding failed for '{self.city}', using cached "
+                               f"coordinates: {e}")
+                self._geo_cache = stale
+                return stale
             logger.error(f"Geocoding failed for '{self.city}': {e}")
             return None
 
@@ -129,8 +221,6 @@ class WeatherModule:
 
     def _fetch_open_meteo(self):
         """Fetch current weather from Open-Meteo (no API key needed)."""
-        if not api_tracker.allow("weather", "open-meteo"):
-            return None
         geo = self._geocode_city()
         if not geo:
             return None
@@ -146,9 +236,12 @@ class WeatherModule:
             "wind_speed_unit": "ms",
         }
 
-        resp = requests.get(url, params=params, timeout=10)
+        try:
+            resp = http_client.get(url, params=params, timeout=10,
+                                   api=("weather", "open-meteo"))
+        except APICallBlocked:
+            return None
         resp.raise_for_status()
-        api_tracker.record("weather", "open-meteo")
         data = resp.json()
         current = data.get("current", {})
 
@@ -173,12 +266,12 @@ class WeatherModule:
 
     def _fetch_openweathermap(self):
         """Fetch current weather from OpenWeatherMap (requires API key)."""
-        if not api_tracker.allow("weather", "openweathermap"):
-            return None
         url = f"http://api.openweathermap.org/data/2.5/weather?q={self.city}&appid={self.api_key}&units=metric"
-        resp = requests.get(url, timeout=10)
+        try:
+            resp = http_client.get(url, timeout=10, api=("weather", "openweathermap"))
+        except APICallBlocked:
+            return None
         resp.raise_for_status()
-        api_tracker.record("weather", "openweathermap")
         return resp.json()
 
     def _fetch_weather_blocking(self):
@@ -273,6 +366,18 @@ class WeatherModule:
             logging.error(f"Error creating weather animation: {e}")
             self.animation = None
 
+    def needs_redraw(self):
+        """Compositor hook: the sky band animates; text changes per fetch."""
+        return self.animation is not None or self.weather_data is not self._drawn_data
+
+    def is_animating(self):
+        """Frame-scheduler hook: sky particles need the full frame rate."""
+        return self.animation is not None
+
+    def get_draw_rects(self, position):
+        """Compositor hook: the ambience band paints across the top."""
+        return [self.animation.get_rect()] if self.animation else []
+
     def get_temperature_color(self, temperature):
         # Clamp temperature between 0 and 32
         t = max(0, min(temperature, 32))
@@ -326,6 +431,7 @@ class WeatherModule:
 
             # Title label
             from module_base import ModuleDrawHelper
+            self._drawn_data = self.weather_data
             draw_y = ModuleDrawHelper.draw_module_title(
                 screen, "Weather", x, y, width
             )
@@ -2,7 +2,8 @@
 
 A wall-mounted mirror has no keyboard, so this serves a small dark-themed
 page on the LAN to control it: switch state (active/screensaver/sleep),
-toggle module visibility, and watch API usage and recent logs.
+toggle module visibility, and watch API usage, render timings,
+background fetches, HTTP traffic, the startup timeline and recent logs.
 
 Zero dependencies - stdlib ThreadingHTTPServer running in a daemon
 thread. The handler only READS mirror state; all writes are pushed onto
@@ -71,9 +72,11 @@ PAGE = """<!DOCTYPE html>
 
 <h2>State</h2>
 <div class="row" id="states"></div>
+<div class="meta" id="frameRate"></div>
 
 <h2>Modules</h2>
 <div class="row" id="modules"></div>
+<div class="row" id="refreshButtons"></div>
 
 <h2>Stocks watchlist</h2>
 <textarea id="tickers" rows="8" placeholder="loading..."></textarea>
@@ -97,6 +100,15 @@ PAGE = """<!DOCTYPE html>
 </thead><tbody></tbody></table>
 <div class="meta" id="apiTotals"></div>
 
+<h2>Render profile</h2>
+<table id="profile"><thead>
+<tr><th>Module</th><th>Mean</th><th>p95</th><th>Max</th><th>Over</th></tr>
+</thead><tbody></tbody></table>
+<div class="meta" id="profileMeta"></div>
+<div class="meta" id="cacheMeta"></div>
+<div class="meta" id="fetchMeta"></div>
+<div class="meta" id="httpMeta"></div>
+
 <h2>Recent log</h2>
 <pre id="log">loading...</pre>
 
@@ -123,6 +135,11 @@ function render(s) {
     b.onclick = () => post("/api/state?value=" + st);
     states.appendChild(b);
   }
+  const f = s.frame;
+  document.getElementById("frameRate").textContent = f
+    ? f.fps + " FPS (" + f.reason + "), avg " + f.avg_fps + " FPS, busy "
+      + (f.busy_fraction * 100).toFixed(1) + "%"
+    : "";
 
   const mods = document.getElementById("modules");
   mods.innerHTML = "";
@@ -133,6 +150,14 @@ function render(s) {
     b.onclick = () => post("/api/toggle?module=" + name);
     mods.appendChild(b);
   }
+  const refreshRow = document.getElementById("refreshButtons");
+  refreshRow.innerHTML = "";
+  for (const name of s.refreshable || []) {
+    const b = document.createElement("button");
+    b.textContent = "refresh " + name;
+    b.onclick = () => post("/api/refresh?module=" + name);
+    refreshRow.appendChild(b);
+  }
 
   const tbody = document.querySelector("#api tbody");
   tbody.innerHTML = "";
@@ -159,6 +184,62 @@ async function refresh() {
   try { render(await getStatus()); } catch (e) {}
 }
 
+async function refreshProfile() {
+  try {
+    const r = await fetch("/api/profile");
+    const p = await r.json();
+    if (!p.enabled) return;
+    const tbody = document.querySelector("#profile tbody");
+    tbody.innerHTML = "";
+    for (const [key, m] of Object.entries(p.modules).slice(0, 12)) {
+      const tr = document.createElement("tr");
+      tr.innerHTML = "<td>" + key + "</td><td>" + m.mean_ms.toFixed(2) + "</td><td>"
+        + m.p95_ms + "</td><td>" + m.max_ms.toFixed(1) + "</td><td>"
+        + m.over_budget + "</td>";
+      tbody.appendChild(tr);
+    }
+    document.getElementById("profileMeta").textContent =
+      "Frame mean " + p.frame.mean_ms.toFixed(1) + " ms, p95 " + p.frame.p95_ms
+      + " ms, " + p.frame.over_budget + "/" + p.frame.count + " over "
+      + p.frame_budget_ms + " ms (last " + p.window_s + "s, ms; over = frames above "
+      + p.module_budget_ms + " ms). Profiler overhead "
+      + (p.overhead.fraction_of_frame * 100).toFixed(2) + "%";
+    const c = await (await fetch("/api/caches")).json();
+    const sc = c.surfaces;
+    let hits = 0, lookups = 0;
+    for (const v of Object.values(sc.caches)) { hits += v.hits; lookups += v.hits + v.misses; }
+    document.getElementById("cacheMeta").textContent =
+      "Text cache " + (sc.bytes / 1048576).toFixed(1) + " / "
+      + (sc.max_bytes / 1048576).toFixed(0) + " MB, hit rate "
+      + (lookups ? (hits / lookups * 100).toFixed(1) : "0") + "%, "
+      + sc.evictions + " evictions"
+      + (c.ticker ? "; ticker strip " + c.ticker.rebuilds + " rebuilds, "
+         + c.ticker.patches + " patches" : "");
+    const f = await (await fetch("/api/fetch")).json();
+    const slow = Object.entries(f.jobs)
+      .sort((a, b) => b[1].run_ms_mean - a[1].run_ms_mean).slice(0, 3)
+      .map(([n, j]) => n + " " + j.run_ms_mean.toFixed(0) + " ms (wait "
+           + j.wait_ms_mean.toFixed(0) + ")").join(", ");
+    document.getElementById("fetchMeta").textContent =
+      "Fetch pool " + f.busy + "/" + f.workers + " busy, " + f.queued
+      + " queued" + (slow ? "; slowest: " + slow : "")
+      + (f.stocks && f.stocks.last_round_s !== null
+         ? "; stock refresh " + f.stocks.last_round_s + " s" : "")
+      + (f.news ? "; feeds " + Object.entries(f.news).map(([n, s]) =>
+           n + " " + s.latency_ms_last.toFixed(0) + " ms"
+           + (s.retry_in_s ? " (retry " + s.retry_in_s + " s)" : "")).join(", ") : "")
+      + (f.home_assistant ? "; HA " + f.home_assistant.mode + ", "
+         + f.home_assistant.entities + " entities, " + f.home_assistant.events
+         + " events" : "");
+    const h = await (await fetch("/api/http")).json();
+    const t = h.totals;
+    document.getElementById("httpMeta").textContent =
+      "HTTP " + t.network + " upstream calls (" + t.handshakes_per_hour + " handshakes/h, "
+      + (t.bytes_per_hour / 1024).toFixed(0) + " KB/h), " + t.not_modified + " not modified, "
+      + t.fresh_hits + " fresh hits, " + (t.bytes_saved / 1024).toFixed(0) + " KB saved";
+  } catch (e) {}
+}
+
 async function loadTickers() {
   try {
     const r = await fetch("/api/tickers");
@@ -212,10 +293,12 @@ async function saveEntities() {
 
 refresh();
 refreshLog();
+refreshProfile();
 loadTickers();
 loadEntities();
 setInterval(refresh, 5000);
 setInterval(refreshLog, 10000);
+setInterval(refreshProfile, 10000);
 </script>
 </body>
 </html>
@@ -234,6 +317,13 @@ class WebPanel:
         self._server = None
         self._thread = None
 
+    def queue_command(self, command):
+        """Queue a (cmd, value) pair and wake the main loop if it is idling."""
+        self.commands.put(command)
+        scheduler = getattr(self.mirror, "frame_scheduler", None)
+        if scheduler is not None:
+            scheduler.wake("panel")
+
     # ----- main-loop side -------------------------------------------------
 
     def process_commands(self):
@@ -254,20 +344,29 @@ class WebPanel:
                             f"[panel] {value}: {'OFF' if current else 'ON'}",
                             duration_ms=2000,
                         )
+                elif cmd == "refresh":
+                    self.mirror.refresh_module(value)
                 elif cmd == "state":
                     self.mirror.change_state(value)
                     logger.info(f"Panel set state: {value}")
                 elif cmd == "set_tickers":
-                    stocks = self.mirror.modules.get("stocks")
+                    stocks = self._command_module("stocks")
                     if stocks and hasattr(stocks, "set_tickers"):
                         stocks.set_tickers(value)
                 elif cmd == "set_entities":
-                    sh = self.mirror.modules.get("smarthome")
+                    sh = self._command_module("smarthome")
                     if sh and hasattr(sh, "set_entities"):
                         sh.set_entities(value)
             except Exception as e:
                 logger.error(f"Panel command {cmd}={value} failed: {e}")
 
+    def _command_module(self, name):
+        """A module a command needs, constructing it if it has not loaded yet."""
+        registry = getattr(self.mirror, "registry", None)
+        if registry is not None:
+            return registry.load(name, "command")
+        return self.mirror.modules.get(name)
+
     # ----- server side ----------------------------------------------------
 
     def start(self):
@@ -291,6 +390,17 @@ class WebPanel:
                     self._send(200, PAGE, "text/html")
                 elif url.path == "/api/status":
                     self._send(200, json.dumps(panel.status()))
+                elif url.path == "/api/profile":
+                    self._send(200, json.dumps(panel.profile()))
+                elif url.path == "/api/startup":
+                    self._send(200, json.dumps(panel.startup()))
+                elif url.path == "/api/caches":
+                    self._send(200, json.dumps(panel.caches()))
+                elif url.path == "/api/fetch":
+                    self._send(200, json.dumps(panel.fetch_stats()))
+                elif url.path == "/api/http":
+                    from http_client import http_client
+                    self._send(200, json.dumps(http_client.get_stats()))
                 elif url.path == "/api/logs":
                     qs = parse_qs(url.query)
                     lines = int(qs.get("lines", ["60"])[0])
@@ -313,15 +423,22 @@ class WebPanel:
                 qs = parse_qs(url.query)
                 if url.path == "/api/toggle":
                     module = qs.get("module", [""])[0]
-                    if module in panel.mirror.modules:
-                        panel.commands.put(("toggle", module))
+                    if module in panel.module_names():
+                        panel.queue_command(("toggle", module))
                         self._send(200, json.dumps({"ok": True}))
                     else:
                         self._send(400, json.dumps({"error": "unknown module"}))
+                elif url.path == "/api/refresh":
+                    module = qs.get("module", [""])[0]
+                    if module in panel.refreshable():
+                        panel.queue_command(("refresh", module))
+                        self._send(200, json.dumps({"ok": True}))
+                    else:
+                        self._send(400, json.dumps({"error": "module cannot refresh"}))
                 elif url.path == "/api/state":
                     value = qs.get("value", [""])[0]
                     if value in ("active", "screensaver", "sleep"):
-                        panel.commands.put(("state", value))
+                        panel.queue_command(("state", value))
                         self._send(200, json.dumps({"ok": True}))
                     else:
                         self._send(400, json.dumps({"error": "bad state"}))
@@ -331,7 +448,7 @@ class WebPanel:
                     # Accept newline- or comma-separated symbols
                     syms = [s.strip() for s in body.replace(",", "\n").splitlines()
                             if s.strip()]
-                    panel.commands.put(("set_tickers", syms))
+                    panel.queue_command(("set_tickers", syms))
                     self._send(200, json.dumps({"ok": True, "count": len(syms)}))
                 elif url.path == "/api/ha_entities":
                     length = int(self.headers.get("Content-Length", 0) or 0)
@@ -342,7 +459,7 @@ class WebPanel:
                             ids = []
                     except Exception:
                         ids = [s.strip() for s in body.splitlines() if s.strip()]
-                    panel.commands.put(("set_entities", ids))
+                    panel.queue_command(("set_entities", ids))
                     self._send(200, json.dumps({"ok": True, "count": len(ids)}))
                 else:
                     self._send(404, json.dumps({"error": "not found"}))
@@ -375,11 +492,68 @@ class WebPanel:
             "state": self.mirror.state,
             "modules": {
                 name: bool(mm.is_module_visible(name))
-                for name in sorted(self.mirror.modules.keys())
+                for name in sorted(self.module_names())
             },
+            "refreshable": self.refreshable(),
             "api": api_tracker.get_summary(),
+            "frame": (self.mirror.frame_scheduler.get_stats()
+                      if hasattr(self.mirror, "frame_scheduler") else None),
         }
 
+    def refreshable(self):
+        """Loaded modules with a refresh() hook."""
+        return sorted(name for name, module in self.mirror.modules.items()
+                      if hasattr(module, "refresh"))
+
+    def module_names(self):
+        """Every module the mirror can show, loaded or not."""
+        registry = getattr(self.mirror, "registry", None)
+        return registry.names() if registry is not None else list(self.mirror.modules.keys())
+
+    def startup(self):
+        registry = getattr(self.mirror, "registry", None)
+        return registry.get_timeline() if registry is not None else {"events": []}
+
+    def profile(self):
+        profiler = getattr(self.mirror, "profiler", None)
+        return profiler.get_stats() if profiler is not None else {"enabled": False}
+
+    def caches(self):
+        from module_base import surface_budget
+        layer_cache = getattr(self.mirror, "layer_cache", None)
+        stocks = self.mirror.modules.get("stocks")
+        return {
+            "surfaces": surface_budget.get_stats(),
+            "layers": layer_cache.get_stats() if layer_cache is not None else None,
+            "ticker": stocks.get_ticker_stats() if hasattr(stocks, "get_ticker_stats") else None,
+        }
+
+    def fetch_stats(self):
+        from background_fetcher import fetch_scheduler
+        stats = fetch_scheduler.get_stats()
+        stocks = self.mirror.modules.get("stocks")
+        if hasattr(stocks, "get_quote_stats"):
+            stats["stocks"] = stocks.get_quote_stats()
+        news = self.mirror.modules.get("news")
+        if hasattr(news, "get_feed_stats"):
+            stats["news"] = news.get_feed_stats()
+        voice = self.mirror.modules.get("ai_voice")
+        if hasattr(voice, "get_connection_stats"):
+            stats["voice"] = voice.get_connection_stats()
+        if hasattr(voice, "get_playback_stats"):
+            stats["voice_playback"] = voice.get_playback_stats()
+        fallback = self.mirror.modules.get("ai_interaction")
+        if hasattr(fallback, "get_tts_stats"):
+            stats["tts_cache"] = fallback.get_tts_stats()
+        if hasattr(fallback, "get_speech_stats"):
+            stats["speech"] = fallback.get_speech_stats()
+        for name in ("smarthome", "phone"):
+            sub = getattr(self.mirror.modules.get(name), "_ha_sub", None)
+            if sub is not None:
+                stats["home_assistant"] = sub.store.get_stats()
+                break
+        return stats
+
     def tail_log(self, lines):
         try:
             with open(_LOG_FILE, "rb") as f: